@@ -0,0 +1,660 @@
+"""Artefactos compilados: el resultado de un análisis guardado en binario.
+
+Un artefacto (.cosb) guarda lo que deja `Compilador.analizar` (sentencias,
+tabla de símbolos, mensajes, estadísticas y los inicios de línea del código)
+para usarlo sin volver a compilar. Se abre con mmap y cada parte se
+decodifica la primera vez que se pide: leer `estadisticas` no toca las
+sentencias, y una sentencia o un símbolo se decodifican solos.
+
+Formato (little-endian, cada sección alineada a 4 bytes):
+
+    cabecera    MAGIA, FORMATO (u16), cantidad de secciones (u16) y por
+                sección su (inicio, largo) en u32
+    RESUMEN     exito, vacio, estadisticas y cantidad de sentencias
+    CADENAS     nombres y textos internados: inicios (u32) + UTF-8
+    CONSTANTES  números que no caben en una referencia: tipo (u8) + 8 bytes
+    TUPLAS      nodos de sentencias y expresiones: inicios (u32) + referencias
+    SENTENCIAS  (referencia, línea) de cada sentencia, en orden
+    SIMBOLOS    un registro por slot: nombre, tipo, línea, valor, elemento,
+                tamaño y módulo
+    MENSAJES    un registro por mensaje: tipo, línea, código, argumentos,
+                posición y fin
+    LINEAS      posición donde empieza cada línea del código (columnas)
+
+Una referencia es un u32: los 3 bits bajos dicen qué es (None/booleano,
+entero pequeño, cadena, constante o tupla) y el resto es el valor o el
+índice. Un nodo internado se guarda una vez y al cargar vuelve a ser un
+solo objeto compartido.
+
+Uso:
+    python artifact.py compilar programa.cos [-o programa.cosb]
+    python artifact.py resumen programa.cosb
+    python artifact.py ejecutar programa.cosb [--especializado] < entrada
+    python artifact.py verificar [carpeta]
+"""
+import argparse
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left, bisect_right
+
+from diagnostics import Codigo, Diagnostico
+from runtime import Programa
+from source import IndiceLineas
+
+MAGIA = b'COSB'
+FORMATO = 1
+EXTENSION = '.cosb'
+
+# Secciones, en el orden de la cabecera
+RESUMEN, CADENAS, CONSTANTES, TUPLAS, SENTENCIAS, SIMBOLOS, MENSAJES, LINEAS = range(8)
+SECCIONES = 8
+
+CABECERA = struct.Struct('<4sHH')
+ENTRADA_SECCION = struct.Struct('<II')
+# exito, vacio, estadisticas (referencia), sentencias (SIN_SENTENCIAS si no hubo resultado)
+FORMATO_RESUMEN = struct.Struct('<BBxxII')
+CONSTANTE = struct.Struct('<cq')
+CONSTANTE_REAL = struct.Struct('<cd')
+
+# Tipo de referencia (3 bits bajos)
+ESPECIAL, ENTERO, CADENA, NUMERO, TUPLA = range(5)
+BITS_TIPO = 3
+MAX_ENTERO = (1 << (32 - BITS_TIPO)) - 1
+ESPECIALES = (None, False, True)
+# Campo que no está en el símbolo (una variable simple no tiene 'elemento')
+AUSENTE = (3 << BITS_TIPO) | ESPECIAL
+
+CAMPOS_SIMBOLO = ('tipo', 'linea', 'valor', 'elemento', 'tamano', 'modulo')
+# nombre + campos
+ANCHO_SIMBOLO = 1 + len(CAMPOS_SIMBOLO)
+# tipo, línea, código, argumentos, posición, fin
+ANCHO_MENSAJE = 6
+SIN_SENTENCIAS = 0xFFFFFFFF
+CODIGOS = {codigo.value: codigo for codigo in Codigo}
+
+
+class ArtefactoInvalido(Exception):
+    """El archivo no es un artefacto o es de otro formato"""
+
+
+# ===================== ESCRITURA =====================
+
+class EscritorArtefacto:
+    """Arma las secciones de un artefacto a partir de un resultado de analizar()"""
+
+    def __init__(self):
+        self.cadenas = {}
+        self.constantes = {}
+        self.datos_constantes = bytearray()
+        # id(tupla) -> índice; se guardan las tuplas para que su id no se recicle
+        self.indices_tuplas = {}
+        self.tuplas = []
+        self.inicios_tuplas = array('I', [0])
+        self.datos_tuplas = array('I')
+
+    def referencia(self, valor):
+        """Referencia u32 de un valor (las tuplas ya tienen que estar guardadas)"""
+        if valor is None or valor is False or valor is True:
+            return ESPECIALES.index(valor) << BITS_TIPO | ESPECIAL
+        tipo = type(valor)
+        if tipo is int:
+            if 0 <= valor <= MAX_ENTERO:
+                return valor << BITS_TIPO | ENTERO
+            return self.constante(valor) << BITS_TIPO | NUMERO
+        if tipo is float:
+            return self.constante(valor) << BITS_TIPO | NUMERO
+        if tipo is str:
+            return self.cadena(valor) << BITS_TIPO | CADENA
+        if tipo is tuple:
+            return self.indices_tuplas[id(valor)] << BITS_TIPO | TUPLA
+        if isinstance(valor, int):
+            # Enteros derivados (IntEnum): se guarda el número
+            return self.referencia(int(valor))
+        raise TypeError(f"No se puede guardar un {tipo.__name__} en un artefacto")
+
+    def cadena(self, texto):
+        indice = self.cadenas.get(texto)
+        if indice is None:
+            indice = self.cadenas[texto] = len(self.cadenas)
+        return indice
+
+    def constante(self, numero):
+        if type(numero) is float:
+            clave = CONSTANTE_REAL.pack(b'd', numero)
+        elif -(1 << 63) <= numero < 1 << 63:
+            clave = CONSTANTE.pack(b'q', numero)
+        else:
+            # Entero grande: se guarda su texto en las cadenas
+            clave = CONSTANTE.pack(b'g', self.cadena(str(numero)))
+        indice = self.constantes.get(clave)
+        if indice is None:
+            indice = self.constantes[clave] = len(self.constantes)
+            self.datos_constantes += clave
+        return indice
+
+    def valor(self, valor):
+        """Guarda un valor (con sus tuplas, sin recursión) y retorna su referencia"""
+        if type(valor) is tuple:
+            pendientes = [valor]
+            while pendientes:
+                nodo = pendientes[-1]
+                if id(nodo) in self.indices_tuplas:
+                    pendientes.pop()
+                    continue
+                faltan = [hijo for hijo in nodo if type(hijo) is tuple and id(hijo) not in self.indices_tuplas]
+                if faltan:
+                    pendientes.extend(faltan)
+                    continue
+                pendientes.pop()
+                self.datos_tuplas.extend(self.referencia(hijo) for hijo in nodo)
+                self.inicios_tuplas.append(len(self.datos_tuplas))
+                self.indices_tuplas[id(nodo)] = len(self.tuplas)
+                self.tuplas.append(nodo)
+        return self.referencia(valor)
+
+    def secciones(self, resultado, tabla_simbolos, indice=None):
+        """Retorna el contenido (bytes) de cada sección, en orden"""
+        estadisticas = self.valor(tuple(resultado['estadisticas'].items()))
+        sentencias = resultado['resultado']
+        registros_sentencias = array('I')
+        for sentencia in sentencias or ():
+            linea = sentencia[-1] if type(sentencia[-1]) is int else 0
+            registros_sentencias.extend((self.valor(sentencia), linea))
+
+        registros_simbolos = array('I')
+        for nombre, simbolo in tabla_simbolos.items():
+            registros_simbolos.append(self.valor(nombre))
+            for campo in CAMPOS_SIMBOLO:
+                registros_simbolos.append(self.valor(simbolo[campo]) if campo in simbolo else AUSENTE)
+
+        registros_mensajes = array('I')
+        for m in resultado['mensajes']:
+            registros_mensajes.extend((self.valor(m.tipo), self.valor(m.linea), int(m.codigo),
+                                       self.valor(tuple(m.args)), self.valor(m.posicion), self.valor(m.fin)))
+
+        lineas = array('I', indice.inicios if indice is not None else ())
+
+        resumen = FORMATO_RESUMEN.pack(bool(resultado['exito']), bool(resultado['vacio']), estadisticas,
+                                       SIN_SENTENCIAS if sentencias is None else len(sentencias))
+
+        # Las cadenas van al final: las secciones de arriba todavía agregan
+        codificadas = [texto.encode('utf-8', 'surrogatepass') for texto in self.cadenas]
+        inicios_cadenas = array('I', [0])
+        for codificada in codificadas:
+            inicios_cadenas.append(inicios_cadenas[-1] + len(codificada))
+
+        return [
+            resumen,
+            enteros([len(codificadas)]) + enteros(inicios_cadenas) + b''.join(codificadas),
+            enteros([len(self.constantes)]) + bytes(self.datos_constantes),
+            enteros([len(self.tuplas)]) + enteros(self.inicios_tuplas) + enteros(self.datos_tuplas),
+            enteros(registros_sentencias),
+            enteros(registros_simbolos),
+            enteros(registros_mensajes),
+            enteros(lineas),
+        ]
+
+
+def enteros(valores):
+    """u32 little-endian"""
+    datos = array('I', valores)
+    if sys.byteorder != 'little':
+        datos.byteswap()
+    return datos.tobytes()
+
+
+def serializar(resultado, tabla_simbolos, indice=None):
+    """Bytes del artefacto de un resultado de analizar() y su tabla de símbolos"""
+    secciones = EscritorArtefacto().secciones(resultado, tabla_simbolos, indice)
+    inicio = CABECERA.size + ENTRADA_SECCION.size * len(secciones)
+    partes = [CABECERA.pack(MAGIA, FORMATO, len(secciones))]
+    cuerpo = []
+    for seccion in secciones:
+        relleno = -inicio % 4
+        cuerpo.append(b'\0' * relleno + seccion)
+        inicio += relleno
+        partes.append(ENTRADA_SECCION.pack(inicio, len(seccion)))
+        inicio += len(seccion)
+    return b''.join(partes + cuerpo)
+
+
+def guardar_artefacto(ruta, resultado, tabla_simbolos, indice=None):
+    """Escribe el artefacto (primero a un temporal, así nadie lee uno a medias)"""
+    temporal = ruta + '.tmp'
+    with open(temporal, 'wb') as f:
+        f.write(serializar(resultado, tabla_simbolos, indice))
+    os.replace(temporal, ruta)
+
+
+# ===================== LECTURA =====================
+
+class Artefacto:
+    """Artefacto abierto: cada parte se decodifica al pedirla y se guarda.
+
+    `Artefacto(ruta)` mapea el archivo en memoria; `Artefacto.desde_bytes(datos)`
+    lee uno que ya está en memoria. Se cierra con cerrar() o con `with`; lo
+    ya decodificado sigue sirviendo después de cerrar.
+    """
+
+    def __init__(self, ruta=None, datos=None):
+        self.ruta = ruta
+        self.mapa = None
+        if datos is None:
+            with open(ruta, 'rb') as archivo:
+                try:
+                    self.mapa = datos = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    # Archivo vacío: mmap no acepta tamaño 0
+                    datos = b''
+            if self.mapa is not None and hasattr(self.mapa, 'madvise'):
+                # Se salta de una sección a otra según lo que se pida
+                self.mapa.madvise(mmap.MADV_RANDOM)
+        self.vista = memoryview(datos)
+        # Vistas derivadas: se liberan antes de cerrar el mapa
+        self.vistas = [self.vista]
+        try:
+            self.secciones = self.leer_cabecera()
+        except ArtefactoInvalido:
+            self.cerrar()
+            raise
+
+        self._resumen = None
+        self._cadenas = None
+        self._constantes = None
+        self._tuplas = None
+        self._sentencias = None
+        self._simbolos = None
+        self._mensajes = None
+        self._indice = None
+        self._slots = None
+
+    @classmethod
+    def desde_bytes(cls, datos):
+        return cls(datos=datos)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
+
+    def cerrar(self):
+        for vista in reversed(self.vistas):
+            vista.release()
+        self.vistas = []
+        if self.mapa is not None:
+            self.mapa.close()
+            self.mapa = None
+
+    def leer_cabecera(self):
+        if len(self.vista) < CABECERA.size:
+            raise ArtefactoInvalido("El archivo es muy corto para ser un artefacto")
+        magia, formato, cantidad = CABECERA.unpack_from(self.vista)
+        if magia != MAGIA:
+            raise ArtefactoInvalido("El archivo no es un artefacto de Costeñol")
+        if formato != FORMATO:
+            raise ArtefactoInvalido(f"Artefacto de formato {formato}, se esperaba {FORMATO}: vuelve a compilar")
+        if cantidad < SECCIONES or len(self.vista) < CABECERA.size + ENTRADA_SECCION.size * cantidad:
+            raise ArtefactoInvalido("Cabecera del artefacto incompleta")
+        secciones = []
+        for i in range(cantidad):
+            inicio, largo = ENTRADA_SECCION.unpack_from(self.vista, CABECERA.size + ENTRADA_SECCION.size * i)
+            if inicio + largo > len(self.vista):
+                raise ArtefactoInvalido("Artefacto cortado: una sección se sale del archivo")
+            secciones.append((inicio, largo))
+        return secciones
+
+    def bytes_seccion(self, seccion):
+        inicio, largo = self.secciones[seccion]
+        return self.derivar(self.vista[inicio:inicio + largo])
+
+    def derivar(self, vista):
+        """Registra una vista del mapa para liberarla al cerrar"""
+        self.vistas.append(vista)
+        return vista
+
+    def enteros(self, vista, copiar=False):
+        """Los bytes como u32 (sin copiar si la máquina es little-endian)"""
+        if sys.byteorder != 'little' or copiar:
+            valores = array('I', vista.tobytes())
+            if sys.byteorder != 'little':
+                valores.byteswap()
+            return valores
+        return self.derivar(vista.cast('I'))
+
+    # ===================== VALORES =====================
+
+    @property
+    def cadenas(self):
+        """(inicios, bytes, decodificadas) de la sección CADENAS"""
+        if self._cadenas is None:
+            vista = self.bytes_seccion(CADENAS)
+            cantidad = int.from_bytes(vista[:4], 'little')
+            inicios = self.enteros(self.derivar(vista[4:4 * (cantidad + 2)]))
+            self._cadenas = (inicios, self.derivar(vista[4 * (cantidad + 2):]), [None] * cantidad)
+        return self._cadenas
+
+    def cadena(self, indice):
+        inicios, datos, decodificadas = self.cadenas
+        texto = decodificadas[indice]
+        if texto is None:
+            texto = decodificadas[indice] = str(datos[inicios[indice]:inicios[indice + 1]], 'utf-8', 'surrogatepass')
+        return texto
+
+    def constante(self, indice):
+        if self._constantes is None:
+            self._constantes = self.bytes_seccion(CONSTANTES)
+        posicion = 4 + CONSTANTE.size * indice
+        tipo, numero = CONSTANTE.unpack_from(self._constantes, posicion)
+        if tipo == b'd':
+            return CONSTANTE_REAL.unpack_from(self._constantes, posicion)[1]
+        if tipo == b'g':
+            return int(self.cadena(numero))
+        return numero
+
+    def valor(self, referencia):
+        """Decodifica una referencia"""
+        tipo = referencia & 7
+        indice = referencia >> BITS_TIPO
+        if tipo == ENTERO:
+            return indice
+        if tipo == CADENA:
+            return self.cadena(indice)
+        if tipo == TUPLA:
+            return self.tupla(indice)
+        if tipo == NUMERO:
+            return self.constante(indice)
+        return ESPECIALES[indice]
+
+    @property
+    def tuplas(self):
+        """(inicios, referencias, decodificadas) de la sección TUPLAS"""
+        if self._tuplas is None:
+            valores = self.enteros(self.bytes_seccion(TUPLAS))
+            cantidad = valores[0]
+            self._tuplas = (self.derivar(valores[1:cantidad + 2]), self.derivar(valores[cantidad + 2:]),
+                            [None] * cantidad)
+        return self._tuplas
+
+    def tupla(self, indice):
+        decodificadas = self.tuplas[2]
+        tupla = decodificadas[indice]
+        if tupla is None:
+            self.decodificar_tuplas(self.faltantes(indice))
+            tupla = decodificadas[indice]
+        return tupla
+
+    def faltantes(self, indice):
+        """Índices de la tupla y de las tuplas hijas que aún no se decodifican, en orden"""
+        inicios, referencias, decodificadas = self.tuplas
+        faltan = {indice}
+        pendientes = [indice]
+        while pendientes:
+            actual = pendientes.pop()
+            for referencia in referencias[inicios[actual]:inicios[actual + 1]]:
+                hijo = referencia >> BITS_TIPO
+                if referencia & 7 == TUPLA and decodificadas[hijo] is None and hijo not in faltan:
+                    faltan.add(hijo)
+                    pendientes.append(hijo)
+        return sorted(faltan)
+
+    def decodificar_tuplas(self, indices):
+        """Decodifica las tuplas en orden creciente, sin recursión.
+
+        Cada tupla se escribió después de sus hijas, así que al llegar a
+        una sus hijas ya están decodificadas.
+        """
+        inicios, referencias, decodificadas = self.tuplas
+        textos = self.cadenas[2]
+        cadena = self.cadena
+        constante = self.constante
+        for i in indices:
+            elementos = []
+            for referencia in referencias[inicios[i]:inicios[i + 1]]:
+                tipo = referencia & 7
+                indice = referencia >> BITS_TIPO
+                if tipo == TUPLA:
+                    elementos.append(decodificadas[indice])
+                elif tipo == CADENA:
+                    elementos.append(textos[indice] or cadena(indice))
+                elif tipo == ENTERO:
+                    elementos.append(indice)
+                elif tipo == NUMERO:
+                    elementos.append(constante(indice))
+                else:
+                    elementos.append(ESPECIALES[indice])
+            decodificadas[i] = tuple(elementos)
+
+    def decodificar_todo(self):
+        """Decodifica de una vez las tuplas que falten (para cargas completas)"""
+        decodificadas = self.tuplas[2]
+        self.decodificar_tuplas([i for i, tupla in enumerate(decodificadas) if tupla is None])
+
+    # ===================== RESUMEN =====================
+
+    @property
+    def resumen(self):
+        """(exito, vacio, referencia a estadisticas, cantidad de sentencias)"""
+        if self._resumen is None:
+            self._resumen = FORMATO_RESUMEN.unpack_from(self.bytes_seccion(RESUMEN))
+        return self._resumen
+
+    @property
+    def exito(self):
+        return bool(self.resumen[0])
+
+    @property
+    def vacio(self):
+        return bool(self.resumen[1])
+
+    @property
+    def estadisticas(self):
+        return dict(self.valor(self.resumen[2]))
+
+    # ===================== SENTENCIAS =====================
+
+    @property
+    def registros_sentencias(self):
+        if self._sentencias is None:
+            self._sentencias = self.enteros(self.bytes_seccion(SENTENCIAS))
+        return self._sentencias
+
+    def __len__(self):
+        return len(self.registros_sentencias) // 2
+
+    def sentencia(self, i):
+        """La sentencia i (solo esa y sus expresiones se decodifican)"""
+        return self.valor(self.registros_sentencias[2 * i])
+
+    @property
+    def sentencias(self):
+        """Todas las sentencias, o None si el análisis no dejó resultado"""
+        if self.resumen[3] == SIN_SENTENCIAS:
+            return None
+        self.decodificar_todo()
+        return [self.sentencia(i) for i in range(len(self))]
+
+    def sentencias_en_linea(self, linea):
+        """Sentencias que terminan en la línea (búsqueda binaria en la tabla de líneas)"""
+        with self.registros_sentencias[1::2] as lineas:
+            desde = bisect_left(lineas, linea)
+            hasta = bisect_right(lineas, linea, desde)
+        return [self.sentencia(i) for i in range(desde, hasta)]
+
+    # ===================== SÍMBOLOS =====================
+
+    @property
+    def registros_simbolos(self):
+        if self._simbolos is None:
+            self._simbolos = self.enteros(self.bytes_seccion(SIMBOLOS))
+        return self._simbolos
+
+    @property
+    def slots(self):
+        """nombre -> slot (solo decodifica los nombres)"""
+        if self._slots is None:
+            registros = self.registros_simbolos
+            self._slots = {self.valor(registros[i]): i // ANCHO_SIMBOLO
+                           for i in range(0, len(registros), ANCHO_SIMBOLO)}
+        return self._slots
+
+    def simbolo_slot(self, slot):
+        base = slot * ANCHO_SIMBOLO
+        registros = self.registros_simbolos
+        simbolo = {}
+        for k, campo in enumerate(CAMPOS_SIMBOLO, base + 1):
+            if registros[k] != AUSENTE:
+                simbolo[campo] = self.valor(registros[k])
+        return simbolo
+
+    def simbolo(self, nombre):
+        """Entrada de la tabla de símbolos, o None si no está"""
+        slot = self.slots.get(nombre)
+        return None if slot is None else self.simbolo_slot(slot)
+
+    @property
+    def tabla_simbolos(self):
+        return {nombre: self.simbolo_slot(slot) for nombre, slot in self.slots.items()}
+
+    def tipos(self):
+        """nombre -> tipo declarado, sin decodificar los valores"""
+        registros = self.registros_simbolos
+        return {nombre: self.valor(registros[slot * ANCHO_SIMBOLO + 1]) for nombre, slot in self.slots.items()}
+
+    # ===================== MENSAJES =====================
+
+    @property
+    def indice(self):
+        """Índice de líneas armado desde la tabla guardada (sin el código).
+
+        Se copia (es chico) para que las columnas sigan sirviendo al cerrar.
+        """
+        if self._indice is None:
+            self._indice = IndiceLineas(None)
+            self._indice._inicios = self.enteros(self.bytes_seccion(LINEAS), copiar=True)
+        return self._indice
+
+    @property
+    def mensajes(self):
+        if self._mensajes is None:
+            registros = self.enteros(self.bytes_seccion(MENSAJES))
+            indice = self.indice if self.secciones[LINEAS][1] else None
+            valor = self.valor
+            mensajes = []
+            for i in range(0, len(registros), ANCHO_MENSAJE):
+                tipo, linea, codigo, args, posicion, fin = registros[i:i + ANCHO_MENSAJE]
+                mensaje = Diagnostico(valor(tipo), valor(linea), CODIGOS[codigo], valor(args),
+                                      valor(posicion), valor(fin))
+                mensaje.fuente = indice
+                mensajes.append(mensaje)
+            self._mensajes = mensajes
+        return self._mensajes
+
+    # ===================== USO =====================
+
+    def resultado(self):
+        """El mismo diccionario que Compilador.analizar()"""
+        return {
+            'exito': self.exito,
+            'resultado': self.sentencias,
+            'mensajes': self.mensajes,
+            'estadisticas': self.estadisticas,
+            'vacio': self.vacio
+        }
+
+    def programa(self, especializado=False):
+        """Programa ejecutable, como Compilador.compilar()"""
+        interprete = None
+        if especializado:
+            from specialized import InterpreteEspecializado
+            interprete = InterpreteEspecializado()
+        return Programa(self.sentencias or [], self.tipos(), self.mensajes, self.exito, interprete)
+
+
+def cargar_artefacto(ruta):
+    return Artefacto(ruta)
+
+
+# ===================== LÍNEA DE COMANDOS =====================
+
+def verificar(carpeta, generados=200):
+    """Guarda y vuelve a cargar los .cos de la carpeta y programas generados.
+
+    Retorna (programas, nombres de los que no dan lo mismo al recargar).
+    """
+    from golden import huella, programas_corpus
+    from parser import Compilador
+
+    compilador = Compilador()
+    fallas = []
+    programas = programas_corpus(carpeta, generados, 0)
+    for nombre, codigo in programas:
+        resultado = compilador.analizar(codigo)
+        tabla = compilador.semantico.tabla_simbolos
+        with Artefacto.desde_bytes(serializar(resultado, tabla, compilador.indice)) as artefacto:
+            cargado = artefacto.resultado()
+            iguales = (huella(cargado) == huella(resultado)
+                       and cargado['resultado'] == resultado['resultado']
+                       and artefacto.tabla_simbolos == tabla
+                       and [m.span for m in cargado['mensajes']] == [m.span for m in resultado['mensajes']])
+        if not iguales:
+            fallas.append(nombre)
+    return programas, fallas
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description="Artefactos compilados de Costeñol")
+    acciones = argumentos.add_subparsers(dest='accion', required=True)
+    compilar = acciones.add_parser('compilar', help="Analiza un .cos y guarda su artefacto")
+    compilar.add_argument('programa')
+    compilar.add_argument('-o', '--salida', default=None, help=f"Por defecto el mismo nombre con {EXTENSION}")
+    resumen = acciones.add_parser('resumen', help="Muestra éxito y estadísticas sin cargar el resto")
+    resumen.add_argument('artefacto')
+    ejecutar = acciones.add_parser('ejecutar', help="Ejecuta un artefacto leyendo la entrada estándar")
+    ejecutar.add_argument('artefacto')
+    ejecutar.add_argument('--especializado', action='store_true')
+    revisar = acciones.add_parser('verificar', help="Guarda y recarga cada .cos de una carpeta y compara")
+    revisar.add_argument('carpeta', nargs='?', default='corpus')
+    opciones = argumentos.parse_args()
+
+    if opciones.accion == 'compilar':
+        from parser import Compilador
+        from source import FuenteArchivo
+        salida = opciones.salida or os.path.splitext(opciones.programa)[0] + EXTENSION
+        resultado = Compilador().guardar_artefacto(FuenteArchivo(opciones.programa).codigo, salida)
+        estadisticas = resultado['estadisticas']
+        print(f"{salida}: {os.path.getsize(salida)} bytes, "
+              f"{estadisticas['aciertos']} aciertos, {estadisticas['errores']} errores")
+
+    elif opciones.accion == 'resumen':
+        with Artefacto(opciones.artefacto) as artefacto:
+            estadisticas = artefacto.estadisticas
+            print(f"{'sin errores' if artefacto.exito else 'con errores'}: {estadisticas['aciertos']} aciertos, "
+                  f"{estadisticas['errores']} errores, {len(artefacto)} sentencias")
+
+    elif opciones.accion == 'ejecutar':
+        from runtime import EntradaEstandar, ErrorEjecucion, Salida
+        with Artefacto(opciones.artefacto) as artefacto:
+            programa = artefacto.programa(opciones.especializado)
+        salida = Salida(sys.stdout)
+        try:
+            programa.ejecutar(EntradaEstandar(), salida)
+        except ErrorEjecucion as e:
+            salida.vaciar()
+            print(e, file=sys.stderr)
+            sys.exit(1)
+
+    else:
+        programas, fallas = verificar(opciones.carpeta)
+        for nombre in fallas:
+            print(f"Distinto al recargar: {nombre}")
+        if fallas:
+            sys.exit(1)
+        print(f"{len(programas)} programas: todos iguales al recargar")
+
+
+if __name__ == '__main__':
+    main()
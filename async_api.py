@@ -0,0 +1,188 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from parser import Compilador
+from limits import Limites
+
+
+# ===================== TRABAJADORES =====================
+
+# Cada hilo (o proceso) del pool tiene su propio Compilador ya construido
+_local = threading.local()
+
+
+def _preparar_trabajador(opciones):
+    """Inicializador del pool: construye el Compilador del trabajador una sola vez"""
+    _local.compilador = Compilador(**opciones)
+
+
+def _limites_con_plazo(limites, segundos):
+    """Copia de los límites con el tiempo recortado a `segundos`"""
+    if limites is None:
+        return Limites(max_caracteres=None, max_tokens=None, max_profundidad=None,
+                       max_mensajes=None, max_segundos=segundos)
+    maximo = segundos if limites.max_segundos is None else min(limites.max_segundos, segundos)
+    return Limites(limites.max_caracteres, limites.max_tokens, limites.max_profundidad,
+                   limites.max_mensajes, maximo)
+
+
+def _compilar(codigo, segundos=None, observador=None):
+    """Analiza en el trabajador; con `segundos` el propio análisis se corta a tiempo"""
+    compilador = _local.compilador
+    limites = compilador.limites
+    if segundos is not None:
+        compilador.limites = _limites_con_plazo(limites, round(max(segundos, 0.0), 2))
+    try:
+        return compilador.analizar(codigo, observador=observador)
+    finally:
+        compilador.limites = limites
+
+
+# ===================== FACHADA ASÍNCRONA =====================
+
+class CompiladorAsincrono:
+    """Fachada asyncio del Compilador.
+
+    Los análisis corren en un pool de hilos o de procesos con un Compilador
+    caliente por trabajador. Las peticiones pasan por una cola acotada: si
+    está llena, `analizar` espera (contrapresión) en vez de acumular trabajo.
+
+        async with CompiladorAsincrono(procesos=True) as compilador:
+            resultado = await compilador.analizar(codigo, timeout=2)
+            async for mensaje in compilador.diagnosticos(codigo):
+                ...
+    """
+
+    # Margen sobre el timeout para que llegue el resultado cortado por el trabajador
+    GRACIA = 0.5
+
+    def __init__(self, trabajadores=None, procesos=False, max_pendientes=64, timeout=None, **opciones):
+        self.trabajadores = trabajadores or os.cpu_count() or 1
+        self.procesos = procesos
+        self.max_pendientes = max_pendientes
+        self.timeout = timeout
+        # Opciones para cada Compilador (advertencias, modo_lote, max_errores, limites)
+        self.opciones = opciones
+
+        self.ejecutor = None
+        self.hilos = None
+        self.cola = None
+        self.tareas = []
+
+    async def iniciar(self):
+        """Crea los pools y las tareas que atienden la cola"""
+        if self.cola is not None:
+            return
+        if self.procesos:
+            self.ejecutor = ProcessPoolExecutor(self.trabajadores, initializer=_preparar_trabajador,
+                                                initargs=(self.opciones,))
+        else:
+            self.ejecutor = ThreadPoolExecutor(self.trabajadores, initializer=_preparar_trabajador,
+                                               initargs=(self.opciones,))
+        self.cola = asyncio.Queue(self.max_pendientes)
+        self.tareas = [asyncio.create_task(self.atender()) for _ in range(self.trabajadores)]
+
+    async def cerrar(self):
+        """Termina las tareas y apaga los pools"""
+        for tarea in self.tareas:
+            tarea.cancel()
+        await asyncio.gather(*self.tareas, return_exceptions=True)
+        self.tareas = []
+        self.cola = None
+        for ejecutor in (self.ejecutor, self.hilos):
+            if ejecutor is not None:
+                ejecutor.shutdown(wait=False, cancel_futures=True)
+        self.ejecutor = None
+        self.hilos = None
+
+    async def __aenter__(self):
+        await self.iniciar()
+        return self
+
+    async def __aexit__(self, *_):
+        await self.cerrar()
+
+    async def atender(self):
+        """Toma peticiones de la cola y las manda al pool"""
+        loop = asyncio.get_running_loop()
+        while True:
+            codigo, plazo, observador, futuro = await self.cola.get()
+            try:
+                if futuro.cancelled():
+                    continue
+                segundos = None if plazo is None else plazo - loop.time()
+                # El observador necesita memoria compartida: siempre en hilos
+                ejecutor = self.ejecutor if observador is None else self.pool_hilos()
+                resultado = await loop.run_in_executor(ejecutor, _compilar, codigo, segundos, observador)
+                if not futuro.done():
+                    futuro.set_result(resultado)
+            except asyncio.CancelledError:
+                if not futuro.done():
+                    futuro.cancel()
+                raise
+            except Exception as e:
+                if not futuro.done():
+                    futuro.set_exception(e)
+            finally:
+                self.cola.task_done()
+
+    def pool_hilos(self):
+        """Pool de hilos para los análisis con observador"""
+        if not self.procesos:
+            return self.ejecutor
+        if self.hilos is None:
+            self.hilos = ThreadPoolExecutor(self.trabajadores, initializer=_preparar_trabajador,
+                                            initargs=(self.opciones,))
+        return self.hilos
+
+    async def enviar(self, codigo, timeout, observador=None):
+        """Encola una petición (espera si la cola está llena) y retorna su futuro"""
+        await self.iniciar()
+        loop = asyncio.get_running_loop()
+        timeout = self.timeout if timeout is None else timeout
+        plazo = None if timeout is None else loop.time() + timeout
+        futuro = loop.create_future()
+        if timeout is None:
+            await self.cola.put((codigo, plazo, observador, futuro))
+        else:
+            await asyncio.wait_for(self.cola.put((codigo, plazo, observador, futuro)), timeout)
+        return futuro, plazo
+
+    async def analizar(self, codigo, timeout=None):
+        """Versión awaitable de Compilador.analizar.
+
+        Con timeout el trabajador corta el análisis a tiempo (mensaje de
+        límite de tiempo); si ni así responde, se lanza asyncio.TimeoutError.
+        """
+        futuro, plazo = await self.enviar(codigo, timeout)
+        if plazo is None:
+            return await futuro
+        restante = plazo - asyncio.get_running_loop().time()
+        return await asyncio.wait_for(futuro, max(restante, 0) + self.GRACIA)
+
+    async def diagnosticos(self, codigo, timeout=None):
+        """Generador asíncrono: entrega cada mensaje apenas el compilador lo produce"""
+        loop = asyncio.get_running_loop()
+        salida = asyncio.Queue()
+        fin = object()
+
+        def observador(mensaje):
+            loop.call_soon_threadsafe(salida.put_nowait, mensaje)
+
+        futuro, plazo = await self.enviar(codigo, timeout, observador)
+        futuro.add_done_callback(lambda _: salida.put_nowait(fin))
+
+        while True:
+            if plazo is None:
+                mensaje = await salida.get()
+            else:
+                restante = plazo - loop.time()
+                mensaje = await asyncio.wait_for(salida.get(), max(restante, 0) + self.GRACIA)
+            if mensaje is fin:
+                break
+            yield mensaje
+
+        # Propaga errores del trabajador
+        futuro.result()
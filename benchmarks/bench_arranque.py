@@ -0,0 +1,59 @@
+"""Benchmark del arranque: tiempo de import y latencia del primer análisis.
+
+Cada medición corre en un proceso nuevo (los imports y las tablas de PLY
+se cargan una vez por proceso): import del paquete costenol, import de
+parser, crear un Compilador, el primer analizar (construye el lexer y el
+parser) y un segundo Compilador con su analizar (reusa las tablas).
+
+Uso: python benchmarks/bench_arranque.py [repeticiones]
+"""
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+HIJO = r'''
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+codigo = 'edad Entero;\nedad = 20 + 1;\nMensaje.Texto(edad);\n'
+tiempos = {}
+inicio = time.perf_counter()
+import costenol
+tiempos['import costenol'] = time.perf_counter() - inicio
+inicio = time.perf_counter()
+from parser import Compilador
+tiempos['import parser'] = time.perf_counter() - inicio
+inicio = time.perf_counter()
+compilador = Compilador()
+tiempos['Compilador()'] = time.perf_counter() - inicio
+inicio = time.perf_counter()
+compilador.analizar(codigo)
+tiempos['primer analizar'] = time.perf_counter() - inicio
+inicio = time.perf_counter()
+Compilador().analizar(codigo)
+tiempos['otro Compilador + analizar'] = time.perf_counter() - inicio
+tiempos['cargó tkinter'] = 'tkinter' in sys.modules
+print(json.dumps(tiempos))
+'''
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    corridas = []
+    for _ in range(repeticiones):
+        salida = subprocess.run([sys.executable, '-c', HIJO, RAIZ], capture_output=True, text=True, check=True)
+        corridas.append(json.loads(salida.stdout))
+
+    print(f"Mediana de {repeticiones} procesos nuevos")
+    for nombre in corridas[0]:
+        if nombre == 'cargó tkinter':
+            print(f"{nombre:<30}{'sí' if any(c[nombre] for c in corridas) else 'no':>10}")
+            continue
+        print(f"{nombre:<30}{statistics.median(c[nombre] for c in corridas) * 1000:>10.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
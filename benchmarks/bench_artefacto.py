@@ -0,0 +1,124 @@
+"""Benchmark de los artefactos compilados contra JSON y pickle.
+
+Guarda el resultado de analizar un programa generado (sentencias, tabla de
+símbolos, mensajes y estadísticas) en los tres formatos y mide el tamaño y
+el tiempo de carga: todo, solo las estadísticas, una sentencia y un símbolo.
+JSON y pickle tienen que cargar todo para cualquiera de las cuatro; el
+artefacto decodifica solo lo que se pide.
+
+Uso: python benchmarks/bench_artefacto.py [lineas] [repeticiones]
+"""
+import json
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from artifact import Artefacto
+from golden import generar_programa
+from parser import Compilador
+
+
+def a_json(valor):
+    """Tuplas a listas con marca, para que se distingan al volver"""
+    if isinstance(valor, tuple):
+        return {'t': [a_json(v) for v in valor]}
+    return valor
+
+
+def desde_json(valor):
+    if isinstance(valor, dict):
+        return tuple(desde_json(v) for v in valor['t'])
+    return valor
+
+
+def datos_planos(resultado, tabla):
+    """Lo mismo que guarda el artefacto, con tipos que JSON y pickle entienden"""
+    return {
+        'exito': resultado['exito'],
+        'vacio': resultado['vacio'],
+        'estadisticas': resultado['estadisticas'],
+        'sentencias': resultado['resultado'],
+        'simbolos': tabla,
+        'mensajes': [(m.tipo, m.linea, int(m.codigo), m.args, m.posicion, m.fin) for m in resultado['mensajes']],
+    }
+
+
+def cargar_json(ruta):
+    with open(ruta, encoding='utf-8') as f:
+        datos = json.load(f)
+    datos['sentencias'] = [desde_json(s) for s in datos['sentencias']]
+    datos['simbolos'] = {n: {k: desde_json(v) for k, v in s.items()} for n, s in datos['simbolos'].items()}
+    return datos
+
+
+def cargar_pickle(ruta):
+    with open(ruta, 'rb') as f:
+        return pickle.load(f)
+
+
+def medir(funcion, repeticiones):
+    inicio = time.perf_counter()
+    for _ in range(repeticiones):
+        funcion()
+    return (time.perf_counter() - inicio) / repeticiones
+
+
+def main():
+    lineas = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeticiones = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    compilador = Compilador(advertencias=False)
+    codigo = generar_programa(7, lineas)
+    resultado = compilador.analizar(codigo)
+    tabla = compilador.semantico.tabla_simbolos
+    planos = datos_planos(resultado, tabla)
+    sentencia = len(planos['sentencias']) // 2
+    nombre = next(reversed(tabla))
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta_artefacto = os.path.join(carpeta, 'programa.cosb')
+        ruta_json = os.path.join(carpeta, 'programa.json')
+        ruta_pickle = os.path.join(carpeta, 'programa.pickle')
+
+        compilador.guardar_artefacto(codigo, ruta_artefacto)
+        with open(ruta_json, 'w', encoding='utf-8') as f:
+            json.dump({**planos,
+                       'sentencias': [a_json(s) for s in planos['sentencias']],
+                       'simbolos': {n: {k: a_json(v) for k, v in s.items()} for n, s in tabla.items()}},
+                      f, ensure_ascii=False, separators=(',', ':'))
+        with open(ruta_pickle, 'wb') as f:
+            pickle.dump(planos, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        def abrir(usar):
+            def funcion():
+                with Artefacto(ruta_artefacto) as artefacto:
+                    return usar(artefacto)
+            return funcion
+
+        # Lo que se carga debe ser igual a lo guardado en los tres formatos
+        iguales = (abrir(lambda a: a.sentencias)() == planos['sentencias'] == cargar_json(ruta_json)['sentencias']
+                   == cargar_pickle(ruta_pickle)['sentencias']
+                   and abrir(lambda a: a.tabla_simbolos)() == tabla)
+
+        print(f"{lineas} líneas generadas: {len(planos['sentencias'])} sentencias, {len(tabla)} variables, "
+              f"{len(planos['mensajes'])} mensajes")
+        print(f"{'formato':<12}{'tamaño':>12}{'todo':>12}{'estadísticas':>15}{'una sentencia':>15}{'un símbolo':>13}")
+        casos = [
+            ('artefacto', ruta_artefacto, abrir(lambda a: a.resultado()), abrir(lambda a: a.estadisticas),
+             abrir(lambda a: a.sentencia(sentencia)), abrir(lambda a: a.simbolo(nombre))),
+            ('json', ruta_json) + (lambda: cargar_json(ruta_json),) * 4,
+            ('pickle', ruta_pickle) + (lambda: cargar_pickle(ruta_pickle),) * 4,
+        ]
+        for formato, ruta, *cargas in casos:
+            tiempos = [medir(carga, repeticiones) * 1000 for carga in cargas]
+            print(f"{formato:<12}{os.path.getsize(ruta) / 1024:>9.0f} KB"
+                  + ''.join(f"{t:>{ancho}.2f} ms" for t, ancho in zip(tiempos, (9, 12, 12, 10))))
+        print(f"Mismo contenido al cargar: {'sí' if iguales else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
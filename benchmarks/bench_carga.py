@@ -0,0 +1,72 @@
+"""Benchmark de carga de fuentes grandes: tiempo y pico de memoria (RSS).
+
+Compara leer el archivo completo y decodificarlo (`open().read()` en modo
+binario + `decode`, como se hacía) contra `FuenteArchivo`, que decodifica
+directo desde el mapa en memoria. Cada forma corre en su propio proceso
+para que el pico de RSS de una no tape a la otra.
+
+Uso: python benchmarks/bench_carga.py [megabytes]   (p. ej. 1024 para 1 GB)
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+
+BLOQUE = ('nombre Texto;\nnombre = "canción del año, ñandú";\nedad Entero;\n'
+          'edad = Captura.Entero() * 2 + 1;\nMensaje.Texto(nombre);\n').encode('utf-8')
+
+
+def crear_archivo(ruta, megabytes):
+    repeticiones = 1 + (megabytes * 1024 * 1024) // (len(BLOQUE) * 1000)
+    trozo = BLOQUE * 1000
+    with open(ruta, 'wb') as archivo:
+        for _ in range(repeticiones):
+            archivo.write(trozo)
+
+
+def pico_rss_mb():
+    """Pico de RSS del proceso (ru_maxrss viene en KB en Linux y en bytes en macOS)"""
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024) if sys.platform == 'darwin' else pico / 1024
+
+
+def medir(forma, ruta):
+    """Corre dentro del proceso hijo: carga, arma el índice de líneas e informa"""
+    from source import FuenteArchivo, IndiceLineas
+
+    inicio = time.perf_counter()
+    if forma == 'leer':
+        with open(ruta, 'rb') as archivo:
+            codigo = archivo.read().decode('utf-8')
+        lineas = len(IndiceLineas(codigo).inicios)
+    else:
+        fuente = FuenteArchivo(ruta)
+        lineas = len(fuente.indice.inicios)
+    segundos = time.perf_counter() - inicio
+    print(f"{segundos} {pico_rss_mb()} {lineas}")
+
+
+def main():
+    if len(sys.argv) > 2 and sys.argv[1] == '--medir':
+        medir(sys.argv[2], sys.argv[3])
+        return
+
+    megabytes = int(sys.argv[1]) if len(sys.argv) > 1 else 256
+    with tempfile.TemporaryDirectory() as carpeta:
+        ruta = os.path.join(carpeta, 'grande.cos')
+        crear_archivo(ruta, megabytes)
+        print(f"Archivo: {os.path.getsize(ruta) / 1024 / 1024:.0f} MB")
+        for nombre, forma in [('read() + decode', 'leer'), ('FuenteArchivo (mmap)', 'mapa')]:
+            salida = subprocess.run([sys.executable, os.path.abspath(__file__), '--medir', forma, ruta],
+                                    capture_output=True, text=True, check=True).stdout
+            segundos, pico, lineas = salida.split()
+            print(f"{nombre:<24}{float(segundos):>8.2f} s  pico RSS {float(pico):>8.0f} MB  ({lineas} líneas)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+"""Benchmark de la ejecución por columnas (NumPy) contra el intérprete fila por fila.
+
+El mismo programa se corre sobre N filas de entrada: con ejecutar_columnas
+(una pasada con arreglos) y con ejecutar_lote (una ejecución por fila; se
+mide sobre una muestra y se extrapola).
+
+Antes de medir revisa con assert que ejecutar_columnas dé lo mismo que
+ejecutar_lote en los bordes: Entero que no caben en int64 (en texto y en
+uint64) y una matriz (N, 0) para un programa sin capturas.
+
+Uso: python benchmarks/bench_columnas.py [filas]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+
+PROGRAMA = '''
+base Real;
+base = Captura.Real();
+veces Entero;
+veces = Captura.Entero();
+total Real;
+total = base * veces + base / 2 - veces * 3;
+promedio Real;
+promedio = total / veces;
+Mensaje.Texto("Resultado:");
+Mensaje.Texto(total);
+Mensaje.Texto(promedio * promedio - base);
+'''
+
+BORDES = '''
+a Entero;
+a = Captura.Entero();
+b Entero;
+b = a * 2 + 1;
+r Real;
+r = a / 3;
+Mensaje.Texto(b);
+Mensaje.Texto(r);
+'''
+
+
+def como_texto(resultados):
+    return [(salida, None if error is None else str(error)) for salida, error in resultados]
+
+
+def verificar_bordes(compilador):
+    """ejecutar_columnas tiene que dar lo mismo que ejecutar_lote"""
+    programa = compilador.compilar(BORDES)
+    textos = np.array(['5', str(2 ** 63 - 1), '99999999999999999999', '-99999999999999999999', 'x'])
+    sin_signo = np.array([5, 2 ** 63, 2 ** 64 - 1], dtype=np.uint64)
+    for columna in (textos, sin_signo):
+        esperado = como_texto(programa.ejecutar_lote([[str(valor)] for valor in columna.tolist()]))
+        assert como_texto(programa.ejecutar_columnas([columna]).como_lote()) == esperado, columna
+
+    sin_capturas = compilador.compilar('Mensaje.Texto(2 * 3);')
+    resultado = sin_capturas.ejecutar_columnas(np.zeros((4, 0)))
+    assert resultado.filas == 4 and resultado.como_lote() == [('6\n', None)] * 4
+    assert sin_capturas.ejecutar_columnas([], filas=3).filas == 3
+    print("Bordes: mismas salidas que ejecutar_lote")
+
+
+def main():
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    compilador = Compilador(advertencias=False)
+    verificar_bordes(compilador)
+    programa = compilador.compilar(PROGRAMA)
+
+    azar = np.random.default_rng(0)
+    base = azar.uniform(-100, 100, filas).round(2)
+    veces = azar.integers(0, 50, filas)      # con ceros: esas filas dividen por cero
+    print(f"Filas: {filas}")
+
+    inicio = time.perf_counter()
+    resultado = programa.ejecutar_columnas([base, veces])
+    columnas = time.perf_counter() - inicio
+    print(f"{'ejecutar_columnas':<24}{columnas * 1000:>12.1f} ms  ({int(resultado.filas_ok.sum())} filas sin error)")
+
+    muestra = min(filas, 20000)
+    entradas = [[base[i].item(), veces[i].item()] for i in range(muestra)]
+    inicio = time.perf_counter()
+    programa.ejecutar_lote(entradas)
+    por_fila = (time.perf_counter() - inicio) / muestra
+    print(f"{'ejecutar_lote':<24}{por_fila * filas * 1000:>12.1f} ms  (extrapolado de {muestra} filas)")
+
+    inicio = time.perf_counter()
+    resultado.texto_columna(1)
+    print(f"{'una columna como texto':<24}{(time.perf_counter() - inicio) * 1000:>12.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
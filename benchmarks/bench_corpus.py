@@ -0,0 +1,38 @@
+"""Benchmark del corpus dorado: corrida completa contra corrida incremental.
+
+La primera corrida analiza todo (repartido entre procesos); la segunda, con
+el mismo código y el mismo compilador, sale entera del caché.
+
+Uso: python benchmarks/bench_corpus.py [generados]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from golden import generar_corpus, huellas_corpus
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    programas = generar_corpus(cantidad)
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        cache = os.path.join(carpeta, 'cache.json')
+        for trabajadores in sorted({1, os.cpu_count() or 1}):
+            inicio = time.perf_counter()
+            huellas_corpus(programas, trabajadores=trabajadores)
+            segundos = time.perf_counter() - inicio
+            print(f"{trabajadores} proceso(s), sin caché {segundos:>8.2f} s  {cantidad / segundos:>8.0f} programas/s")
+
+        huellas_corpus(programas, ruta_cache=cache)
+        inicio = time.perf_counter()
+        _, analizados = huellas_corpus(programas, ruta_cache=cache)
+        segundos = time.perf_counter() - inicio
+        print(f"incremental ({analizados} analizados) {segundos:>6.2f} s")
+
+
+if __name__ == '__main__':
+    main()
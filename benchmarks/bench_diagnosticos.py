@@ -0,0 +1,59 @@
+"""Benchmark de los diagnósticos: modo normal contra modo lote.
+
+En modo lote los aciertos ("¡Bien ahí!", "¡Tá bueno!"...) solo se cuentan.
+También mide cuánto cuesta armar el texto de todos los mensajes al mostrarlos.
+
+Uso: python benchmarks/bench_diagnosticos.py [sentencias]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+
+
+def generar_programa(n):
+    lineas = []
+    for i in range(n):
+        lineas.append(f'v{i} Entero;')
+        lineas.append(f'v{i} = {i} * 2 + 1;')
+        if i % 50 == 0:
+            # Un error de vez en cuando
+            lineas.append(f'v{i} = "texto";')
+    return '\n'.join(lineas) + '\n'
+
+
+def medir(codigo, modo_lote, repeticiones=3):
+    compilador = Compilador(advertencias=False, modo_lote=modo_lote)
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = compilador.analizar(codigo)
+        mejor = min(mejor, time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    resultado = compilador.analizar(codigo)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    inicio = time.perf_counter()
+    textos = [m['mensaje'] for m in resultado['mensajes']]
+    formato = time.perf_counter() - inicio
+    return mejor, pico, len(textos), formato, resultado['estadisticas']
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    codigo = generar_programa(n)
+    print(f"Programa: {n * 2} sentencias")
+    print(f"{'modo':<10}{'compilar (ms)':>15}{'pico (KB)':>12}{'guardados':>12}{'formatear (ms)':>16}  estadísticas")
+    for nombre, modo_lote in [('normal', False), ('lote', True)]:
+        tiempo, pico, guardados, formato, estadisticas = medir(codigo, modo_lote)
+        print(f"{nombre:<10}{tiempo * 1000:>15.1f}{pico // 1024:>12}{guardados:>12}{formato * 1000:>16.1f}  {estadisticas}")
+
+
+if __name__ == '__main__':
+    main()
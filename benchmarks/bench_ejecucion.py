@@ -0,0 +1,78 @@
+"""Benchmark de ejecución por lotes: un programa compilado una vez contra N entradas.
+
+Compara recompilar en cada caso contra compilar una sola vez, y los
+proveedores de entrada (lista en memoria, archivo y archivo mapeado).
+
+Uso: python benchmarks/bench_ejecucion.py [casos]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+from runtime import EntradaArchivo, EntradaLista, EntradaMapeada
+
+PROGRAMA = '''
+nombre Texto;
+nombre = Captura.Texto();
+base Real;
+base = Captura.Real();
+altura Real;
+altura = Captura.Real();
+veces Entero;
+veces = Captura.Entero();
+area Real;
+area = base * altura / 2;
+Mensaje.Texto("Hola " + nombre);
+Mensaje.Texto(area);
+Mensaje.Texto(area * veces + veces / 4);
+'''
+
+
+def generar_entradas(n):
+    return [[f'estudiante {i}', f'{i % 17},5', f'{i % 9 + 1}.25', str(i % 5)] for i in range(n)]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    entradas = generar_entradas(n)
+    compilador = Compilador(advertencias=False)
+
+    inicio = time.perf_counter()
+    for vector in entradas[:max(1, n // 10)]:
+        compilador.compilar(PROGRAMA).ejecutar(EntradaLista(vector))
+    recompilar = (time.perf_counter() - inicio) * 10
+
+    programa = compilador.compilar(PROGRAMA)
+    inicio = time.perf_counter()
+    programa.ejecutar_lote(entradas)
+    lista = time.perf_counter() - inicio
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        rutas = []
+        for i, vector in enumerate(entradas):
+            ruta = os.path.join(carpeta, f'{i}.in')
+            with open(ruta, 'w', encoding='utf-8') as archivo:
+                archivo.write('\n'.join(vector) + '\n')
+            rutas.append(ruta)
+
+        inicio = time.perf_counter()
+        programa.ejecutar_lote(EntradaArchivo(ruta) for ruta in rutas)
+        archivos = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        programa.ejecutar_lote(EntradaMapeada(ruta) for ruta in rutas)
+        mapeados = time.perf_counter() - inicio
+
+    print(f"{n} entradas")
+    print(f"{'recompilando cada vez (estimado)':<36}{recompilar * 1000:>10.1f} ms")
+    print(f"{'compilado una vez, lista':<36}{lista * 1000:>10.1f} ms")
+    print(f"{'compilado una vez, archivos':<36}{archivos * 1000:>10.1f} ms")
+    print(f"{'compilado una vez, mmap':<36}{mapeados * 1000:>10.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
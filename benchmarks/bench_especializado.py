@@ -0,0 +1,75 @@
+"""Benchmark del código especializado por tipos contra el intérprete genérico.
+
+Corre el mismo programa compilado contra N entradas con Interprete (pila
+genérica, despacho por operador y por tipo en cada operación) y con
+InterpreteEspecializado (una función de Python por programa). También
+mide lo que cuesta generar esa función la primera vez.
+
+Uso: python benchmarks/bench_especializado.py [entradas]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+from specialized import GeneradorEspecializado
+
+PROGRAMA = '''
+nombre Texto;
+nombre = Captura.Texto();
+base Real;
+base = Captura.Real();
+veces Entero;
+veces = Captura.Entero();
+pasos Entero;
+pasos = veces * veces + 3 * veces - 7;
+area Real;
+area = base * veces / 2 + pasos;
+media Real;
+media = (area + base + veces) / 3;
+saludo Texto;
+saludo = "Hola " + nombre + ", resultado:";
+Mensaje.Texto(saludo);
+Mensaje.Texto(pasos * 2 - veces);
+Mensaje.Texto(area);
+Mensaje.Texto(media * media - area / (veces + 1));
+'''
+
+
+def generar_entradas(n):
+    return [[f'estudiante {i}', f'{i % 17},5', str(i % 9 + 1)] for i in range(n)]
+
+
+def medir(programa, entradas):
+    inicio = time.perf_counter()
+    resultados = programa.ejecutar_lote(entradas)
+    return time.perf_counter() - inicio, resultados
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    entradas = generar_entradas(n)
+    compilador = Compilador(advertencias=False)
+    generico = compilador.compilar(PROGRAMA)
+    especializado = compilador.compilar(PROGRAMA, especializado=True)
+
+    inicio = time.perf_counter()
+    GeneradorEspecializado().generar(especializado)
+    generar = time.perf_counter() - inicio
+
+    t_generico, esperado = medir(generico, entradas)
+    t_especializado, obtenido = medir(especializado, entradas)
+    iguales = [(s, str(e)) for s, e in esperado] == [(s, str(e)) for s, e in obtenido]
+
+    print(f"{n} entradas, {len(generico.sentencias)} sentencias")
+    print(f"{'generar la función (una vez)':<32}{generar * 1000:>10.2f} ms")
+    print(f"{'Interprete genérico':<32}{t_generico * 1000:>10.1f} ms")
+    print(f"{'especializado por tipos':<32}{t_especializado * 1000:>10.1f} ms  "
+          f"({t_generico / t_especializado:.1f}x)")
+    print(f"Mismas salidas: {'sí' if iguales else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark del internado de expresiones sobre un corpus con mucha repetición.
+
+Compara el análisis con la fábrica de nodos activa (DAG compartido y memos
+por nodo) contra árboles nuevos en cada ocurrencia.
+
+Uso: python benchmarks/bench_internado.py [sentencias]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+from optimizer import contar_nodos
+
+
+def generar_corpus(n):
+    """Programa tipo estudiante: las mismas subexpresiones una y otra vez"""
+    lineas = [
+        'edad Entero;', 'edad = 25;',
+        'altura Real;', 'altura = 1,75;',
+        'peso Real;', 'peso = 70,5;',
+        'resultado Real;',
+    ]
+    for i in range(n):
+        lineas.append(
+            'resultado = edad * altura + edad * altura * (peso / altura) '
+            f'- (edad * altura + peso) * (edad * altura + peso) + {i % 10};'
+        )
+        lineas.append('Mensaje.Texto(edad * altura + (edad * altura + peso));')
+    return '\n'.join(lineas) + '\n'
+
+
+def medir(codigo, activa, repeticiones=3):
+    compilador = Compilador(advertencias=False)
+    compilador.semantico.nodos.activa = activa
+
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = compilador.analizar(codigo)
+        mejor = min(mejor, time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    resultado = compilador.analizar(codigo)
+    _, pico = tracemalloc.get_traced_memory()
+    retenida = tracemalloc.take_snapshot().statistics('filename')
+    tracemalloc.stop()
+
+    # Tipado y evaluación solos (sin el parser), con los memos vacíos
+    semantico = compilador.semantico
+    expresiones = [s[2] if s[0] == 'asignar' else s[1] for s in resultado['resultado'] if s[0] != 'declarar']
+    semantico.cache_tipos.clear()
+    semantico.cache_valores.clear()
+    inicio = time.perf_counter()
+    for expresion in expresiones:
+        semantico.obtener_tipo_expresion(expresion)
+        semantico.obtener_valor_expresion(expresion)
+    analisis = time.perf_counter() - inicio
+
+    nodos = sum(contar_nodos(s[2], unicos=True) for s in resultado['resultado'] if s[0] == 'asignar')
+    return mejor, analisis, pico, sum(e.size for e in retenida), nodos
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    codigo = generar_corpus(n)
+    print(f"Corpus: {n * 2} sentencias, {len(codigo) // 1024} KB")
+    print(f"{'modo':<16}{'compilar (ms)':>15}{'tipos+valores (ms)':>20}"
+          f"{'pico (KB)':>12}{'retenida (KB)':>16}{'nodos únicos':>15}")
+    for nombre, activa in [('árboles', False), ('DAG internado', True)]:
+        tiempo, analisis, pico, retenida, nodos = medir(codigo, activa)
+        print(f"{nombre:<16}{tiempo * 1000:>15.1f}{analisis * 1000:>20.1f}"
+              f"{pico // 1024:>12}{retenida // 1024:>16}{nodos:>15}")
+
+
+if __name__ == '__main__':
+    main()
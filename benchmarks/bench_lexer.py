@@ -0,0 +1,75 @@
+"""Microbenchmark del lexer: reconocimiento de palabras reservadas.
+
+Compara la tabla de variantes (una sola búsqueda que ya dice si la palabra
+está mal escrita) contra la búsqueda anterior en `reservadas`, y el costo de
+detectar en el parser un tipo mal escrito: `lower()` + lista + `capitalize()`
+contra leer la marca del token.
+
+Uso: python benchmarks/bench_lexer.py [líneas]
+"""
+import os
+import sys
+import time
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import ply.lex as lex
+from lexer import AnalizadorLexico
+
+
+class LexerAnterior(AnalizadorLexico):
+    """t_IDENTIFICADOR como estaba antes (referencia)"""
+
+    def t_IDENTIFICADOR(self, t):
+        r'[a-zA-Z_][a-zA-Z0-9_]*'
+        t.type = self.reservadas.get(t.value, 'IDENTIFICADOR')
+        return t
+
+
+def generar_programa(n):
+    lineas = []
+    for i in range(n):
+        lineas.append(f'variable_{i} Entero;')
+        lineas.append(f'variable_{i} = Captura.Entero() + otra_{i % 10} * base;')
+        lineas.append(f'Mensaje.Texto(variable_{i} + altura);')
+        if i % 20 == 0:
+            lineas.append(f'mal_{i} entero;')
+    return '\n'.join(lineas) + '\n'
+
+
+def tokenizar(clase, codigo, repeticiones=5):
+    analizador = clase()
+    analizador.construir()
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        analizador.reset()
+        inicio = time.perf_counter()
+        tokens = analizador.tokenizar(codigo)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, len(tokens)
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    codigo = generar_programa(n)
+
+    print(f"Programa: {codigo.count(chr(10))} líneas")
+    for nombre, clase in [('reservadas.get', LexerAnterior), ('tabla de variantes', AnalizadorLexico)]:
+        tiempo, cantidad = tokenizar(clase, codigo)
+        print(f"{nombre:<22}{tiempo * 1000:>10.1f} ms  {cantidad / tiempo / 1e6:>6.2f} Mtokens/s")
+
+    # Detección de un tipo mal escrito en el parser
+    token = lex.LexToken()
+    token.value, token.canonica = 'ENTERO', 'Entero'
+    tipos = frozenset(['Texto', 'Entero', 'Real'])
+    veces = 1_000_000
+    antes = timeit.timeit(lambda: token.value.lower() in ['texto', 'entero', 'real'] and token.value.capitalize(),
+                          number=veces)
+    ahora = timeit.timeit(lambda: getattr(token, 'canonica', None) in tipos, number=veces)
+    print(f"{'lower()+capitalize()':<22}{antes / veces * 1e9:>10.0f} ns por token")
+    print(f"{'marca del lexer':<22}{ahora / veces * 1e9:>10.0f} ns por token")
+
+
+if __name__ == '__main__':
+    main()
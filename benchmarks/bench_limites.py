@@ -0,0 +1,70 @@
+"""Corridas adversarias del modo protegido (Compilador con limites=Limites()).
+
+Cada entrada se analiza sin límites y con un solo límite activo (o con
+max_errores). Muestra los tiempos y revisa con assert que el análisis con
+límite no lance excepciones, no tenga éxito y termine con el mensaje del
+límite que lo cortó. Sin límites todas terminan (la cadena larga de sumas
+ya no revienta la pila), solo que tardan más.
+
+Uso: python benchmarks/bench_limites.py
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from diagnostics import Codigo
+from limits import Limites
+from parser import Compilador
+
+
+def solo(**limite):
+    """Limites con todo desactivado menos lo que se pasa"""
+    todos = dict(max_caracteres=None, max_tokens=None, max_profundidad=None, max_mensajes=None, max_segundos=None)
+    todos.update(limite)
+    return Limites(**todos)
+
+
+# (nombre, código, argumentos del Compilador, código del mensaje que lo corta)
+CASOS = [
+    ('suma de 5000 términos', 'x Entero;\nx = ' + ' + '.join(['x'] * 5000) + ';\n',
+     {'limites': solo(max_profundidad=200)}, Codigo.LIMITE_PROFUNDIDAD),
+    ('negaciones anidadas', 'x Entero;\nx = ' + '-(' * 2000 + '1' + ')' * 2000 + ';\n',
+     {'limites': solo(max_profundidad=200)}, Codigo.LIMITE_PROFUNDIDAD),
+    ('código enorme', 'x Entero;\n' * 200000,
+     {'limites': solo(max_caracteres=500_000)}, Codigo.LIMITE_CARACTERES),
+    ('lluvia de mensajes', 'a Entero;\n' * 50000,
+     {'limites': solo(max_mensajes=20_000)}, Codigo.LIMITE_MENSAJES),
+    ('demasiados tokens', 'x Real;\n' + 'x=1+2+3+4+5+6+7+8;\n' * 12000,
+     {'limites': solo(max_tokens=100_000)}, Codigo.LIMITE_TOKENS),
+    ('muy lento', 'x Real;\n' + 'x = 1,5 * 2 + 3;\n' * 25000,
+     {'limites': solo(max_segundos=0.2)}, Codigo.LIMITE_TIEMPO),
+    ('muchos errores', 'a Entero;\n' * 50000,
+     {'max_errores': 100}, Codigo.DEMASIADOS_ERRORES),
+]
+
+
+def analizar(codigo, **opciones):
+    compilador = Compilador(advertencias=False, **opciones)
+    inicio = time.perf_counter()
+    resultado = compilador.analizar(codigo)
+    return resultado, time.perf_counter() - inicio
+
+
+def main():
+    print(f"{'entrada':<24}{'sin límites (ms)':>17}{'con límite (ms)':>17}  mensaje final")
+    for nombre, codigo, opciones, esperado in CASOS:
+        libre_resultado, libre = analizar(codigo)
+        assert all(m.codigo != Codigo.ERROR_INTERNO for m in libre_resultado['mensajes']), nombre
+        resultado, cortado = analizar(codigo, **opciones)
+        ultimo = resultado['mensajes'][-1]
+        print(f"{nombre:<24}{libre * 1000:>17.1f}{cortado * 1000:>17.1f}  {ultimo.codigo.name}: {ultimo.mensaje[:50]}")
+        assert not resultado['exito'], nombre
+        assert ultimo.codigo == esperado, f"{nombre}: {ultimo.codigo.name} en vez de {esperado.name}"
+        assert resultado['estadisticas']['errores'] >= 1, nombre
+    print("Cada límite cortó con su mensaje")
+
+
+if __name__ == '__main__':
+    main()
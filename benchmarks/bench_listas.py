@@ -0,0 +1,94 @@
+"""Benchmark de las Listas: memoria del arreglo y velocidad de acceso a elementos.
+
+Memoria: una Lista de N Entero (array('q'), 8 bytes por elemento) contra
+una lista de Python con los mismos valores (un puntero más un objeto int
+por elemento), medidas con tracemalloc.
+
+Acceso: el mismo programa con índices constantes (revisados al compilar,
+sin revisión en ejecución) y con índices variables (revisados en cada
+acceso), con Interprete y con InterpreteEspecializado.
+
+Uso: python benchmarks/bench_listas.py [entradas] [elementos]
+"""
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+from runtime import nueva_lista
+
+TAMANO = 8
+LECTURAS = 40
+
+
+def programa(constantes):
+    """Llena la Lista y la lee LECTURAS veces, con posiciones constantes o variables"""
+    lineas = [f'datos Lista Entero[{TAMANO}];', 'base Entero;', 'base = Captura.Entero();',
+              'i Entero;', 'i = Captura.Entero();', 'suma Entero;', 'suma = 0;']
+    for k in range(TAMANO):
+        lineas.append(f'datos[{k}] = base * {k + 1};')
+    for k in range(LECTURAS):
+        posicion = k % TAMANO if constantes else f'i + {k % (TAMANO - 1)}' if k % 2 else 'i'
+        lineas.append(f'suma = suma + datos[{posicion}];')
+        if k % 4 == 3:
+            destino = (k // 4) % TAMANO if constantes else 'i'
+            lineas.append(f'datos[{destino}] = suma;')
+    lineas.append('Mensaje.Texto(suma);')
+    return '\n'.join(lineas)
+
+
+def memoria(crear):
+    tracemalloc.start()
+    valores = crear()
+    usado = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del valores
+    return usado
+
+
+def llenar_arreglo(n):
+    lista = nueva_lista('Entero', n)
+    for k in range(n):
+        lista[k] = k * 1000
+    return lista
+
+
+def medir(programa, entradas):
+    inicio = time.perf_counter()
+    resultados = programa.ejecutar_lote(entradas)
+    return time.perf_counter() - inicio, [(s, str(e)) for s, e in resultados]
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    elementos = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000_000
+
+    arreglo = memoria(lambda: llenar_arreglo(elementos))
+    lista = memoria(lambda: [k * 1000 for k in range(elementos)])
+    print(f"Memoria de {elementos} Entero")
+    print(f"{'Lista (array q)':<32}{arreglo / 2 ** 20:>10.1f} MB  ({arreglo / elementos:.1f} bytes por elemento)")
+    print(f"{'lista de Python':<32}{lista / 2 ** 20:>10.1f} MB  ({lista / elementos:.1f} bytes por elemento)")
+    print()
+
+    compilador = Compilador(advertencias=False)
+    entradas = [[str(k % 50), str(k % 2)] for k in range(n)]
+    print(f"{n} entradas, {LECTURAS} lecturas y {LECTURAS // 4} escrituras de elementos por entrada")
+    for constantes in (True, False):
+        codigo = programa(constantes)
+        generico = compilador.compilar(codigo)
+        especializado = compilador.compilar(codigo, especializado=True)
+        t_generico, esperado = medir(generico, entradas)
+        t_especializado, obtenido = medir(especializado, entradas)
+        nombre = 'índices constantes' if constantes else 'índices variables'
+        por_acceso = t_especializado / (n * (LECTURAS + LECTURAS // 4)) * 1e9
+        print(f"{nombre + ', Interprete':<40}{t_generico * 1000:>10.1f} ms")
+        print(f"{nombre + ', especializado':<40}{t_especializado * 1000:>10.1f} ms  "
+              f"({t_generico / t_especializado:.1f}x, {por_acceso:.0f} ns por acceso)")
+        print(f"Mismas salidas: {'sí' if esperado == obtenido else 'NO'}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""Benchmark de proyectos de varios módulos (modules.py).
+
+Genera un proyecto de N módulos que se importan en forma de árbol (cada
+módulo importa a su padre) y mide la construcción completa con 1 trabajador
+y con os.cpu_count(), una reconstrucción sin cambios, un cambio que no toca
+la interfaz de un módulo y uno que sí la toca.
+
+Con un solo núcleo las dos construcciones completas tardan lo mismo (o la
+del pool algo más, por los procesos).
+
+Uso: python benchmarks/bench_modulos.py [modulos] [lineas]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import Proyecto
+
+
+def modulo(i, lineas):
+    """Código del módulo i: importa a su padre y declara variables propias"""
+    codigo = [f'Importar m{(i - 1) // 2};'] if i else []
+    codigo += [f'a{i} Entero;', f'a{i} = {i};', f'b{i} Real;', f'b{i} = a{i} * 2,5;']
+    for k in range(lineas):
+        codigo.append(f'b{i} = b{i} + a{i} * {k + 1} - {k} / 2;')
+    codigo.append(f'Mensaje.Texto(b{i});')
+    return '\n'.join(codigo) + '\n'
+
+
+def escribir(carpeta, nombre, codigo):
+    with open(os.path.join(carpeta, nombre + '.cos'), 'w', encoding='utf-8') as f:
+        f.write(codigo)
+
+
+def medir(nombre, proyecto, cantidad):
+    inicio = time.perf_counter()
+    analizados = proyecto.construir()
+    segundos = time.perf_counter() - inicio
+    print(f"{nombre:<32}{segundos * 1000:>10.1f} ms  {len(analizados):>6} analizados de {cantidad}")
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    lineas = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+    nucleos = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        for i in range(cantidad):
+            escribir(carpeta, f'm{i}', modulo(i, lineas))
+
+        for trabajadores in sorted({1, nucleos}):
+            cache = os.path.join(carpeta, f'.cache{trabajadores}.json')
+            with Proyecto(carpeta, trabajadores, cache) as proyecto:
+                medir(f"completa, {trabajadores} trabajadores", proyecto, cantidad)
+
+        with Proyecto(carpeta, nucleos, os.path.join(carpeta, f'.cache{nucleos}.json')) as proyecto:
+            medir("sin cambios", proyecto, cantidad)
+
+            # Una hoja cambia su cuerpo pero no su interfaz
+            with open(os.path.join(carpeta, f'm{cantidad - 1}.cos'), 'a', encoding='utf-8') as f:
+                f.write(f'Mensaje.Texto(a{cantidad - 1});\n')
+            medir("cuerpo de una hoja", proyecto, cantidad)
+
+            # m1 cambia una constante: se revisa su subárbol
+            escribir(carpeta, 'm1', modulo(1, lineas).replace('a1 = 1;', 'a1 = 100;'))
+            medir("interfaz de m1 (subárbol)", proyecto, cantidad)
+
+        # Otro proceso que arranca con el caché ya guardado
+        with Proyecto(carpeta, nucleos, os.path.join(carpeta, f'.cache{nucleos}.json')) as proyecto:
+            medir("arranque con caché", proyecto, cantidad)
+
+
+if __name__ == '__main__':
+    main()
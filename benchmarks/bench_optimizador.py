@@ -0,0 +1,76 @@
+"""Benchmark del gestor de pasadas: nodos antes/después y tiempo de evaluación.
+
+Uso: python benchmarks/bench_optimizador.py [sentencias]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+from optimizer import GestorPasadas, contar_nodos
+
+
+def generar_programa(n):
+    """Programa con identidades, constantes y subexpresiones repetidas"""
+    lineas = ['a Entero;', 'a = 3;', 'b Entero;', 'b = 4;', 'c Real;', 'c = 2,5;', 'x Real;']
+    for i in range(n):
+        lineas.append(f'x = (a * 1 + 0) * (b - 0) + (a * 1 + 0) * (b - 0) - -c + {i} * 2;')
+        lineas.append('Mensaje.Texto(x);')
+    return '\n'.join(lineas) + '\n'
+
+
+def contar(sentencias, unicos=False):
+    total = 0
+    for sentencia in sentencias:
+        if sentencia[0] == 'asignar':
+            total += contar_nodos(sentencia[2], unicos)
+        elif sentencia[0] == 'mensaje_texto':
+            total += contar_nodos(sentencia[1], unicos)
+    return total
+
+
+def tiempo_evaluacion(semantico, sentencias, repeticiones=5):
+    expresiones = [s[2] for s in sentencias if s[0] == 'asignar']
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        for expresion in expresiones:
+            semantico.evaluar_operacion(expresion)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    compilador = Compilador(advertencias=False)
+    resultado = compilador.analizar(generar_programa(n))
+    sentencias = resultado['resultado']
+    tabla = compilador.tabla_simbolos
+
+    print(f"Sentencias: {len(sentencias)}")
+    print(f"{'configuración':<32}{'nodos':>10}{'únicos':>10}{'evaluar (ms)':>15}")
+
+    base = tiempo_evaluacion(compilador.semantico, sentencias)
+    print(f"{'sin optimizar':<32}{contar(sentencias):>10}{contar(sentencias, True):>10}{base * 1000:>15.2f}")
+
+    configuraciones = [
+        ('simplificación', ['simplificacion']),
+        ('simplificación + subexpresiones', ['simplificacion', 'subexpresiones']),
+        ('todas las pasadas', None),
+    ]
+    for nombre, activas in configuraciones:
+        gestor = GestorPasadas()
+        if activas is not None:
+            for pasada in gestor.pasadas:
+                gestor.habilitar(pasada.nombre, pasada.nombre in activas)
+        optimizadas = gestor.optimizar(sentencias, tabla)
+        tiempo = tiempo_evaluacion(compilador.semantico, optimizadas)
+        print(f"{nombre:<32}{contar(optimizadas):>10}{contar(optimizadas, True):>10}{tiempo * 1000:>15.2f}")
+        for pasada, segundos in gestor.tiempos.items():
+            print(f"    {pasada:<28}{segundos * 1000:>10.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
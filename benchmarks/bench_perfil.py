@@ -0,0 +1,48 @@
+"""Benchmark del costo del perfil por línea.
+
+Corre el mismo lote sin perfil, con perfil exacto y con perfil por
+muestreo, con el intérprete genérico y con el especializado.
+
+Uso: python benchmarks/bench_perfil.py [entradas]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+from profiler import PerfilLineas
+from bench_especializado import PROGRAMA, generar_entradas
+
+
+def medir(programa, entradas, perfil):
+    inicio = time.perf_counter()
+    if perfil is None:
+        programa.ejecutar_lote(entradas)
+    else:
+        with perfil.midiendo(programa):
+            programa.ejecutar_lote(entradas)
+    return time.perf_counter() - inicio
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    entradas = generar_entradas(n)
+    compilador = Compilador(advertencias=False)
+
+    print(f"{n} entradas")
+    for nombre, especializado in [('genérico', False), ('especializado', True)]:
+        programa = compilador.compilar(PROGRAMA, especializado)
+        # Calentar (y generar el código especializado) antes de medir
+        programa.ejecutar_lote(entradas[:100])
+        base = medir(programa, entradas, None)
+        exacto = medir(programa, entradas, PerfilLineas())
+        muestreo = medir(programa, entradas, PerfilLineas(muestreo=True))
+        print(f"{nombre:<16}{'sin perfil':<12}{base * 1000:>9.1f} ms")
+        print(f"{'':<16}{'exacto':<12}{exacto * 1000:>9.1f} ms  ({(exacto / base - 1) * 100:+.0f}%)")
+        print(f"{'':<16}{'muestreo':<12}{muestreo * 1000:>9.1f} ms  ({(muestreo / base - 1) * 100:+.0f}%)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark de la recuperación de errores sobre entradas adversarias.
+
+Entradas con un error en casi cada token (basura, binarios renombrados a
+.cos, líneas larguísimas sin ';'). Se mide cómo crece el tiempo al duplicar
+el tamaño (debe ser lineal) y el efecto del corte con max_errores.
+
+Uso: python benchmarks/bench_recuperacion.py [tamaño]
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+
+
+def basura(n, semilla=7):
+    """Bytes aleatorios leídos como latin-1, como un binario renombrado"""
+    azar = random.Random(semilla)
+    return bytes(azar.randrange(256) for _ in range(n)).decode('latin-1')
+
+
+def errores_lexicos(n):
+    """Muchos errores léxicos seguidos de errores sintácticos en la misma línea"""
+    return '\n'.join('1a @b ) ( + ; ;' for _ in range(n // 16)) + '\n'
+
+
+def linea_sin_fin(n):
+    """Una sola línea enorme sin punto y coma"""
+    return 'x = ' + ' ) a' * (n // 4) + '\n'
+
+
+def medir(compilador, codigo, repeticiones=3):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultado = compilador.analizar(codigo)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado['estadisticas']['errores']
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    entradas = [('basura', basura), ('errores léxicos', errores_lexicos), ('línea sin fin', linea_sin_fin)]
+    configuraciones = [('sin límite', None), ('max_errores=100', 100)]
+
+    print(f"{'entrada':<18}{'modo':<18}{'n (ms)':>10}{'2n (ms)':>10}{'2n/n':>7}{'errores':>10}")
+    for nombre, generar in entradas:
+        for modo, max_errores in configuraciones:
+            compilador = Compilador(advertencias=False, modo_lote=True, max_errores=max_errores)
+            t1, errores = medir(compilador, generar(n))
+            t2, _ = medir(compilador, generar(2 * n))
+            print(f"{nombre:<18}{modo:<18}{t1 * 1000:>10.1f}{t2 * 1000:>10.1f}{t2 / t1:>7.2f}{errores:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,127 @@
+"""Benchmark del tipado y la evaluación actuales contra los solo recursivos.
+
+`SemanticoRecursivo` conserva las versiones anteriores (un frame de Python
+por nivel) como referencia. Las actuales van por recursión hasta
+PROFUNDIDAD_RECURSIVA niveles y de ahí siguen con una pila explícita.
+Se miden cadenas `x + x + ...` (árboles muy profundos por la asociatividad
+izquierda) y expresiones anchas y bajitas, que son las típicas de un
+programa normal: en esas las actuales no deben ser más lentas.
+
+Uso: python benchmarks/bench_recursion.py [repeticiones]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from semantic import AnalizadorSemantico
+
+
+class SemanticoRecursivo(AnalizadorSemantico):
+    """Tipado y evaluación recursivos (referencia)"""
+
+    def obtener_tipo_expresion(self, expresion):
+        if not self.es_compuesta(expresion):
+            return self.calcular_tipo_expresion(expresion)
+        memo = self.cache_tipos.get(id(expresion))
+        if memo is not None and memo[0] is expresion:
+            return memo[1]
+        # Sin `tipo_hijo` los hijos se tipan llamando otra vez a este método
+        tipo = self.calcular_tipo_expresion(expresion)
+        if self.nodos.activa:
+            self.cache_tipos[id(expresion)] = (expresion, tipo)
+        return tipo
+
+    def evaluar_operacion(self, expresion, visitados=None):
+        if visitados is None:
+            visitados = set()
+        if not isinstance(expresion, tuple):
+            return None
+        if expresion[0] == 'operacion_binaria':
+            constante = self.nodos.es_constante(expresion)
+            if constante and id(expresion) in self.cache_valores:
+                return self.cache_valores[id(expresion)]
+            val_izq = self.evaluar_operacion(expresion[2], visitados)
+            val_der = self.evaluar_operacion(expresion[3], visitados)
+            if val_izq is None or val_der is None:
+                resultado = None
+            else:
+                resultado = self.operar(expresion[1], val_izq, val_der)
+            if constante:
+                self.cache_valores[id(expresion)] = resultado
+            return resultado
+        elif expresion[0] == 'negacion':
+            valor = self.evaluar_operacion(expresion[1], visitados)
+            return None if valor is None else -valor
+        elif expresion[0] == 'numero':
+            return expresion[1]
+        elif expresion[0] == 'variable':
+            var = expresion[1]
+            if var in visitados or not self.variable_tiene_valor(var):
+                return None
+            visitados.add(var)
+            return self.evaluar_operacion(self.tabla_simbolos[var]['valor'], visitados)
+        return None
+
+
+def preparar(semantico):
+    semantico.reset()
+    semantico.declarar_variable('x', 'Real', 1)
+    semantico.asignar_variable('x', semantico.nodos.numero(1.5), 2)
+
+
+def cadena(semantico, n):
+    """x * 1 + 1 + 1 ... (profundidad n)"""
+    nodos = semantico.nodos
+    expresion = nodos.binaria('*', nodos.variable('x'), nodos.numero(2))
+    for i in range(n):
+        expresion = nodos.binaria('+' if i % 2 else '-', expresion, nodos.numero(i % 7 + 1))
+    return expresion
+
+
+def ancha(semantico, n):
+    """Árbol balanceado de n hojas (profundidad log n)"""
+    nodos = semantico.nodos
+    nivel = [nodos.binaria('*', nodos.variable('x'), nodos.numero(i % 5 + 1)) for i in range(n)]
+    while len(nivel) > 1:
+        nivel = [nodos.binaria('+', nivel[i], nivel[i + 1]) if i + 1 < len(nivel) else nivel[i]
+                 for i in range(0, len(nivel), 2)]
+    return nivel[0]
+
+
+def medir(clase, construir, n, repeticiones):
+    semantico = clase()
+    # Árboles sin compartir nodos para que el memo no esconda el recorrido
+    semantico.nodos.activa = False
+    preparar(semantico)
+    expresion = construir(semantico, n)
+    mejor = float('inf')
+    try:
+        for _ in range(repeticiones):
+            semantico.cache_tipos.clear()
+            semantico.cache_valores.clear()
+            inicio = time.perf_counter()
+            semantico.obtener_tipo_expresion(expresion)
+            semantico.obtener_valor_expresion(expresion)
+            mejor = min(mejor, time.perf_counter() - inicio)
+    except RecursionError:
+        return None
+    return mejor
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    casos = [('cadena', cadena, n) for n in (10, 100, 900, 10_000, 100_000)]
+    casos += [('ancha', ancha, n) for n in (1_000, 100_000)]
+
+    print(f"{'forma':<8}{'nodos':>9}{'recursivo (ms)':>16}{'iterativo (ms)':>16}")
+    for nombre, construir, n in casos:
+        recursivo = medir(SemanticoRecursivo, construir, n, repeticiones)
+        iterativo = medir(AnalizadorSemantico, construir, n, repeticiones)
+        texto = 'RecursionError' if recursivo is None else f"{recursivo * 1000:.2f}"
+        print(f"{nombre:<8}{n:>9}{texto:>16}{iterativo * 1000:>16.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""Benchmark del resaltado incremental sobre un texto de 100.000 líneas.
+
+Mide lo que siente quien escribe: abrir el archivo, pintar la pantalla,
+teclear en el medio, saltar al final y abrir un /* que cambia todo lo que
+sigue. Se compara con volver a pasar el lexer por todo el texto en cada
+tecla (lo que haría un resaltado ingenuo).
+
+Uso: python benchmarks/bench_resaltado.py [líneas]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from highlight import ResaltadorIncremental
+from lexer import AnalizadorLexico
+
+PANTALLA = 40
+
+BLOQUE = [
+    'nombre Texto; // quién',
+    'nombre = "Carlos /* no es comentario */";',
+    'edad Entero;',
+    '/* comentario',
+    '   de varias líneas */ edad = Captura.Entero();',
+    'altura = 1,75 * edad - 3;',
+    'Mensaje.Texto(nombre + "hola");',
+    'x entero;',
+]
+
+
+def cronometrar(funcion):
+    inicio = time.perf_counter()
+    funcion()
+    return (time.perf_counter() - inicio) * 1000
+
+
+def main():
+    total = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    texto = '\n'.join(BLOQUE[i % len(BLOQUE)] for i in range(total))
+    resaltador = ResaltadorIncremental()
+
+    print(f"Texto: {total} líneas, {len(texto) / 1024 / 1024:.1f} MB")
+    print(f"{'cargar':<34}{cronometrar(lambda: resaltador.cargar(texto)):>10.2f} ms")
+    print(f"{'pintar la primera pantalla':<34}{cronometrar(lambda: resaltador.visibles(0, PANTALLA)):>10.2f} ms")
+
+    medio = total // 2
+    print(f"{'saltar a la mitad':<34}{cronometrar(lambda: resaltador.visibles(medio, medio + PANTALLA)):>10.2f} ms")
+
+    # Teclear en el medio: cada tecla cambia una línea y se repinta la pantalla
+    teclas = 500
+    linea = medio + 10
+
+    def teclear():
+        for i in range(teclas):
+            resaltador.editar(linea, linea + 1, [resaltador.lineas[linea] + 'a'])
+            resaltador.visibles(medio, medio + PANTALLA)
+
+    print(f"{'tecla en el medio (promedio)':<34}{cronometrar(teclear) / teclas:>10.3f} ms")
+
+    def enter():
+        for _ in range(50):
+            texto_linea = resaltador.lineas[linea]
+            resaltador.editar(linea, linea + 1, [texto_linea[:3], texto_linea[3:]])
+            resaltador.visibles(medio, medio + PANTALLA)
+
+    print(f"{'Enter en el medio (promedio)':<34}{cronometrar(enter) / 50:>10.3f} ms")
+
+    def abrir_comentario():
+        resaltador.editar(medio, medio + 1, ['/* ' + resaltador.lineas[medio]])
+        resaltador.visibles(medio, medio + PANTALLA)
+
+    print(f"{'abrir /* sin cerrar en el medio':<34}{cronometrar(abrir_comentario):>10.2f} ms")
+    print(f"{'saltar al final después':<34}{cronometrar(lambda: resaltador.visibles(total - PANTALLA, total)):>10.2f} ms")
+
+    analizador = AnalizadorLexico()
+    analizador.construir()
+    print(f"{'ingenuo: lexer sobre todo el texto':<34}{cronometrar(lambda: analizador.tokenizar(texto)):>10.2f} ms por tecla")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""Benchmark del runner de casos: casos por segundo según la cantidad de procesos.
+
+El programa se compila una vez; con buen reparto el rendimiento debe crecer
+casi lineal con los núcleos (hasta os.cpu_count()).
+
+Antes de medir revisa con assert que un caso desbocado (una sola sentencia
+que eleva al cuadrado un Entero enorme) quede como 'tiempo' cerca del
+plazo, sin frenar a los demás casos.
+
+Uso: python benchmarks/bench_runner.py [casos]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+from runner import GRACIA, buscar_casos, ejecutar_casos
+from runtime import formatear_valor
+
+PROGRAMA = '''
+base Real;
+base = Captura.Real();
+veces Entero;
+veces = Captura.Entero();
+total Real;
+total = base * veces + base / 2 - veces * 3;
+Mensaje.Texto(total);
+Mensaje.Texto(total * total - base);
+'''
+
+# Cada sentencia duplica los dígitos de a: las últimas tardan segundos cada una
+DESBOCADO = 'a Entero;\na = Captura.Entero();\nMensaje.Texto(a);\n' + 'a = a * a;\n' * 32
+
+
+def verificar_tiempo(timeout=0.3):
+    """Un caso desbocado queda como 'tiempo' aunque el plazo venza dentro de una sentencia"""
+    programa = Compilador(advertencias=False).compilar(DESBOCADO)
+    with tempfile.TemporaryDirectory() as carpeta:
+        for nombre, entrada in [('bien', '1'), ('desbocado', '3')]:
+            with open(os.path.join(carpeta, f'{nombre}.in'), 'w') as archivo:
+                archivo.write(entrada + '\n')
+        for trabajadores in (1, 2):
+            inicio = time.perf_counter()
+            resultados = {r['nombre']: r for r in ejecutar_casos(programa, buscar_casos(carpeta), trabajadores, timeout)}
+            segundos = time.perf_counter() - inicio
+            assert resultados['bien']['estado'] == 'ok', resultados['bien']
+            assert resultados['desbocado']['estado'] == 'tiempo', resultados['desbocado']
+            assert segundos < timeout + GRACIA + 2, segundos
+    print(f"Caso desbocado: 'tiempo' con plazo de {timeout} s")
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 4000
+    verificar_tiempo()
+    programa = Compilador(advertencias=False).compilar(PROGRAMA)
+    nucleos = os.cpu_count() or 1
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        for i in range(n):
+            base, veces = i % 13 + 0.5, i % 7 + 1
+            total = base * veces + base / 2 - veces * 3
+            with open(os.path.join(carpeta, f'{i:05}.in'), 'w') as archivo:
+                archivo.write(f'{str(base).replace(".", ",")}\n{veces}\n')
+            with open(os.path.join(carpeta, f'{i:05}.out'), 'w') as archivo:
+                archivo.write(f'{formatear_valor(total)}\n{formatear_valor(total * total - base)}\n')
+        casos = buscar_casos(carpeta)
+
+        print(f"{n} casos, {nucleos} núcleo(s)")
+        print(f"{'procesos':>9}{'segundos':>11}{'casos/s':>11}{'escala':>8}")
+        base_rendimiento = None
+        for trabajadores in sorted({1, 2, 4, nucleos}):
+            inicio = time.perf_counter()
+            resultados = ejecutar_casos(programa, casos, trabajadores)
+            tiempo = time.perf_counter() - inicio
+            rendimiento = n / tiempo
+            base_rendimiento = base_rendimiento or rendimiento
+            fallos = sum(1 for r in resultados if r['estado'] != 'ok')
+            aviso = f"  ({fallos} no ok)" if fallos else ''
+            print(f"{trabajadores:>9}{tiempo:>11.2f}{rendimiento:>11.0f}{rendimiento / base_rendimiento:>8.2f}{aviso}")
+
+
+if __name__ == '__main__':
+    main()
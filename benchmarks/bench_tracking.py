@@ -0,0 +1,70 @@
+"""Benchmark del parseo con y sin `tracking` de PLY.
+
+Con `tracking=True` PLY copia línea y posición en cada reducción; las
+columnas ahora salen del índice de líneas de `source.py`, armado una sola
+vez por código. Se mide también cuánto cuesta pedir la columna de todos
+los mensajes.
+
+Uso: python benchmarks/bench_tracking.py [sentencias]
+"""
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+from source import IndiceLineas
+
+
+def generar_programa(n):
+    lineas = []
+    for i in range(n):
+        lineas.append(f'v{i} Entero;')
+        lineas.append(f'v{i} = ({i} + 3) * 2 - {i} / 4;')
+        lineas.append(f'Mensaje.Texto(v{i} + 1);')
+        if i % 100 == 0:
+            lineas.append(f'v{i} = "texto";')
+    return '\n'.join(lineas) + '\n'
+
+
+def parsear(compilador, codigo, tracking, repeticiones=3):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        compilador.reset()
+        inicio = time.perf_counter()
+        compilador.parser.parser.parse(codigo, lexer=compilador.lexer.lexer, tracking=tracking)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    codigo = generar_programa(n)
+    compilador = Compilador(advertencias=False)
+    # PLY se construye en el primer analizar; aquí se usa el parser directamente
+    compilador.construir()
+    print(f"Programa: {codigo.count(chr(10))} líneas, {len(codigo) // 1024} KB")
+
+    con = parsear(compilador, codigo, True)
+    sin = parsear(compilador, codigo, False)
+    print(f"{'tracking=True':<24}{con * 1000:>10.1f} ms")
+    print(f"{'tracking=False':<24}{sin * 1000:>10.1f} ms  ({(1 - sin / con) * 100:.0f}% menos)")
+
+    resultado = compilador.analizar(codigo)
+    mensajes = resultado['mensajes']
+    inicio = time.perf_counter()
+    indice = IndiceLineas(codigo)
+    indice.inicios
+    armado = time.perf_counter() - inicio
+    for m in mensajes:
+        m.fuente = indice
+    inicio = time.perf_counter()
+    columnas = [m.columna for m in mensajes]
+    consultas = time.perf_counter() - inicio
+    print(f"{'índice de líneas':<24}{armado * 1000:>10.1f} ms")
+    print(f"{'columnas':<24}{consultas * 1000:>10.1f} ms  ({len(columnas)} mensajes)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark de la revisión de código vacío antes de compilar.
+
+Antes la GUI quitaba los comentarios con dos `re.sub` sobre todo el texto
+para ver si quedaba algo, y después el lexer volvía a recorrerlo. Ahora
+`Compilador.analizar` lo detecta en su única pasada (resultado 'vacio').
+
+Uso: python benchmarks/bench_vacio.py [líneas]
+"""
+import os
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import Compilador
+
+
+def revision_anterior(compilador, codigo):
+    """Lo que hacía la GUI: dos re.sub, strip y después analizar"""
+    sin_comentarios = re.sub(r'//.*', '', codigo)
+    sin_comentarios = re.sub(r'/\*[\s\S]*?\*/', '', sin_comentarios)
+    if not sin_comentarios.strip():
+        return None
+    return compilador.analizar(codigo)
+
+
+def revision_actual(compilador, codigo):
+    return compilador.analizar(codigo)
+
+
+def medir(funcion, compilador, codigo, repeticiones=5):
+    mejor = float('inf')
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion(compilador, codigo)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    compilador = Compilador(modo_lote=True, advertencias=False)
+
+    comentario = '// comentario de una línea con algo de texto\n/* bloque\n   de varias líneas */\n'
+    programa = 'x Entero; // la x\nx = x + 1; /* suma */\nMensaje.Texto(x);\n'
+    codigos = [
+        ('solo comentarios', comentario * n),
+        ('programa comentado', 'x Entero;\nx = 1;\n' + programa * (n // 10)),
+    ]
+
+    for nombre, codigo in codigos:
+        antes = medir(revision_anterior, compilador, codigo)
+        ahora = medir(revision_actual, compilador, codigo)
+        print(f"{nombre:<20}{len(codigo) / 1024:>8.0f} KB  re.sub + analizar {antes * 1000:>9.1f} ms"
+              f"   analizar {ahora * 1000:>9.1f} ms")
+
+    # Lo que cuesta la pasada previa sola, sin compilar (se ahorra en todo código no vacío)
+    codigo = codigos[1][1]
+    inicio = time.perf_counter()
+    re.sub(r'/\*[\s\S]*?\*/', '', re.sub(r'//.*', '', codigo)).strip()
+    print(f"{'pasada previa sola':<20}{len(codigo) / 1024:>8.0f} KB  {(time.perf_counter() - inicio) * 1000:>9.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
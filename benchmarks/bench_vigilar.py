@@ -0,0 +1,58 @@
+"""Benchmark del modo vigilancia sobre una carpeta de programas generados.
+
+Mide la primera revisión (analiza todo), una revisión sin cambios (solo
+stat de cada archivo), otra con archivos guardados sin cambiar el contenido
+y otra con unos pocos archivos editados.
+
+Uso: python benchmarks/bench_vigilar.py [archivos]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from golden import generar_corpus
+from watch import Vigilante
+
+
+def medir(nombre, vigilante, archivos):
+    inicio = time.perf_counter()
+    analizados = vigilante.revisar()
+    segundos = time.perf_counter() - inicio
+    print(f"{nombre:<28}{segundos * 1000:>10.1f} ms  {len(analizados):>6} analizados de {archivos}")
+
+
+def main():
+    cantidad = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    with tempfile.TemporaryDirectory() as carpeta:
+        rutas = []
+        for i, (_, codigo) in enumerate(generar_corpus(cantidad)):
+            subcarpeta = os.path.join(carpeta, f"grupo{i % 20}")
+            os.makedirs(subcarpeta, exist_ok=True)
+            rutas.append(os.path.join(subcarpeta, f"estudiante{i}.cos"))
+            with open(rutas[-1], 'w', encoding='utf-8') as f:
+                f.write(codigo)
+
+        with Vigilante(carpeta, trabajadores=os.cpu_count(), espera=0) as vigilante:
+            medir("primera revisión", vigilante, cantidad)
+            medir("sin cambios", vigilante, cantidad)
+
+            for ruta in rutas[::10]:
+                os.utime(ruta, ns=(time.time_ns(), time.time_ns()))
+            medir("guardados sin cambios", vigilante, cantidad)
+
+            for ruta in rutas[::100]:
+                with open(ruta, 'a', encoding='utf-8') as f:
+                    f.write('\nextra Entero;\n')
+            medir("1% editados", vigilante, cantidad)
+
+        # Otro proceso que arranca con el índice ya guardado
+        with Vigilante(carpeta, espera=0) as vigilante:
+            medir("arranque con índice", vigilante, cantidad)
+
+
+if __name__ == '__main__':
+    main()
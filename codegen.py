@@ -0,0 +1,161 @@
+from liveness import AnalizadorVivacidad
+
+
+class GeneradorCodigo:
+    """Generador de código Costeñol - Emite el programa sin asignaciones muertas"""
+
+    # Precedencia de los operadores para decidir dónde van paréntesis
+    precedencia = {'+': 1, '-': 1, '*': 2, '/': 2}
+
+    def __init__(self, semantico, optimizador=None):
+        self.semantico = semantico
+        self.optimizador = optimizador
+        self.vivacidad = AnalizadorVivacidad()
+
+    def generar(self, sentencias, vivacidad=None):
+        """Genera el código fuente optimizado a partir de las sentencias"""
+        if not sentencias:
+            return ''
+
+        if self.optimizador is not None:
+            sentencias = self.optimizador.optimizar(sentencias, self.semantico.tabla_simbolos)
+            # La vivacidad cambia después de propagar constantes
+            vivacidad = None
+
+        if vivacidad is None:
+            vivacidad = self.vivacidad.analizar(sentencias, self.semantico.tabla_simbolos)
+
+        lineas = []
+        for i, sentencia in enumerate(sentencias):
+            if i in vivacidad.almacenamientos_muertos:
+                continue
+
+            clase = sentencia[0]
+            if clase == 'declarar':
+                lineas.append(f"{sentencia[1]} {sentencia[2]};")
+
+            elif clase == 'importar':
+                lineas.append(f"Importar {sentencia[1]};")
+
+            elif clase == 'declarar_lista':
+                lineas.append(f"{sentencia[1]} Lista {sentencia[2]}[{sentencia[3]}];")
+
+            elif clase == 'asignar':
+                lineas.append(f"{sentencia[1]} = {self.generar_expresion(sentencia[2])};")
+
+            elif clase == 'asignar_elemento':
+                lineas.append(f"{sentencia[1]}[{self.generar_expresion(sentencia[2])}] = "
+                              f"{self.generar_expresion(sentencia[3])};")
+
+            elif clase == 'mensaje_texto':
+                expresion = sentencia[1]
+                # El parser deja pasar Mensaje.Texto con errores ya reportados
+                if isinstance(expresion, tuple) and expresion[0] == 'error':
+                    continue
+                if i in vivacidad.mensajes_constantes:
+                    expresion = self.plegar_constante(expresion)
+                lineas.append(f"Mensaje.Texto({self.generar_expresion(expresion)});")
+
+        return '\n'.join(lineas) + '\n'
+
+    def plegar_constante(self, expresion):
+        """Convierte un Mensaje.Texto de constantes en su texto final"""
+        if not isinstance(expresion, tuple) or expresion[0] not in ['operacion_binaria', 'negacion']:
+            return expresion
+
+        valor = self.semantico.evaluar_operacion(expresion)
+        if valor is None:
+            # Ej: división por cero, se deja tal cual
+            return expresion
+
+        return ('cadena', self.semantico.obtener_valor_expresion(('numero', valor)))
+
+    # ===================== EXPRESIONES =====================
+
+    def generar_expresion(self, expresion):
+        """Convierte una expresión en texto con los paréntesis mínimos.
+
+        Recorre en orden con una pila explícita y junta los pedazos al final,
+        así una expresión muy anidada no gasta recursión ni copia texto por nivel.
+        """
+        # Mensaje.Texto("...") guarda la cadena sin envolver
+        if isinstance(expresion, str):
+            return f'"{expresion}"'
+
+        pedazos = []
+        pila = [expresion]
+        while pila:
+            elemento = pila.pop()
+            if isinstance(elemento, str):
+                pedazos.append(elemento)
+                continue
+            pila.extend(reversed(self.partes_expresion(elemento)))
+        return ''.join(pedazos)
+
+    def partes_expresion(self, expresion):
+        """Pedazos de texto y subexpresiones de un nodo, en orden"""
+        clase = expresion[0]
+
+        if clase == 'numero':
+            texto = self.formatear_numero(expresion[1])
+            return [f"({texto})" if texto.startswith('-') else texto]
+
+        elif clase == 'cadena':
+            return [f'"{expresion[1]}"']
+
+        elif clase == 'variable':
+            return [expresion[1]]
+
+        elif clase == 'capturar':
+            return [f"Captura.{expresion[1]}()"]
+
+        elif clase == 'elemento':
+            return [f"{expresion[1]}[", expresion[2], "]"]
+
+        elif clase == 'negacion':
+            hijo = expresion[1]
+            if self.nivel_expresion(hijo) < 3 or hijo[0] == 'negacion':
+                return ['-(', hijo, ')']
+            return ['-', hijo]
+
+        elif clase == 'operacion_binaria':
+            op, izq, der = expresion[1], expresion[2], expresion[3]
+            nivel = self.precedencia[op]
+            partes = []
+
+            if self.nivel_expresion(izq) < nivel:
+                partes += ['(', izq, ')']
+            else:
+                partes.append(izq)
+
+            partes.append(f" {op} ")
+
+            # Los operadores son asociativos por la izquierda
+            if self.nivel_expresion(der) <= nivel:
+                partes += ['(', der, ')']
+            else:
+                partes.append(der)
+
+            return partes
+
+        raise ValueError(f"Expresión no soportada: {expresion!r}")
+
+    def nivel_expresion(self, expresion):
+        """Precedencia de una expresión (los átomos tienen la más alta)"""
+        if expresion[0] == 'operacion_binaria':
+            return self.precedencia[expresion[1]]
+        return 3
+
+    def formatear_numero(self, valor):
+        """Formatea un número sin notación científica"""
+        if isinstance(valor, int):
+            return str(valor)
+
+        texto = repr(valor)
+        if 'e' in texto or 'E' in texto:
+            texto = f"{valor:.17f}".rstrip('0')
+        if '.' not in texto:
+            texto += '.0'
+        elif texto.endswith('.'):
+            texto += '0'
+        return texto
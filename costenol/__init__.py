@@ -0,0 +1,75 @@
+"""Núcleo del compilador Costeñol para usar como librería (sin tkinter).
+
+Importar el paquete no carga el compilador: cada nombre se importa la
+primera vez que se usa, y el lexer y el parser de PLY se construyen en el
+primer análisis, una sola vez por proceso.
+
+    import costenol
+
+    resultado = costenol.analizar('edad Entero;')
+    programa = costenol.compilar(codigo)
+    compilador = costenol.Compilador(advertencias=False)
+
+La interfaz gráfica sigue en main.py / gui.py.
+"""
+import importlib
+
+# Nombre público -> módulo donde está
+_MODULOS = {
+    'Compilador': 'parser',
+    'Programa': 'runtime',
+    'ErrorEjecucion': 'runtime',
+    'TiempoAgotado': 'runtime',
+    'EntradaLista': 'runtime',
+    'EntradaArchivo': 'runtime',
+    'Salida': 'runtime',
+    'Limites': 'limits',
+    'Codigo': 'diagnostics',
+    'Diagnostico': 'diagnostics',
+    'CompiladorAsincrono': 'async_api',
+    'Proyecto': 'modules',
+    'Artefacto': 'artifact',
+}
+
+__all__ = sorted(_MODULOS) + ['analizar', 'compilar']
+
+# Un Compilador por hilo para analizar() y compilar() (un Compilador no es
+# seguro entre hilos). threading se importa al primer uso
+_local = None
+
+
+def __getattr__(nombre):
+    modulo = _MODULOS.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module 'costenol' has no attribute {nombre!r}")
+    valor = getattr(importlib.import_module(modulo), nombre)
+    # La próxima vez ya no pasa por aquí
+    globals()[nombre] = valor
+    return valor
+
+
+def __dir__():
+    return __all__
+
+
+def _compilador():
+    global _local
+    if _local is None:
+        import threading
+        # Si dos hilos llegan a la vez, uno crea su compilador de nuevo y ya
+        _local = threading.local()
+    compilador = getattr(_local, 'compilador', None)
+    if compilador is None:
+        from parser import Compilador
+        compilador = _local.compilador = Compilador()
+    return compilador
+
+
+def analizar(codigo):
+    """Compilador.analizar con el compilador de este hilo"""
+    return _compilador().analizar(codigo)
+
+
+def compilar(codigo, especializado=False):
+    """Compilador.compilar con el compilador de este hilo; retorna un Programa"""
+    return _compilador().compilar(codigo, especializado)
@@ -0,0 +1,217 @@
+from enum import IntEnum
+
+
+class Codigo(IntEnum):
+    """Códigos de los mensajes del compilador"""
+
+    # Léxicos
+    SIMBOLO_ESPECIAL = 1
+    EMPIEZA_CON_NUMERO = 2
+    CARACTER_ILEGAL = 3
+
+    # Sintácticos
+    TIPO_MINUSCULA = 10
+    TIPO_INVALIDO = 11
+    CAPTURA_INVALIDA = 12
+    FALTA_PUNTO_COMA_DECLARACION = 13
+    FALTA_PUNTO_COMA_ASIGNACION = 14
+    MENSAJE_VACIO = 15
+    MENSAJE_MINUSCULA = 16
+    MENSAJE_METODO_INVALIDO = 17
+    MENSAJE_SIN_CERRAR = 18
+    CAPTURA_SIN_PARENS = 19
+    CAPTURA_SIN_CERRAR = 20
+    CAPTURA_SIN_PUNTO = 21
+    NO_ES_FUNCION = 22
+    CAPTURA_MINUSCULA = 23
+    VARIABLE_SIN_METODOS = 24
+    PAREN_SIN_CERRAR = 25
+    DOBLE_PUNTO_COMA = 26
+    PARENTESIS_MAL_UBICADO = 27
+    OPERADOR_MAL_UBICADO = 28
+    ERROR_SINTAXIS = 29
+    FIN_INESPERADO = 30
+    PROGRAMA_VACIO = 31
+    NO_ES_LISTA = 32
+    LISTA_SIN_TAMANO = 33
+    LISTA_METODO_INVALIDO = 34
+    MODULO_CON_COMILLAS = 35
+
+    # Semánticos
+    VARIABLE_REPETIDA = 40
+    VARIABLE_NO_DECLARADA = 41
+    FALTAN_COMILLAS = 42
+    VARIABLE_INEXISTENTE = 43
+    CAPTURA_TIPO_INCORRECTO = 44
+    TIPOS_INCOMPATIBLES = 45
+    ERROR_TIPO = 46
+    MENSAJE_FANTASMA = 47
+    CAPTURA_EN_MENSAJE = 48
+    VARIABLE_SIN_VALOR = 49
+    LISTA_TIPO_INVALIDO = 50
+    LISTA_TAMANO_INVALIDO = 51
+    LISTA_COMPLETA = 52
+    LISTA_EN_MENSAJE = 53
+    MODULO_NO_ENCONTRADO = 54
+    IMPORTACION_CICLICA = 55
+    IMPORTACION_REPETIDA = 56
+    IMPORTACION_CHOQUE = 57
+
+    # Aciertos
+    DECLARACION_OK = 60
+    CAPTURA_OK = 61
+    ASIGNACION_OK = 62
+    MENSAJE_OK = 63
+    LISTA_OK = 64
+    IMPORTACION_OK = 65
+
+    # Advertencias
+    ASIGNACION_MUERTA = 80
+    VARIABLE_SIN_USO = 81
+
+    # Del compilador
+    DEMASIADOS_ERRORES = 90
+    LIMITE_CARACTERES = 91
+    LIMITE_TOKENS = 92
+    LIMITE_PROFUNDIDAD = 93
+    LIMITE_MENSAJES = 94
+    LIMITE_TIEMPO = 95
+    ERROR_INTERNO = 96
+
+
+PLANTILLAS = {
+    Codigo.SIMBOLO_ESPECIAL: "¡Eche tú que ve! Las variables no pueden empezar con simbolos especiales: '{0}'",
+    Codigo.EMPIEZA_CON_NUMERO: "¡Eche tú que ve! Las variables no pueden empezar con números: '{0}'",
+    Codigo.CARACTER_ILEGAL: "Carácter ilegal: '{0}'",
+
+    Codigo.TIPO_MINUSCULA: "¡Ombe! '{0}' debe escribirse con mayúscula inicial: '{1}'",
+    Codigo.TIPO_INVALIDO: "¡Qué vaina! '{0}' no es un tipo válido. Usa: Texto, Entero o Real",
+    Codigo.CAPTURA_INVALIDA: "¡Qué vaina! 'Captura.{0}()' no existe. Usa: Captura.Texto(), Captura.Entero() o Captura.Real()",
+    Codigo.FALTA_PUNTO_COMA_DECLARACION: "¡Ey mi llave! Te faltó el punto y coma (;) después de '{0} {1}'",
+    Codigo.FALTA_PUNTO_COMA_ASIGNACION: "¡Ey mi llave! Te faltó el punto y coma (;) después de '{0} = ...'",
+    Codigo.MENSAJE_VACIO: "¡Joa! Mensaje.Texto está vacío, ponle algo pues.",
+    Codigo.MENSAJE_MINUSCULA: "¡Eche! Es 'Mensaje.Texto', con mayúscula inicial, no '{0}'.",
+    Codigo.MENSAJE_METODO_INVALIDO: "¡Qué vaina! 'Mensaje' no tiene un método llamado '{0}'.",
+    Codigo.MENSAJE_SIN_CERRAR: "¡Ombe! Te faltó cerrar el paréntesis ')' en Mensaje.Texto()",
+    Codigo.CAPTURA_SIN_PARENS: "¡Ombe! Te faltaron los paréntesis en Captura.{0}()",
+    Codigo.CAPTURA_SIN_CERRAR: "¡Ombe! Falta cerrar el paréntesis ')' en Captura.{0}()",
+    Codigo.CAPTURA_SIN_PUNTO: "¡Eche! Creo que querías decir 'Captura.{0}()'. Te faltó el punto.",
+    Codigo.NO_ES_FUNCION: "¡Qué vaina! '{0}' no es una función, no le pongas paréntesis.",
+    Codigo.CAPTURA_MINUSCULA: "¡Ombe! 'Captura' debe escribirse con mayúscula inicial: 'Captura.{0}()'",
+    Codigo.VARIABLE_SIN_METODOS: "¡Qué vaina! La variable '{0}' no tiene métodos, no inventes.",
+    Codigo.PAREN_SIN_CERRAR: "¡Ombe! Falta cerrar el paréntesis ')' en la expresión",
+    Codigo.DOBLE_PUNTO_COMA: "¡Ey! Tienes doble punto y coma (;;) en la misma línea, borra uno pues.",
+    Codigo.PARENTESIS_MAL_UBICADO: "¡Ombe! Falta un paréntesis o está en el lugar equivocado",
+    Codigo.OPERADOR_MAL_UBICADO: "¡Qué vaina! El operador '{0}' no está bien colocado",
+    Codigo.ERROR_SINTAXIS: "¡Qué vaina! Error de sintaxis con '{0}' aquí",
+    Codigo.FIN_INESPERADO: "¡Ombe! El archivo terminó de forma inesperada, seguro te faltó un punto y coma (;) al final.",
+    Codigo.PROGRAMA_VACIO: "¡Ombe! No hay nada que analizar, escribe algo apue.",
+    Codigo.NO_ES_LISTA: "¡Qué vaina! '{0}' no es una Lista, no le pongas corchetes.",
+    Codigo.LISTA_SIN_TAMANO: "¡Ombe! A la Lista '{0}' le falta el tamaño, por ejemplo: {0} Lista {1}[10];",
+    Codigo.LISTA_METODO_INVALIDO: "¡Qué vaina! La Lista '{0}' solo tiene el método Largo(), no '{1}'.",
+    Codigo.MODULO_CON_COMILLAS: "¡Eche! El módulo va sin comillas y sin .cos: Importar {0};",
+
+    Codigo.VARIABLE_REPETIDA: "¡Epa! La variable '{0}' ya la declaraste mano, no la repitas.",
+    Codigo.VARIABLE_NO_DECLARADA: "¡Ombe hey! La variable '{0}' no existe, declárala primero apue.",
+    Codigo.FALTAN_COMILLAS: "¡Eche! Si '{0}' es texto, ponle comillas ombe: \"{0}\"",
+    Codigo.VARIABLE_INEXISTENTE: "¡Ombe! La variable '{0}' no existe, no inventes.",
+    Codigo.CAPTURA_TIPO_INCORRECTO: "¡Ey vale! No puedes usar Captura.{0}() para '{1}' que es {2}",
+    Codigo.TIPOS_INCOMPATIBLES: "¡Esa vaina que cole! No puedes meter {0} en '{1}' que es {2}",
+    Codigo.ERROR_TIPO: "{0}",
+    Codigo.MENSAJE_FANTASMA: "¡Ombe! La variable '{0}' no existe, no puedo mostrar un fantasma.",
+    Codigo.CAPTURA_EN_MENSAJE: "¡Ombe! No puedes usar Captura.{0}() dentro de Mensaje.Texto()",
+    Codigo.VARIABLE_SIN_VALOR: "¡Ombe! La variable '{0}' no tiene valor, asígnale algo primero.",
+    Codigo.LISTA_TIPO_INVALIDO: "¡Qué vaina! Una Lista solo puede ser de Entero o Real, no de {1}: '{0}'",
+    Codigo.LISTA_TAMANO_INVALIDO: "¡Ombe! La Lista '{0}' puede tener de 1 a {2} elementos, no {1}.",
+    Codigo.LISTA_COMPLETA: "¡Ombe! '{0}' es una Lista, asígnale los elementos uno por uno: {0}[0] = ...",
+    Codigo.LISTA_EN_MENSAJE: "¡Ombe! '{0}' es una Lista, muestra sus elementos uno por uno: {0}[0]",
+    Codigo.MODULO_NO_ENCONTRADO: "¡Ombe hey! No encuentro el módulo '{0}', ¿sí existe {0}.cos en el proyecto?",
+    Codigo.IMPORTACION_CICLICA: "¡Qué vaina! '{0}' termina importando este mismo archivo (importación circular).",
+    Codigo.IMPORTACION_REPETIDA: "¡Epa! El módulo '{0}' ya lo importaste mano, no lo repitas.",
+    Codigo.IMPORTACION_CHOQUE: "¡Epa! La variable '{0}' que trae '{1}' ya existe aquí, cámbiale el nombre a una de las dos.",
+
+    Codigo.DECLARACION_OK: "¡Bien ahí! Variable '{0}' quedó como {1}",
+    Codigo.CAPTURA_OK: "¡Tá bueno! Captura.{0}() → {1}({2})",
+    Codigo.ASIGNACION_OK: "¡Tá bueno! {0} → {1}({2})",
+    Codigo.MENSAJE_OK: "Nojoda mostro está bueno el valor es \"{0}\"",
+    Codigo.LISTA_OK: "¡Bien ahí! Lista '{0}' quedó con {2} elementos {1}, todos en 0",
+    Codigo.IMPORTACION_OK: "¡Bien ahí! Módulo '{0}' importado con {1} variables",
+
+    Codigo.ASIGNACION_MUERTA: "¡Ojo pues! El valor que le metes a '{0}' aquí nunca se usa, se pierde.",
+    Codigo.VARIABLE_SIN_USO: "¡Ojo pues! Declaraste '{0}' pero nunca la usas.",
+
+    Codigo.DEMASIADOS_ERRORES: "¡Ombe! Ya van {0} errores, dejé de revisar en la línea {1}. Arregla esos primero.",
+    Codigo.LIMITE_CARACTERES: "¡Eche! El código tiene {0} caracteres y el máximo es {1}, está muy grande.",
+    Codigo.LIMITE_TOKENS: "¡Eche! El código pasó de {1} tokens, está muy largo para revisarlo.",
+    Codigo.LIMITE_PROFUNDIDAD: "¡Qué vaina! Esa expresión está muy anidada, tiene más de {1} niveles.",
+    Codigo.LIMITE_MENSAJES: "¡Ombe! Ya van más de {1} mensajes, dejé de revisar.",
+    Codigo.LIMITE_TIEMPO: "¡Ombe! La revisión se demoró más de {1} segundos y la paré.",
+    Codigo.ERROR_INTERNO: "¡Qué pena! El compilador se enredó ({0}), revisa el código cerca de aquí.",
+}
+
+
+class Diagnostico:
+    """Mensaje del compilador - El texto se arma solo cuando se muestra"""
+
+    __slots__ = ('tipo', 'linea', 'codigo', 'args', 'posicion', 'fin', 'fuente')
+
+    campos = frozenset(['tipo', 'linea', 'mensaje', 'columna'])
+
+    def __init__(self, tipo, linea, codigo, args=(), posicion=None, fin=None):
+        self.tipo = tipo
+        self.linea = linea
+        self.codigo = codigo
+        self.args = args
+        # Posiciones (offsets) en el código fuente; la columna se calcula con `fuente`
+        self.posicion = posicion
+        self.fin = fin
+        self.fuente = None
+
+    @property
+    def mensaje(self):
+        """Texto en costeñol del mensaje"""
+        return PLANTILLAS[self.codigo].format(*self.args)
+
+    @property
+    def columna(self):
+        """Columna (desde 1) donde empieza el mensaje, si se conoce"""
+        if self.posicion is None or self.fuente is None:
+            return None
+        return self.fuente.columna(self.posicion)
+
+    @property
+    def span(self):
+        """Retorna ((línea, columna) inicio, (línea, columna) fin), si se conoce"""
+        if self.posicion is None or self.fuente is None:
+            return None
+        fin = self.fin if self.fin is not None else self.posicion
+        return self.fuente.ubicacion(self.posicion), self.fuente.ubicacion(fin)
+
+    # Compatibilidad con los mensajes como diccionario: m['tipo'], m['mensaje']...
+    def __getitem__(self, clave):
+        if clave in Diagnostico.campos:
+            return getattr(self, clave)
+        raise KeyError(clave)
+
+    def __contains__(self, clave):
+        return clave in Diagnostico.campos
+
+    def get(self, clave, defecto=None):
+        if clave in Diagnostico.campos:
+            return getattr(self, clave)
+        return defecto
+
+    def como_dict(self):
+        """Retorna el mensaje como diccionario"""
+        return {'tipo': self.tipo, 'linea': self.linea, 'columna': self.columna, 'mensaje': self.mensaje}
+
+    def __eq__(self, otro):
+        if not isinstance(otro, Diagnostico):
+            return NotImplemented
+        return (self.tipo, self.linea, self.mensaje) == (otro.tipo, otro.linea, otro.mensaje)
+
+    def __hash__(self):
+        return hash((self.tipo, self.linea, self.mensaje))
+
+    def __repr__(self):
+        return f"Diagnostico({self.tipo!r}, {self.linea!r}, {self.codigo.name}, {self.args!r})"
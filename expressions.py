@@ -0,0 +1,130 @@
+import math
+
+from limits import LimiteExcedido
+
+
+class FabricaExpresiones:
+    """Fábrica de nodos de expresión internados (hash-consing).
+
+    Dos subexpresiones estructuralmente iguales quedan como el mismo
+    objeto, así que los tipos y valores se pueden memoizar por nodo.
+    """
+
+    def __init__(self, activa=True):
+        self.activa = activa
+        self.tabla = {}
+        # ids de nodos internados que no leen variables ni capturas
+        self.sin_variables = set()
+        self.creados = 0
+        self.reutilizados = 0
+        # Profundidad máxima de una expresión (None = sin límite) y profundidad por nodo
+        self.max_profundidad = None
+        self.profundidades = {}
+
+    def reset(self):
+        """Limpia los nodos internados"""
+        self.tabla.clear()
+        self.sin_variables.clear()
+        self.profundidades.clear()
+        self.creados = 0
+        self.reutilizados = 0
+
+    # ===================== CONSTRUCTORES =====================
+
+    def numero(self, valor):
+        return self.internar(('numero', valor))
+
+    def cadena(self, texto):
+        return self.internar(('cadena', texto))
+
+    def variable(self, nombre):
+        return self.internar(('variable', nombre))
+
+    def capturar(self, tipo):
+        return self.internar(('capturar', tipo))
+
+    def binaria(self, op, izq, der):
+        nodo = self.internar(('operacion_binaria', op, izq, der))
+        if self.max_profundidad is not None:
+            self.medir(nodo, izq, der)
+        return nodo
+
+    def negacion(self, expresion):
+        nodo = self.internar(('negacion', expresion))
+        if self.max_profundidad is not None:
+            self.medir(nodo, expresion)
+        return nodo
+
+    def elemento(self, nombre, indice):
+        """nombre[indice] de una Lista (lee la Lista, así que nunca es constante)"""
+        nodo = self.internar(('elemento', nombre, indice))
+        if self.max_profundidad is not None:
+            self.medir(nodo, indice)
+        return nodo
+
+    # ===================== PROFUNDIDAD =====================
+
+    def profundidad(self, nodo):
+        """Profundidad de un nodo medido (las hojas valen 1)"""
+        registro = self.profundidades.get(id(nodo))
+        if registro is not None and registro[0] is nodo:
+            return registro[1]
+        return 1
+
+    def medir(self, nodo, *hijos):
+        """Guarda la profundidad del nodo y corta si pasa el máximo"""
+        profundidad = 1 + max(self.profundidad(hijo) for hijo in hijos)
+        if profundidad > self.max_profundidad:
+            raise LimiteExcedido('profundidad', profundidad, self.max_profundidad)
+        # Se guarda el nodo junto a su profundidad para que el id no se recicle
+        self.profundidades[id(nodo)] = (nodo, profundidad)
+
+    # ===================== INTERNADO =====================
+
+    def clave(self, nodo):
+        """Clave del nodo (los hijos ya internados se comparan por identidad)"""
+        clase = nodo[0]
+        if clase == 'operacion_binaria':
+            return (clase, nodo[1], id(nodo[2]), id(nodo[3]))
+        if clase == 'negacion':
+            return (clase, id(nodo[1]))
+        if clase == 'elemento':
+            return (clase, nodo[1], id(nodo[2]))
+        if clase == 'numero':
+            # 1 y 1.0 son iguales en Python pero no en Costeñol, y 0.0 y -0.0 tampoco
+            valor = nodo[1]
+            if isinstance(valor, float):
+                return (clase, float, valor, math.copysign(1.0, valor))
+            return (clase, type(valor), valor)
+        return nodo
+
+    def internar(self, nodo):
+        """Retorna el nodo único equivalente a `nodo`"""
+        if not self.activa:
+            return nodo
+
+        clave = self.clave(nodo)
+        existente = self.tabla.get(clave)
+        if existente is not None:
+            self.reutilizados += 1
+            return existente
+
+        # El nodo guardado mantiene vivos a sus hijos, así los ids de la clave no se reciclan
+        self.tabla[clave] = nodo
+        self.creados += 1
+
+        clase = nodo[0]
+        if clase in ['numero', 'cadena']:
+            self.sin_variables.add(id(nodo))
+        elif clase == 'operacion_binaria':
+            if id(nodo[2]) in self.sin_variables and id(nodo[3]) in self.sin_variables:
+                self.sin_variables.add(id(nodo))
+        elif clase == 'negacion':
+            if id(nodo[1]) in self.sin_variables:
+                self.sin_variables.add(id(nodo))
+
+        return nodo
+
+    def es_constante(self, nodo):
+        """Verifica si el nodo internado no depende de variables ni capturas"""
+        return id(nodo) in self.sin_variables
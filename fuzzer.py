@@ -0,0 +1,492 @@
+"""Fuzzer de rendimiento: busca entradas cuyo tiempo de análisis crece más que lineal.
+
+Los programas se generan con las reglas de AnalizadorSintactico (se leen de
+los docstrings de los métodos p_), así siguen la gramática de verdad; con
+cierta probabilidad se usan las alternativas con `error`, que dan código
+casi válido como el de los estudiantes. Los programas del corpus también
+sirven de base.
+
+Cada candidato es un bombeo: a + u*k + b + w*k + c. Las mutaciones escogen
+qué se repite: sentencias, un pedazo de tokens, paréntesis o signos
+alrededor de una expresión, o una cola de operaciones. El tiempo de
+Compilador.analizar se mide con dos tamaños y se estima el exponente
+(log t2/t1 / log n2/n1): 1 es lineal, 2 es cuadrático. Lo que pase del
+umbral se confirma, se minimiza (quitando pedazos mientras siga lento) y
+se guarda como JSON en la carpeta del fuzzer. También se guardan las
+entradas que dan un ERROR_INTERNO (falla-*.json) y las que no terminan en
+PLAZO_MEDICION segundos (colgado-*.json): un ciclo en la recuperación de
+errores de PLY no lee tokens, así que el plazo de Limites no lo para.
+
+`verificar` vuelve a medir lo guardado y falla si algo sigue (o vuelve a
+estar) por encima del umbral, así una regresión de rendimiento se nota.
+Un hallazgo puede traer sus propios `tamanos` cuando lo cuadrático solo
+se nota en entradas más grandes que TAMANOS.
+
+Uso:
+    python fuzzer.py buscar [--carpeta fuzz] [--iteraciones N] [--trabajadores N] [--semilla S]
+    python fuzzer.py verificar [--carpeta fuzz]
+"""
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import re
+import signal
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+from diagnostics import Codigo
+from golden import CARPETA_CORPUS, leer_corpus
+
+CARPETA_FUZZ = 'fuzz'
+# Exponente desde el que una entrada se considera más que lineal
+UMBRAL = 1.3
+# Bytes de las dos mediciones
+TAMANOS = (4000, 32000)
+# Veces que se mide cada tamaño (se toma el mínimo)
+REPETICIONES = 3
+# Tope de mediciones al minimizar un hallazgo
+MAX_PASOS_MINIMIZAR = 150
+# Segundos que puede tardar un análisis antes de darlo por colgado
+PLAZO_MEDICION = 2.0
+
+
+# ===================== GRAMÁTICA =====================
+
+def leer_gramatica():
+    """{no terminal: [alternativas]} sacado de las reglas p_ de AnalizadorSintactico"""
+    from parser import AnalizadorSintactico
+
+    reglas = defaultdict(list)
+    for nombre in sorted(dir(AnalizadorSintactico)):
+        if not nombre.startswith('p_') or nombre == 'p_error':
+            continue
+        cabeza, _, cuerpo = getattr(AnalizadorSintactico, nombre).__doc__.partition(':')
+        for alternativa in cuerpo.split('|'):
+            simbolos = alternativa.split()
+            if '%prec' in simbolos:
+                simbolos = simbolos[:simbolos.index('%prec')]
+            reglas[cabeza.strip()].append(tuple(simbolos))
+    return dict(reglas)
+
+
+def profundidades_minimas(reglas):
+    """Profundidad mínima de derivación de cada no terminal (para cortar la recursión)"""
+    minimas = {}
+    cambio = True
+    while cambio:
+        cambio = False
+        for cabeza, alternativas in reglas.items():
+            for alternativa in alternativas:
+                hijos = [minimas.get(s) if s in reglas else 0 for s in alternativa]
+                if None in hijos:
+                    continue
+                profundidad = 1 + max(hijos, default=0)
+                if profundidad < minimas.get(cabeza, math.inf):
+                    minimas[cabeza] = profundidad
+                    cambio = True
+    return minimas
+
+
+# Texto de los terminales fijos (los demás se sortean en lexema())
+LEXEMAS = {
+    'IGUAL': '=', 'MAS': '+', 'MENOS': '-', 'POR': '*', 'DIVIDIDO': '/',
+    'PARENTESIS_IZQ': '(', 'PARENTESIS_DER': ')', 'PUNTO_Y_COMA': ';', 'PUNTO': '.',
+    'CORCHETE_IZQ': '[', 'CORCHETE_DER': ']', 'LISTA': 'Lista', 'IMPORTAR': 'Importar',
+    'TEXTO': 'Texto', 'ENTERO': 'Entero', 'REAL': 'Real', 'CAPTURA': 'Captura', 'MENSAJE': 'Mensaje',
+}
+IDENTIFICADORES = ['a', 'b', 'c', 'total', 'x1', 'texto', 'entero', 'Imprimir']
+# Lo que aparece donde la regla dice `error`
+BASURA = ['@', '#', '1abc', ')', '(', '+', '=', 'Mensaje', 'Captura', ';', '"sin cerrar', '.', ']']
+
+
+def lexema(simbolo, azar):
+    texto = LEXEMAS.get(simbolo)
+    if texto is not None:
+        return texto
+    if simbolo == 'NUMERO_ENTERO':
+        return str(azar.randrange(1000))
+    if simbolo == 'NUMERO_REAL':
+        return f"{azar.randrange(100)}{azar.choice(',.')}{azar.randrange(100)}"
+    if simbolo == 'IDENTIFICADOR':
+        return azar.choice(IDENTIFICADORES)
+    if simbolo == 'CADENA_TEXTO':
+        return f'"hola {azar.randrange(10)}"'
+    return azar.choice(BASURA)
+
+
+class Generador:
+    """Deriva sentencias al azar con la gramática del parser"""
+
+    def __init__(self, reglas=None, profundidad=8, cerca=0.15):
+        self.reglas = reglas if reglas is not None else leer_gramatica()
+        self.minimas = profundidades_minimas(self.reglas)
+        self.profundidad = profundidad
+        # Probabilidad de usar una alternativa con `error` (código casi válido)
+        self.cerca = cerca
+
+    def alternativa(self, simbolo, profundidad, azar):
+        alternativas = self.reglas[simbolo]
+        if profundidad >= self.profundidad:
+            # Sin presupuesto: la alternativa que termina más rápido
+            return min(alternativas, key=lambda alt: max(
+                [self.minimas.get(s, 0) for s in alt], default=0))
+        validas = [alt for alt in alternativas if 'error' not in alt]
+        if validas and azar.random() >= self.cerca:
+            return azar.choice(validas)
+        return azar.choice(alternativas)
+
+    def sentencia(self, azar, tokens, expresiones):
+        """Agrega a `tokens` una sentencia; anota en `expresiones` los tramos (inicio, fin) de cada expresión"""
+        pila = [('sentencia', 0)]
+        while pila:
+            simbolo, profundidad = pila.pop()
+            if simbolo == '#fin':
+                expresiones.append((profundidad, len(tokens)))
+                continue
+            if simbolo not in self.reglas:
+                tokens.append(lexema(simbolo, azar))
+                continue
+            if simbolo == 'expresion':
+                # Se saca después de los hijos, con el índice donde empezó
+                pila.append(('#fin', len(tokens)))
+            for hijo in reversed(self.alternativa(simbolo, profundidad, azar)):
+                pila.append((hijo, profundidad + 1))
+
+    def programa(self, azar, sentencias):
+        """(tokens, tramos de expresiones); cada sentencia termina en un salto de línea"""
+        tokens = []
+        expresiones = []
+        for _ in range(sentencias):
+            self.sentencia(azar, tokens, expresiones)
+            tokens.append('\n')
+        return tokens, expresiones
+
+
+PATRON_TOKEN = re.compile(r'"[^"\n]*"?|\d+(?:[,.]\d+)?|\w+|\n|\S')
+
+
+def partir(texto):
+    """Tokens aproximados de un texto (para mutar y minimizar código del corpus)"""
+    return PATRON_TOKEN.findall(texto)
+
+
+def unir(tokens):
+    return ' '.join(tokens).replace(' \n ', '\n').replace(' \n', '\n')
+
+
+# ===================== BOMBEOS =====================
+
+class Bombeo:
+    """Entrada que crece repitiendo dos partes: a + u*k + b + w*k + c"""
+
+    partes = ('a', 'u', 'b', 'w', 'c')
+
+    def __init__(self, a, u, b='', w='', c='', origen=''):
+        self.a, self.u, self.b, self.w, self.c = a, u, b, w, c
+        # Qué mutación lo produjo (solo informativo)
+        self.origen = origen
+
+    def texto(self, k):
+        return self.a + self.u * k + self.b + self.w * k + self.c
+
+    def repeticiones(self, tamano):
+        """k con el que el texto llega más o menos a `tamano` bytes"""
+        fijo = len((self.a + self.b + self.c).encode('utf-8'))
+        paso = len((self.u + self.w).encode('utf-8'))
+        return max(1, (tamano - fijo) // paso) if paso else 1
+
+    def como_dict(self):
+        datos = {parte: getattr(self, parte) for parte in self.partes}
+        datos['origen'] = self.origen
+        return datos
+
+    @classmethod
+    def desde_dict(cls, datos):
+        return cls(*(datos.get(parte, '') for parte in cls.partes), origen=datos.get('origen', ''))
+
+    def clave(self):
+        return hashlib.sha1(json.dumps(self.como_dict(), sort_keys=True).encode('utf-8')).hexdigest()[:12]
+
+
+# Envolturas para anidar una expresión: (antes, después)
+ENVOLTURAS = [('(', ')'), ('-', ''), ('-(', ')'), ('(1 + ', ')'), ('Captura.Entero(', ')'), ('(', '')]
+# Colas para alargar una expresión sin anidar
+COLAS = [' + 1', ' * x1', ' - "a"', ' / 0', ' +', ' + (2']
+
+
+def mutar(azar, tokens, expresiones):
+    """Un Bombeo a partir de un programa en tokens"""
+    lineas = [i + 1 for i, token in enumerate(tokens) if token == '\n']
+    opcion = azar.randrange(5)
+
+    if opcion == 0 or not expresiones:
+        # Repetir un bloque de sentencias completas
+        i, j = sorted(azar.sample([0] + lineas, 2)) if len(lineas) > 1 else (0, len(tokens))
+        return Bombeo(unir(tokens[:i]), unir(tokens[i:j]), '', '', unir(tokens[j:]), 'sentencias')
+
+    if opcion == 1:
+        # Repetir un pedazo cualquiera de tokens (casi siempre queda casi válido)
+        i = azar.randrange(len(tokens))
+        j = min(len(tokens), i + azar.randrange(1, 8))
+        return Bombeo(unir(tokens[:i]) + ' ', unir(tokens[i:j]) + ' ', '', '', unir(tokens[j:]), 'tokens')
+
+    inicio, fin = azar.choice(expresiones)
+    antes, expresion, despues = unir(tokens[:inicio]), unir(tokens[inicio:fin]), unir(tokens[fin:])
+    if opcion == 2:
+        # Anidar la expresión: (((x))), ---x, (1 + (1 + x))...
+        abre, cierra = azar.choice(ENVOLTURAS)
+        return Bombeo(antes + ' ', abre, expresion, cierra, ' ' + despues, 'anidar')
+    if opcion == 3:
+        # Alargar la expresión: x + 1 + 1 + 1...
+        return Bombeo(antes + ' ', '', expresion, azar.choice(COLAS), ' ' + despues, 'cola')
+
+    # Quitar o cambiar un token del pedazo repetido: errores que se repiten
+    i = azar.randrange(len(tokens))
+    j = min(len(tokens), i + azar.randrange(2, 12))
+    pedazo = tokens[i:j]
+    k = azar.randrange(len(pedazo))
+    if azar.random() < 0.5:
+        del pedazo[k]
+    else:
+        pedazo[k] = azar.choice(BASURA)
+    return Bombeo(unir(tokens[:i]) + ' ', unir(pedazo) + ' ', '', '', unir(tokens[j:]), 'casi_valido')
+
+
+# ===================== MEDICIÓN =====================
+
+class Colgado(BaseException):
+    """El análisis pasó de PLAZO_MEDICION (BaseException: analizar no la convierte en ERROR_INTERNO)"""
+
+
+@contextmanager
+def plazo_medicion(segundos):
+    """Lanza Colgado si el bloque tarda más de `segundos` (solo donde hay SIGALRM)"""
+    if not hasattr(signal, 'setitimer'):
+        yield
+        return
+
+    def colgado(*_):
+        raise Colgado()
+
+    anterior = signal.signal(signal.SIGALRM, colgado)
+    signal.setitimer(signal.ITIMER_REAL, segundos)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, anterior)
+
+
+def medir(compilador, texto, repeticiones=REPETICIONES):
+    """Mejor tiempo de Compilador.analizar; retorna (segundos, resultado)"""
+    mejor = math.inf
+    resultado = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        with plazo_medicion(PLAZO_MEDICION):
+            resultado = compilador.analizar(texto)
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return mejor, resultado
+
+
+def exponente(compilador, bombeo, tamanos=TAMANOS, repeticiones=REPETICIONES):
+    """(exponente de crecimiento, segundos por byte en el tamaño grande, problema).
+
+    `problema` es None, 'falla' (ERROR_INTERNO) o 'colgado' (no terminó).
+    """
+    k1, k2 = bombeo.repeticiones(tamanos[0]), bombeo.repeticiones(tamanos[1])
+    if k2 <= k1:
+        return 0.0, 0.0, None
+    texto1, texto2 = bombeo.texto(k1), bombeo.texto(k2)
+    try:
+        t1, resultado = medir(compilador, texto1, repeticiones)
+        t2, _ = medir(compilador, texto2, repeticiones)
+    except Colgado:
+        return 0.0, 0.0, 'colgado'
+    falla = any(m.codigo == Codigo.ERROR_INTERNO for m in resultado['mensajes'])
+    n1, n2 = len(texto1.encode('utf-8')), len(texto2.encode('utf-8'))
+    return math.log(t2 / t1) / math.log(n2 / n1), t2 / n2, 'falla' if falla else None
+
+
+def minimizar(compilador, bombeo, umbral=UMBRAL, problema=None):
+    """Quita pedazos de cada parte mientras la entrada siga más que lineal (o con el mismo problema)"""
+    pasos = 0
+    for parte in ('a', 'c', 'b', 'u', 'w'):
+        tokens = partir(getattr(bombeo, parte))
+        tamano = max(1, len(tokens) // 2)
+        while tamano >= 1 and pasos < MAX_PASOS_MINIMIZAR:
+            i = 0
+            while i < len(tokens) and pasos < MAX_PASOS_MINIMIZAR:
+                prueba = tokens[:i] + tokens[i + tamano:]
+                candidato = Bombeo.desde_dict(dict(bombeo.como_dict(), **{parte: unir(prueba)}))
+                if parte in ('u', 'w') and not (candidato.u + candidato.w).strip():
+                    i += tamano
+                    continue
+                pasos += 1
+                valor, _, otro = exponente(compilador, candidato, repeticiones=1 if problema else REPETICIONES)
+                if (otro == problema) if problema else valor > umbral:
+                    tokens, bombeo = prueba, candidato
+                else:
+                    i += tamano
+            tamano //= 2
+    return bombeo
+
+
+# ===================== TRABAJADORES =====================
+
+# Un compilador y un generador por proceso
+_compilador = None
+_generador = None
+_bases = []
+
+
+def _preparar_trabajador(bases):
+    global _compilador, _generador, _bases
+    from parser import Compilador
+    _compilador = Compilador()
+    _generador = Generador()
+    _bases = [partir(codigo) for codigo in bases]
+
+
+def _buscar(tarea):
+    """Corre `iteraciones` mutaciones con una semilla; retorna (candidatos, peor exponente).
+
+    Aquí solo se descarta lo que es lineal: con varios procesos midiendo a
+    la vez el tiempo es ruidoso, así que confirmar y minimizar se hace
+    después, en el proceso principal.
+    """
+    semilla, iteraciones, umbral = tarea
+    azar = random.Random(semilla)
+    candidatos = []
+    peor = 0.0
+    for _ in range(iteraciones):
+        if _bases and azar.random() < 0.3:
+            tokens = azar.choice(_bases)
+            expresiones = []
+        else:
+            tokens, expresiones = _generador.programa(azar, azar.randrange(1, 12))
+        if not tokens:
+            continue
+        bombeo = mutar(azar, tokens, expresiones)
+        valor, _, problema = exponente(_compilador, bombeo, repeticiones=1)
+        peor = max(peor, valor)
+        if valor > umbral or problema:
+            candidatos.append(bombeo.como_dict())
+    return candidatos, peor
+
+
+def confirmar(compilador, bombeo, umbral=UMBRAL):
+    """Vuelve a medir un candidato sin competir por la CPU; retorna el hallazgo minimizado o None"""
+    valor, costo, problema = exponente(compilador, bombeo, repeticiones=5)
+    if valor <= umbral and not problema:
+        return None
+    if valor > umbral or problema == 'colgado':
+        bombeo = minimizar(compilador, bombeo, umbral, problema if problema == 'colgado' else None)
+        valor, costo, problema = exponente(compilador, bombeo, repeticiones=5)
+        if valor <= umbral and not problema:
+            return None
+    return dict(bombeo.como_dict(), exponente=round(valor, 3), us_por_byte=round(costo * 1e6, 3), problema=problema)
+
+
+def buscar(iteraciones, trabajadores=None, semilla=0, bases=(), umbral=UMBRAL):
+    """Reparte las iteraciones en tareas entre procesos; retorna (hallazgos, peor exponente)"""
+    from parser import Compilador
+
+    trabajadores = trabajadores or os.cpu_count() or 1
+    por_tarea = 25
+    tareas = [(semilla * 1000003 + i, min(por_tarea, iteraciones - i * por_tarea), umbral)
+              for i in range(math.ceil(iteraciones / por_tarea))]
+    if trabajadores == 1:
+        _preparar_trabajador(list(bases))
+        resultados = [_buscar(tarea) for tarea in tareas]
+    else:
+        with ProcessPoolExecutor(trabajadores, initializer=_preparar_trabajador, initargs=(list(bases),)) as ejecutor:
+            resultados = list(ejecutor.map(_buscar, tareas))
+
+    compilador = Compilador()
+    hallazgos = {}
+    for candidatos, _ in resultados:
+        for datos in candidatos:
+            hallazgo = confirmar(compilador, Bombeo.desde_dict(datos), umbral)
+            if hallazgo is not None:
+                hallazgos.setdefault(Bombeo.desde_dict(hallazgo).clave(), hallazgo)
+    return list(hallazgos.values()), max((peor for _, peor in resultados), default=0.0)
+
+
+# ===================== CARPETA =====================
+
+def guardar(carpeta, hallazgo):
+    """Guarda un hallazgo como <carpeta>/lento-<clave>.json (o falla-, colgado-); retorna la ruta"""
+    os.makedirs(carpeta, exist_ok=True)
+    prefijo = hallazgo.get('problema') or 'lento'
+    ruta = os.path.join(carpeta, f"{prefijo}-{Bombeo.desde_dict(hallazgo).clave()}.json")
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(hallazgo, f, ensure_ascii=False, indent=1)
+        f.write('\n')
+    return ruta
+
+
+def leer_carpeta(carpeta):
+    """Pares (archivo, hallazgo) guardados, ordenados por nombre"""
+    if not os.path.isdir(carpeta):
+        return []
+    guardados = []
+    for archivo in sorted(os.listdir(carpeta)):
+        if archivo.endswith('.json'):
+            with open(os.path.join(carpeta, archivo), encoding='utf-8') as f:
+                guardados.append((archivo, json.load(f)))
+    return guardados
+
+
+def verificar(carpeta, umbral=UMBRAL):
+    """Vuelve a medir lo guardado; retorna [(archivo, exponente, problema)] de lo que sigue mal"""
+    from parser import Compilador
+
+    compilador = Compilador()
+    malos = []
+    for archivo, hallazgo in leer_carpeta(carpeta):
+        tamanos = tuple(hallazgo.get('tamanos', TAMANOS))
+        valor, _, problema = exponente(compilador, Bombeo.desde_dict(hallazgo), tamanos, repeticiones=5)
+        print(f"{archivo:<34}{valor:>7.2f}  {problema or ''}")
+        if valor > umbral or problema:
+            malos.append((archivo, valor, problema))
+    return malos
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description="Fuzzer de rendimiento del compilador")
+    argumentos.add_argument('accion', choices=['buscar', 'verificar'])
+    argumentos.add_argument('--carpeta', default=CARPETA_FUZZ, help="Donde se guardan los hallazgos")
+    argumentos.add_argument('--corpus', default=CARPETA_CORPUS, help="Programas .cos que sirven de base")
+    argumentos.add_argument('--iteraciones', type=int, default=500)
+    argumentos.add_argument('--trabajadores', type=int, default=None)
+    argumentos.add_argument('--semilla', type=int, default=None)
+    argumentos.add_argument('--umbral', type=float, default=UMBRAL)
+    opciones = argumentos.parse_args()
+
+    if opciones.accion == 'verificar':
+        malos = verificar(opciones.carpeta, opciones.umbral)
+        print(f"{len(malos)} entradas siguen mal" if malos else "Todo lineal")
+        sys.exit(1 if malos else 0)
+
+    semilla = opciones.semilla if opciones.semilla is not None else random.randrange(1 << 30)
+    bases = [codigo for _, codigo in leer_corpus(opciones.corpus)] if os.path.isdir(opciones.corpus) else []
+    inicio = time.perf_counter()
+    hallazgos, peor = buscar(opciones.iteraciones, opciones.trabajadores, semilla, bases, opciones.umbral)
+    print(f"{opciones.iteraciones} entradas (semilla {semilla}) en {time.perf_counter() - inicio:.1f} s, "
+          f"peor exponente {peor:.2f}")
+    for hallazgo in hallazgos:
+        ruta = guardar(opciones.carpeta, hallazgo)
+        detalle = hallazgo['problema'] or f"exponente {hallazgo['exponente']}, {hallazgo['us_por_byte']} µs/byte"
+        print(f"{ruta}: {detalle} ({hallazgo['origen']})")
+    sys.exit(1 if hallazgos else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,365 @@
+"""Corpus dorado: graba lo que dice el compilador y compara implementaciones.
+
+Cada programa del corpus (los `.cos` escritos a mano en una carpeta más
+programas generados con una semilla fija) se analiza con
+`Compilador.analizar` y se guarda su huella: éxito, estadísticas y la lista
+de mensajes en orden (tipo, línea, texto). Después cualquier implementación
+nueva se compara contra ese archivo y se muestran las diferencias.
+
+La corrida es incremental: un caché guarda la huella de cada programa junto
+con el hash de su código y el de los módulos del compilador que se cargaron.
+Solo se vuelven a analizar los programas cuyo código o compilador cambió.
+Los que faltan se reparten entre procesos.
+
+Uso:
+    python golden.py grabar [--corpus corpus] [--generados N] [--semilla S]
+    python golden.py comparar [--corpus corpus] [--backend modulo:Clase] [--trabajadores N]
+"""
+import argparse
+import ast
+import difflib
+import hashlib
+import importlib
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from source import FuenteArchivo
+
+CARPETA_CORPUS = 'corpus'
+ARCHIVO_DORADO = 'golden.json'
+ARCHIVO_CACHE = '.golden_cache.json'
+BACKEND = 'parser:Compilador'
+
+
+# ===================== CORPUS =====================
+
+def leer_corpus(carpeta):
+    """Pares (nombre, código) de los .cos escritos a mano, ordenados por nombre"""
+    programas = []
+    for archivo in sorted(os.listdir(carpeta)):
+        if not archivo.endswith('.cos'):
+            continue
+        programas.append((archivo, FuenteArchivo(os.path.join(carpeta, archivo)).codigo))
+    return programas
+
+
+# Piezas para armar programas: válidas y con los errores típicos de los estudiantes
+TIPOS = ['Entero', 'Real', 'Texto']
+TIPOS_MAL = ['entero', 'real', 'texto', 'ENTERO', 'TeXto', 'Numero']
+
+
+def generar_expresion(azar, variables, profundidad=0):
+    """Expresión aleatoria con variables (declaradas o no), números, textos y capturas"""
+    opcion = azar.random()
+    if profundidad > 3 or opcion < 0.35:
+        hoja = azar.randrange(7)
+        if hoja == 0 and variables:
+            return azar.choice(variables)
+        if hoja == 1:
+            return str(azar.randrange(100))
+        if hoja == 2:
+            return f"{azar.randrange(10)},{azar.randrange(100)}"
+        if hoja == 3:
+            return f'"hola {azar.randrange(10)}"'
+        if hoja == 4:
+            return f"Captura.{azar.choice(TIPOS)}()"
+        if hoja == 5:
+            return f"fantasma{azar.randrange(3)}"
+        return azar.choice(variables) if variables else '1'
+    if opcion < 0.45:
+        return f"({generar_expresion(azar, variables, profundidad + 1)})"
+    if opcion < 0.5:
+        return f"-{generar_expresion(azar, variables, profundidad + 1)}"
+    operador = azar.choice('+-*/')
+    return (f"{generar_expresion(azar, variables, profundidad + 1)} {operador} "
+            f"{generar_expresion(azar, variables, profundidad + 1)}")
+
+
+def generar_sentencia(azar, variables):
+    """Una línea de programa; a veces con un error a propósito"""
+    opcion = azar.randrange(20)
+    if opcion < 4:
+        nombre = f"v{azar.randrange(12)}"
+        variables.append(nombre)
+        return f"{nombre} {azar.choice(TIPOS)};"
+    if opcion == 4:
+        return f"v{azar.randrange(12)} {azar.choice(TIPOS_MAL)};"
+    if opcion == 5:
+        return f"v{azar.randrange(12)} {azar.choice(TIPOS)}"
+    if opcion < 11:
+        destino = azar.choice(variables) if variables else 'v0'
+        return f"{destino} = {generar_expresion(azar, variables)};"
+    if opcion == 11:
+        # Identificador suelto: en una variable Texto sale el "ponle comillas"
+        destino = azar.choice(variables) if variables else 'v0'
+        return f"{destino} = palabra{azar.randrange(3)};"
+    if opcion == 12:
+        destino = azar.choice(variables) if variables else 'v0'
+        return f"{destino} = {generar_expresion(azar, variables)}"
+    if opcion < 16:
+        return f"Mensaje.Texto({generar_expresion(azar, variables)});"
+    return azar.choice([
+        "Mensaje.texto(v0);",
+        "Mensaje.Texto();",
+        "Mensaje.Texto(v1;",
+        "Mensaje.Imprimir(v2);",
+        "v3 = captura.Entero();",
+        "v4 = Captura.Entero;",
+        "v5 = Captura.Real(;",
+        "v6 = Captura.Texto(1);",
+        "v7 = v8();",
+        "v9 = 1 +;",
+        ";;",
+        "= v1;",
+        "1abc Entero;",
+        "v2 = @;",
+        "v10 = (3 + 4;",
+    ])
+
+
+def generar_programa(semilla, lineas=None):
+    """Programa aleatorio reproducible (solo depende de la semilla)"""
+    azar = random.Random(semilla)
+    variables = []
+    cantidad = lineas if lineas is not None else azar.randrange(3, 25)
+    return '\n'.join(generar_sentencia(azar, variables) for _ in range(cantidad)) + '\n'
+
+
+def generar_corpus(cantidad, semilla=0):
+    """Pares (nombre, código) generados; el programa i no depende de `cantidad`"""
+    return [(f"generado/{i:04d}", generar_programa(semilla * 1000003 + i)) for i in range(cantidad)]
+
+
+# ===================== HUELLAS =====================
+
+def huella(resultado):
+    """Lo que se compara de un análisis: éxito, estadísticas y mensajes en orden"""
+    return {
+        'exito': resultado['exito'],
+        'estadisticas': resultado['estadisticas'],
+        'mensajes': [[m.tipo, m.linea, m.mensaje] for m in resultado['mensajes']],
+    }
+
+
+def hash_texto(texto):
+    return hashlib.sha1(texto.encode('utf-8')).hexdigest()
+
+
+def cargar_backend(backend):
+    """Importa 'modulo:Clase' y retorna la clase"""
+    modulo, _, clase = backend.partition(':')
+    return getattr(importlib.import_module(modulo), clase or 'Compilador')
+
+
+def archivos_importados(ruta, raiz):
+    """Archivos .py de `raiz` que importa el de `ruta`, directa o indirectamente.
+
+    Se leen todos los import del archivo, también los que están dentro de
+    funciones: así el resultado no depende de lo que ya se haya cargado.
+    """
+    archivos = set()
+    pendientes = [os.path.abspath(ruta)]
+    while pendientes:
+        actual = pendientes.pop()
+        if actual in archivos:
+            continue
+        archivos.add(actual)
+        with open(actual, 'rb') as f:
+            arbol = ast.parse(f.read(), actual)
+        for nodo in ast.walk(arbol):
+            if isinstance(nodo, ast.Import):
+                nombres = [alias.name for alias in nodo.names]
+            elif isinstance(nodo, ast.ImportFrom) and nodo.module and not nodo.level:
+                nombres = [nodo.module]
+            else:
+                continue
+            for nombre in nombres:
+                base = os.path.join(raiz, *nombre.split('.'))
+                for candidato in (base + '.py', os.path.join(base, '__init__.py')):
+                    if os.path.isfile(candidato):
+                        pendientes.append(candidato)
+                        break
+    return archivos
+
+
+def version_backend(backend):
+    """Hash de los módulos del proyecto que usa el backend.
+
+    Si ninguno cambió, ningún programa ya analizado puede cambiar su huella.
+    """
+    cargar_backend(backend)
+    raiz = os.path.dirname(os.path.abspath(__file__))
+    digest = hashlib.sha1(backend.encode('utf-8'))
+    archivos = archivos_importados(sys.modules[backend.partition(':')[0]].__file__, raiz)
+    for ruta in sorted(archivos):
+        digest.update(os.path.relpath(ruta, raiz).encode('utf-8'))
+        with open(ruta, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+# ===================== TRABAJADORES =====================
+
+# Un compilador ya construido por proceso (construir las tablas de PLY es lo caro)
+_compilador = None
+
+
+def _preparar_trabajador(backend):
+    global _compilador
+    _compilador = cargar_backend(backend)()
+
+
+def _analizar(programa):
+    nombre, codigo = programa
+    return nombre, huella(_compilador.analizar(codigo))
+
+
+def analizar_todos(programas, backend=BACKEND, trabajadores=None):
+    """Huellas de los programas, repartidos en `trabajadores` procesos (1 = aquí)"""
+    trabajadores = trabajadores or os.cpu_count() or 1
+    if trabajadores == 1 or len(programas) < 2:
+        _preparar_trabajador(backend)
+        return dict(_analizar(p) for p in programas)
+
+    lote = max(1, len(programas) // (trabajadores * 4))
+    with ProcessPoolExecutor(trabajadores, initializer=_preparar_trabajador, initargs=(backend,)) as ejecutor:
+        return dict(ejecutor.map(_analizar, programas, chunksize=lote))
+
+
+# ===================== CACHÉ INCREMENTAL =====================
+
+def leer_json(ruta, defecto):
+    try:
+        with open(ruta, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return defecto
+
+
+def escribir_json(ruta, datos):
+    with open(ruta, 'w', encoding='utf-8') as f:
+        json.dump(datos, f, ensure_ascii=False, separators=(',', ':'))
+
+
+def escribir_dorado(ruta, generados, semilla, huellas):
+    """Archivo grabado con un programa por línea (diffs de git legibles)"""
+    with open(ruta, 'w', encoding='utf-8') as f:
+        f.write(f'{{"generados": {generados}, "semilla": {semilla}, "huellas": {{\n')
+        f.write(',\n'.join(
+            f'{json.dumps(nombre)}: {json.dumps(huellas[nombre], ensure_ascii=False, sort_keys=True)}'
+            for nombre in sorted(huellas)))
+        f.write('\n}}\n')
+
+
+def huellas_corpus(programas, backend=BACKEND, trabajadores=None, ruta_cache=None):
+    """Huella de cada programa; solo analiza los que no están en el caché.
+
+    Retorna (huellas, cantidad analizada).
+    """
+    version = version_backend(backend)
+    cache = leer_json(ruta_cache, {}) if ruta_cache else {}
+    entradas = cache.get(version, {})
+
+    huellas = {}
+    pendientes = []
+    for nombre, codigo in programas:
+        clave = hash_texto(codigo)
+        guardado = entradas.get(nombre)
+        if guardado is not None and guardado['hash'] == clave:
+            huellas[nombre] = guardado['huella']
+        else:
+            pendientes.append((nombre, codigo))
+
+    if pendientes:
+        nuevas = analizar_todos(pendientes, backend, trabajadores)
+        huellas.update(nuevas)
+
+    if ruta_cache and pendientes:
+        codigos = dict(programas)
+        # Solo se guarda la versión actual: las anteriores ya no sirven
+        escribir_json(ruta_cache, {version: {
+            nombre: {'hash': hash_texto(codigos[nombre]), 'huella': huellas[nombre]} for nombre in codigos
+        }})
+
+    return huellas, len(pendientes)
+
+
+# ===================== COMPARACIÓN =====================
+
+def lineas_huella(h):
+    """Huella como líneas de texto, para mostrar un diff legible"""
+    lineas = [f"exito: {h['exito']}", f"estadisticas: {json.dumps(h['estadisticas'], sort_keys=True)}"]
+    lineas.extend(f"{tipo} [{linea}] {mensaje}" for tipo, linea, mensaje in h['mensajes'])
+    return lineas
+
+
+def comparar(dorado, huellas):
+    """Diferencias {nombre: líneas de diff} entre lo grabado y lo obtenido"""
+    diferencias = {}
+    for nombre in sorted(set(dorado) | set(huellas)):
+        if nombre not in huellas:
+            diferencias[nombre] = ['(no está en el corpus actual)']
+        elif nombre not in dorado:
+            diferencias[nombre] = ['(no está grabado)']
+        elif dorado[nombre] != huellas[nombre]:
+            diferencias[nombre] = list(difflib.unified_diff(
+                lineas_huella(dorado[nombre]), lineas_huella(huellas[nombre]),
+                'grabado', 'obtenido', lineterm=''))
+    return diferencias
+
+
+def programas_corpus(carpeta, generados, semilla):
+    return leer_corpus(carpeta) + generar_corpus(generados, semilla)
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description="Corpus dorado de mensajes del compilador")
+    argumentos.add_argument('accion', choices=['grabar', 'comparar'])
+    argumentos.add_argument('--corpus', default=CARPETA_CORPUS, help="Carpeta con los .cos escritos a mano")
+    argumentos.add_argument('--dorado', default=None, help=f"Archivo grabado (por defecto <corpus>/{ARCHIVO_DORADO})")
+    argumentos.add_argument('--backend', default=BACKEND, help="Implementación a usar, 'modulo:Clase'")
+    argumentos.add_argument('--generados', type=int, default=None, help="Programas generados (por defecto los grabados)")
+    argumentos.add_argument('--semilla', type=int, default=None)
+    argumentos.add_argument('--trabajadores', type=int, default=None)
+    argumentos.add_argument('--sin-cache', action='store_true')
+    opciones = argumentos.parse_args()
+
+    ruta_dorado = opciones.dorado or os.path.join(opciones.corpus, ARCHIVO_DORADO)
+    ruta_cache = None if opciones.sin_cache else os.path.join(opciones.corpus, ARCHIVO_CACHE)
+    grabado = leer_json(ruta_dorado, {})
+
+    # Por defecto se usa el mismo corpus generado que se grabó
+    generados = opciones.generados if opciones.generados is not None else grabado.get('generados', 200)
+    semilla = opciones.semilla if opciones.semilla is not None else grabado.get('semilla', 0)
+    programas = programas_corpus(opciones.corpus, generados, semilla)
+
+    inicio = time.perf_counter()
+    huellas, analizados = huellas_corpus(programas, opciones.backend, opciones.trabajadores, ruta_cache)
+    segundos = time.perf_counter() - inicio
+    print(f"{len(programas)} programas, {analizados} analizados ({len(programas) - analizados} del caché) "
+          f"en {segundos:.2f} s")
+
+    if opciones.accion == 'grabar':
+        escribir_dorado(ruta_dorado, generados, semilla, huellas)
+        print(f"Grabado en {ruta_dorado}")
+        return
+
+    if 'huellas' not in grabado:
+        print(f"No hay nada grabado en {ruta_dorado}; corre primero 'python golden.py grabar'")
+        sys.exit(2)
+
+    diferencias = comparar(grabado['huellas'], huellas)
+    for nombre, lineas in diferencias.items():
+        print(f"\n=== {nombre}")
+        for linea in lineas:
+            print(linea)
+    print(f"\n{len(diferencias)} programas con diferencias" if diferencias else "Sin diferencias")
+    sys.exit(1 if diferencias else 0)
+
+
+if __name__ == '__main__':
+    main()
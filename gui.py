@@ -1,6 +1,9 @@
+import time
 import tkinter as tk
-from tkinter import scrolledtext
-import re
+from tkinter import filedialog, scrolledtext
+from highlight import ResaltadorIncremental
+from profiler import PerfilLineas
+from runtime import EntradaArchivo, ErrorEjecucion, Salida
 
 class CompiladorGUI:
     def __init__(self, root, compilador):
@@ -72,6 +75,15 @@ class CompiladorGUI:
                                       command=self.analizar_codigo)
         self.analizar_btn.pack(side=tk.RIGHT, padx=15, pady=5)
         
+        self.perfilar_btn = tk.Button(editor_header, text="⏱ Perfilar", 
+                                      font=('Arial', 12, 'bold'),
+                                      bg='#f39c12', fg='white', 
+                                      activebackground='#d68910',
+                                      relief=tk.RAISED, bd=3,
+                                      cursor='hand2',
+                                      command=self.perfilar_codigo)
+        self.perfilar_btn.pack(side=tk.RIGHT, pady=5)
+        
         # Área de ejemplos ARRIBA - MÁS VISIBLE
         self.crear_ejemplos(left_panel)
         
@@ -84,6 +96,91 @@ class CompiladorGUI:
                                                      padx=10, pady=10,
                                                      wrap=tk.WORD)
         self.codigo_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        self.configurar_resaltado()
+    
+    # ===================== RESALTADO DE SINTAXIS =====================
+    
+    # Colores de cada categoría de ResaltadorIncremental (fondo oscuro)
+    ESTILOS_RESALTADO = {
+        'tipo': {'foreground': '#5dade2', 'font': ('Consolas', 11, 'bold')},
+        'reservada': {'foreground': '#c39bd3', 'font': ('Consolas', 11, 'bold')},
+        'numero': {'foreground': '#f5b041'},
+        'cadena': {'foreground': '#58d68d'},
+        'operador': {'foreground': '#f7dc6f'},
+        'comentario': {'foreground': '#95a5a6', 'font': ('Consolas', 11, 'italic')},
+        'mal_escrita': {'underline': True, 'foreground': '#f1c40f'},
+        'error': {'underline': True, 'foreground': '#e74c3c'},
+    }
+    
+    def configurar_resaltado(self):
+        """Conecta el editor con el resaltador: solo se pinta lo que se ve"""
+        self.resaltador = ResaltadorIncremental()
+        self.pintado_pendiente = False
+        for categoria, estilo in self.ESTILOS_RESALTADO.items():
+            self.codigo_text.tag_config(categoria, **estilo)
+        
+        # El comando Tcl del editor pasa por despachar_edicion, que ve cada
+        # insert/delete con sus índices exactos (como hace el IDLE)
+        texto = self.codigo_text
+        self.comando_editor = texto._w + '_original'
+        texto.tk.call('rename', texto._w, self.comando_editor)
+        texto.tk.createcommand(texto._w, self.despachar_edicion)
+        
+        texto.bind('<Configure>', lambda evento: self.programar_pintado())
+        texto.configure(yscrollcommand=self.al_desplazar_codigo)
+    
+    def al_desplazar_codigo(self, *args):
+        """Mueve la barra y repinta las líneas que quedaron a la vista"""
+        self.codigo_text.vbar.set(*args)
+        self.programar_pintado()
+    
+    def despachar_edicion(self, operacion, *args):
+        """Ejecuta un comando del editor y pasa al resaltador las líneas que cambiaron"""
+        llamar = self.codigo_text.tk.call
+        original = self.comando_editor
+        if operacion not in ('insert', 'delete', 'replace'):
+            return llamar((original, operacion) + args)
+        
+        def linea(indice):
+            return int(str(llamar(original, 'index', indice)).split('.')[0]) - 1
+        
+        # Líneas tocadas (desde 0); 'end' cae en la línea vacía después de la última
+        ultima = linea('end-1c')
+        desde = min(linea(args[0]), ultima)
+        if operacion == 'insert':
+            hasta = desde
+        elif operacion == 'delete' and len(args) == 1:
+            hasta = min(linea(f'{args[0]}+1c'), ultima)
+        else:
+            hasta = max(min(linea(args[1]), ultima), desde)
+        
+        resultado = llamar((original, operacion) + args)
+        
+        cambio = linea('end-1c') - ultima
+        nuevas = str(llamar(original, 'get', f'{desde + 1}.0', f'{hasta + cambio + 1}.end')).split('\n')
+        self.resaltador.editar(desde, hasta + 1, nuevas)
+        self.programar_pintado()
+        return resultado
+    
+    def programar_pintado(self):
+        """Agrupa varios cambios seguidos en un solo pintado"""
+        if not self.pintado_pendiente:
+            self.pintado_pendiente = True
+            self.codigo_text.after_idle(self.pintar_visibles)
+    
+    def pintar_visibles(self):
+        """Vuelve a poner las etiquetas de color solo en las líneas visibles"""
+        self.pintado_pendiente = False
+        texto = self.codigo_text
+        primera = int(texto.index('@0,0').split('.')[0])
+        ultima = int(texto.index(f'@0,{texto.winfo_height()}').split('.')[0])
+        
+        for categoria in self.ESTILOS_RESALTADO:
+            texto.tag_remove(categoria, f'{primera}.0', f'{ultima}.end')
+        for i, tramos in self.resaltador.visibles(primera - 1, ultima - 1):
+            for inicio, fin, categoria in tramos:
+                texto.tag_add(categoria, f'{i + 1}.{inicio}', f'{i + 1}.{fin}')
     
     def crear_ejemplos(self, parent):
         """Crea el área de ejemplos con mejor visibilidad"""
@@ -137,6 +234,16 @@ altura = 1,75;  // ó 1.75 (ambos funcionan)"""
                 font=('Arial', 14, 'bold'),
                 bg='#e74c3c', fg='white').pack(side=tk.LEFT, padx=15, pady=10)
         
+        # Se habilita cuando hay un perfil que exportar
+        self.ultimo_perfil = None
+        self.exportar_btn = tk.Button(console_header, text="💾 Exportar perfil",
+                                      font=('Arial', 10, 'bold'),
+                                      bg='#c0392b', fg='white',
+                                      relief=tk.RAISED, bd=2,
+                                      state=tk.DISABLED,
+                                      command=self.exportar_perfil)
+        self.exportar_btn.pack(side=tk.RIGHT, padx=15, pady=5)
+        
         # Área de consola
         console_frame = tk.Frame(right_panel, bg='#1e1e1e')
         console_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
@@ -156,6 +263,8 @@ altura = 1,75;  // ó 1.75 (ambos funcionan)"""
         self.consola_text.tag_config('advertencia', foreground='#fbbf24', font=('Consolas', 10, 'bold'))
         self.consola_text.tag_config('linea', foreground='#60a5fa', font=('Consolas', 9))
         self.consola_text.tag_config('resumen', foreground='#c084fc', font=('Consolas', 11, 'bold'))
+        self.consola_text.tag_config('perfil', foreground='#fb923c', font=('Consolas', 10))
+        self.consola_text.tag_config('salida', foreground='#d4d4d4', font=('Consolas', 10))
     
     def analizar_codigo(self):
         """Ejecuta el análisis del código"""
@@ -165,21 +274,17 @@ altura = 1,75;  // ó 1.75 (ambos funcionan)"""
         self.consola_text.config(state=tk.NORMAL)
         self.consola_text.delete('1.0', tk.END)
         
-        # Validación previa: verificar si hay código (sin contar comentarios)
-        codigo_sin_comentarios = re.sub(r'//.*', '', codigo)
-        codigo_sin_comentarios = re.sub(r'/\*[\s\S]*?\*/', '', codigo_sin_comentarios)
-        codigo_limpio = codigo_sin_comentarios.strip()
+        # Analizar con el compilador (el lexer ya se salta los comentarios,
+        # así que un código sin nada más llega como 'vacio')
+        resultado = self.compilador.analizar(codigo)
         
-        if not codigo_limpio:
+        if resultado['vacio']:
             self.consola_text.insert(tk.END, "⚠️ ", 'advertencia')
-            self.consola_text.insert(tk.END, "¡Ombe! No hay nada que analizar, escribe algo apue.\n", 'advertencia')
+            self.consola_text.insert(tk.END, f"{resultado['mensajes'][0]['mensaje']}\n", 'advertencia')
             self.actualizar_estadisticas(0, 0)
             self.consola_text.config(state=tk.DISABLED)
             return
         
-        # Analizar con el compilador
-        resultado = self.compilador.analizar(codigo)
-        
         # Mostrar mensajes
         self.mostrar_mensajes(resultado['mensajes'])
         
@@ -189,10 +294,76 @@ altura = 1,75;  // ó 1.75 (ambos funcionan)"""
         
         self.consola_text.config(state=tk.DISABLED)
     
+    # ===================== PERFIL DE EJECUCIÓN =====================
+    
+    # Segundos antes de parar un programa que se está perfilando
+    PLAZO_PERFIL = 10
+    
+    def perfilar_codigo(self):
+        """Ejecuta el programa con el perfil por línea y muestra las líneas más lentas"""
+        codigo = self.codigo_text.get('1.0', tk.END)
+        programa = self.compilador.compilar(codigo)
+        if not programa.exito:
+            # Con errores se muestra lo mismo que al compilar
+            self.analizar_codigo()
+            return
+        
+        # Cada Captura lee una línea del archivo; sin archivo no hay entrada
+        ruta = filedialog.askopenfilename(title="Entrada para el programa (opcional)",
+                                          filetypes=[('Entrada', '*.in *.txt'), ('Todos', '*')])
+        entrada = EntradaArchivo(ruta) if ruta else None
+        
+        perfil = PerfilLineas()
+        salida = Salida()
+        error = None
+        try:
+            with perfil.midiendo(programa):
+                programa.ejecutar(entrada, salida, time.perf_counter() + self.PLAZO_PERFIL)
+        except ErrorEjecucion as e:
+            # Se muestra también lo que alcanzó a escribir
+            error = e
+        texto = salida.texto()
+        
+        self.consola_text.config(state=tk.NORMAL)
+        self.consola_text.delete('1.0', tk.END)
+        self.consola_text.insert(tk.END, texto, 'salida')
+        if error is not None:
+            self.consola_text.insert(tk.END, f"❌ {error}\n", 'error')
+        else:
+            self.consola_text.insert(tk.END, "✅ El programa terminó\n", 'exito')
+        
+        self.consola_text.insert(tk.END, f"\n{'='*50}\n", 'resumen')
+        self.consola_text.insert(tk.END, f"⏱ LÍNEAS MÁS LENTAS ({perfil.total * 1000:.2f} ms)\n", 'resumen')
+        self.consola_text.insert(tk.END, f"{'='*50}\n", 'resumen')
+        for linea in perfil.informe(codigo):
+            # '[Línea N]' con el color de siempre y el resto con el del perfil
+            marca, resto = linea.split('] ', 1)
+            self.consola_text.insert(tk.END, marca + '] ', 'linea')
+            self.consola_text.insert(tk.END, resto + '\n', 'perfil')
+        self.consola_text.config(state=tk.DISABLED)
+        
+        self.ultimo_perfil = (perfil, codigo)
+        self.exportar_btn.config(state=tk.NORMAL)
+    
+    def exportar_perfil(self):
+        """Guarda el último perfil como pilas colapsadas (para flamegraph.pl o speedscope)"""
+        if self.ultimo_perfil is None:
+            return
+        ruta = filedialog.asksaveasfilename(title="Exportar perfil", defaultextension='.txt',
+                                            filetypes=[('Pilas colapsadas', '*.txt'), ('Todos', '*')])
+        if not ruta:
+            return
+        perfil, codigo = self.ultimo_perfil
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            archivo.write(perfil.colapsado(codigo))
+    
     def mostrar_mensajes(self, mensajes):
         """Muestra los mensajes en la consola"""
         for msg in mensajes:
-            linea_text = f"[Línea {msg['linea']}] "
+            if msg.get('columna'):
+                linea_text = f"[Línea {msg['linea']}, Columna {msg['columna']}] "
+            else:
+                linea_text = f"[Línea {msg['linea']}] "
             self.consola_text.insert(tk.END, linea_text, 'linea')
             
             if msg['tipo'] == 'exito':
@@ -0,0 +1,198 @@
+import re
+from lexer import AnalizadorLexico
+
+
+# Categoría de resaltado de cada tipo de token del lexer
+CATEGORIAS = {
+    'TEXTO': 'tipo',
+    'ENTERO': 'tipo',
+    'REAL': 'tipo',
+    'LISTA': 'tipo',
+    'CAPTURA': 'reservada',
+    'MENSAJE': 'reservada',
+    'IMPORTAR': 'reservada',
+    'NUMERO_ENTERO': 'numero',
+    'NUMERO_REAL': 'numero',
+    'CADENA_TEXTO': 'cadena',
+    'IGUAL': 'operador',
+    'MAS': 'operador',
+    'MENOS': 'operador',
+    'POR': 'operador',
+    'DIVIDIDO': 'operador',
+}
+
+# Lo único que puede cambiar el estado entre líneas es un /* sin cerrar; las
+# cadenas se saltan para que un "/*" dentro de ellas no abra comentario
+PATRON_COMENTARIO = re.compile(r'"(?:[^\\\n]|\\.)*?"|//|/\*')
+
+
+def comentarios_linea(texto, en_comentario):
+    """Tramos de comentario de una línea y si termina dentro de un /* */.
+
+    Retorna ([(inicio, fin), ...], en_comentario_al_final).
+    """
+    tramos = []
+    posicion = 0
+    largo = len(texto)
+
+    if en_comentario:
+        fin = texto.find('*/')
+        if fin == -1:
+            return ([(0, largo)] if largo else []), True
+        tramos.append((0, fin + 2))
+        posicion = fin + 2
+
+    while True:
+        m = PATRON_COMENTARIO.search(texto, posicion)
+        if m is None:
+            return tramos, False
+        marca = m.group()
+        if marca == '//':
+            tramos.append((m.start(), largo))
+            return tramos, False
+        if marca == '/*':
+            fin = texto.find('*/', m.end())
+            if fin == -1:
+                tramos.append((m.start(), largo))
+                return tramos, True
+            tramos.append((m.start(), fin + 2))
+            posicion = fin + 2
+        else:
+            posicion = m.end()
+
+
+class ResaltadorIncremental:
+    """Resaltado de sintaxis por líneas, con el lexer real del compilador.
+
+    Cada línea guarda un punto de control: si empieza dentro de un
+    comentario /* */. Al editar se recalculan los puntos de control hasta
+    que vuelven a coincidir con los de antes (casi siempre en la misma
+    línea); si no coinciden pronto, el resto se recalcula cuando se pida.
+    Los tokens se sacan con AnalizadorLexico solo para las líneas que se
+    piden (las visibles) y se guardan hasta que la línea cambie.
+
+    A diferencia del compilador, un /* que nunca se cierra se muestra como
+    comentario hasta el final (el lexer lo toma como '/' y '*').
+    """
+
+    # Líneas que se recalculan al editar antes de dejar el resto para después
+    MAX_ANSIOSO = 200
+
+    def __init__(self, texto=''):
+        self.analizador = AnalizadorLexico()
+        self.analizador.construir()
+        self.cargar(texto)
+
+    def cargar(self, texto):
+        """Reemplaza todo el texto (no analiza nada todavía)"""
+        self.lineas = texto.split('\n')
+        # estados[i]: la línea i empieza dentro de un comentario (válido si i < validos)
+        self.estados = [False] * len(self.lineas)
+        self.validos = 1
+        self.tokens = [None] * len(self.lineas)
+
+    def __len__(self):
+        return len(self.lineas)
+
+    # ===================== PUNTOS DE CONTROL =====================
+
+    def salida(self, i):
+        """Si la línea i termina dentro de un comentario (su estado de entrada debe ser válido)"""
+        return comentarios_linea(self.lineas[i], self.estados[i])[1]
+
+    def asegurar_estados(self, hasta):
+        """Deja válidos los estados de las líneas 0..hasta"""
+        hasta = min(hasta, len(self.lineas) - 1)
+        for j in range(self.validos, hasta + 1):
+            nuevo = self.salida(j - 1)
+            if nuevo != self.estados[j]:
+                self.estados[j] = nuevo
+                self.tokens[j] = None
+        self.validos = max(self.validos, hasta + 1)
+
+    def editar(self, desde, hasta, nuevas):
+        """Reemplaza las líneas [desde, hasta) por `nuevas` (índices desde 0)"""
+        if not nuevas:
+            nuevas = ['']
+        entrada = self.estados[desde] if desde < len(self.estados) else False
+        validos_antes = self.validos
+        cambio = len(nuevas) - (hasta - desde)
+
+        self.lineas[desde:hasta] = nuevas
+        self.estados[desde:hasta] = [entrada] + [False] * (len(nuevas) - 1)
+        self.tokens[desde:hasta] = [None] * len(nuevas)
+
+        if validos_antes <= desde:
+            # La edición cae en la parte que todavía no se ha calculado
+            return
+
+        # Los estados viejos después del bloque editado siguen siendo válidos
+        # mientras el estado con que se llega a ellos no cambie
+        fin_bloque = desde + len(nuevas)
+        validos_viejos = validos_antes + cambio if validos_antes > hasta else fin_bloque
+
+        self.validos = desde + 1
+        j = desde + 1
+        while j < len(self.lineas):
+            nuevo = self.salida(j - 1)
+            if j >= fin_bloque and j < validos_viejos and nuevo == self.estados[j]:
+                self.validos = validos_viejos
+                return
+            if nuevo != self.estados[j]:
+                self.estados[j] = nuevo
+                self.tokens[j] = None
+            self.validos = j + 1
+            if j - desde >= self.MAX_ANSIOSO:
+                return
+            j += 1
+
+    # ===================== TOKENS =====================
+
+    def tokens_linea(self, i):
+        """Tramos (inicio, fin, categoría) de la línea i, en columnas desde 0"""
+        if i >= self.validos:
+            self.asegurar_estados(i)
+        tramos = self.tokens[i]
+        if tramos is None:
+            tramos = self.analizar_linea(self.lineas[i], self.estados[i])
+            self.tokens[i] = tramos
+        return tramos
+
+    def visibles(self, primera, ultima):
+        """(línea, tramos) de las líneas primera..ultima (desde 0), para pintar"""
+        ultima = min(ultima, len(self.lineas) - 1)
+        self.asegurar_estados(ultima)
+        return [(i, self.tokens_linea(i)) for i in range(primera, ultima + 1)]
+
+    def analizar_linea(self, texto, en_comentario):
+        """Corre el lexer sobre una línea con los comentarios tapados con espacios"""
+        comentarios, _ = comentarios_linea(texto, en_comentario)
+        tramos = [(inicio, fin, 'comentario') for inicio, fin in comentarios]
+        if comentarios:
+            partes = []
+            posicion = 0
+            for inicio, fin in comentarios:
+                partes.append(texto[posicion:inicio])
+                partes.append(' ' * (fin - inicio))
+                posicion = fin
+            partes.append(texto[posicion:])
+            texto = ''.join(partes)
+
+        if not texto.strip():
+            return tramos
+
+        analizador = self.analizador
+        analizador.errores.clear()
+        lexer = analizador.lexer
+        lexer.input(texto)
+        for tok in iter(lexer.token, None):
+            if tok.type == 'IDENTIFICADOR':
+                # Palabra reservada mal escrita (texto, ENTERO...): la marca el lexer
+                categoria = 'mal_escrita' if getattr(tok, 'canonica', None) else None
+            else:
+                categoria = CATEGORIAS.get(tok.type)
+            if categoria is not None:
+                tramos.append((tok.lexpos, AnalizadorLexico.fin_token(tok), categoria))
+        for error in analizador.errores:
+            tramos.append((error.posicion, error.fin, 'error'))
+        return tramos
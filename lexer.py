@@ -1,15 +1,40 @@
-import ply.lex as lex
+import threading
+from itertools import product
+from diagnostics import Codigo, Diagnostico
+
+
+def variantes_mayusculas(palabra):
+    """Todas las formas de escribir una palabra cambiando mayúsculas (texto, TEXTO, tExTo...)"""
+    opciones = [(letra.lower(), letra.upper()) for letra in palabra]
+    return {''.join(letras) for letras in product(*opciones)}
+
 
 class AnalizadorLexico:
     """Analizador léxico"""
     
+    # Lexer de PLY ya construido por clase: las expresiones regulares se
+    # compilan una vez por proceso y cada instancia usa un clon
+    _plantillas = {}
+    _candado = threading.Lock()
+    
     def __init__(self):
         self.errores = []
         self.lexer = None
         
     def construir(self):
-        """Construye el lexer de PLY"""
-        self.lexer = lex.lex(module=self)
+        """Construye el lexer de PLY (un clon de la plantilla de la clase)"""
+        clase = type(self)
+        plantilla = self._plantillas.get(clase)
+        if plantilla is None:
+            with self._candado:
+                plantilla = self._plantillas.get(clase)
+                if plantilla is None:
+                    # ply.lex trae inspect y re: se importa solo al construir
+                    import ply.lex as lex
+                    plantilla = lex.lex(module=self)
+                    self._plantillas[clase] = plantilla
+        # clone(self) enlaza las reglas t_ a los métodos de esta instancia
+        self.lexer = plantilla.clone(self)
         return self.lexer
     
     def reset(self):
@@ -29,12 +54,21 @@ class AnalizadorLexico:
             tokens.append(tok)
         return tokens
     
+    @staticmethod
+    def fin_token(tok):
+        """Posición donde termina un token (los que cambian su valor guardan `fin`)"""
+        fin = getattr(tok, 'fin', None)
+        if fin is not None:
+            return fin
+        return tok.lexpos + len(str(tok.value))
+    
     # ===================== DEFINICIÓN DE TOKENS =====================
     
     tokens = (
         'IGUAL', 'MAS', 'MENOS', 'POR', 'DIVIDIDO',
         'NUMERO_ENTERO', 'NUMERO_REAL', 'IDENTIFICADOR',
         'PARENTESIS_IZQ', 'PARENTESIS_DER',
+        'CORCHETE_IZQ', 'CORCHETE_DER',
         'PUNTO_Y_COMA', 'CADENA_TEXTO', 'PUNTO'
     )
     
@@ -44,11 +78,23 @@ class AnalizadorLexico:
         'Entero': 'ENTERO',
         'Real': 'REAL',
         'Captura': 'CAPTURA',
-        'Mensaje': 'MENSAJE'
+        'Mensaje': 'MENSAJE',
+        'Lista': 'LISTA',
+        'Importar': 'IMPORTAR'
     }
     
     tokens = tokens + tuple(reservadas.values())
     
+    # Tabla armada una sola vez: cada forma de escribir una palabra reservada
+    # -> (tipo de token, forma correcta). Las mal escritas quedan como
+    # IDENTIFICADOR y el token lleva `canonica` para que el parser no la recalcule
+    variantes = {}
+    for _palabra, _tipo in reservadas.items():
+        for _variante in variantes_mayusculas(_palabra):
+            variantes[_variante] = ('IDENTIFICADOR', _palabra)
+        variantes[_palabra] = (_tipo, _palabra)
+    del _palabra, _tipo, _variante
+    
     # ===================== TOKENS SIMPLES =====================
     
     t_IGUAL = r'='
@@ -58,6 +104,8 @@ class AnalizadorLexico:
     t_DIVIDIDO = r'/'
     t_PARENTESIS_IZQ = r'\('
     t_PARENTESIS_DER = r'\)'
+    t_CORCHETE_IZQ = r'\['
+    t_CORCHETE_DER = r'\]'
     t_PUNTO_Y_COMA = r';'
     t_PUNTO = r'\.'
     
@@ -69,73 +117,63 @@ class AnalizadorLexico:
     # IMPORTANTE: El orden importa - las funciones se evalúan antes que los strings
     
     def t_CARACTER_ESPECIAL_PEGADO_A_LETRA(self, t):
-        r'[$@#%&!?~`|\\^<>\[\]{}]+[a-zA-Z_][a-zA-Z0-9_]*'
-        self.errores.append({
-            'tipo': 'error',
-            'linea': t.lineno,
-            'mensaje': f"¡Eche tú que ve! Las variables no pueden empezar con simbolos especiales: '{t.value}'"
-        })
+        r'[$@#%&!?~`|\\^<>{}]+[a-zA-Z_][a-zA-Z0-9_]*'
+        self.errores.append(Diagnostico('error', t.lineno, Codigo.SIMBOLO_ESPECIAL, (t.value,),
+                                        t.lexpos, t.lexpos + len(t.value)))
         # NO retornar token - esto previene que se use como identificador válido
         t.lexer.skip(len(t.value))
     
     def t_NUMERO_PEGADO_A_LETRA(self, t):
         r'\d+[a-zA-Z_][a-zA-Z0-9_]*'
-        self.errores.append({
-            'tipo': 'error',
-            'linea': t.lineno,
-            'mensaje': f"¡Eche tú que ve! Las variables no pueden empezar con números: '{t.value}'"
-        })
+        self.errores.append(Diagnostico('error', t.lineno, Codigo.EMPIEZA_CON_NUMERO, (t.value,),
+                                        t.lexpos, t.lexpos + len(t.value)))
         # NO retornar token - esto previene que se use como identificador válido
         t.lexer.skip(len(t.value))
     
     def t_IDENTIFICADOR(self, t):
         r'[a-zA-Z_][a-zA-Z0-9_]*'
-        # Verificar si es palabra reservada
-        t.type = self.reservadas.get(t.value, 'IDENTIFICADOR')
+        # Verificar si es palabra reservada (o una mal escrita: texto, ENTERO, captura...)
+        entrada = self.variantes.get(t.value)
+        if entrada is None:
+            t.type = 'IDENTIFICADOR'
+        else:
+            t.type = entrada[0]
+            if t.type == 'IDENTIFICADOR':
+                t.canonica = entrada[1]
         return t
     
     def t_NUMERO_REAL(self, t):
         r'\d+[,.]\d+'
         # Normalizar: aceptar coma o punto
         t.value = float(t.value.replace(',', '.'))
+        t.fin = t.lexer.lexpos
         return t
     
     def t_NUMERO_ENTERO(self, t):
         r'\d+'
         t.value = int(t.value)
+        t.fin = t.lexer.lexpos
         return t
     
     def t_CADENA_TEXTO(self, t):
         r'\"([^\\\n]|(\\.))*?\"'
         # Remover comillas
         t.value = t.value[1:-1]
+        t.fin = t.lexer.lexpos
         return t
     
-    # ===================== COMENTARIOS =====================
-    
-    def t_COMENTARIO_SIMPLE(self, t):
-        r'//.*'
-        pass  # Ignorar comentarios
+    # ===================== COMENTARIOS Y LÍNEAS =====================
     
-    def t_COMENTARIO_MULTILINEA(self, t):
-        r'/\*[\s\S]*?\*/'
-        # Contar líneas en el comentario
+    def t_espacios_y_comentarios(self, t):
+        r'(?:[ \t\n]+|//.*|/\*[\s\S]*?\*/)+'
+        # Saltos de línea, espacios y comentarios seguidos salen en una sola
+        # coincidencia: un código con solo comentarios se recorre de una vez
         t.lexer.lineno += t.value.count('\n')
-        pass  # Ignorar comentarios
-    
-    # ===================== CONTROL DE LÍNEAS =====================
-    
-    def t_nueva_linea(self, t):
-        r'\n+'
-        t.lexer.lineno += len(t.value)
     
     # ===================== MANEJO DE ERRORES =====================
     
     def t_error(self, t):
         """Manejo de caracteres ilegales"""
-        self.errores.append({
-            'tipo': 'error',
-            'linea': t.lineno,
-            'mensaje': f"Carácter ilegal: '{t.value[0]}'"
-        })
+        self.errores.append(Diagnostico('error', t.lineno, Codigo.CARACTER_ILEGAL, (t.value[0],),
+                                        t.lexpos, t.lexpos + 1))
         t.lexer.skip(1)
\ No newline at end of file
@@ -0,0 +1,73 @@
+from time import perf_counter
+
+
+class LimiteExcedido(Exception):
+    """Se pasó uno de los límites del modo protegido"""
+
+    def __init__(self, limite, valor, maximo, linea=None):
+        super().__init__(f"límite '{limite}' excedido: {valor} > {maximo}")
+        self.limite = limite
+        self.valor = valor
+        self.maximo = maximo
+        self.linea = linea
+
+
+class Limites:
+    """Límites para compilar código que no es de confianza.
+
+    Cualquier límite en None queda desactivado.
+    """
+
+    # Cada cuántos tokens se revisa el reloj
+    REVISAR_RELOJ_CADA = 256
+
+    def __init__(self, max_caracteres=1_000_000, max_tokens=200_000, max_profundidad=200,
+                 max_mensajes=10_000, max_segundos=5.0):
+        self.max_caracteres = max_caracteres
+        self.max_tokens = max_tokens
+        self.max_profundidad = max_profundidad
+        self.max_mensajes = max_mensajes
+        self.max_segundos = max_segundos
+
+    def verificar_fuente(self, codigo):
+        """Revisa el tamaño del código antes de empezar"""
+        if self.max_caracteres is not None and len(codigo) > self.max_caracteres:
+            raise LimiteExcedido('caracteres', len(codigo), self.max_caracteres, '?')
+
+    def plazo(self):
+        """Instante (perf_counter) en que se acaba el tiempo, o None"""
+        if self.max_segundos is None:
+            return None
+        return perf_counter() + self.max_segundos
+
+    def verificar_plazo(self, plazo, linea=None):
+        """Revisa el reloj contra el plazo"""
+        if plazo is not None and perf_counter() > plazo:
+            raise LimiteExcedido('segundos', round(self.max_segundos + perf_counter() - plazo, 3),
+                                 self.max_segundos, linea)
+
+    def vigilar_tokens(self, lexer, contar_mensajes, plazo):
+        """Envuelve lexer.token() para contar tokens, mensajes y tiempo"""
+        max_tokens = self.max_tokens
+        max_mensajes = self.max_mensajes
+        cada = self.REVISAR_RELOJ_CADA
+        token = lexer.token
+        contados = 0
+
+        def siguiente():
+            nonlocal contados
+            tok = token()
+            if tok is None:
+                return None
+            contados += 1
+            if max_tokens is not None and contados > max_tokens:
+                raise LimiteExcedido('tokens', contados, max_tokens, tok.lineno)
+            if max_mensajes is not None:
+                mensajes = contar_mensajes()
+                if mensajes > max_mensajes:
+                    raise LimiteExcedido('mensajes', mensajes, max_mensajes, tok.lineno)
+            if contados % cada == 0:
+                self.verificar_plazo(plazo, tok.lineno)
+            return tok
+
+        return siguiente
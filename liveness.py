@@ -0,0 +1,106 @@
+from diagnostics import Codigo, Diagnostico
+
+
+class ResultadoVivacidad:
+    """Resultado del análisis de vivacidad sobre una lista de sentencias"""
+
+    def __init__(self):
+        self.no_usadas = []
+        self.almacenamientos_muertos = set()
+        self.mensajes_constantes = set()
+        self.advertencias = []
+
+
+class AnalizadorVivacidad:
+    """Análisis de vivacidad hacia atrás - Variables sin uso y asignaciones muertas"""
+
+    def analizar(self, sentencias, tabla_simbolos, exporta=False):
+        """Recorre las sentencias una sola vez de atrás pa' lante.
+
+        Con exporta=True (un módulo que otros importan) todas las variables
+        siguen vivas al final: las lee quien lo importa.
+        """
+        resultado = ResultadoVivacidad()
+        if not sentencias:
+            sentencias = []
+
+        # Cada variable tiene su posición (slot) dentro del conjunto de bits
+        slots = {nombre: i for i, nombre in enumerate(tabla_simbolos)}
+
+        vivas = (1 << len(slots)) - 1 if exporta else 0
+        leidas = vivas
+
+        for i in range(len(sentencias) - 1, -1, -1):
+            sentencia = sentencias[i]
+            clase = sentencia[0]
+
+            if clase == 'asignar':
+                bit = 1 << slots[sentencia[1]]
+                usos, tiene_captura = self.usos_expresion(sentencia[2], slots)
+                leidas |= usos
+
+                # La captura consume entrada, así que nunca es un almacenamiento muerto
+                if not vivas & bit and not tiene_captura:
+                    resultado.almacenamientos_muertos.add(i)
+                    resultado.advertencias.append(
+                        Diagnostico('advertencia', sentencia[3], Codigo.ASIGNACION_MUERTA, (sentencia[1],)))
+                    continue
+
+                vivas = (vivas & ~bit) | usos
+
+            elif clase == 'asignar_elemento':
+                # Un elemento no pisa el resto de la Lista: nunca es un almacenamiento muerto
+                usos_indice, _ = self.usos_expresion(sentencia[2], slots)
+                usos, _ = self.usos_expresion(sentencia[3], slots)
+                leidas |= usos | usos_indice
+                vivas |= usos | usos_indice
+
+            elif clase == 'mensaje_texto':
+                expresion = sentencia[1]
+                usos, tiene_captura = self.usos_expresion(expresion, slots)
+                leidas |= usos
+                vivas |= usos
+
+                es_error = isinstance(expresion, tuple) and expresion[0] == 'error'
+                if not usos and not tiene_captura and not es_error:
+                    resultado.mensajes_constantes.add(i)
+
+        # Variables declaradas que nadie lee (las importadas se declararon en su módulo)
+        for nombre, slot in slots.items():
+            if not leidas & (1 << slot) and 'modulo' not in tabla_simbolos[nombre]:
+                linea = tabla_simbolos[nombre]['linea']
+                resultado.no_usadas.append((nombre, linea))
+                resultado.advertencias.append(
+                    Diagnostico('advertencia', linea, Codigo.VARIABLE_SIN_USO, (nombre,)))
+
+        return resultado
+
+    def usos_expresion(self, expresion, slots):
+        """Retorna los bits de las variables leídas y si hay una captura"""
+        usos = 0
+        tiene_captura = False
+        pendientes = [expresion]
+
+        while pendientes:
+            nodo = pendientes.pop()
+            if not isinstance(nodo, tuple):
+                continue
+
+            if nodo[0] == 'variable':
+                slot = slots.get(nodo[1])
+                if slot is not None:
+                    usos |= 1 << slot
+            elif nodo[0] == 'operacion_binaria':
+                pendientes.append(nodo[2])
+                pendientes.append(nodo[3])
+            elif nodo[0] == 'negacion':
+                pendientes.append(nodo[1])
+            elif nodo[0] == 'elemento':
+                slot = slots.get(nodo[1])
+                if slot is not None:
+                    usos |= 1 << slot
+                pendientes.append(nodo[2])
+            elif nodo[0] == 'capturar':
+                tiene_captura = True
+
+        return usos, tiene_captura
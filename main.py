@@ -1,15 +1,26 @@
-import tkinter as tk
-from parser import Compilador
-from gui import CompiladorGUI
-    
-# Crear ventana principal
-root = tk.Tk()
-    
-# Crear instancia del compilador
-compilador = Compilador()
-    
-# Crear interfaz gráfica
-app = CompiladorGUI(root, compilador)
-    
-# Iniciar aplicación
-root.mainloop()
\ No newline at end of file
+"""Lanzador de la interfaz gráfica.
+
+tkinter y gui solo se importan aquí: el compilador (paquete costenol) no los necesita.
+"""
+
+
+def main():
+    import tkinter as tk
+    from gui import CompiladorGUI
+    from parser import Compilador
+
+    # Crear ventana principal
+    root = tk.Tk()
+
+    # Crear instancia del compilador
+    compilador = Compilador()
+
+    # Crear interfaz gráfica
+    app = CompiladorGUI(root, compilador)
+
+    # Iniciar aplicación
+    root.mainloop()
+
+
+if __name__ == '__main__':
+    main()
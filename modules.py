@@ -0,0 +1,415 @@
+"""Proyectos de varios archivos: módulos que se importan con `Importar nombre;`.
+
+Cada .cos de la carpeta del proyecto es un módulo y su nombre es el del
+archivo sin .cos. `Importar util;` trae al programa las variables de
+util.cos con su tipo (y su valor, si es constante); al ejecutar, util.cos
+corre primero y una sola vez, aunque lo importen varios.
+
+La interfaz de un módulo son todas las variables de su tabla de símbolos,
+las propias y las que importó. Así un nombre repetido en dos módulos se
+detecta al importarlos juntos, y al ejecutar todos comparten un solo
+espacio de variables.
+
+- Las importaciones de cada archivo se leen solo con el lexer.
+- Cada módulo se analiza en un pool de procesos apenas están las
+  interfaces de lo que importa: los que no dependen entre sí van en paralelo.
+- El caché (ARCHIVO_CACHE) guarda por módulo la firma del archivo (mtime
+  en ns y tamaño), el hash del código, sus importaciones, su interfaz y el
+  hash de la interfaz de cada módulo que importa. Un módulo se vuelve a
+  analizar si cambió su código o la interfaz de algo que importa: un cambio
+  que no toca la interfaz no hace revisar a quienes lo importan.
+- Sin cambios, construir el proyecto solo hace un stat por archivo.
+
+Uso: python modules.py carpeta [--trabajadores N] [--ejecutar MODULO [--especializado]]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from golden import hash_texto, leer_json, version_backend
+from source import FuenteArchivo
+
+ARCHIVO_CACHE = '.modulos.json'
+BACKEND = 'parser:Compilador'
+EXTENSION = '.cos'
+
+# Dependencia que no se puede importar porque vuelve al mismo módulo
+CICLO = 'ciclo'
+
+
+def resumen(resultado):
+    """Lo que se guarda en el caché de un análisis (los aciertos solo se cuentan)"""
+    return {
+        'exito': resultado['exito'],
+        'vacio': resultado['vacio'],
+        'estadisticas': resultado['estadisticas'],
+        'mensajes': [[m.tipo, m.linea, m.mensaje] for m in resultado['mensajes'] if m.tipo != 'exito'],
+    }
+
+
+def hash_interfaz(interfaz):
+    return hash_texto(json.dumps(interfaz, ensure_ascii=False, sort_keys=True))
+
+
+def componentes(grafo):
+    """Componente fuertemente conexa de cada módulo (Tarjan sin recursión).
+
+    Dos módulos en la misma componente se importan en círculo.
+    """
+    indice = {}
+    bajo = {}
+    pila = []
+    en_pila = set()
+    componente = {}
+    for inicio in grafo:
+        if inicio in indice:
+            continue
+        indice[inicio] = bajo[inicio] = len(indice)
+        pila.append(inicio)
+        en_pila.add(inicio)
+        recorrido = [(inicio, iter(grafo[inicio]))]
+        while recorrido:
+            nodo, vecinos = recorrido[-1]
+            for vecino in vecinos:
+                if vecino not in indice:
+                    indice[vecino] = bajo[vecino] = len(indice)
+                    pila.append(vecino)
+                    en_pila.add(vecino)
+                    recorrido.append((vecino, iter(grafo[vecino])))
+                    break
+                if vecino in en_pila:
+                    bajo[nodo] = min(bajo[nodo], indice[vecino])
+            else:
+                recorrido.pop()
+                if recorrido:
+                    padre = recorrido[-1][0]
+                    bajo[padre] = min(bajo[padre], bajo[nodo])
+                if bajo[nodo] == indice[nodo]:
+                    while True:
+                        miembro = pila.pop()
+                        en_pila.discard(miembro)
+                        componente[miembro] = nodo
+                        if miembro == nodo:
+                            break
+    return componente
+
+
+# ===================== IMPORTACIONES =====================
+
+# Lexer para leer las importaciones sin analizar (se construye al primer uso)
+_lexer = None
+
+
+def importaciones(codigo):
+    """Módulos que importa el código, en orden y sin repetir"""
+    global _lexer
+    if _lexer is None:
+        from lexer import AnalizadorLexico
+        _lexer = AnalizadorLexico()
+        _lexer.construir()
+    _lexer.reset()
+    modulos = []
+    anterior = None
+    for token in _lexer.tokenizar(codigo):
+        if anterior == 'IMPORTAR' and token.type == 'IDENTIFICADOR' and token.value not in modulos:
+            modulos.append(token.value)
+        anterior = token.type
+    return modulos
+
+
+# ===================== TRABAJADORES =====================
+
+# Un compilador ya construido por proceso (construir las tablas de PLY es lo caro)
+_compilador = None
+
+
+def _preparar_trabajador():
+    global _compilador
+    from parser import Compilador
+    _compilador = Compilador()
+
+
+def _compilar(trabajo):
+    clave, modulo, codigo, interfaces, exporta = trabajo
+    resultado = _compilador.analizar(codigo, interfaces=interfaces, exporta=exporta)
+    return clave, resumen(resultado), _compilador.semantico.interfaz(modulo)
+
+
+# ===================== ORDEN DE ANÁLISIS =====================
+
+def interfaces(modulos, hashes, nombre_modulo=str):
+    """Interfaces que se le pasan al análisis: None para las que cierran un círculo"""
+    return {nombre_modulo(d): None if h == CICLO else modulos[d]['interfaz'] for d, h in hashes.items()}
+
+
+def analizar_en_orden(modulos, codigos, leer, nombre_modulo=str, ejecutor=None):
+    """Analiza los módulos que no están al día, cada uno después de lo que importa.
+
+    `modulos` es {clave: datos} como en el caché de Proyecto: 'importa' trae
+    las claves de lo que importa, y un módulo sin 'interfaz' es uno cuyo
+    código cambió. Los demás se vuelven a analizar solo si cambió el hash de
+    la interfaz de algo que importan (o si apareció o desapareció). `codigos`
+    trae el código ya leído; `leer(clave)` lee el de los demás y
+    `nombre_modulo(clave)` es el nombre con que se importa. `ejecutor()`
+    retorna el pool donde se analiza, o None para analizar en este proceso.
+
+    Actualiza `modulos` y retorna las claves analizadas.
+    """
+    grafo = {clave: [d for d in datos['importa'] if d in modulos] for clave, datos in modulos.items()}
+    componente = componentes(grafo)
+    importados = {d for dependencias in grafo.values() for d in dependencias}
+
+    # Lo que le falta a cada módulo para poder analizarse (las dependencias en círculo no esperan)
+    faltan = {clave: {d for d in dependencias if componente[d] != componente[clave]}
+              for clave, dependencias in grafo.items()}
+    # Dependencias al revés: quién espera la interfaz de cada módulo
+    esperan = {clave: [] for clave in grafo}
+    for clave, dependencias in faltan.items():
+        for d in dependencias:
+            esperan[d].append(clave)
+
+    def terminar(clave):
+        """Marca el módulo como al día; retorna los que quedaron listos para analizarse"""
+        listos = []
+        for importador in esperan[clave]:
+            faltan[importador].discard(clave)
+            if not faltan[importador]:
+                listos.append(importador)
+        return listos
+
+    def guardar_resultado(trabajo, datos, interfaz):
+        clave, _, _, _, exporta = trabajo
+        modulo = modulos[clave]
+        modulo.update(datos)
+        modulo['exporta'] = exporta
+        modulo['dependencias'] = hashes[clave]
+        modulo['interfaz'] = interfaz
+        modulo['hash_interfaz'] = hash_interfaz(interfaz)
+        analizados.append(clave)
+        listos.extend(terminar(clave))
+
+    analizados = []
+    # Hash de la interfaz de cada dependencia con la que se analiza el módulo
+    hashes = {}
+    listos = deque(clave for clave, dependencias in faltan.items() if not dependencias)
+    en_curso = {}
+    while listos or en_curso:
+        while listos:
+            clave = listos.popleft()
+            hashes[clave] = {d: CICLO if componente[d] == componente[clave] else modulos[d]['hash_interfaz']
+                             for d in grafo[clave]}
+            datos = modulos[clave]
+            exporta = clave in importados
+            if 'interfaz' in datos and datos['exporta'] == exporta and datos['dependencias'] == hashes[clave]:
+                listos.extend(terminar(clave))
+                continue
+            codigo = codigos[clave] if clave in codigos else leer(clave)
+            trabajo = (clave, nombre_modulo(clave), codigo, interfaces(modulos, hashes[clave], nombre_modulo), exporta)
+            pool = ejecutor() if ejecutor is not None else None
+            if pool is None:
+                if _compilador is None:
+                    _preparar_trabajador()
+                guardar_resultado(trabajo, *_compilar(trabajo)[1:])
+            else:
+                en_curso[pool.submit(_compilar, trabajo)] = trabajo
+        if en_curso:
+            hechos, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for futuro in hechos:
+                guardar_resultado(en_curso.pop(futuro), *futuro.result()[1:])
+    return analizados
+
+
+# ===================== PROYECTO =====================
+
+class Proyecto:
+    """Carpeta de módulos .cos que se pone al día con construir()"""
+
+    def __init__(self, carpeta, trabajadores=1, ruta_cache=None):
+        self.carpeta = carpeta
+        self.trabajadores = trabajadores or os.cpu_count() or 1
+        self.ruta_cache = ruta_cache if ruta_cache is not None else os.path.join(carpeta, ARCHIVO_CACHE)
+        self.version = version_backend(BACKEND)
+        self.ejecutor = None
+
+        guardado = leer_json(self.ruta_cache, {})
+        # nombre -> {'firma', 'hash', 'importa', 'exporta', 'dependencias', 'interfaz',
+        #            'hash_interfaz', 'exito', 'vacio', 'estadisticas', 'mensajes'}
+        self.modulos = guardado.get('modulos', {}) if guardado.get('version') == self.version else {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
+
+    def cerrar(self):
+        if self.ejecutor is not None:
+            self.ejecutor.shutdown()
+            self.ejecutor = None
+
+    def ruta(self, nombre):
+        return os.path.join(self.carpeta, nombre + EXTENSION)
+
+    def escanear(self):
+        """{nombre: firma} de los .cos de la carpeta"""
+        encontrados = {}
+        with os.scandir(self.carpeta) as entradas:
+            for entrada in entradas:
+                if entrada.name.endswith(EXTENSION) and entrada.is_file():
+                    try:
+                        datos = entrada.stat()
+                    except OSError:
+                        continue
+                    encontrados[entrada.name[:-len(EXTENSION)]] = [datos.st_mtime_ns, datos.st_size]
+        return encontrados
+
+    # ===================== CONSTRUCCIÓN =====================
+
+    def construir(self):
+        """Analiza lo que cambió (o depende de una interfaz que cambió); retorna esos nombres"""
+        encontrados = self.escanear()
+        cambio = False
+
+        for nombre in [n for n in self.modulos if n not in encontrados]:
+            del self.modulos[nombre]
+            cambio = True
+
+        # Código de los archivos que hubo que leer (los demás se leen solo si se reanalizan)
+        codigos = {}
+        for nombre, firma in encontrados.items():
+            datos = self.modulos.get(nombre)
+            if datos is not None and datos['firma'] == firma:
+                continue
+            try:
+                codigo = FuenteArchivo(self.ruta(nombre)).codigo
+            except OSError:
+                continue
+            clave = hash_texto(codigo)
+            cambio = True
+            if datos is not None and datos['hash'] == clave:
+                datos['firma'] = firma
+                continue
+            codigos[nombre] = codigo
+            # Sin 'interfaz' el módulo queda marcado para analizar
+            self.modulos[nombre] = {'firma': firma, 'hash': clave, 'importa': importaciones(codigo)}
+
+        analizados = analizar_en_orden(self.modulos, codigos, lambda nombre: FuenteArchivo(self.ruta(nombre)).codigo,
+                                       ejecutor=self.pool)
+        if cambio or analizados:
+            self.guardar()
+        return analizados
+
+    def pool(self):
+        """Pool de procesos para analizar (se crea al primer uso), o None con un solo trabajador"""
+        if self.trabajadores == 1:
+            return None
+        if self.ejecutor is None:
+            self.ejecutor = ProcessPoolExecutor(self.trabajadores, initializer=_preparar_trabajador)
+        return self.ejecutor
+
+    def guardar(self):
+        """Escribe el caché (primero a un temporal, así nunca queda a medias)"""
+        temporal = self.ruta_cache + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.version, 'modulos': self.modulos}, f,
+                      ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+        os.replace(temporal, self.ruta_cache)
+
+    # ===================== ENLACE =====================
+
+    def orden(self, principal):
+        """Módulos que necesita `principal`, cada uno después de lo que importa (principal al final)"""
+        orden = []
+        vistos = {principal}
+        recorrido = [(principal, iter(self.modulos[principal]['importa']))]
+        while recorrido:
+            nombre, dependencias = recorrido[-1]
+            for d in dependencias:
+                if d in self.modulos and d not in vistos:
+                    vistos.add(d)
+                    recorrido.append((d, iter(self.modulos[d]['importa'])))
+                    break
+            else:
+                recorrido.pop()
+                orden.append(nombre)
+        return orden
+
+    def compilar(self, principal, especializado=False):
+        """Programa ejecutable con `principal` y todo lo que importa"""
+        from parser import Compilador
+        from runtime import Programa
+        from specialized import InterpreteEspecializado
+
+        self.construir()
+        if principal not in self.modulos:
+            raise KeyError(f"No existe el módulo '{principal}'")
+
+        compilador = Compilador(advertencias=False, modo_lote=True)
+        sentencias = []
+        tipos = {}
+        exito = True
+        for nombre in self.orden(principal):
+            datos = self.modulos[nombre]
+            resultado = compilador.analizar(FuenteArchivo(self.ruta(nombre)).codigo,
+                                            interfaces=interfaces(self.modulos, datos['dependencias']),
+                                            exporta=datos['exporta'])
+            exito = exito and resultado['exito']
+            sentencias.extend(resultado['resultado'] or [])
+            tipos.update((n, simbolo['tipo']) for n, simbolo in compilador.semantico.tabla_simbolos.items())
+        interprete = InterpreteEspecializado() if especializado else None
+        return Programa(sentencias, tipos, exito=exito, interprete=interprete)
+
+    def totales(self):
+        """Módulos, módulos sin errores y suma de aciertos y errores"""
+        totales = {'modulos': len(self.modulos), 'sin_errores': 0, 'aciertos': 0, 'errores': 0}
+        for datos in self.modulos.values():
+            totales['sin_errores'] += datos['exito']
+            totales['aciertos'] += datos['estadisticas']['aciertos']
+            totales['errores'] += datos['estadisticas']['errores']
+        return totales
+
+
+def mostrar(nombre, datos):
+    estadisticas = datos['estadisticas']
+    estado = 'vacío' if datos['vacio'] else ('ok' if datos['exito'] else 'errores')
+    print(f"[{estado}] {nombre}: {estadisticas['aciertos']} aciertos, {estadisticas['errores']} errores")
+    for tipo, linea, mensaje in datos['mensajes']:
+        print(f"    {tipo} [Línea {linea}] {mensaje}")
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description="Compila un proyecto de varios .cos que se importan")
+    argumentos.add_argument('carpeta')
+    argumentos.add_argument('--trabajadores', type=int, default=None)
+    argumentos.add_argument('--cache', default=None, help=f"Archivo del caché (por defecto <carpeta>/{ARCHIVO_CACHE})")
+    argumentos.add_argument('--ejecutar', metavar='MODULO', default=None,
+                            help="Ejecuta el módulo (con lo que importa) leyendo la entrada estándar")
+    argumentos.add_argument('--especializado', action='store_true')
+    opciones = argumentos.parse_args()
+
+    with Proyecto(opciones.carpeta, opciones.trabajadores, opciones.cache) as proyecto:
+        inicio = time.perf_counter()
+        analizados = proyecto.construir()
+        for nombre in sorted(analizados):
+            mostrar(nombre, proyecto.modulos[nombre])
+        totales = proyecto.totales()
+        print(f"{totales['modulos']} módulos ({totales['sin_errores']} sin errores), {len(analizados)} analizados "
+              f"en {time.perf_counter() - inicio:.2f} s", file=sys.stderr if opciones.ejecutar else sys.stdout)
+
+        if opciones.ejecutar:
+            from runtime import EntradaEstandar, ErrorEjecucion, Salida
+            salida = Salida(sys.stdout)
+            try:
+                proyecto.compilar(opciones.ejecutar, opciones.especializado).ejecutar(EntradaEstandar(), salida)
+            except ErrorEjecucion as e:
+                salida.vaciar()
+                print(e, file=sys.stderr)
+                sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
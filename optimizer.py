@@ -0,0 +1,386 @@
+import time
+from semantic import AnalizadorSemantico
+from expressions import FabricaExpresiones
+
+
+# ===================== RECORRIDO DE EXPRESIONES =====================
+
+def hijos(nodo):
+    """Retorna los hijos de un nodo de expresión"""
+    if nodo[0] == 'operacion_binaria':
+        return (nodo[2], nodo[3])
+    if nodo[0] == 'negacion':
+        return (nodo[1],)
+    if nodo[0] == 'elemento':
+        return (nodo[2],)
+    return ()
+
+
+def reescribir(expresion, funcion):
+    """Reescribe una expresión de abajo hacia arriba, sin recursión.
+
+    `funcion` recibe cada nodo con sus hijos ya reescritos. Los nodos
+    compartidos se reescriben una sola vez.
+    """
+    if not isinstance(expresion, tuple):
+        return expresion
+
+    # id(nodo) -> (nodo original, nodo reescrito); guardar el original evita reusar ids
+    hechos = {}
+    pila = [expresion]
+
+    while pila:
+        nodo = pila[-1]
+        if id(nodo) in hechos:
+            pila.pop()
+            continue
+
+        pendientes = [h for h in hijos(nodo) if id(h) not in hechos]
+        if pendientes:
+            pila.extend(pendientes)
+            continue
+
+        pila.pop()
+        if nodo[0] == 'operacion_binaria':
+            izq = hechos[id(nodo[2])][1]
+            der = hechos[id(nodo[3])][1]
+            if izq is not nodo[2] or der is not nodo[3]:
+                nodo_nuevo = ('operacion_binaria', nodo[1], izq, der)
+            else:
+                nodo_nuevo = nodo
+        elif nodo[0] == 'negacion':
+            hijo = hechos[id(nodo[1])][1]
+            nodo_nuevo = nodo if hijo is nodo[1] else ('negacion', hijo)
+        elif nodo[0] == 'elemento':
+            indice = hechos[id(nodo[2])][1]
+            nodo_nuevo = nodo if indice is nodo[2] else ('elemento', nodo[1], indice)
+        else:
+            nodo_nuevo = nodo
+
+        hechos[id(nodo)] = (nodo, funcion(nodo_nuevo))
+
+    return hechos[id(expresion)][1]
+
+
+def contar_nodos(expresion, unicos=False):
+    """Cuenta los nodos del árbol (o solo los nodos distintos si unicos=True)"""
+    if not isinstance(expresion, tuple):
+        return 0
+
+    tamanos = {}
+    pila = [expresion]
+
+    while pila:
+        nodo = pila[-1]
+        if id(nodo) in tamanos:
+            pila.pop()
+            continue
+
+        pendientes = [h for h in hijos(nodo) if id(h) not in tamanos]
+        if pendientes:
+            pila.extend(pendientes)
+            continue
+
+        pila.pop()
+        if unicos:
+            tamanos[id(nodo)] = (nodo, 1)
+        else:
+            tamanos[id(nodo)] = (nodo, 1 + sum(tamanos[id(h)][1] for h in hijos(nodo)))
+
+    if unicos:
+        return len(tamanos)
+    return tamanos[id(expresion)][1]
+
+
+def tipo_estatico(expresion, tipos, cache):
+    """Tipo de una expresión ya validada (None si no es numérica ni texto)"""
+    pila = [expresion]
+
+    while pila:
+        nodo = pila[-1]
+        if id(nodo) in cache:
+            pila.pop()
+            continue
+
+        pendientes = [h for h in hijos(nodo) if id(h) not in cache]
+        if pendientes:
+            pila.extend(pendientes)
+            continue
+
+        pila.pop()
+        clase = nodo[0]
+        if clase == 'numero':
+            tipo = 'Entero' if isinstance(nodo[1], int) else 'Real'
+        elif clase == 'cadena':
+            tipo = 'Texto'
+        elif clase == 'variable':
+            tipo = tipos.get(nodo[1])
+        elif clase == 'capturar':
+            tipo = nodo[1]
+        elif clase == 'elemento':
+            tipo = AnalizadorSemantico.tipo_elemento(tipos.get(nodo[1]))
+        elif clase == 'negacion':
+            tipo = cache[id(nodo[1])][1]
+        elif clase == 'operacion_binaria':
+            tipo_izq = cache[id(nodo[2])][1]
+            tipo_der = cache[id(nodo[3])][1]
+            if tipo_izq == 'Texto' and tipo_der == 'Texto' and nodo[1] == '+':
+                tipo = 'Texto'
+            elif tipo_izq == 'Entero' and tipo_der == 'Entero':
+                tipo = 'Entero'
+            elif tipo_izq in ['Entero', 'Real'] and tipo_der in ['Entero', 'Real']:
+                tipo = 'Real'
+            else:
+                tipo = None
+        else:
+            tipo = None
+
+        cache[id(nodo)] = (nodo, tipo)
+
+    return cache[id(expresion)][1]
+
+
+def plegar_nodo(nodo):
+    """Pliega un nodo cuyos hijos son constantes, respetando Entero/Real"""
+    clase = nodo[0]
+
+    if clase == 'operacion_binaria':
+        op, izq, der = nodo[1], nodo[2], nodo[3]
+
+        if izq[0] == 'cadena' and der[0] == 'cadena' and op == '+':
+            return ('cadena', izq[1] + der[1])
+
+        if izq[0] != 'numero' or der[0] != 'numero':
+            return nodo
+
+        valor = AnalizadorSemantico.operar(op, izq[1], der[1])
+        if valor is None:
+            # División por cero: se deja para que la reporte la ejecución
+            return nodo
+
+        if isinstance(izq[1], int) and isinstance(der[1], int):
+            # Entero con Entero debe seguir siendo Entero
+            if isinstance(valor, float):
+                if not valor.is_integer():
+                    return nodo
+                valor = int(valor)
+        else:
+            valor = float(valor)
+
+        return ('numero', valor)
+
+    if clase == 'negacion' and nodo[1][0] == 'numero':
+        return ('numero', -nodo[1][1])
+
+    return nodo
+
+
+def es_constante(nodo, valor):
+    """Verifica si un nodo es el número `valor` (sin importar si es Entero o Real)"""
+    return nodo[0] == 'numero' and nodo[1] == valor
+
+
+# ===================== PASADAS =====================
+
+class Pasada:
+    """Pasada base - Aplica `transformar` a la expresión de cada sentencia"""
+
+    nombre = 'pasada'
+
+    def ejecutar(self, sentencias, tipos):
+        """Ejecuta la pasada sobre la lista de sentencias"""
+        self.preparar(tipos)
+        nuevas = []
+        for sentencia in sentencias:
+            if sentencia[0] == 'asignar':
+                expresion = self.transformar(sentencia[2])
+                if expresion is not sentencia[2]:
+                    sentencia = (sentencia[0], sentencia[1], expresion) + sentencia[3:]
+            elif sentencia[0] == 'mensaje_texto':
+                expresion = self.transformar(sentencia[1])
+                if expresion is not sentencia[1]:
+                    sentencia = (sentencia[0], expresion) + sentencia[2:]
+            elif sentencia[0] == 'asignar_elemento':
+                indice = self.transformar(sentencia[2])
+                expresion = self.transformar(sentencia[3])
+                if indice is not sentencia[2] or expresion is not sentencia[3]:
+                    sentencia = (sentencia[0], sentencia[1], indice, expresion) + sentencia[4:]
+            nuevas.append(sentencia)
+        return nuevas
+
+    def preparar(self, tipos):
+        """Prepara el estado de la pasada antes de recorrer las sentencias"""
+        self.tipos = tipos
+
+    def transformar(self, expresion):
+        """Transforma una expresión"""
+        return expresion
+
+
+class PropagacionConstantes(Pasada):
+    """Reemplaza variables con valor constante conocido y pliega el resultado"""
+
+    nombre = 'propagacion'
+
+    def ejecutar(self, sentencias, tipos):
+        self.preparar(tipos)
+        constantes = {}
+
+        def sustituir(nodo):
+            if nodo[0] == 'variable' and nodo[1] in constantes:
+                return constantes[nodo[1]]
+            return plegar_nodo(nodo)
+
+        nuevas = []
+        for sentencia in sentencias:
+            if sentencia[0] == 'asignar':
+                var = sentencia[1]
+                expresion = reescribir(sentencia[2], sustituir)
+                if expresion[0] in ['numero', 'cadena']:
+                    constantes[var] = self.ajustar_tipo(expresion, tipos.get(var))
+                else:
+                    constantes.pop(var, None)
+                if expresion is not sentencia[2]:
+                    sentencia = (sentencia[0], var, expresion) + sentencia[3:]
+
+            elif sentencia[0] == 'mensaje_texto':
+                expresion = reescribir(sentencia[1], sustituir)
+                if expresion is not sentencia[1]:
+                    sentencia = (sentencia[0], expresion) + sentencia[2:]
+
+            elif sentencia[0] == 'asignar_elemento':
+                # Los elementos no se siguen como constantes: solo se reescriben sus expresiones
+                indice = reescribir(sentencia[2], sustituir)
+                expresion = reescribir(sentencia[3], sustituir)
+                if indice is not sentencia[2] or expresion is not sentencia[3]:
+                    sentencia = (sentencia[0], sentencia[1], indice, expresion) + sentencia[4:]
+
+            nuevas.append(sentencia)
+        return nuevas
+
+    def ajustar_tipo(self, constante, tipo):
+        """Un Entero guardado en una variable Real pasa a ser Real"""
+        if tipo == 'Real' and constante[0] == 'numero' and isinstance(constante[1], int):
+            return ('numero', float(constante[1]))
+        return constante
+
+
+class PlegadoConstantes(Pasada):
+    """Evalúa en compilación las operaciones entre constantes"""
+
+    nombre = 'plegado'
+
+    def transformar(self, expresion):
+        return reescribir(expresion, plegar_nodo)
+
+
+class SimplificacionAlgebraica(Pasada):
+    """Quita identidades (x*1, x+0, x-0, x/1) y convierte 0 - x en negación"""
+
+    nombre = 'simplificacion'
+
+    def preparar(self, tipos):
+        super().preparar(tipos)
+        self.cache_tipos = {}
+
+    def transformar(self, expresion):
+        return reescribir(expresion, self.simplificar)
+
+    def tipo(self, nodo):
+        return tipo_estatico(nodo, self.tipos, self.cache_tipos)
+
+    def simplificar(self, nodo):
+        clase = nodo[0]
+
+        if clase == 'negacion' and nodo[1][0] == 'negacion':
+            return nodo[1][1]
+
+        if clase != 'operacion_binaria':
+            return nodo
+
+        op, izq, der = nodo[1], nodo[2], nodo[3]
+        tipo = self.tipo(nodo)
+
+        # Solo se quita la identidad si el tipo del resultado no cambia
+        if op == '*':
+            if es_constante(der, 1) and self.tipo(izq) == tipo:
+                return izq
+            if es_constante(izq, 1) and self.tipo(der) == tipo:
+                return der
+        elif op == '+':
+            if es_constante(der, 0) and self.tipo(izq) == tipo:
+                return izq
+            if es_constante(izq, 0) and self.tipo(der) == tipo:
+                return der
+            if der[0] == 'negacion':
+                return ('operacion_binaria', '-', izq, der[1])
+        elif op == '-':
+            if es_constante(der, 0) and self.tipo(izq) == tipo:
+                return izq
+            if es_constante(izq, 0) and self.tipo(der) == tipo:
+                # El parser convierte -x en 0 - x
+                if der[0] == 'negacion':
+                    return der[1]
+                return ('negacion', der)
+            if der[0] == 'negacion':
+                return ('operacion_binaria', '+', izq, der[1])
+        elif op == '/':
+            if es_constante(der, 1) and self.tipo(izq) == tipo:
+                return izq
+
+        return nodo
+
+
+class EliminacionSubexpresiones(Pasada):
+    """Consolida subexpresiones repetidas en un solo nodo (hash-consing)"""
+
+    nombre = 'subexpresiones'
+
+    def preparar(self, tipos):
+        super().preparar(tipos)
+        self.nodos = FabricaExpresiones()
+
+    def transformar(self, expresion):
+        return reescribir(expresion, self.nodos.internar)
+
+
+# ===================== GESTOR DE PASADAS =====================
+
+class GestorPasadas:
+    """Gestor de pasadas de optimización - Cronometradas y activables"""
+
+    def __init__(self, pasadas=None):
+        if pasadas is None:
+            pasadas = [
+                PropagacionConstantes(),
+                SimplificacionAlgebraica(),
+                PlegadoConstantes(),
+                EliminacionSubexpresiones(),
+            ]
+        self.pasadas = pasadas
+        self.activas = {pasada.nombre: True for pasada in pasadas}
+        self.tiempos = {}
+
+    def habilitar(self, nombre, activa=True):
+        """Activa o desactiva una pasada por nombre"""
+        if nombre not in self.activas:
+            raise KeyError(f"No existe la pasada '{nombre}'")
+        self.activas[nombre] = activa
+
+    def deshabilitar(self, nombre):
+        """Desactiva una pasada por nombre"""
+        self.habilitar(nombre, False)
+
+    def optimizar(self, sentencias, tabla_simbolos):
+        """Corre las pasadas activas en orden y mide el tiempo de cada una"""
+        tipos = {nombre: datos['tipo'] for nombre, datos in tabla_simbolos.items()}
+        self.tiempos = {}
+
+        for pasada in self.pasadas:
+            if not self.activas[pasada.nombre]:
+                continue
+            inicio = time.perf_counter()
+            sentencias = pasada.ejecutar(sentencias, tipos)
+            self.tiempos[pasada.nombre] = time.perf_counter() - inicio
+
+        return sentencias
@@ -1,11 +1,37 @@
-import ply.yacc as yacc
+import copy
+import threading
 from lexer import AnalizadorLexico
 from semantic import AnalizadorSemantico
+from diagnostics import Codigo, Diagnostico
+from source import FuenteArchivo, IndiceLineas
+from limits import LimiteExcedido
+
+class DemasiadosErrores(Exception):
+    """Se alcanzó el máximo de errores permitidos, el análisis se corta"""
+    
+    def __init__(self, total, linea):
+        super().__init__(f"{total} errores (línea {linea})")
+        self.total = total
+        self.linea = linea
+
 
 class AnalizadorSintactico:
     """Parser sintáctico"""
     
-    def __init__(self, lexer, semantico):
+    # Parser de PLY ya construido por clase: las tablas LALR se calculan una
+    # vez por proceso y cada instancia enlaza sus propios métodos p_
+    _plantillas = {}
+    _candado = threading.Lock()
+    
+    # Clase de los tokens de PLY (se carga al construir, ver span)
+    LexToken = None
+    
+    # Tokens que se descartan como máximo buscando un ';' tras un error repetido
+    MAX_DESCARTES = 1000
+    
+    tipos_datos = frozenset(['Texto', 'Entero', 'Real'])
+    
+    def __init__(self, lexer, semantico, max_errores=None):
         self.lexer_obj = lexer
         self.semantico = semantico
         self.tokens = lexer.tokens
@@ -16,32 +42,115 @@ class AnalizadorSintactico:
         self.lineas_con_error = set()
         self.ultima_linea_completa = 0
         self.ultimo_error_linea = -1
+        
+        # Cuántos errores léxicos ya se marcaron en lineas_con_error
+        self.errores_lexicos_vistos = 0
+        
+        # Corte temprano: None = sin límite
+        self.max_errores = max_errores
+        
+        # Se llama después de cada sentencia (para ir entregando los mensajes)
+        self.al_terminar_sentencia = None
+        
+        # El código no tenía ningún token (vacío o solo comentarios)
+        self.sin_tokens = False
     
     def construir(self, debug=False):
-        """Construye el parser de PLY"""
-        self.parser = yacc.yacc(
-            module=self,
-            debug=debug,
-            write_tables=False
-        )
+        """Construye el parser de PLY.
+        
+        La primera instancia de la clase calcula las tablas (con un candado,
+        por si varios hilos construyen a la vez); las demás solo las enlazan.
+        Con debug=True se calcula todo de nuevo (PLY escribe parser.out).
+        """
+        # ply.yacc trae inspect: se importa solo al construir
+        import ply.lex as lex
+        import ply.yacc as yacc
+        AnalizadorSintactico.LexToken = lex.LexToken
+        
+        if debug:
+            self.parser = yacc.yacc(module=self, debug=True, write_tables=False)
+            return self.parser
+        
+        clase = type(self)
+        plantilla = self._plantillas.get(clase)
+        if plantilla is None:
+            with self._candado:
+                plantilla = self._plantillas.get(clase)
+                if plantilla is None:
+                    plantilla = yacc.yacc(module=self, debug=False, write_tables=False)
+                    self._plantillas[clase] = plantilla
+        self.parser = self.enlazar(plantilla)
         return self.parser
     
+    def enlazar(self, plantilla):
+        """Copia del parser de PLY que llama a los métodos de esta instancia.
+        
+        Las tablas (action, goto) se comparten; solo se copian las producciones,
+        que guardan el método p_ que ejecutan.
+        """
+        parser = copy.copy(plantilla)
+        parser.productions = [copy.copy(produccion) for produccion in plantilla.productions]
+        for produccion in parser.productions:
+            if produccion.func:
+                produccion.callable = getattr(self, produccion.func)
+        parser.errorfunc = self.p_error
+        return parser
+    
     def reset(self):
         """Limpia el estado del parser"""
         self.errores_sintacticos.clear()
         self.lineas_con_error.clear()
         self.ultima_linea_completa = 0
         self.ultimo_error_linea = -1
+        self.errores_lexicos_vistos = 0
+        self.sin_tokens = False
     
-    def agregar_error(self, linea, mensaje):
+    def agregar_error(self, linea, codigo, *args, span=None):
         """Agrega un error sintáctico"""
         if linea not in self.lineas_con_error:
-            self.errores_sintacticos.append({
-                'tipo': 'error',
-                'linea': linea,
-                'mensaje': mensaje
-            })
+            posicion, fin = span if span else (None, None)
+            self.errores_sintacticos.append(Diagnostico('error', linea, codigo, args, posicion, fin))
             self.lineas_con_error.add(linea)
+            self.verificar_max_errores(linea)
+    
+    def marcar_errores_lexicos(self):
+        """Marca las líneas de los errores léxicos nuevos (cada error se mira una sola vez)"""
+        errores = self.lexer_obj.errores
+        for i in range(self.errores_lexicos_vistos, len(errores)):
+            if isinstance(errores[i].linea, int):
+                self.lineas_con_error.add(errores[i].linea)
+        self.errores_lexicos_vistos = len(errores)
+    
+    def total_errores(self):
+        """Errores acumulados de las tres fases"""
+        return len(self.lexer_obj.errores) + len(self.errores_sintacticos) + self.semantico.errores
+    
+    def verificar_max_errores(self, linea):
+        """Corta el análisis si ya se llegó al máximo de errores"""
+        if self.max_errores is not None:
+            total = self.total_errores()
+            if total >= self.max_errores:
+                raise DemasiadosErrores(total, linea)
+    
+    @staticmethod
+    def palabra_mal_escrita(p, i):
+        """Forma correcta si el símbolo i es una palabra reservada mal escrita (la marca el lexer)"""
+        return getattr(p.slice[i], 'canonica', None)
+    
+    def span(self, p):
+        """Retorna (inicio, fin) de una producción o de un token suelto.
+        
+        Sin tracking=True solo los tokens traen posición, así que el fin es
+        el del último token de la producción.
+        """
+        if isinstance(p, self.LexToken):
+            return p.lexpos, self.lexer_obj.fin_token(p)
+        
+        inicio = p.lexpos(1)
+        for simbolo in reversed(p.slice[1:]):
+            if isinstance(simbolo, self.LexToken):
+                return inicio, self.lexer_obj.fin_token(simbolo)
+        return inicio, inicio
     
     # ===================== PRECEDENCIA DE OPERADORES =====================
     
@@ -61,9 +170,18 @@ class AnalizadorSintactico:
         '''lista_sentencias : lista_sentencias sentencia
                             | sentencia'''
         if len(p) == 3:
-            p[0] = p[1] + [p[2]] if p[2] is not None else p[1]
+            # Se agrega en la misma lista (copiarla en cada sentencia es cuadrático)
+            if p[2] is not None:
+                p[1].append(p[2])
+            p[0] = p[1]
         else:
             p[0] = [p[1]] if p[1] is not None else []
+        
+        # Los errores semánticos de la sentencia ya se reportaron
+        if self.max_errores is not None:
+            self.verificar_max_errores(self.semantico.linea_actual or p.lexer.lineno)
+        if self.al_terminar_sentencia is not None:
+            self.al_terminar_sentencia()
     
     # ===================== TIPOS =====================
     
@@ -75,15 +193,20 @@ class AnalizadorSintactico:
     
     def p_tipo_declaracion_minuscula(self, p):
         '''tipo : IDENTIFICADOR'''
-        if p[1].lower() in ['texto', 'entero', 'real']:
+        canonica = self.palabra_mal_escrita(p, 1)
+        if canonica in self.tipos_datos or canonica == 'Lista':
             linea = p.lineno(1)
-            self.agregar_error(linea, 
-                f"¡Ombe! '{p[1]}' debe escribirse con mayúscula inicial: '{p[1].capitalize()}'")
+            self.agregar_error(linea, Codigo.TIPO_MINUSCULA, p[1], canonica, span=self.span(p))
+            p[0] = None
+        elif getattr(p.stack[-1], 'canonica', None) == 'Importar':
+            # `importar util;` se lee como declarar 'importar' de tipo 'util'
+            anterior = p.stack[-1]
+            self.agregar_error(anterior.lineno, Codigo.TIPO_MINUSCULA, anterior.value, 'Importar',
+                               span=(anterior.lexpos, self.span(p)[1]))
             p[0] = None
         else:
             linea = p.lineno(1)
-            self.agregar_error(linea, 
-                f"¡Qué vaina! '{p[1]}' no es un tipo válido. Usa: Texto, Entero o Real")
+            self.agregar_error(linea, Codigo.TIPO_INVALIDO, p[1], span=self.span(p))
             p[0] = None
     
     def p_tipo_captura(self, p):
@@ -94,15 +217,14 @@ class AnalizadorSintactico:
     
     def p_tipo_captura_minuscula(self, p):
         '''tipo_captura : IDENTIFICADOR'''
-        if p[1].lower() in ['texto', 'entero', 'real']:
+        canonica = self.palabra_mal_escrita(p, 1)
+        if canonica in self.tipos_datos:
             linea = p.lineno(1)
-            self.agregar_error(linea, 
-                f"¡Ombe! '{p[1]}' debe escribirse con mayúscula inicial: '{p[1].capitalize()}'")
+            self.agregar_error(linea, Codigo.TIPO_MINUSCULA, p[1], canonica, span=self.span(p))
             p[0] = None
         else:
             linea = p.lineno(1)
-            self.agregar_error(linea, 
-                f"¡Qué vaina! 'Captura.{p[1]}()' no existe. Usa: Captura.Texto(), Captura.Entero() o Captura.Real()")
+            self.agregar_error(linea, Codigo.CAPTURA_INVALIDA, p[1], span=self.span(p))
             p[0] = None
     
     # ===================== DECLARACIONES =====================
@@ -116,9 +238,9 @@ class AnalizadorSintactico:
             p[0] = None
             return
         
-        if self.semantico.declarar_variable(var, tipo_var, linea):
+        if self.semantico.declarar_variable(var, tipo_var, linea, self.span(p)):
             self.ultima_linea_completa = linea
-            p[0] = ('declarar', var, tipo_var)
+            p[0] = ('declarar', var, tipo_var, linea)
         else:
             p[0] = None
 
@@ -138,8 +260,7 @@ class AnalizadorSintactico:
         # Construir el nombre completo con el operador
         nombre_completo = f"{operador}{var}"
         
-        self.agregar_error(linea, 
-            f"¡Eche tú que ve! Las variables no pueden empezar con simbolos especiales: '{nombre_completo}'")
+        self.agregar_error(linea, Codigo.SIMBOLO_ESPECIAL, nombre_completo, span=self.span(p))
         p[0] = None
     
     def p_sentencia_declaracion_sin_punto_coma(self, p):
@@ -148,8 +269,7 @@ class AnalizadorSintactico:
         linea = p.lineno(1)
         
         if linea not in self.lineas_con_error:
-            self.agregar_error(linea, 
-                f"¡Ey mi llave! Te faltó el punto y coma (;) después de '{var} {tipo_var}'")
+            self.agregar_error(linea, Codigo.FALTA_PUNTO_COMA_DECLARACION, var, tipo_var, span=self.span(p))
         
         p[0] = None
     
@@ -173,9 +293,9 @@ class AnalizadorSintactico:
                 p[0] = None
                 return
         
-        if self.semantico.asignar_variable(var, expr, linea):
+        if self.semantico.asignar_variable(var, expr, linea, self.span(p)):
             self.ultima_linea_completa = linea
-            p[0] = ('asignar', var, expr)
+            p[0] = ('asignar', var, expr, linea)
         else:
             p[0] = None
     
@@ -185,8 +305,107 @@ class AnalizadorSintactico:
         linea = p.lineno(1)
         
         if linea not in self.lineas_con_error:
-            self.agregar_error(linea, 
-                f"¡Ey mi llave! Te faltó el punto y coma (;) después de '{var} = ...'")
+            self.agregar_error(linea, Codigo.FALTA_PUNTO_COMA_ASIGNACION, var, span=self.span(p))
+        
+        p[0] = None
+    
+    # ===================== LISTAS =====================
+    
+    def p_sentencia_declaracion_lista(self, p):
+        'sentencia : IDENTIFICADOR LISTA tipo CORCHETE_IZQ NUMERO_ENTERO CORCHETE_DER PUNTO_Y_COMA'
+        var, tipo_elemento, tamano = p[1], p[3], p[5]
+        linea = p.lineno(1)
+        
+        if tipo_elemento is None:
+            p[0] = None
+            return
+        
+        if self.semantico.declarar_lista(var, tipo_elemento, tamano, linea, self.span(p)):
+            self.ultima_linea_completa = linea
+            p[0] = ('declarar_lista', var, tipo_elemento, tamano, linea)
+        else:
+            p[0] = None
+    
+    def p_sentencia_declaracion_lista_sin_tamano(self, p):
+        '''sentencia : IDENTIFICADOR LISTA tipo PUNTO_Y_COMA
+                     | IDENTIFICADOR LISTA tipo CORCHETE_IZQ CORCHETE_DER PUNTO_Y_COMA'''
+        if p[3] is not None:
+            self.agregar_error(p.lineno(1), Codigo.LISTA_SIN_TAMANO, p[1], p[3], span=self.span(p))
+        p[0] = None
+    
+    def p_sentencia_declaracion_lista_sin_tipo(self, p):
+        'sentencia : IDENTIFICADOR LISTA PUNTO_Y_COMA'
+        # Sin tipo ni tamaño: el ejemplo del mensaje lleva los dos
+        self.agregar_error(p.lineno(1), Codigo.LISTA_SIN_TAMANO, p[1], 'Entero', span=self.span(p))
+        p[0] = None
+    
+    def p_sentencia_declaracion_lista_sin_punto_coma(self, p):
+        'sentencia : IDENTIFICADOR LISTA tipo CORCHETE_IZQ NUMERO_ENTERO CORCHETE_DER error'
+        linea = p.lineno(1)
+        
+        if linea not in self.lineas_con_error:
+            self.agregar_error(linea, Codigo.FALTA_PUNTO_COMA_DECLARACION, p[1], f"Lista {p[3]}[{p[5]}]",
+                               span=self.span(p))
+        
+        p[0] = None
+    
+    def p_sentencia_asignacion_elemento(self, p):
+        'sentencia : IDENTIFICADOR CORCHETE_IZQ expresion CORCHETE_DER IGUAL expresion PUNTO_Y_COMA'
+        var, indice, expr = p[1], p[3], p[6]
+        linea = p.lineno(1)
+        
+        if self.semantico.variable_existe(var) and self.semantico.lista(var) is None:
+            self.agregar_error(linea, Codigo.NO_ES_LISTA, var, span=self.span(p))
+            p[0] = None
+            return
+        
+        # Igual que en p_sentencia_asignacion: los errores que ya se reportaron cortan aquí
+        for parte in (indice, expr):
+            if isinstance(parte, tuple) and parte[0] == 'error' and parte[1] != 'variable_no_definida':
+                p[0] = None
+                return
+        
+        indice = self.semantico.plegar_indice(indice)
+        if self.semantico.asignar_elemento(var, indice, expr, linea, self.span(p)):
+            self.ultima_linea_completa = linea
+            p[0] = ('asignar_elemento', var, indice, expr, linea)
+        else:
+            p[0] = None
+    
+    def p_sentencia_asignacion_elemento_sin_punto_coma(self, p):
+        'sentencia : IDENTIFICADOR CORCHETE_IZQ expresion CORCHETE_DER IGUAL expresion error'
+        linea = p.lineno(1)
+        
+        if linea not in self.lineas_con_error:
+            self.agregar_error(linea, Codigo.FALTA_PUNTO_COMA_ASIGNACION, f"{p[1]}[...]", span=self.span(p))
+        
+        p[0] = None
+    
+    # ===================== MÓDULOS =====================
+    
+    def p_sentencia_importar(self, p):
+        'sentencia : IMPORTAR IDENTIFICADOR PUNTO_Y_COMA'
+        modulo = p[2]
+        linea = p.lineno(1)
+        
+        if self.semantico.importar(modulo, linea, self.span(p)):
+            self.ultima_linea_completa = linea
+            p[0] = ('importar', modulo, linea)
+        else:
+            p[0] = None
+    
+    def p_sentencia_importar_con_comillas(self, p):
+        'sentencia : IMPORTAR CADENA_TEXTO PUNTO_Y_COMA'
+        modulo = p[2][:-len('.cos')] if p[2].endswith('.cos') else p[2]
+        self.agregar_error(p.lineno(1), Codigo.MODULO_CON_COMILLAS, modulo, span=self.span(p))
+        p[0] = None
+    
+    def p_sentencia_importar_sin_punto_coma(self, p):
+        'sentencia : IMPORTAR IDENTIFICADOR error'
+        linea = p.lineno(1)
+        
+        if linea not in self.lineas_con_error:
+            self.agregar_error(linea, Codigo.FALTA_PUNTO_COMA_DECLARACION, 'Importar', p[2], span=self.span(p))
         
         p[0] = None
     
@@ -198,29 +417,29 @@ class AnalizadorSintactico:
         linea = p.lineno(1)
         valor_texto = p[5]
         
-        self.semantico.validar_mensaje(valor_texto, linea)
+        self.semantico.validar_mensaje(valor_texto, linea, self.span(p))
         self.ultima_linea_completa = linea
-        p[0] = ('mensaje_texto', valor_texto)
+        p[0] = ('mensaje_texto', valor_texto, linea)
     
     def p_sentencia_mensaje_vacio(self, p):
         'sentencia : MENSAJE PUNTO TEXTO PARENTESIS_IZQ PARENTESIS_DER PUNTO_Y_COMA'
         linea = p.lineno(1)
-        self.agregar_error(linea, "¡Joa! Mensaje.Texto está vacío, ponle algo pues.")
+        self.agregar_error(linea, Codigo.MENSAJE_VACIO, span=self.span(p))
         p[0] = None
     
     def p_sentencia_mensaje_metodo_invalido(self, p):
         '''sentencia : MENSAJE PUNTO IDENTIFICADOR PARENTESIS_IZQ CADENA_TEXTO PARENTESIS_DER PUNTO_Y_COMA
                      | MENSAJE PUNTO IDENTIFICADOR PARENTESIS_IZQ expresion PARENTESIS_DER PUNTO_Y_COMA
-                     | MENSAJE PUNTO IDENTIFICADOR PARENTESIS_IZQ PARENTESIS_DER PUNTO_Y_COMA'''
+                     | MENSAJE PUNTO IDENTIFICADOR PARENTESIS_IZQ PARENTESIS_DER PUNTO_Y_COMA
+                     | MENSAJE PUNTO IDENTIFICADOR PARENTESIS_IZQ CADENA_TEXTO error
+                     | MENSAJE PUNTO IDENTIFICADOR PARENTESIS_IZQ expresion error'''
         linea = p.lineno(1)
         metodo = p[3]
         
-        if metodo.lower() == 'texto':
-            self.agregar_error(linea, 
-                f"¡Eche! Es 'Mensaje.Texto', con mayúscula inicial, no '{metodo}'.")
+        if self.palabra_mal_escrita(p, 3) == 'Texto':
+            self.agregar_error(linea, Codigo.MENSAJE_MINUSCULA, metodo, span=self.span(p))
         else:
-            self.agregar_error(linea, 
-                f"¡Qué vaina! 'Mensaje' no tiene un método llamado '{metodo}'.")
+            self.agregar_error(linea, Codigo.MENSAJE_METODO_INVALIDO, metodo, span=self.span(p))
         
         p[0] = None
     
@@ -230,8 +449,7 @@ class AnalizadorSintactico:
                      | MENSAJE PUNTO TEXTO PARENTESIS_IZQ CADENA_TEXTO error
                      | MENSAJE PUNTO TEXTO PARENTESIS_IZQ expresion error'''
         linea = p.lineno(1)
-        self.agregar_error(linea, 
-            "¡Ombe! Te faltó cerrar el paréntesis ')' en Mensaje.Texto()")
+        self.agregar_error(linea, Codigo.MENSAJE_SIN_CERRAR, span=self.span(p))
         p[0] = None
     
     # ===================== EXPRESIONES =====================
@@ -241,7 +459,7 @@ class AnalizadorSintactico:
                      | expresion MENOS expresion
                      | expresion POR expresion
                      | expresion DIVIDIDO expresion'''
-        p[0] = ('operacion_binaria', p[2], p[1], p[3])
+        p[0] = self.semantico.nodos.binaria(p[2], p[1], p[3])
     
     def p_expresion_grupo(self, p):
         'expresion : PARENTESIS_IZQ expresion PARENTESIS_DER'
@@ -250,7 +468,7 @@ class AnalizadorSintactico:
     def p_expresion_valor(self, p):
         '''expresion : NUMERO_ENTERO
                      | NUMERO_REAL'''
-        p[0] = ('numero', p[1])
+        p[0] = self.semantico.nodos.numero(p[1])
     
     def p_expresion_identificador(self, p):
         'expresion : IDENTIFICADOR'
@@ -259,29 +477,51 @@ class AnalizadorSintactico:
         if not self.semantico.variable_existe(var):
             p[0] = ('error', 'variable_no_definida', var)
         else:
-            p[0] = ('variable', var)
+            p[0] = self.semantico.nodos.variable(var)
     
     def p_expresion_cadena(self, p):
         'expresion : CADENA_TEXTO'
-        p[0] = ('cadena', p[1])
+        p[0] = self.semantico.nodos.cadena(p[1])
     
     def p_expresion_captura_vacia(self, p):
         'expresion : CAPTURA PUNTO tipo_captura PARENTESIS_IZQ PARENTESIS_DER'
         if p[3] is not None:
-            p[0] = ('capturar', p[3])
+            p[0] = self.semantico.nodos.capturar(p[3])
         else:
             p[0] = ('error', 'tipo_invalido')
     
     def p_expresion_captura_con_parametro(self, p):
         'expresion : CAPTURA PUNTO tipo_captura PARENTESIS_IZQ expresion PARENTESIS_DER'
         if p[3] is not None:
-            p[0] = ('capturar', p[3])
+            p[0] = self.semantico.nodos.capturar(p[3])
         else:
             p[0] = ('error', 'tipo_invalido')
     
+    def p_expresion_elemento(self, p):
+        'expresion : IDENTIFICADOR CORCHETE_IZQ expresion CORCHETE_DER'
+        var, indice = p[1], p[3]
+        
+        if not self.semantico.variable_existe(var):
+            p[0] = ('error', 'variable_no_definida', var)
+        elif self.semantico.lista(var) is None:
+            self.agregar_error(p.lineno(1), Codigo.NO_ES_LISTA, var, span=self.span(p))
+            p[0] = ('error', 'no_es_lista')
+        else:
+            p[0] = self.semantico.nodos.elemento(var, self.semantico.plegar_indice(indice))
+    
+    def p_expresion_largo(self, p):
+        'expresion : IDENTIFICADOR PUNTO IDENTIFICADOR PARENTESIS_IZQ PARENTESIS_DER'
+        simbolo = self.semantico.lista(p[1])
+        if simbolo is not None and p[3] == 'Largo':
+            # Las Listas tienen tamaño fijo: Largo() es una constante
+            p[0] = self.semantico.nodos.numero(simbolo['tamano'])
+        else:
+            self.metodo_invalido(p)
+    
     def p_expresion_unaria(self, p):
         'expresion : MENOS expresion %prec UMINUS'
-        p[0] = ('operacion_binaria', '-', ('numero', 0), p[2])
+        nodos = self.semantico.nodos
+        p[0] = nodos.binaria('-', nodos.numero(0), p[2])
     
     # ===================== ERRORES DE CAPTURA =====================
     
@@ -289,16 +529,14 @@ class AnalizadorSintactico:
         'expresion : CAPTURA PUNTO tipo_captura'
         linea = p.lineno(1)
         if p[3] is not None:
-            self.agregar_error(linea, 
-                f"¡Ombe! Te faltaron los paréntesis en Captura.{p[3]}()")
+            self.agregar_error(linea, Codigo.CAPTURA_SIN_PARENS, p[3], span=self.span(p))
         p[0] = ('error', 'falta_parens')
     
     def p_expresion_captura_paren_izq_sin_cerrar(self, p):
         'expresion : CAPTURA PUNTO tipo_captura PARENTESIS_IZQ error'
         linea = p.lineno(1)
         if p[3] is not None:
-            self.agregar_error(linea, 
-                f"¡Ombe! Falta cerrar el paréntesis ')' en Captura.{p[3]}()")
+            self.agregar_error(linea, Codigo.CAPTURA_SIN_CERRAR, p[3], span=self.span(p))
         p[0] = ('error', 'captura_sin_cerrar')
     
     def p_expresion_identificador_parens(self, p):
@@ -307,29 +545,33 @@ class AnalizadorSintactico:
         nombre = p[1]
         
         if nombre.startswith('Captura'):
-            self.agregar_error(linea, 
-                f"¡Eche! Creo que querías decir 'Captura.{nombre[7:]}()'. Te faltó el punto.")
+            self.agregar_error(linea, Codigo.CAPTURA_SIN_PUNTO, nombre[7:], span=self.span(p))
         else:
-            self.agregar_error(linea, 
-                f"¡Qué vaina! '{nombre}' no es una función, no le pongas paréntesis.")
+            self.agregar_error(linea, Codigo.NO_ES_FUNCION, nombre, span=self.span(p))
         
         p[0] = ('error', 'funcion_invalida')
     
     def p_expresion_metodo_malformado(self, p):
-        '''expresion : IDENTIFICADOR PUNTO IDENTIFICADOR PARENTESIS_IZQ PARENTESIS_DER
-                     | IDENTIFICADOR PUNTO IDENTIFICADOR PARENTESIS_IZQ expresion PARENTESIS_DER
+        '''expresion : IDENTIFICADOR PUNTO IDENTIFICADOR PARENTESIS_IZQ expresion PARENTESIS_DER
                      | IDENTIFICADOR PUNTO tipo_captura PARENTESIS_IZQ PARENTESIS_DER
-                     | IDENTIFICADOR PUNTO tipo_captura PARENTESIS_IZQ expresion PARENTESIS_DER'''
+                     | IDENTIFICADOR PUNTO tipo_captura PARENTESIS_IZQ expresion PARENTESIS_DER
+                     | IDENTIFICADOR PUNTO IDENTIFICADOR PARENTESIS_IZQ expresion error
+                     | IDENTIFICADOR PUNTO tipo_captura PARENTESIS_IZQ expresion error'''
+        self.metodo_invalido(p)
+    
+    def metodo_invalido(self, p):
+        """Reporta obj.metodo(...) cuando obj no tiene ese método"""
         linea = p.lineno(1)
         obj = p[1]
         metodo = p[3]
         
-        if obj.lower() == 'captura':
-            self.agregar_error(linea, 
-                f"¡Ombe! 'Captura' debe escribirse con mayúscula inicial: 'Captura.{metodo}()'")
+        if self.palabra_mal_escrita(p, 1) == 'Captura':
+            self.agregar_error(linea, Codigo.CAPTURA_MINUSCULA, metodo, span=self.span(p))
+        elif self.semantico.lista(obj) is not None:
+            llamada = f"{metodo}()" if len(p) == 6 else f"{metodo}(...)"
+            self.agregar_error(linea, Codigo.LISTA_METODO_INVALIDO, obj, llamada, span=self.span(p))
         else:
-            self.agregar_error(linea, 
-                f"¡Qué vaina! La variable '{obj}' no tiene métodos, no inventes.")
+            self.agregar_error(linea, Codigo.VARIABLE_SIN_METODOS, obj, span=self.span(p))
         
         p[0] = ('error', 'metodo_invalido')
     
@@ -342,7 +584,7 @@ class AnalizadorSintactico:
     def p_expresion_paren_sin_cerrar(self, p):
         'expresion : PARENTESIS_IZQ expresion error'
         linea = p.lineno(1)
-        self.agregar_error(linea, "¡Ombe! Falta cerrar el paréntesis ')' en la expresión")
+        self.agregar_error(linea, Codigo.PAREN_SIN_CERRAR, span=self.span(p))
         p[0] = ('error', 'paren_sin_cerrar')
     
     def p_expresion_error(self, p):
@@ -354,8 +596,7 @@ class AnalizadorSintactico:
         linea = p.lineno(1)
         
         if hasattr(self, 'ultima_linea_completa') and self.ultima_linea_completa == linea:
-            self.agregar_error(linea, 
-                "¡Ey! Tienes doble punto y coma (;;) en la misma línea, borra uno pues.")
+            self.agregar_error(linea, Codigo.DOBLE_PUNTO_COMA, span=self.span(p))
         
         p[0] = None
     
@@ -370,16 +611,17 @@ class AnalizadorSintactico:
         if p:
             linea = p.lineno
             
-            # Marcar errores léxicos primero
-            for error in self.lexer_obj.errores:
-                if 'linea' in error and isinstance(error['linea'], int):
-                    self.lineas_con_error.add(error['linea'])
+            # Marcar errores léxicos primero (solo los nuevos)
+            self.marcar_errores_lexicos()
+            if self.max_errores is not None:
+                self.verificar_max_errores(linea)
             
             # Evitar duplicados de la misma línea
             if linea == self.ultimo_error_linea:
                 # Ya reportamos error en esta línea, solo recuperar
-                # Intentar avanzar hasta punto y coma para sincronizar
-                while True:
+                # Intentar avanzar hasta punto y coma para sincronizar (con tope)
+                tok = None
+                for _ in range(self.MAX_DESCARTES):
                     tok = self.parser.token()
                     if not tok or tok.type == 'PUNTO_Y_COMA':
                         break
@@ -402,32 +644,32 @@ class AnalizadorSintactico:
             elif p.type in ['PARENTESIS_DER', 'PARENTESIS_IZQ']:
                 # Solo reportar si no hay error previo en esta línea
                 if linea not in self.lineas_con_error:
-                    self.agregar_error(linea, 
-                        "¡Ombe! Falta un paréntesis o está en el lugar equivocado")
+                    self.agregar_error(linea, Codigo.PARENTESIS_MAL_UBICADO, span=self.span(p))
                 # Dejar que PLY descarte el token
                 return None
             
             elif p.type in ['MAS', 'MENOS', 'POR', 'DIVIDIDO']:
                 # Solo reportar si no hay error previo en esta línea
                 if linea not in self.lineas_con_error:
-                    self.agregar_error(linea, 
-                        f"¡Qué vaina! El operador '{p.value}' no está bien colocado")
+                    self.agregar_error(linea, Codigo.OPERADOR_MAL_UBICADO, p.value, span=self.span(p))
                 # Dejar que PLY descarte el token (FIX para 1,75*+2)
                 return None
             
             else:
                 # Solo reportar si no hay error previo en esta línea
                 if linea not in self.lineas_con_error:
-                    self.agregar_error(linea, 
-                        f"¡Qué vaina! Error de sintaxis con '{p.value}' aquí")
+                    self.agregar_error(linea, Codigo.ERROR_SINTAXIS, p.value, span=self.span(p))
                 # Dejar que PLY descarte el token
                 return None
         
         else:
+            # Fin sin haber recibido ningún token: el lexer ya se saltó los
+            # comentarios y espacios, así que el código está vacío
+            if len(self.parser.symstack) == 1 and self.total_errores() == 0:
+                self.sin_tokens = True
             # EOF inesperado
-            if len(self.lineas_con_error) == 0:
-                self.agregar_error('?', 
-                    "¡Ombe! El archivo terminó de forma inesperada, seguro te faltó un punto y coma (;) al final.")
+            elif len(self.lineas_con_error) == 0:
+                self.agregar_error('?', Codigo.FIN_INESPERADO)
 
 
 # ===================== CLASE COMPILADOR PRINCIPAL =====================
@@ -435,84 +677,287 @@ class AnalizadorSintactico:
 class Compilador:
     """Compilador completo - Orquesta todas las fases"""
     
-    def __init__(self):
-        # Crear analizadores
+    # Código del mensaje para cada límite del modo protegido
+    CODIGOS_LIMITE = {
+        'caracteres': Codigo.LIMITE_CARACTERES,
+        'tokens': Codigo.LIMITE_TOKENS,
+        'profundidad': Codigo.LIMITE_PROFUNDIDAD,
+        'mensajes': Codigo.LIMITE_MENSAJES,
+        'segundos': Codigo.LIMITE_TIEMPO,
+    }
+    
+    def __init__(self, advertencias=True, modo_lote=False, max_errores=None, limites=None):
+        # Crear analizadores (PLY se construye en el primer análisis, ver construir)
         self.lexer = AnalizadorLexico()
-        self.lexer.construir()
         
-        self.semantico = AnalizadorSemantico()
+        # En modo lote los aciertos solo se cuentan (útil para corridas masivas)
+        self.semantico = AnalizadorSemantico(modo_lote=modo_lote)
+        
+        # Con max_errores el análisis se corta al llegar a ese número de errores
+        self.parser = AnalizadorSintactico(self.lexer, self.semantico, max_errores)
+        
+        # Análisis de vivacidad (variables sin uso y asignaciones muertas)
+        self.advertencias = advertencias
+        self._vivacidad = None
+        self.ultima_vivacidad = None
+        self.indice = None
+        
+        # Pasadas de optimización sobre las expresiones (ver optimizador)
+        self._optimizador = None
+        
+        # Modo protegido para código que no es de confianza (ver limits.Limites)
+        self.limites = limites
+        if limites is not None:
+            self.semantico.nodos.max_profundidad = limites.max_profundidad
+        
+        # Observador de mensajes: recibe cada Diagnostico apenas sale
+        self.observador = None
+        self.entregados = [0, 0, 0]
+    
+    @property
+    def vivacidad(self):
+        """Analizador de vivacidad; liveness.py se importa al primer uso"""
+        if self._vivacidad is None:
+            from liveness import AnalizadorVivacidad
+            self._vivacidad = AnalizadorVivacidad()
+        return self._vivacidad
+    
+    @property
+    def optimizador(self):
+        """Pasadas de optimización; optimizer.py se importa al primer uso"""
+        if self._optimizador is None:
+            from optimizer import GestorPasadas
+            self._optimizador = GestorPasadas()
+        return self._optimizador
+    
+    def construir(self):
+        """Construye el lexer y el parser de PLY si todavía no están.
         
-        self.parser = AnalizadorSintactico(self.lexer, self.semantico)
-        self.parser.construir(debug=False)
+        Lo hace el primer analizar(): crear un Compilador no cuesta nada y las
+        tablas se calculan una sola vez por proceso.
+        """
+        if self.parser.parser is None:
+            self.lexer.construir()
+            self.parser.construir(debug=False)
     
     def reset(self):
         """Limpia el estado de todos los analizadores"""
         self.lexer.reset()
         self.parser.reset()
         self.semantico.reset()
+        self.ultima_vivacidad = None
     
-    def analizar(self, codigo):
-        """Ejecuta análisis completo del código"""
+    def analizar(self, codigo, observador=None, interfaces=None, exporta=False):
+        """Ejecuta análisis completo del código.
+        
+        Si se pasa `observador`, se le entrega cada mensaje al terminar la
+        sentencia que lo produjo (antes del orden final por línea).
+        
+        `interfaces` son las de los módulos que el código puede importar
+        (ver modules.py). Con exporta=True el código es un módulo que otros
+        importan: sus variables se usan afuera, así que no se avisa que
+        nunca se leen.
+        """
+        self.construir()
         self.reset()
+        self.semantico.interfaces = interfaces if interfaces is not None else {}
+        
+        # Índice de líneas para calcular columnas (se arma solo si alguien las pide)
+        self.indice = IndiceLineas(codigo)
+        
+        self.observador = observador
+        self.entregados = [0, 0, 0]
+        self.parser.al_terminar_sentencia = self.entregar_nuevos if observador is not None else None
         
         try:
+            # En modo protegido se vigilan tamaño, tokens, mensajes y tiempo
+            tokenfunc = None
+            plazo = None
+            if self.limites is not None:
+                self.limites.verificar_fuente(codigo)
+                plazo = self.limites.plazo()
+                tokenfunc = self.limites.vigilar_tokens(self.lexer.lexer, self.contar_mensajes, plazo)
+            
             # Parse el código
             resultado = self.parser.parser.parse(
                 codigo,
                 lexer=self.lexer.lexer,
-                tracking=True
+                tracking=False,
+                tokenfunc=tokenfunc
             )
             
+            if self.parser.sin_tokens:
+                return self.resultado_vacio()
+            
             # Recolectar todos los mensajes
-            mensajes = []
-            mensajes.extend(self.lexer.errores)
-            mensajes.extend(self.parser.errores_sintacticos)
-            mensajes.extend(self.semantico.mensajes)
+            mensajes = self.recolectar_mensajes()
+            estadisticas = self.contar(mensajes)
             
-            # Ordenar por línea
-            mensajes.sort(key=lambda x: x['linea'] if isinstance(x['linea'], int) else 999999)
+            # Advertencias de vivacidad (solo si el programa quedó limpio)
+            if self.advertencias and resultado and estadisticas['errores'] == 0:
+                self.ultima_vivacidad = self.vivacidad.analizar(resultado, self.semantico.tabla_simbolos, exporta)
+                mensajes.extend(self.ultima_vivacidad.advertencias)
+            
+            if self.limites is not None:
+                self.limites.verificar_plazo(plazo, '?')
             
-            # Calcular estadísticas
-            aciertos = sum(1 for m in mensajes if m['tipo'] == 'exito')
-            errores = sum(1 for m in mensajes if m['tipo'] == 'error')
+            if self.observador is not None:
+                self.entregar_nuevos()
+                if self.ultima_vivacidad is not None:
+                    self.entregar(self.ultima_vivacidad.advertencias)
+            
+            # Ordenar por línea
+            mensajes.sort(key=self.clave_linea)
+            self.asignar_fuente(mensajes)
             
             return {
-                'exito': errores == 0,
+                'exito': estadisticas['errores'] == 0,
                 'resultado': resultado,
                 'mensajes': mensajes,
-                'estadisticas': {'aciertos': aciertos, 'errores': errores}
+                'estadisticas': estadisticas,
+                'vacio': False
             }
         
+        except DemasiadosErrores as e:
+            # Corte temprano: se devuelve lo que hay más un resumen al final
+            return self.resultado_cortado(Diagnostico('error', '?', Codigo.DEMASIADOS_ERRORES, (e.total, e.linea)))
+        
+        except LimiteExcedido as e:
+            linea = e.linea if e.linea is not None else self.lexer.lexer.lineno
+            return self.resultado_cortado(
+                Diagnostico('error', linea, self.CODIGOS_LIMITE[e.limite], (e.valor, e.maximo)))
+        
         except Exception as e:
-            # En caso de error fatal
-            mensajes = []
-            mensajes.extend(self.lexer.errores)
-            mensajes.extend(self.parser.errores_sintacticos)
-            mensajes.extend(self.semantico.mensajes)
-            
-            mensajes.sort(key=lambda x: x['linea'] if isinstance(x['linea'], int) else 999999)
-            
-            return {
-                'exito': False,
-                'resultado': None,
-                'mensajes': mensajes,
-                'estadisticas': {
-                    'aciertos': sum(1 for m in mensajes if m['tipo'] == 'exito'),
-                    'errores': sum(1 for m in mensajes if m['tipo'] == 'error')
-                }
-            }
+            # Falla interna (p. ej. RecursionError sin límites): se reporta en vez de esconderla
+            return self.resultado_cortado(
+                Diagnostico('error', self.lexer.lexer.lineno, Codigo.ERROR_INTERNO, (type(e).__name__,)))
     
-    def obtener_estadisticas(self):
-        """Retorna estadísticas de compilación"""
+    def analizar_archivo(self, ruta, observador=None):
+        """Carga un archivo (mapeado en memoria, UTF-8 o Latin-1) y lo analiza.
+        
+        El resultado trae además 'fuente', con la que se pasa de la posición
+        de un mensaje a su byte en el archivo.
+        """
+        fuente = FuenteArchivo(ruta)
+        resultado = self.analizar(fuente.codigo, observador)
+        resultado['fuente'] = fuente
+        return resultado
+    
+    def guardar_artefacto(self, codigo, ruta):
+        """Analiza el código y guarda el resultado en un artefacto binario.
+        
+        `Artefacto(ruta)` lo vuelve a abrir sin compilar (ver artifact.py).
+        Retorna el resultado del análisis.
+        """
+        from artifact import guardar_artefacto
+        resultado = self.analizar(codigo)
+        guardar_artefacto(ruta, resultado, self.semantico.tabla_simbolos, self.indice)
+        return resultado
+    
+    def resultado_cortado(self, resumen):
+        """Resultado de un análisis que no terminó: lo que hay más un mensaje al final"""
+        mensajes = self.recolectar_mensajes()
+        mensajes.sort(key=self.clave_linea)
+        mensajes.append(resumen)
+        self.asignar_fuente(mensajes)
+        
+        if self.observador is not None:
+            self.entregar_nuevos()
+            self.entregar([resumen])
+        
+        return {
+            'exito': False,
+            'resultado': None,
+            'mensajes': mensajes,
+            'estadisticas': self.contar(mensajes),
+            'vacio': False
+        }
+    
+    def resultado_vacio(self):
+        """Resultado de un código sin tokens (vacío o solo comentarios): un aviso y nada más"""
+        aviso = Diagnostico('advertencia', '?', Codigo.PROGRAMA_VACIO)
+        self.asignar_fuente([aviso])
+        if self.observador is not None:
+            self.entregar([aviso])
+        return {
+            'exito': False,
+            'resultado': None,
+            'mensajes': [aviso],
+            'estadisticas': {'aciertos': 0, 'errores': 0},
+            'vacio': True
+        }
+    
+    def entregar_nuevos(self):
+        """Pasa al observador los mensajes que salieron desde la última entrega"""
+        nuevos = []
+        for i, lista in enumerate([self.lexer.errores, self.parser.errores_sintacticos, self.semantico.mensajes]):
+            nuevos.extend(lista[self.entregados[i]:])
+            self.entregados[i] = len(lista)
+        nuevos.sort(key=self.clave_linea)
+        self.entregar(nuevos)
+    
+    def entregar(self, mensajes):
+        """Pasa mensajes al observador"""
+        for mensaje in mensajes:
+            mensaje.fuente = self.indice
+            self.observador(mensaje)
+    
+    def contar_mensajes(self):
+        """Mensajes producidos hasta ahora (incluye los aciertos omitidos en modo lote)"""
+        return (len(self.lexer.errores) + len(self.parser.errores_sintacticos)
+                + len(self.semantico.mensajes) + self.semantico.aciertos_omitidos)
+    
+    def recolectar_mensajes(self):
+        """Junta los mensajes de las tres fases"""
         mensajes = []
         mensajes.extend(self.lexer.errores)
         mensajes.extend(self.parser.errores_sintacticos)
         mensajes.extend(self.semantico.mensajes)
+        return mensajes
+    
+    def contar(self, mensajes):
+        """Cuenta aciertos y errores (incluye los aciertos omitidos en modo lote)"""
+        aciertos = self.semantico.aciertos_omitidos
+        errores = 0
+        for m in mensajes:
+            if m.tipo == 'exito':
+                aciertos += 1
+            elif m.tipo == 'error':
+                errores += 1
+        return {'aciertos': aciertos, 'errores': errores}
+    
+    def asignar_fuente(self, mensajes):
+        """Conecta los mensajes con el índice de líneas para que sepan su columna"""
+        for mensaje in mensajes:
+            mensaje.fuente = self.indice
+    
+    @staticmethod
+    def clave_linea(mensaje):
+        """Clave de orden: los mensajes sin línea ('?') van al final"""
+        return mensaje.linea if isinstance(mensaje.linea, int) else 999999
+    
+    def compilar(self, codigo, especializado=False):
+        """Analiza el código y retorna un Programa ejecutable (ver runtime.py).
         
-        return {
-            'aciertos': sum(1 for m in mensajes if m['tipo'] == 'exito'),
-            'errores': sum(1 for m in mensajes if m['tipo'] == 'error')
-        }
+        Con especializado=True el programa se ejecuta traducido a una función
+        de Python con las operaciones resueltas por tipo (ver specialized.py).
+        """
+        from runtime import Programa
+        from specialized import InterpreteEspecializado
+        resultado = self.analizar(codigo)
+        tipos = {nombre: simbolo['tipo'] for nombre, simbolo in self.semantico.tabla_simbolos.items()}
+        interprete = InterpreteEspecializado() if especializado else None
+        return Programa(resultado['resultado'] or [], tipos, resultado['mensajes'], resultado['exito'], interprete)
+    
+    def generar_codigo(self, sentencias, optimizar=True):
+        """Genera código Costeñol sin asignaciones muertas"""
+        from codegen import GeneradorCodigo
+        generador = GeneradorCodigo(self.semantico, self.optimizador if optimizar else None)
+        return generador.generar(sentencias)
+    
+    def obtener_estadisticas(self):
+        """Retorna estadísticas de compilación"""
+        return self.contar(self.recolectar_mensajes())
     
     @property
     def tabla_simbolos(self):
@@ -522,9 +967,8 @@ class Compilador:
     @property
     def mensajes_consola(self):
         """Acceso a los mensajes consolidados"""
-        mensajes = []
-        mensajes.extend(self.lexer.errores)
-        mensajes.extend(self.parser.errores_sintacticos)
-        mensajes.extend(self.semantico.mensajes)
-        mensajes.sort(key=lambda x: x['linea'] if isinstance(x['linea'], int) else 999999)
-        return mensajes
\ No newline at end of file
+        mensajes = self.recolectar_mensajes()
+        if self.ultima_vivacidad:
+            mensajes.extend(self.ultima_vivacidad.advertencias)
+        mensajes.sort(key=self.clave_linea)
+        return mensajes
@@ -0,0 +1,173 @@
+"""Perfil por línea de la ejecución: qué líneas del programa se llevan el tiempo.
+
+Dos modos:
+- exacto: el intérprete mide cada sentencia y llama a registrar() (veces
+  exactas; cuesta dos lecturas del reloj por sentencia).
+- muestreo: un hilo aparte mira cada `intervalo` segundos qué línea está
+  ejecutando el hilo del programa. El programa no se toca, así que casi no
+  cuesta, pero las líneas muy rápidas pueden no salir. El hilo solo puede
+  mirar cuando el programa suelta el GIL, y el código de
+  InterpreteEspecializado solo lo suelta en llamadas (Captura, Mensaje.Texto):
+  con ese motor las muestras se corren a la siguiente llamada, así que ahí
+  conviene el modo exacto.
+
+Sirve con Interprete y con InterpreteEspecializado. El informe se puede ver
+como texto (la GUI lo pinta en la consola) o exportar en formato de pilas
+colapsadas ("programa;línea 3: x = a * b 1200"), el que leen flamegraph.pl
+y speedscope.
+
+Uso: python profiler.py programa.cos [entrada.in] [--muestreo] [--colapsado archivo]
+"""
+import argparse
+import sys
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from time import perf_counter
+
+from runtime import EntradaArchivo, ErrorEjecucion, Interprete, Salida
+from specialized import LINEAS_FUENTE
+
+
+class PerfilLineas:
+    """Veces y tiempo acumulados por línea del programa (los números de línea del parser)"""
+
+    def __init__(self, muestreo=False, intervalo=0.001):
+        self.muestreo = muestreo
+        self.intervalo = intervalo
+        # linea -> veces que se ejecutó (exacto) o muestras que cayeron en ella (muestreo)
+        self.veces = defaultdict(int)
+        # linea -> segundos (en muestreo se estiman al pedir el informe)
+        self.tiempos = defaultdict(float)
+        # Tiempo total medido con midiendo()
+        self.total = 0.0
+
+    def registrar(self, linea, segundos):
+        """Lo llama el intérprete después de cada sentencia (modo exacto)"""
+        self.veces[linea] += 1
+        self.tiempos[linea] += segundos
+
+    @contextmanager
+    def midiendo(self, programa):
+        """Perfila todo lo que el programa ejecute dentro del bloque with"""
+        interprete = programa.interprete
+        parar = threading.Event()
+        hilo = None
+        if self.muestreo:
+            hilo = threading.Thread(target=self.muestrear, args=(threading.get_ident(), parar), daemon=True)
+            hilo.start()
+        else:
+            interprete.perfil = self
+
+        inicio = perf_counter()
+        try:
+            yield self
+        finally:
+            self.total += perf_counter() - inicio
+            if hilo is not None:
+                parar.set()
+                hilo.join()
+            else:
+                interprete.perfil = None
+
+    # ===================== MUESTREO =====================
+
+    def muestrear(self, hilo_programa, parar):
+        veces = self.veces
+        while not parar.wait(self.intervalo):
+            linea = self.linea_actual(sys._current_frames().get(hilo_programa))
+            if linea:
+                veces[linea] += 1
+
+    @staticmethod
+    def linea_actual(frame):
+        """Línea del programa que está ejecutando una pila de Python (0 si ninguna)"""
+        sentencia = Interprete.ejecutar_sentencia.__code__
+        while frame is not None:
+            codigo = frame.f_code
+            if codigo is sentencia:
+                return frame.f_locals['sentencia'][-1]
+            lineas = LINEAS_FUENTE.get(codigo)
+            if lineas is not None:
+                return lineas[frame.f_lineno - 1]
+            frame = frame.f_back
+        return 0
+
+    # ===================== INFORME =====================
+
+    def filas(self):
+        """[(línea, veces, segundos, porcentaje), ...] de la que más tardó a la que menos"""
+        if self.muestreo:
+            muestras = sum(self.veces.values())
+            tiempos = {linea: self.total * n / muestras for linea, n in self.veces.items()} if muestras else {}
+        else:
+            tiempos = self.tiempos
+        total = sum(tiempos.values())
+        filas = [(linea, self.veces[linea], segundos, 100 * segundos / total if total else 0.0)
+                 for linea, segundos in tiempos.items()]
+        filas.sort(key=lambda fila: (-fila[2], fila[0]))
+        return filas
+
+    def informe(self, codigo=None, limite=10):
+        """Líneas de texto con las `limite` líneas más lentas (con su código si se pasa)"""
+        fuente = codigo.splitlines() if codigo is not None else None
+        unidad = 'muestras' if self.muestreo else 'veces'
+        lineas = []
+        for linea, veces, segundos, porcentaje in self.filas()[:limite]:
+            texto = f"[Línea {linea}] {porcentaje:5.1f}%  {segundos * 1000:.3f} ms  {veces} {unidad}"
+            if fuente is not None and 0 < linea <= len(fuente):
+                texto += f"  {fuente[linea - 1].strip()}"
+            lineas.append(texto)
+        return lineas
+
+    def colapsado(self, codigo=None, raiz='programa'):
+        """Texto en formato de pilas colapsadas: una línea 'raiz;línea N: código peso'.
+
+        El peso son microsegundos (exacto) o muestras (muestreo).
+        """
+        fuente = codigo.splitlines() if codigo is not None else None
+        lineas = []
+        for linea, veces, segundos, _ in sorted(self.filas()):
+            marco = f"línea {linea}"
+            if fuente is not None and 0 < linea <= len(fuente):
+                # ';' separa los marcos en este formato
+                marco += ': ' + fuente[linea - 1].strip().replace(';', '')
+            peso = veces if self.muestreo else round(segundos * 1e6)
+            if peso:
+                lineas.append(f"{raiz};{marco} {peso}")
+        return '\n'.join(lineas) + '\n' if lineas else ''
+
+
+def main():
+    from parser import Compilador
+    from source import FuenteArchivo
+
+    argumentos = argparse.ArgumentParser(description="Perfil por línea de un programa Costeñol")
+    argumentos.add_argument('programa')
+    argumentos.add_argument('entrada', nargs='?', default=None, help="Archivo con una línea por Captura")
+    argumentos.add_argument('--muestreo', action='store_true', help="Perfil por muestreo (casi sin costo)")
+    argumentos.add_argument('--intervalo', type=float, default=0.001, help="Segundos entre muestras")
+    argumentos.add_argument('--especializado', action='store_true', help="Ejecutar con el código especializado")
+    argumentos.add_argument('--colapsado', default=None, help="Archivo para las pilas colapsadas (flamegraph)")
+    opciones = argumentos.parse_args()
+
+    codigo = FuenteArchivo(opciones.programa).codigo
+    programa = Compilador(advertencias=False).compilar(codigo, opciones.especializado)
+    perfil = PerfilLineas(opciones.muestreo, opciones.intervalo)
+    entrada = EntradaArchivo(opciones.entrada) if opciones.entrada else None
+    salida = Salida(sys.stdout)
+    try:
+        with perfil.midiendo(programa):
+            programa.ejecutar(entrada, salida)
+    except ErrorEjecucion as e:
+        salida.vaciar()
+        print(e, file=sys.stderr)
+
+    print('\n'.join(perfil.informe(codigo)), file=sys.stderr)
+    if opciones.colapsado:
+        with open(opciones.colapsado, 'w', encoding='utf-8') as archivo:
+            archivo.write(perfil.colapsado(codigo))
+
+
+if __name__ == '__main__':
+    main()
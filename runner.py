@@ -0,0 +1,306 @@
+"""Corre un programa Costeñol contra casos de prueba (calificación).
+
+Cada caso es un par `nombre.in` (lo que lee Captura) y `nombre.out` (lo que
+debe mostrar Mensaje.Texto). El programa se compila una sola vez y los
+casos se reparten entre procesos.
+
+Con --timeout (o --memoria) cada caso corre en un proceso vigilado: el
+plazo se revisa entre sentencias, y si una sola sentencia se pasa (un
+Entero que crece sin tope, por ejemplo) el proceso se mata al vencer el
+plazo más GRACIA, el caso queda como 'tiempo' y se arranca otro proceso.
+
+Uso: python runner.py programa.cos carpeta_casos [--trabajadores N] [--timeout S] [--memoria MB] [--json salida.json]
+"""
+import argparse
+import difflib
+import json
+import math
+import multiprocessing
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.connection import wait
+
+from parser import Compilador
+from source import FuenteArchivo
+from runtime import TIEMPO_AGOTADO, EntradaArchivo, ErrorEjecucion, Programa, Salida, TiempoAgotado
+
+# Segundos después del plazo antes de matar el proceso: así un caso que se
+# corta solo (entre sentencias) alcanza a entregar lo que ya mostró
+GRACIA = 0.25
+
+
+# ===================== CASOS =====================
+
+def buscar_casos(carpeta):
+    """Pares (nombre, ruta .in, ruta .out) ordenados por nombre"""
+    casos = []
+    for archivo in sorted(os.listdir(carpeta)):
+        nombre, extension = os.path.splitext(archivo)
+        if extension != '.in':
+            continue
+        esperado = os.path.join(carpeta, nombre + '.out')
+        casos.append((nombre, os.path.join(carpeta, archivo), esperado if os.path.exists(esperado) else None))
+    return casos
+
+
+def normalizar(texto):
+    """Líneas sin '\\r' ni espacios al final, sin líneas vacías al final"""
+    lineas = [linea.rstrip() for linea in texto.splitlines()]
+    while lineas and not lineas[-1]:
+        lineas.pop()
+    return lineas
+
+
+# ===================== TRABAJADORES =====================
+
+# El programa llega una vez por proceso (en el inicializador), no por caso
+_programa = None
+
+
+def _preparar_trabajador(programa):
+    global _programa
+    _programa = programa
+
+
+def _correr_caso(caso, timeout):
+    """Ejecuta un caso en el trabajador y lo compara con lo esperado"""
+    salida = Salida()
+    error = None
+    estado = 'ok'
+    inicio = time.perf_counter()
+    plazo = None if timeout is None else inicio + timeout
+    try:
+        entrada = EntradaArchivo(caso[1])
+        _programa.ejecutar(entrada, salida, plazo)
+    except TiempoAgotado as e:
+        estado, error = 'tiempo', str(e)
+    except ErrorEjecucion as e:
+        estado, error = 'error', str(e)
+    except (OSError, UnicodeDecodeError) as e:
+        estado, error = 'error', f"No se pudo leer la entrada: {e}"
+    except MemoryError:
+        estado, error = 'error', "¡Ombe! El programa se quedó sin memoria"
+    except Exception as e:
+        # Falla interna del intérprete: el caso queda como error y los demás siguen
+        estado, error = 'error', f"¡Qué pena! El intérprete se enredó ({type(e).__name__}: {e})"
+    salida.vaciar()
+    return informe_caso(caso, estado, salida.texto(), error, time.perf_counter() - inicio)
+
+
+def informe_caso(caso, estado, obtenido, error, segundos):
+    """Compara la salida con lo esperado y arma el informe del caso"""
+    nombre, _, ruta_esperado = caso
+    diferencias = []
+    if ruta_esperado is not None:
+        with open(ruta_esperado, encoding='utf-8') as archivo:
+            esperado = normalizar(archivo.read())
+        lineas = normalizar(obtenido)
+        if lineas != esperado:
+            diferencias = list(difflib.unified_diff(esperado, lineas, 'esperado', 'obtenido', lineterm=''))
+            if estado == 'ok':
+                estado = 'fallo'
+
+    return {
+        'nombre': nombre,
+        'estado': estado,
+        'segundos': round(segundos, 6),
+        'salida': obtenido,
+        'diff': diferencias,
+        'error': error,
+    }
+
+
+def limitar_memoria(megas):
+    """Tope de memoria del proceso (solo Unix): pasarse da MemoryError en el caso"""
+    if megas is None:
+        return
+    import resource
+    tope = int(megas * 2 ** 20)
+    resource.setrlimit(resource.RLIMIT_AS, (tope, tope))
+
+
+def _trabajador_vigilado(conexion, programa, memoria):
+    """Recibe casos de a uno y devuelve su informe; None para terminar"""
+    _preparar_trabajador(programa)
+    limitar_memoria(memoria)
+    conexion.send(None)
+    while True:
+        try:
+            mensaje = conexion.recv()
+        except EOFError:
+            return
+        if mensaje is None:
+            return
+        conexion.send(_correr_caso(*mensaje))
+
+
+class TrabajadorVigilado:
+    """Proceso con un caso a la vez: si se pasa del plazo se mata y se reemplaza"""
+
+    def __init__(self, contexto, programa, memoria):
+        self.conexion, extremo = contexto.Pipe()
+        self.proceso = contexto.Process(target=_trabajador_vigilado, args=(extremo, programa, memoria),
+                                        daemon=True)
+        self.proceso.start()
+        extremo.close()
+        # El plazo del primer caso empieza cuando el proceso avisa que está listo
+        self.listo = False
+        self.indice = None
+        self.caso = None
+        self.inicio = None
+        self.limite = math.inf
+
+    def asignar(self, indice, caso, timeout):
+        self.indice, self.caso = indice, caso
+        self.inicio = time.perf_counter()
+        self.limite = math.inf if timeout is None else self.inicio + timeout + GRACIA
+        self.conexion.send((caso, timeout))
+
+    def liberar(self):
+        """Retorna (índice, caso) y queda libre"""
+        indice, caso = self.indice, self.caso
+        self.indice = self.caso = None
+        self.limite = math.inf
+        return indice, caso
+
+    def matar(self):
+        self.conexion.close()
+        self.proceso.kill()
+        self.proceso.join()
+
+    def cerrar(self):
+        try:
+            self.conexion.send(None)
+        except OSError:
+            pass
+        self.conexion.close()
+        self.proceso.join(1)
+        if self.proceso.is_alive():
+            self.proceso.kill()
+            self.proceso.join()
+
+
+def ejecutar_vigilados(programa, casos, trabajadores, timeout, memoria=None):
+    """Corre los casos en procesos vigilados que se matan si un caso se pasa del plazo"""
+    contexto = multiprocessing.get_context()
+    pendientes = deque(enumerate(casos))
+    resultados = [None] * len(casos)
+    activos = [TrabajadorVigilado(contexto, programa, memoria) for _ in range(min(trabajadores, len(casos)))]
+
+    try:
+        while pendientes or any(t.caso is not None for t in activos):
+            for trabajador in activos:
+                if trabajador.listo and trabajador.caso is None and pendientes:
+                    trabajador.asignar(*pendientes.popleft(), timeout)
+
+            limite = min(t.limite for t in activos)
+            espera = None if limite == math.inf else max(0.0, limite - time.perf_counter())
+            listos = wait([t.conexion for t in activos], espera)
+
+            for i, trabajador in enumerate(activos):
+                if trabajador.conexion in listos:
+                    try:
+                        mensaje = trabajador.conexion.recv()
+                    except EOFError:
+                        # El proceso murió (el sistema lo mató por memoria, por ejemplo)
+                        if trabajador.caso is None:
+                            raise RuntimeError("Un trabajador del runner no pudo arrancar")
+                        indice, caso = trabajador.liberar()
+                        resultados[indice] = informe_caso(caso, 'error', '', "¡Ombe! El programa tumbó el proceso "
+                                                          "que lo corría (¿se quedó sin memoria?)",
+                                                          time.perf_counter() - trabajador.inicio)
+                        trabajador.matar()
+                        activos[i] = TrabajadorVigilado(contexto, programa, memoria)
+                        continue
+                    if not trabajador.listo:
+                        trabajador.listo = True
+                    else:
+                        resultados[trabajador.liberar()[0]] = mensaje
+
+                elif time.perf_counter() >= trabajador.limite:
+                    # Una sola sentencia se pasó del plazo: lo que mostró se pierde con el proceso
+                    segundos = time.perf_counter() - trabajador.inicio
+                    indice, caso = trabajador.liberar()
+                    resultados[indice] = informe_caso(caso, 'tiempo', '', TIEMPO_AGOTADO, segundos)
+                    trabajador.matar()
+                    activos[i] = TrabajadorVigilado(contexto, programa, memoria)
+    finally:
+        for trabajador in activos:
+            trabajador.cerrar()
+    return resultados
+
+
+# ===================== EJECUCIÓN =====================
+
+def ejecutar_casos(programa, casos, trabajadores=None, timeout=None, memoria=None):
+    """Corre los casos repartidos en `trabajadores` procesos (1 = en este proceso).
+
+    Con timeout o memoria los casos corren siempre en procesos vigilados
+    (ver ejecutar_vigilados), también con un solo trabajador.
+    """
+    # Los mensajes del compilador no hacen falta en los trabajadores
+    liviano = Programa(programa.sentencias, programa.tipos, (), programa.exito, programa.interprete)
+    trabajadores = trabajadores or os.cpu_count() or 1
+
+    if (timeout is not None or memoria is not None) and casos:
+        return ejecutar_vigilados(liviano, casos, trabajadores, timeout, memoria)
+
+    if trabajadores == 1 or len(casos) < 2:
+        _preparar_trabajador(liviano)
+        return [_correr_caso(caso, timeout) for caso in casos]
+
+    # Lotes grandes para que la comunicación entre procesos no domine
+    lote = max(1, len(casos) // (trabajadores * 4))
+    with ProcessPoolExecutor(trabajadores, initializer=_preparar_trabajador, initargs=(liviano,)) as ejecutor:
+        return list(ejecutor.map(_correr_caso, casos, [timeout] * len(casos), chunksize=lote))
+
+
+def correr(ruta_programa, carpeta, trabajadores=None, timeout=None, especializado=False, memoria=None):
+    """Compila una vez y corre todos los casos; retorna el informe (dict listo para JSON)"""
+    programa = Compilador(advertencias=False).compilar(FuenteArchivo(ruta_programa).codigo, especializado)
+    informe = {'programa': ruta_programa, 'compilado': programa.exito}
+    if not programa.exito:
+        informe['errores'] = [m.como_dict() for m in programa.mensajes if m.tipo == 'error']
+        informe['casos'] = []
+        informe['resumen'] = {'total': 0}
+        return informe
+
+    inicio = time.perf_counter()
+    resultados = ejecutar_casos(programa, buscar_casos(carpeta), trabajadores, timeout, memoria)
+    informe['casos'] = resultados
+    resumen = {'total': len(resultados), 'segundos': round(time.perf_counter() - inicio, 6)}
+    for estado in ['ok', 'fallo', 'error', 'tiempo']:
+        resumen[estado] = sum(1 for r in resultados if r['estado'] == estado)
+    informe['resumen'] = resumen
+    return informe
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description="Corre un programa Costeñol contra casos .in/.out")
+    argumentos.add_argument('programa')
+    argumentos.add_argument('casos', help="Carpeta con los pares nombre.in / nombre.out")
+    argumentos.add_argument('--trabajadores', type=int, default=None)
+    argumentos.add_argument('--timeout', type=float, default=None, help="Segundos por caso")
+    argumentos.add_argument('--memoria', type=float, default=None, help="Megas por proceso (solo Unix)")
+    argumentos.add_argument('--json', default=None, help="Archivo de salida (por defecto la consola)")
+    argumentos.add_argument('--especializado', action='store_true', help="Ejecutar con el código especializado por tipos")
+    opciones = argumentos.parse_args()
+
+    informe = correr(opciones.programa, opciones.casos, opciones.trabajadores, opciones.timeout,
+                     opciones.especializado, opciones.memoria)
+    texto = json.dumps(informe, ensure_ascii=False, indent=2)
+    if opciones.json:
+        with open(opciones.json, 'w', encoding='utf-8') as archivo:
+            archivo.write(texto)
+    else:
+        print(texto)
+
+    resumen = informe['resumen']
+    sys.exit(0 if informe['compilado'] and resumen.get('ok') == resumen['total'] else 1)
+
+
+if __name__ == '__main__':
+    main()
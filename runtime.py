@@ -0,0 +1,442 @@
+import mmap
+import re
+import sys
+from array import array
+from time import perf_counter
+
+
+class ErrorEjecucion(Exception):
+    """Error al ejecutar un programa (entrada mala, división por cero...)"""
+
+    def __init__(self, mensaje, linea=None):
+        super().__init__(mensaje)
+        self.mensaje = mensaje
+        self.linea = linea
+
+    def __str__(self):
+        if self.linea is None:
+            return self.mensaje
+        return f"[Línea {self.linea}] {self.mensaje}"
+
+
+class TiempoAgotado(ErrorEjecucion):
+    """La ejecución pasó del plazo"""
+
+
+TIEMPO_AGOTADO = "¡Ombe! El programa se demoró demasiado y lo paré"
+# Python no convierte a texto los int de más de sys.get_int_max_str_digits() cifras
+DEMASIADAS_CIFRAS = "¡Ombe! Ese número tiene demasiadas cifras para mostrarlo"
+# Un Entero que no cabe en un Real (al guardarlo en una variable Real o al operarlo con uno)
+NUMERO_MUY_GRANDE = "¡Ombe! Ese número es muy grande para un Real"
+
+
+# ===================== ENTRADA =====================
+
+class Entrada:
+    """Proveedor de entrada para Captura: cada captura lee una línea"""
+
+    # Mismas reglas del lexer (t_NUMERO_ENTERO y t_NUMERO_REAL), con signo opcional
+    patron_entero = re.compile(r'[+-]?\d+')
+    patron_real = re.compile(r'[+-]?\d+(?:[,.]\d+)?')
+
+    def leer_linea(self):
+        """Retorna la siguiente línea sin el salto, o None si se acabó"""
+        raise NotImplementedError
+
+    def leer(self, tipo, linea=None):
+        """Lee un valor de tipo Entero, Real o Texto"""
+        texto = self.leer_linea()
+        if texto is None:
+            raise ErrorEjecucion(f"¡Ombe! Captura.{tipo}() no tiene más entrada que leer", linea)
+
+        if tipo == 'Texto':
+            return texto
+
+        texto = texto.strip()
+        if tipo == 'Entero':
+            if not self.patron_entero.fullmatch(texto):
+                raise ErrorEjecucion(f"¡Qué vaina! '{texto}' no es un Entero", linea)
+            return int(texto)
+
+        if not self.patron_real.fullmatch(texto):
+            raise ErrorEjecucion(f"¡Qué vaina! '{texto}' no es un Real", linea)
+        # Se acepta coma o punto, igual que en el código
+        return float(texto.replace(',', '.'))
+
+    def cerrar(self):
+        pass
+
+
+class EntradaLista(Entrada):
+    """Entrada en memoria (lista de textos o de valores)"""
+
+    def __init__(self, valores):
+        self.valores = [str(valor) for valor in valores]
+        self.posicion = 0
+
+    def leer_linea(self):
+        if self.posicion >= len(self.valores):
+            return None
+        valor = self.valores[self.posicion]
+        self.posicion += 1
+        return valor
+
+
+class EntradaEstandar(Entrada):
+    """Entrada por consola (sys.stdin o el flujo que se pase)"""
+
+    def __init__(self, flujo=None):
+        self.flujo = flujo if flujo is not None else sys.stdin
+
+    def leer_linea(self):
+        texto = self.flujo.readline()
+        if not texto:
+            return None
+        return texto.rstrip('\r\n')
+
+
+class EntradaArchivo(Entrada):
+    """Entrada desde un archivo de texto (se lee completo de una vez)"""
+
+    def __init__(self, ruta, codificacion='utf-8'):
+        with open(ruta, encoding=codificacion, newline='') as archivo:
+            self.lineas = archivo.read().splitlines()
+        self.posicion = 0
+
+    def leer_linea(self):
+        if self.posicion >= len(self.lineas):
+            return None
+        texto = self.lineas[self.posicion]
+        self.posicion += 1
+        return texto
+
+
+class EntradaMapeada(Entrada):
+    """Entrada desde un archivo grande mapeado en memoria (no se copia completo)"""
+
+    def __init__(self, ruta, codificacion='utf-8'):
+        self.codificacion = codificacion
+        self.archivo = open(ruta, 'rb')
+        try:
+            self.datos = mmap.mmap(self.archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Archivo vacío: mmap no acepta tamaño 0
+            self.datos = b''
+        self.posicion = 0
+
+    def leer_linea(self):
+        datos = self.datos
+        if self.posicion >= len(datos):
+            return None
+        fin = datos.find(b'\n', self.posicion)
+        if fin == -1:
+            fin = len(datos)
+        texto = datos[self.posicion:fin]
+        self.posicion = fin + 1
+        return texto.decode(self.codificacion).rstrip('\r')
+
+    def cerrar(self):
+        if isinstance(self.datos, mmap.mmap):
+            self.datos.close()
+        self.archivo.close()
+
+
+# ===================== SALIDA =====================
+
+class Salida:
+    """Salida con buffer para Mensaje.Texto.
+
+    Junta las líneas y las escribe de a bloques en `destino` (un archivo o
+    sys.stdout). Sin destino se quedan en memoria y se leen con `texto()`.
+    """
+
+    def __init__(self, destino=None, tamano_buffer=1 << 16):
+        self.destino = destino
+        self.tamano_buffer = tamano_buffer
+        self.pendientes = []
+        self.tamano = 0
+        self.escritas = []
+
+    def escribir(self, texto):
+        self.pendientes.append(texto)
+        self.tamano += len(texto) + 1
+        if self.destino is not None and self.tamano >= self.tamano_buffer:
+            self.vaciar()
+
+    def vaciar(self):
+        """Escribe lo pendiente en el destino"""
+        if not self.pendientes:
+            return
+        if self.destino is None:
+            self.escritas.extend(self.pendientes)
+        else:
+            self.destino.write('\n'.join(self.pendientes) + '\n')
+        self.pendientes = []
+        self.tamano = 0
+
+    def texto(self):
+        """Todo lo escrito (solo sin destino)"""
+        lineas = self.escritas + self.pendientes
+        return '\n'.join(lineas) + '\n' if lineas else ''
+
+
+# ===================== LISTAS =====================
+
+# Código de array de cada tipo de elemento: enteros de 64 bits y reales dobles
+CODIGOS_LISTA = {'Entero': 'q', 'Real': 'd'}
+
+
+def nueva_lista(tipo, tamano):
+    """Lista de `tamano` elementos en 0, en un solo bloque de memoria (no un objeto por elemento)"""
+    return array(CODIGOS_LISTA[tipo], [0]) * tamano
+
+
+def posicion_lista(lista, indice, nombre, linea):
+    """Índice revisado contra el tamaño de la Lista.
+
+    Los Entero que salen de '/' llegan como Real (4 / 2 da 2.0): sirven si
+    son exactos.
+    """
+    if isinstance(indice, float) and indice.is_integer():
+        indice = int(indice)
+    if not isinstance(indice, int) or not 0 <= indice < len(lista):
+        raise ErrorEjecucion(f"¡Ombe! La Lista '{nombre}' no tiene la posición {formatear_valor(indice)}, "
+                             f"va de 0 a {len(lista) - 1}", linea)
+    return indice
+
+
+def guardar_elemento(lista, indice, valor, nombre, linea):
+    """lista[indice] = valor, con un ErrorEjecucion si el valor no cabe en el arreglo"""
+    if lista.typecode == 'q' and isinstance(valor, float):
+        if not valor.is_integer():
+            raise ErrorEjecucion(f"¡Ombe! {formatear_valor(valor)} no es un Entero, no cabe en la Lista '{nombre}'",
+                                 linea)
+        valor = int(valor)
+    try:
+        lista[indice] = valor
+    except OverflowError:
+        raise ErrorEjecucion(f"¡Ombe! El número {formatear_valor(valor)} es muy grande para la Lista '{nombre}'",
+                             linea) from None
+
+
+# ===================== INTÉRPRETE =====================
+
+def texto_entero(valor, linea=None):
+    """str() de un Entero, con un ErrorEjecucion si tiene demasiadas cifras"""
+    try:
+        return str(valor)
+    except ValueError:
+        raise ErrorEjecucion(DEMASIADAS_CIFRAS, linea) from None
+
+
+def formatear_valor(valor, linea=None):
+    """Texto de un valor como lo muestra Mensaje.Texto (inf y nan salen como en Python)"""
+    if isinstance(valor, float):
+        return str(int(valor)) if valor.is_integer() else str(valor)
+    if isinstance(valor, int):
+        return texto_entero(valor, linea)
+    return str(valor)
+
+
+class Interprete:
+    """Ejecuta las sentencias en orden, con valores reales (no perezosos)"""
+
+    # Marca en la pila de evaluación: combinar los valores de los hijos del nodo
+    COMBINAR = object()
+
+    # PerfilLineas en modo exacto (profiler.py): recibe el tiempo de cada sentencia
+    perfil = None
+
+    def ejecutar(self, programa, entrada=None, salida=None, plazo=None):
+        """Ejecuta el programa; retorna la salida usada.
+
+        `plazo` es un instante de perf_counter: si se pasa, se lanza TiempoAgotado.
+        """
+        entrada = entrada if entrada is not None else EntradaLista([])
+        salida = salida if salida is not None else Salida()
+        valores = {}
+        perfil = self.perfil
+
+        try:
+            for sentencia in programa.sentencias:
+                if plazo is not None and perf_counter() > plazo:
+                    raise TiempoAgotado(TIEMPO_AGOTADO, sentencia[-1])
+
+                if perfil is None:
+                    self.ejecutar_sentencia(programa, sentencia, valores, entrada, salida)
+                    continue
+
+                # Una sentencia que falla también cuenta (con lo que alcanzó a tardar)
+                inicio = perf_counter()
+                try:
+                    self.ejecutar_sentencia(programa, sentencia, valores, entrada, salida)
+                finally:
+                    perfil.registrar(sentencia[-1], perf_counter() - inicio)
+        except OverflowError:
+            raise ErrorEjecucion(NUMERO_MUY_GRANDE, sentencia[-1]) from None
+
+        salida.vaciar()
+        return salida
+
+    def ejecutar_sentencia(self, programa, sentencia, valores, entrada, salida):
+        clase = sentencia[0]
+        if clase == 'asignar':
+            _, nombre, expresion, linea = sentencia
+            valor = self.evaluar(expresion, valores, entrada, linea)
+            if programa.tipos.get(nombre) == 'Real' and isinstance(valor, int):
+                valor = float(valor)
+            valores[nombre] = valor
+
+        elif clase == 'mensaje_texto':
+            _, expresion, linea = sentencia
+            if isinstance(expresion, str):
+                salida.escribir(expresion)
+            else:
+                salida.escribir(formatear_valor(self.evaluar(expresion, valores, entrada, linea), linea))
+
+        elif clase == 'declarar_lista':
+            _, nombre, tipo, tamano, _ = sentencia
+            valores[nombre] = nueva_lista(tipo, tamano)
+
+        elif clase == 'asignar_elemento':
+            _, nombre, indice, expresion, linea = sentencia
+            lista = valores[nombre]
+            if indice[0] == 'numero':
+                # Índice constante: su rango ya se revisó al compilar
+                posicion = indice[1]
+            else:
+                posicion = posicion_lista(lista, self.evaluar(indice, valores, entrada, linea), nombre, linea)
+            guardar_elemento(lista, posicion, self.evaluar(expresion, valores, entrada, linea), nombre, linea)
+
+    def ejecutar_lote(self, programa, entradas):
+        """Corre el mismo programa contra varias entradas (listas o proveedores).
+
+        Retorna por cada una (salida, error): la salida en texto y el
+        ErrorEjecucion si lo hubo (con lo que alcanzó a escribir).
+        """
+        resultados = []
+        for entrada in entradas:
+            if not isinstance(entrada, Entrada):
+                entrada = EntradaLista(entrada)
+            salida = Salida()
+            try:
+                self.ejecutar(programa, entrada, salida)
+                resultados.append((salida.texto(), None))
+            except ErrorEjecucion as e:
+                salida.vaciar()
+                resultados.append((salida.texto(), e))
+            finally:
+                entrada.cerrar()
+        return resultados
+
+    def evaluar(self, expresion, valores, entrada, linea):
+        """Evalúa una expresión con una pila explícita (izquierda a derecha)"""
+        combinar = self.COMBINAR
+        resultados = []
+        pila = [expresion]
+        while pila:
+            nodo = pila.pop()
+
+            if nodo is combinar:
+                nodo = pila.pop()
+                if nodo[0] == 'negacion':
+                    resultados.append(-resultados.pop())
+                    continue
+                if nodo[0] == 'elemento':
+                    lista = valores[nodo[1]]
+                    resultados.append(lista[posicion_lista(lista, resultados.pop(), nodo[1], linea)])
+                    continue
+                der = resultados.pop()
+                izq = resultados.pop()
+                resultados.append(self.operar(nodo[1], izq, der, linea))
+                continue
+
+            clase = nodo[0]
+            if clase == 'operacion_binaria':
+                pila.append(nodo)
+                pila.append(combinar)
+                pila.append(nodo[3])
+                pila.append(nodo[2])
+
+            elif clase in ('numero', 'cadena'):
+                resultados.append(nodo[1])
+
+            elif clase == 'elemento':
+                if nodo[2][0] == 'numero':
+                    # Índice constante: su rango ya se revisó al compilar
+                    resultados.append(valores[nodo[1]][nodo[2][1]])
+                else:
+                    pila.append(nodo)
+                    pila.append(combinar)
+                    pila.append(nodo[2])
+
+            elif clase == 'variable':
+                if nodo[1] not in valores:
+                    raise ErrorEjecucion(f"¡Ombe! La variable '{nodo[1]}' no tiene valor", linea)
+                resultados.append(valores[nodo[1]])
+
+            elif clase == 'capturar':
+                resultados.append(entrada.leer(nodo[1], linea))
+
+            elif clase == 'negacion':
+                pila.append(nodo)
+                pila.append(combinar)
+                pila.append(nodo[1])
+
+            else:
+                raise ErrorEjecucion(f"Expresión no ejecutable: {nodo!r}", linea)
+
+        return resultados[0]
+
+    @staticmethod
+    def operar(op, izq, der, linea):
+        """Igual que AnalizadorSemantico.operar (división real), pero con errores"""
+        if op == '+':
+            return izq + der
+        elif op == '-':
+            return izq - der
+        elif op == '*':
+            return izq * der
+        if der == 0:
+            raise ErrorEjecucion("¡Ombe! Estás dividiendo por cero", linea)
+        return izq / der
+
+
+# ===================== PROGRAMA =====================
+
+class Programa:
+    """Programa ya compilado, listo para ejecutar muchas veces sin recompilar"""
+
+    def __init__(self, sentencias, tipos, mensajes=(), exito=True, interprete=None):
+        self.sentencias = sentencias
+        # Tipo declarado de cada variable (para guardar Entero como Real)
+        self.tipos = tipos
+        self.mensajes = mensajes
+        self.exito = exito
+        # Interprete genérico o InterpreteEspecializado (specialized.py)
+        self.interprete = interprete if interprete is not None else Interprete()
+
+    def verificar(self):
+        if not self.exito:
+            raise ErrorEjecucion("¡Ombe! El programa tiene errores, arréglalos antes de ejecutarlo")
+
+    def ejecutar(self, entrada=None, salida=None, plazo=None):
+        """Ejecuta una vez; retorna la Salida"""
+        self.verificar()
+        return self.interprete.ejecutar(self, entrada, salida, plazo)
+
+    def ejecutar_lote(self, entradas):
+        """Ejecuta contra varias entradas; retorna [(salida, error), ...]"""
+        self.verificar()
+        return self.interprete.ejecutar_lote(self, entradas)
+
+    def ejecutar_columnas(self, entradas, filas=None):
+        """Ejecuta sobre muchas filas de entrada a la vez; retorna un ResultadoColumnas.
+
+        `entradas` es un arreglo 2D de NumPy (filas x capturas) o una lista
+        de columnas; `filas` solo hace falta con una lista vacía (programa
+        sin capturas). Necesita numpy (ver vectorized.py).
+        """
+        self.verificar()
+        from vectorized import InterpreteColumnas
+        return InterpreteColumnas().ejecutar(self, entradas, filas)
@@ -1,24 +1,77 @@
+from expressions import FabricaExpresiones
+from diagnostics import Codigo, Diagnostico
+
+# Comienzo de los mensajes de un acceso malo a una Lista
+MENSAJE_LISTA = '¡Ombe! La Lista'
+
+# Comienzo de los mensajes que arma tipo_binaria para una operación mala
+# (y de los de una Lista, que se propagan igual)
+MENSAJES_OPERACION = ('¡Ombe! La operación', '¡Nojoda que! no puedes sumar', MENSAJE_LISTA)
+
+
 class AnalizadorSemantico:
     """Analizador semántico - Gestión de tabla de símbolos y tipos"""
     
-    def __init__(self):
+    # Marca en la pila de evaluación: combinar los valores de los hijos del nodo
+    COMBINAR = object()
+    
+    # Clases de nodo con subexpresiones
+    COMPUESTAS = ('operacion_binaria', 'negacion', 'elemento')
+    
+    # Niveles que se tipan/evalúan por recursión antes de pasar a la pila
+    # explícita (la recursión es más rápida, pero gasta un frame por nivel)
+    PROFUNDIDAD_RECURSIVA = 100
+    
+    # Tipos que puede tener una Lista (se guardan en arreglos contiguos, ver runtime.nueva_lista)
+    TIPOS_LISTA = ('Entero', 'Real')
+    MAX_TAMANO_LISTA = 10_000_000
+    
+    def __init__(self, modo_lote=False):
         self.tabla_simbolos = {}
         self.mensajes = []
         self.lineas_procesadas = set()
+        
+        # En modo lote los aciertos solo se cuentan, no se guardan
+        self.modo_lote = modo_lote
+        self.aciertos_omitidos = 0
+        self.errores = 0
+        self.linea_actual = None
+        self.claves_linea = set()
+        
+        # (inicio, fin) de la sentencia que se está validando
+        self.span_actual = None
+        
+        # Nodos de expresión internados y memos por nodo único
+        self.nodos = FabricaExpresiones()
+        self.cache_tipos = {}
+        self.cache_valores = {}
+        
+        # Interfaces de los módulos que se pueden importar (None = importación circular)
+        self.interfaces = {}
+        self.importados = set()
     
     def reset(self):
         """Limpia el estado del analizador"""
         self.tabla_simbolos.clear()
         self.mensajes.clear()
         self.lineas_procesadas.clear()
+        self.aciertos_omitidos = 0
+        self.errores = 0
+        self.linea_actual = None
+        self.claves_linea.clear()
+        self.span_actual = None
+        self.nodos.reset()
+        self.cache_tipos.clear()
+        self.cache_valores.clear()
+        self.importados.clear()
     
     # ==================== GESTIÓN DE VARIABLES ====================
     
-    def declarar_variable(self, nombre, tipo, linea):
+    def declarar_variable(self, nombre, tipo, linea, span=None):
         """Declara una variable en la tabla de símbolos"""
+        self.span_actual = span
         if nombre in self.tabla_simbolos:
-            self.agregar_mensaje('error', linea, 
-                f"¡Epa! La variable '{nombre}' ya la declaraste mano, no la repitas.")
+            self.agregar_mensaje('error', linea, Codigo.VARIABLE_REPETIDA, nombre)
             return False
         
         self.tabla_simbolos[nombre] = {
@@ -26,34 +79,85 @@ class AnalizadorSemantico:
             'valor': None,
             'linea': linea
         }
+        # Los tipos memoizados dependen de qué variables existen
+        self.cache_tipos.clear()
         
-        self.agregar_mensaje('exito', linea, 
-            f"¡Bien ahí! Variable '{nombre}' quedó como {tipo}")
+        self.agregar_mensaje('exito', linea, Codigo.DECLARACION_OK, nombre, tipo)
         return True
     
-    def asignar_variable(self, nombre, expresion, linea):
+    def declarar_lista(self, nombre, tipo, tamano, linea, span=None):
+        """Declara una Lista de `tamano` elementos (todos empiezan en 0)"""
+        self.span_actual = span
+        if nombre in self.tabla_simbolos:
+            self.agregar_mensaje('error', linea, Codigo.VARIABLE_REPETIDA, nombre)
+            return False
+        
+        if tipo not in self.TIPOS_LISTA:
+            self.agregar_mensaje('error', linea, Codigo.LISTA_TIPO_INVALIDO, nombre, tipo)
+            return False
+        
+        if not 1 <= tamano <= self.MAX_TAMANO_LISTA:
+            self.agregar_mensaje('error', linea, Codigo.LISTA_TAMANO_INVALIDO, nombre, tamano, self.MAX_TAMANO_LISTA)
+            return False
+        
+        self.tabla_simbolos[nombre] = {
+            'tipo': f'Lista {tipo}',
+            'valor': None,
+            'linea': linea,
+            'elemento': tipo,
+            'tamano': tamano
+        }
+        self.cache_tipos.clear()
+        
+        self.agregar_mensaje('exito', linea, Codigo.LISTA_OK, nombre, tipo, tamano)
+        return True
+    
+    def asignar_variable(self, nombre, expresion, linea, span=None):
         """Asigna un valor a una variable existente"""
+        self.span_actual = span
         if nombre not in self.tabla_simbolos:
-            self.agregar_mensaje('error', linea, 
-                f"¡Ombe hey! La variable '{nombre}' no existe, declárala primero apue.")
+            self.agregar_mensaje('error', linea, Codigo.VARIABLE_NO_DECLARADA, nombre)
             return False
         
-        tipo_declarado = self.tabla_simbolos[nombre]['tipo']
+        if self.lista(nombre) is not None:
+            self.agregar_mensaje('error', linea, Codigo.LISTA_COMPLETA, nombre)
+            return False
         
+        if not self.validar_asignacion(nombre, self.tabla_simbolos[nombre]['tipo'], expresion, linea):
+            return False
+        self.guardar_valor(nombre, expresion)
+        return True
+    
+    def asignar_elemento(self, nombre, indice, expresion, linea, span=None):
+        """Asigna un valor a nombre[indice] (el parser ya revisó que `nombre` sea una Lista)"""
+        self.span_actual = span
+        simbolo = self.lista(nombre)
+        if simbolo is None:
+            self.agregar_mensaje('error', linea, Codigo.VARIABLE_NO_DECLARADA, nombre)
+            return False
+        
+        error = self.error_indice(nombre, indice, self.obtener_tipo_expresion(indice))
+        if error is not None:
+            if error != 'Error':
+                self.agregar_mensaje('error', linea, Codigo.ERROR_TIPO, error)
+            return False
+        
+        return self.validar_asignacion(self.texto_elemento(nombre, indice), simbolo['elemento'], expresion, linea)
+    
+    def validar_asignacion(self, destino, tipo_declarado, expresion, linea):
+        """Revisa que `expresion` se pueda guardar en `destino` (una variable o un elemento de Lista)"""
         # PRIMERO: Verificar si hay errores sintácticos en la expresión
         if isinstance(expresion, tuple) and expresion[0] == 'error':
             # Hay un error sintáctico - NO asignar
             if expresion[1] == 'variable_no_definida':
                 var_error = expresion[2]
                 if tipo_declarado == 'Texto':
-                    self.agregar_mensaje('error', linea, 
-                        f"¡Eche! Si '{var_error}' es texto, ponle comillas ombe: \"{var_error}\"")
+                    self.agregar_mensaje('error', linea, Codigo.FALTAN_COMILLAS, var_error)
                 else:
-                    self.agregar_mensaje('error', linea, 
-                        f"¡Ombe! La variable '{var_error}' no existe, no inventes.")
+                    self.agregar_mensaje('error', linea, Codigo.VARIABLE_INEXISTENTE, var_error)
             elif expresion[1] not in ['tipo_invalido', 'falta_parens', 'captura_sin_cerrar', 
                                        'funcion_invalida', 'metodo_invalido', 'parens_malformados', 
-                                       'paren_sin_cerrar']:
+                                       'paren_sin_cerrar', 'no_es_lista']:
                 # Para errores generales que aún no se reportaron
                 pass
             # Para otros tipos de errores, el parser ya los reportó
@@ -65,20 +169,19 @@ class AnalizadorSemantico:
         if isinstance(expresion, tuple) and expresion[0] == 'capturar':
             tipo_captura = expresion[1]
             if tipo_declarado != tipo_captura:
-                self.agregar_mensaje('error', linea,
-                    f"¡Ey vale! No puedes usar Captura.{tipo_captura}() para '{nombre}' que es {tipo_declarado}")
+                self.agregar_mensaje('error', linea, Codigo.CAPTURA_TIPO_INCORRECTO,
+                    tipo_captura, destino, tipo_declarado)
                 return False
             else:
-                self.tabla_simbolos[nombre]['valor'] = expresion
-                self.agregar_mensaje('exito', linea, 
-                    f"¡Tá bueno! Captura.{tipo_captura}() → {nombre}({tipo_declarado})")
+                self.agregar_mensaje('exito', linea, Codigo.CAPTURA_OK,
+                    tipo_captura, destino, tipo_declarado)
                 return True
         
         # Validar mensajes de error de tipos
         if str(tipo_expresion).startswith('!Eche tú que!') or \
            str(tipo_expresion).startswith('¡Ombe!') or \
            str(tipo_expresion).startswith('¡Nojoda que!'):
-            self.agregar_mensaje('error', linea, tipo_expresion)
+            self.agregar_mensaje('error', linea, Codigo.ERROR_TIPO, tipo_expresion)
             return False
         
         # Si el tipo es 'Error' (propagado de sintaxis), no hacer nada más
@@ -87,16 +190,23 @@ class AnalizadorSemantico:
         
         # Validar compatibilidad de tipos
         if not self.tipos_compatibles(tipo_declarado, tipo_expresion):
-            self.agregar_mensaje('error', linea,
-                f"¡Esa vaina que cole! No puedes meter {tipo_expresion} en '{nombre}' que es {tipo_declarado}")
+            self.agregar_mensaje('error', linea, Codigo.TIPOS_INCOMPATIBLES,
+                tipo_expresion, destino, tipo_declarado)
             return False
         
         # Asignación exitosa
-        self.tabla_simbolos[nombre]['valor'] = expresion
-        self.agregar_mensaje('exito', linea, 
-            f"¡Tá bueno! {tipo_expresion} → {nombre}({tipo_declarado})")
+        self.agregar_mensaje('exito', linea, Codigo.ASIGNACION_OK,
+            tipo_expresion, destino, tipo_declarado)
         return True
     
+    def guardar_valor(self, nombre, expresion):
+        """Guarda la expresión asignada a una variable"""
+        simbolo = self.tabla_simbolos[nombre]
+        if simbolo['valor'] is None:
+            # La variable deja de estar "sin valor": los tipos memoizados cambian
+            self.cache_tipos.clear()
+        simbolo['valor'] = expresion
+    
     def variable_existe(self, nombre):
         """Verifica si una variable existe"""
         return nombre in self.tabla_simbolos
@@ -106,10 +216,298 @@ class AnalizadorSemantico:
             return False
         return self.tabla_simbolos[nombre]['valor'] is not None
     
+    # ==================== LISTAS ====================
+    
+    def lista(self, nombre):
+        """Símbolo de la Lista `nombre` (None si no existe o no es una Lista)"""
+        simbolo = self.tabla_simbolos.get(nombre)
+        if simbolo is None or 'tamano' not in simbolo:
+            return None
+        return simbolo
+    
+    @staticmethod
+    def tipo_elemento(tipo):
+        """Tipo de los elementos de un tipo 'Lista Entero' o 'Lista Real' (None si no es Lista)"""
+        if isinstance(tipo, str) and tipo.startswith('Lista '):
+            return tipo[len('Lista '):]
+        return None
+    
+    def indice_constante(self, indice):
+        """Valor del índice si no depende de variables ni capturas (None si no)"""
+        if not isinstance(indice, tuple) or id(indice) not in self.nodos.sin_variables:
+            return None
+        if indice[0] == 'numero':
+            return indice[1]
+        return self.evaluar_operacion(indice)
+    
+    def plegar_indice(self, indice):
+        """El índice como número si es constante y Entero.
+        
+        El rango de un índice constante se revisa al compilar, así la
+        ejecución no lo vuelve a revisar (ver runtime.posicion_lista).
+        """
+        if not isinstance(indice, tuple) or indice[0] == 'numero':
+            return indice
+        valor = self.indice_constante(indice)
+        if valor is None or self.obtener_tipo_expresion(indice) != 'Entero':
+            return indice
+        if isinstance(valor, float):
+            if not valor.is_integer():
+                return indice
+            valor = int(valor)
+        return self.nodos.numero(valor)
+    
+    def error_indice(self, nombre, indice, tipo_indice):
+        """Mensaje si `indice` no sirve como posición de la Lista `nombre` (None si sirve)"""
+        if isinstance(indice, tuple) and indice[0] == 'error':
+            if len(indice) > 2 and indice[1] == 'variable_no_definida':
+                return f"¡Ombe! La variable '{indice[2]}' no existe, no inventes."
+            return 'Error'
+        
+        if tipo_indice == 'Error' or str(tipo_indice).startswith(('¡', '!')):
+            return tipo_indice
+        
+        if tipo_indice != 'Entero':
+            return f"{MENSAJE_LISTA} '{nombre}' se recorre con posiciones Entero, no con {tipo_indice}"
+        
+        # Con un índice constante el rango se revisa al compilar
+        valor = self.indice_constante(indice)
+        tamano = self.tabla_simbolos[nombre]['tamano']
+        if valor is not None:
+            if isinstance(valor, float) and valor.is_integer():
+                valor = int(valor)
+            if isinstance(valor, float) or not 0 <= valor < tamano:
+                return f"{MENSAJE_LISTA} '{nombre}' no tiene la posición {valor}, va de 0 a {tamano - 1}"
+        return None
+    
+    def tipo_acceso(self, nodo, tipo_indice):
+        """Tipo de nombre[indice]: el de los elementos, o el mensaje si el índice no sirve"""
+        simbolo = self.lista(nodo[1])
+        if simbolo is None:
+            return 'Error'
+        error = self.error_indice(nodo[1], nodo[2], tipo_indice)
+        if error is not None:
+            return error
+        return simbolo['elemento']
+    
+    @staticmethod
+    def texto_elemento(nombre, indice):
+        """Cómo se muestra nombre[indice] en los mensajes"""
+        if isinstance(indice, tuple) and indice[0] in ('numero', 'variable'):
+            return f"{nombre}[{indice[1]}]"
+        return f"{nombre}[...]"
+    
+    # ==================== MÓDULOS ====================
+    
+    def importar(self, modulo, linea, span=None):
+        """Trae a la tabla de símbolos las variables que exporta `modulo` (ver modules.py)"""
+        self.span_actual = span
+        if modulo not in self.interfaces:
+            self.agregar_mensaje('error', linea, Codigo.MODULO_NO_ENCONTRADO, modulo)
+            return False
+        
+        interfaz = self.interfaces[modulo]
+        if interfaz is None:
+            self.agregar_mensaje('error', linea, Codigo.IMPORTACION_CICLICA, modulo)
+            return False
+        
+        if modulo in self.importados:
+            self.agregar_mensaje('error', linea, Codigo.IMPORTACION_REPETIDA, modulo)
+            return False
+        
+        # Una variable que llega por dos caminos (dos módulos que importan el
+        # mismo) es la misma; con otro origen es un choque y no se importa nada
+        for nombre, exportada in interfaz.items():
+            simbolo = self.tabla_simbolos.get(nombre)
+            if simbolo is not None and simbolo.get('modulo') != exportada['modulo']:
+                self.agregar_mensaje('error', linea, Codigo.IMPORTACION_CHOQUE, nombre, modulo)
+                return False
+        
+        for nombre, exportada in interfaz.items():
+            if nombre in self.tabla_simbolos:
+                continue
+            simbolo = {
+                'tipo': exportada['tipo'],
+                'valor': self.valor_importado(nombre, exportada),
+                'linea': linea,
+                'modulo': exportada['modulo']
+            }
+            if 'elemento' in exportada:
+                simbolo['elemento'] = exportada['elemento']
+                simbolo['tamano'] = exportada['tamano']
+            self.tabla_simbolos[nombre] = simbolo
+        
+        self.importados.add(modulo)
+        self.cache_tipos.clear()
+        self.agregar_mensaje('exito', linea, Codigo.IMPORTACION_OK, modulo, len(interfaz))
+        return True
+    
+    def valor_importado(self, nombre, exportada):
+        """Nodo de valor de una variable importada: su constante, o ella misma si solo se sabe al ejecutar"""
+        if not exportada['con_valor']:
+            return None
+        constante = exportada.get('constante')
+        if isinstance(constante, str):
+            return self.nodos.cadena(constante)
+        if constante is not None:
+            return self.nodos.numero(constante)
+        # Apuntando a sí misma se muestra como [nombre] y no se evalúa
+        return self.nodos.variable(nombre)
+    
+    def interfaz(self, modulo):
+        """Lo que exporta este programa como `modulo`: todas sus variables, propias e importadas.
+        
+        Se puede pasar a JSON. Las variables con valor constante lo llevan en
+        'constante' (el que tienen al terminar el módulo).
+        """
+        exportadas = {}
+        for nombre, simbolo in self.tabla_simbolos.items():
+            exportada = {
+                'tipo': simbolo['tipo'],
+                'modulo': simbolo.get('modulo', modulo),
+                'con_valor': simbolo['valor'] is not None
+            }
+            if 'elemento' in simbolo:
+                exportada['elemento'] = simbolo['elemento']
+                exportada['tamano'] = simbolo['tamano']
+            elif exportada['con_valor']:
+                valor = simbolo['valor']
+                constante = valor[1] if valor[0] == 'cadena' else self.evaluar_operacion(valor)
+                if constante is not None:
+                    exportada['constante'] = constante
+            exportadas[nombre] = exportada
+        return exportadas
+    
     # ==================== VALIDACIÓN DE TIPOS ====================
     
     def obtener_tipo_expresion(self, expresion):
-        """Determina el tipo de una expresión"""
+        """Determina el tipo de una expresión (memoizado por nodo).
+        
+        Las expresiones bajitas (las de un programa normal) se tipan
+        recursivamente; pasado PROFUNDIDAD_RECURSIVA el resto del subárbol
+        sigue con la pila explícita de tipo_con_pila.
+        """
+        if not self.es_compuesta(expresion):
+            return self.calcular_tipo_expresion(expresion)
+        return self.tipo_recursivo(expresion, self.PROFUNDIDAD_RECURSIVA)
+    
+    def tipo_recursivo(self, nodo, margen):
+        """Tipo de un nodo compuesto con a lo sumo `margen` frames más"""
+        memo = self.cache_tipos.get(id(nodo))
+        if memo is not None and memo[0] is nodo:
+            return memo[1]
+        if margen == 0:
+            return self.tipo_con_pila(nodo)
+        margen -= 1
+        
+        clase = nodo[0]
+        if clase == 'operacion_binaria':
+            izq, der = nodo[2], nodo[3]
+            if (isinstance(izq, tuple) and izq[0] == 'error') or (isinstance(der, tuple) and der[0] == 'error'):
+                tipo = self.calcular_tipo_expresion(nodo)
+            else:
+                compuestas = self.COMPUESTAS
+                tipo_izq = (self.tipo_recursivo(izq, margen) if isinstance(izq, tuple) and izq[0] in compuestas
+                            else self.calcular_tipo_expresion(izq))
+                tipo_der = (self.tipo_recursivo(der, margen) if isinstance(der, tuple) and der[0] in compuestas
+                            else self.calcular_tipo_expresion(der))
+                tipo = self.tipo_binaria(nodo[1], tipo_izq, tipo_der)
+        else:
+            hijo = nodo[1] if clase == 'negacion' else nodo[2]
+            tipo_hijo = (self.tipo_recursivo(hijo, margen) if isinstance(hijo, tuple) and hijo[0] in self.COMPUESTAS
+                         else self.calcular_tipo_expresion(hijo))
+            tipo = self.tipo_negacion(tipo_hijo) if clase == 'negacion' else self.tipo_acceso(nodo, tipo_hijo)
+        
+        if self.nodos.activa:
+            # Guardar el nodo evita que su id se recicle mientras está en el memo
+            self.cache_tipos[id(nodo)] = (nodo, tipo)
+        return tipo
+    
+    def tipo_con_pila(self, expresion):
+        """Tipo de un nodo compuesto recorriendo en post-orden con una pila
+        explícita: las expresiones muy anidadas no gastan un frame por nivel.
+        """
+        memo = self.cache_tipos.get(id(expresion))
+        if memo is not None and memo[0] is expresion:
+            return memo[1]
+        
+        # Tipos calculados en esta llamada (por id; los nodos siguen vivos en el árbol).
+        # Las hojas no se guardan, se tipan directo
+        tipos = {}
+        cache = self.cache_tipos
+        guardar = self.nodos.activa
+        tipo_hoja = self.calcular_tipo_expresion
+        compuestas = self.COMPUESTAS
+        
+        # El nodo se queda en la pila hasta que sus hijos compuestos tengan tipo
+        pila = [expresion]
+        while pila:
+            nodo = pila[-1]
+            if id(nodo) in tipos:
+                pila.pop()
+                continue
+            
+            memo = cache.get(id(nodo))
+            if memo is not None and memo[0] is nodo:
+                tipos[id(nodo)] = memo[1]
+                pila.pop()
+                continue
+            
+            if nodo[0] == 'negacion':
+                hijo = nodo[1]
+                if isinstance(hijo, tuple) and hijo[0] in compuestas and id(hijo) not in tipos:
+                    pila.append(hijo)
+                    continue
+                tipo_hijo = tipos.get(id(hijo))
+                tipo = self.tipo_negacion(tipo_hijo if tipo_hijo is not None else tipo_hoja(hijo))
+            
+            elif nodo[0] == 'elemento':
+                indice = nodo[2]
+                if isinstance(indice, tuple) and indice[0] in compuestas and id(indice) not in tipos:
+                    pila.append(indice)
+                    continue
+                tipo_indice = tipos.get(id(indice))
+                tipo = self.tipo_acceso(nodo, tipo_indice if tipo_indice is not None else tipo_hoja(indice))
+            
+            else:
+                izq, der = nodo[2], nodo[3]
+                if (isinstance(izq, tuple) and izq[0] == 'error') or (isinstance(der, tuple) and der[0] == 'error'):
+                    # Con un operando con error el tipo sale sin mirar los hijos
+                    tipo = tipo_hoja(nodo)
+                else:
+                    faltan = False
+                    if isinstance(der, tuple) and der[0] in compuestas and id(der) not in tipos:
+                        pila.append(der)
+                        faltan = True
+                    if isinstance(izq, tuple) and izq[0] in compuestas and id(izq) not in tipos:
+                        pila.append(izq)
+                        faltan = True
+                    if faltan:
+                        continue
+                    
+                    tipo_izq = tipos.get(id(izq))
+                    if tipo_izq is None:
+                        tipo_izq = tipo_hoja(izq)
+                    tipo_der = tipos.get(id(der))
+                    if tipo_der is None:
+                        tipo_der = tipo_hoja(der)
+                    tipo = self.tipo_binaria(nodo[1], tipo_izq, tipo_der)
+            
+            pila.pop()
+            tipos[id(nodo)] = tipo
+            if guardar:
+                # Guardar el nodo evita que su id se recicle mientras está en el memo
+                cache[id(nodo)] = (nodo, tipo)
+        
+        return tipos[id(expresion)]
+    
+    @staticmethod
+    def es_compuesta(expresion):
+        """Verifica si la expresión es una operación (tiene subexpresiones)"""
+        return isinstance(expresion, tuple) and expresion[0] in AnalizadorSemantico.COMPUESTAS
+    
+    def calcular_tipo_expresion(self, expresion):
+        """Determina el tipo de una expresión (los hijos se tipan con obtener_tipo_expresion)"""
         if not isinstance(expresion, tuple):
             return 'Desconocido'
         
@@ -128,6 +526,10 @@ class AnalizadorSemantico:
             if not self.variable_existe(variable):
                 return 'Desconocido'
             
+            # Una Lista siempre tiene valor (sus elementos empiezan en 0)
+            if self.lista(variable) is not None:
+                return self.tabla_simbolos[variable]['tipo']
+            
             if not self.variable_tiene_valor(variable):
                 return f'!Eche tú que! La variable "{variable}" no tiene valor todavía, ponle algo primero eche nojoda care mondá'
             
@@ -136,6 +538,12 @@ class AnalizadorSemantico:
         elif expresion[0] == 'capturar':
             return expresion[1]
         
+        elif expresion[0] == 'negacion':
+            return self.tipo_negacion(self.obtener_tipo_expresion(expresion[1]))
+        
+        elif expresion[0] == 'elemento':
+            return self.tipo_acceso(expresion, self.obtener_tipo_expresion(expresion[2]))
+        
         elif expresion[0] == 'operacion_binaria':
             op, izq, der = expresion[1], expresion[2], expresion[3]
             
@@ -149,40 +557,74 @@ class AnalizadorSemantico:
                      return f"¡Ombe! La variable '{der[2]}' no existe, no inventes."
                 return 'Error'
             
-            tipo_izq = self.obtener_tipo_expresion(izq)
-            tipo_der = self.obtener_tipo_expresion(der)
-            
-            # Propagar errores
-            if tipo_izq == 'Error' or tipo_der == 'Error':
-                return 'Error'
-            
-            if 'Error:' in str(tipo_izq) or 'Error:' in str(tipo_der):
-                return tipo_izq if 'Error:' in str(tipo_izq) else tipo_der
-            
-            # Operador suma (especial para texto)
-            if op == '+':
-                if tipo_izq == 'Texto' or tipo_der == 'Texto':
-                    if tipo_izq == 'Texto' and tipo_der == 'Texto':
-                        return 'Texto'
-                    else:
-                        return f'¡Nojoda que! no puedes sumar Texto con {tipo_izq if tipo_izq != "Texto" else tipo_der}'
-                else:
-                    if tipo_izq == 'Entero' and tipo_der == 'Entero':
-                        return 'Entero'
-                    else:
-                        return 'Real'
-            
-            # Otros operadores (solo numéricos)
+            return self.tipo_binaria(op, self.obtener_tipo_expresion(izq), self.obtener_tipo_expresion(der))
+        
+        return 'Desconocido'
+    
+    @staticmethod
+    def tipo_negacion(tipo):
+        """Tipo de -x a partir del tipo de x"""
+        # Negación real (la produce el optimizador en lugar de 0 - x)
+        if tipo in ['Entero', 'Real', 'Error']:
+            return tipo
+        if str(tipo).startswith('¡') or str(tipo).startswith('!'):
+            return tipo
+        return f'¡Ombe! La operación "-" solo funciona con números, no con {tipo} eche'
+    
+    @staticmethod
+    def tipo_binaria(op, tipo_izq, tipo_der):
+        """Tipo de una operación binaria a partir del tipo de sus operandos"""
+        # Propagar errores
+        if tipo_izq == 'Error' or tipo_der == 'Error':
+            return 'Error'
+        
+        if 'Error:' in str(tipo_izq) or 'Error:' in str(tipo_der):
+            return tipo_izq if 'Error:' in str(tipo_izq) else tipo_der
+        
+        # Operador suma (especial para texto)
+        if op == '+':
+            if tipo_izq == 'Texto' or tipo_der == 'Texto':
+                if tipo_izq == 'Texto' and tipo_der == 'Texto':
+                    return 'Texto'
+                otro = tipo_izq if tipo_izq != "Texto" else tipo_der
+                if str(otro).startswith(MENSAJES_OPERACION):
+                    return otro
+                return f'¡Nojoda que! no puedes sumar Texto con {otro}'
             else:
-                if tipo_izq not in ['Entero', 'Real'] or tipo_der not in ['Entero', 'Real']:
-                    return f'¡Ombe! La operación "{op}" solo funciona con números, no con {tipo_izq} y {tipo_der} eche'
-                
+                # Una Lista no entra en la regla de abajo (todo lo que no es Texto da número)
+                error = AnalizadorSemantico.error_lista(op, tipo_izq, tipo_der)
+                if error is not None:
+                    return error
                 if tipo_izq == 'Entero' and tipo_der == 'Entero':
                     return 'Entero'
                 else:
                     return 'Real'
         
-        return 'Desconocido'
+        # Otros operadores (solo numéricos)
+        else:
+            if tipo_izq not in ['Entero', 'Real'] or tipo_der not in ['Entero', 'Real']:
+                # El mensaje de otra operación mala se propaga tal cual: meterlo
+                # dentro del nuevo lo haría crecer con cada operación
+                # (a * b * c * ... daba un mensaje de tamaño cuadrático)
+                for tipo in (tipo_izq, tipo_der):
+                    if str(tipo).startswith(MENSAJES_OPERACION):
+                        return tipo
+                return f'¡Ombe! La operación "{op}" solo funciona con números, no con {tipo_izq} y {tipo_der} eche'
+            
+            if tipo_izq == 'Entero' and tipo_der == 'Entero':
+                return 'Entero'
+            else:
+                return 'Real'
+    
+    @staticmethod
+    def error_lista(op, tipo_izq, tipo_der):
+        """Mensaje de una suma con una Lista completa o con un acceso malo a una (None si no hay)"""
+        for tipo in (tipo_izq, tipo_der):
+            if str(tipo).startswith(MENSAJE_LISTA):
+                return tipo
+        if AnalizadorSemantico.tipo_elemento(tipo_izq) or AnalizadorSemantico.tipo_elemento(tipo_der):
+            return f'¡Ombe! La operación "{op}" solo funciona con números, no con {tipo_izq} y {tipo_der} eche'
+        return None
     
     def tipos_compatibles(self, tipo_declarado, tipo_expresion):
         """Verifica si dos tipos son compatibles"""
@@ -204,6 +646,16 @@ class AnalizadorSemantico:
         if visitados is None:
             visitados = set()
         
+        # Seguir la cadena de variables (a = b; b = c; ...) sin recursión
+        while isinstance(expresion, tuple) and expresion[0] == 'variable':
+            variable = expresion[1]
+            
+            if variable in visitados or not self.variable_tiene_valor(variable):
+                return f"[{variable}]"
+            
+            visitados.add(variable)
+            expresion = self.tabla_simbolos[variable]['valor']
+        
         if not isinstance(expresion, tuple):
             return str(expresion)
         
@@ -219,24 +671,15 @@ class AnalizadorSemantico:
         elif expresion[0] == 'cadena':
             return expresion[1]
         
-        elif expresion[0] == 'variable':
-            variable = expresion[1]
-            
-            if variable in visitados:
-                return f"[{variable}]"
-            
-            if self.variable_tiene_valor(variable):
-                valor_almacenado = self.tabla_simbolos[variable]['valor']
-                visitados.add(variable)
-                return self.obtener_valor_expresion(valor_almacenado, visitados)
-            
-            return f"[{variable}]"
-        
         elif expresion[0] == 'capturar':
             tipo_captura = expresion[1]
             return f"[Captura.{tipo_captura}()]"
         
-        elif expresion[0] == 'operacion_binaria':
+        elif expresion[0] == 'elemento':
+            # Los elementos de una Lista solo se conocen al ejecutar
+            return f"[{self.texto_elemento(expresion[1], expresion[2])}]"
+        
+        elif expresion[0] in ('operacion_binaria', 'negacion'):
             resultado = self.evaluar_operacion(expresion, visitados)
             if resultado is not None:
                 if isinstance(resultado, float) and resultado == int(resultado):
@@ -247,113 +690,206 @@ class AnalizadorSemantico:
         return str(expresion)
     
     def evaluar_operacion(self, expresion, visitados=None):
-        """Evalúa una operación binaria y retorna el resultado numérico"""
+        """Evalúa una operación binaria y retorna el resultado numérico.
+        
+        Como en obtener_tipo_expresion, lo bajito va por recursión y lo que
+        pasa de PROFUNDIDAD_RECURSIVA sigue con la pila de valor_con_pila.
+        """
         if visitados is None:
             visitados = set()
-        
-        if not isinstance(expresion, tuple):
+        return self.valor_recursivo(expresion, visitados, self.PROFUNDIDAD_RECURSIVA)
+    
+    def valor_recursivo(self, nodo, visitados, margen):
+        """Valor de un nodo con a lo sumo `margen` frames más (None si no se puede)"""
+        if not isinstance(nodo, tuple):
             return None
-        
-        if expresion[0] == 'operacion_binaria':
-            op, izq, der = expresion[1], expresion[2], expresion[3]
+        clase = nodo[0]
+        if clase == 'numero':
+            return nodo[1]
+        if clase == 'operacion_binaria':
+            # Las subexpresiones constantes se evalúan una sola vez por nodo
+            constante = id(nodo) in self.nodos.sin_variables
+            if constante and id(nodo) in self.cache_valores:
+                return self.cache_valores[id(nodo)]
+            if margen == 0:
+                return self.valor_con_pila(nodo, visitados)
+            val_izq = self.valor_recursivo(nodo[2], visitados, margen - 1)
+            val_der = self.valor_recursivo(nodo[3], visitados, margen - 1)
+            resultado = None if val_izq is None or val_der is None else self.operar(nodo[1], val_izq, val_der)
+            if constante:
+                self.cache_valores[id(nodo)] = resultado
+            return resultado
+        if margen == 0:
+            return self.valor_con_pila(nodo, visitados)
+        if clase == 'variable':
+            var = nodo[1]
+            if var in visitados or not self.variable_tiene_valor(var):
+                return None
+            visitados.add(var)
+            return self.valor_recursivo(self.tabla_simbolos[var]['valor'], visitados, margen - 1)
+        if clase == 'negacion':
+            valor = self.valor_recursivo(nodo[1], visitados, margen - 1)
+            return None if valor is None else -valor
+        return None
+    
+    def valor_con_pila(self, expresion, visitados):
+        """Valor de una expresión con una pila explícita: los operandos se
+        evalúan de izquierda a derecha (igual que valor_recursivo), así
+        `visitados` se llena en el mismo orden.
+        """
+        cache_valores = self.cache_valores
+        sin_variables = self.nodos.sin_variables
+        tabla = self.tabla_simbolos
+        operar = self.operar
+        combinar = self.COMBINAR
+        
+        valores = []
+        # En la pila van nodos por evaluar; COMBINAR indica que el nodo de abajo
+        # ya tiene los valores de sus hijos encima de `valores`
+        pila = [expresion]
+        while pila:
+            nodo = pila.pop()
             
-            val_izq = self.evaluar_operacion(izq, visitados)
-            val_der = self.evaluar_operacion(der, visitados)
+            if nodo is combinar:
+                nodo = pila.pop()
+                if nodo[0] == 'negacion':
+                    valor = valores.pop()
+                    valores.append(None if valor is None else -valor)
+                    continue
+                val_der = valores.pop()
+                val_izq = valores.pop()
+                if val_izq is None or val_der is None:
+                    resultado = None
+                else:
+                    resultado = operar(nodo[1], val_izq, val_der)
+                if id(nodo) in sin_variables:
+                    cache_valores[id(nodo)] = resultado
+                valores.append(resultado)
+                continue
             
-            if val_izq is None or val_der is None:
-                return None
+            if not isinstance(nodo, tuple):
+                valores.append(None)
+                continue
             
-            try:
-                if op == '+':
-                    return val_izq + val_der
-                elif op == '-':
-                    return val_izq - val_der
-                elif op == '*':
-                    return val_izq * val_der
-                elif op == '/':
-                    if val_der == 0:
-                        return None
-                    return val_izq / val_der
-            except:
-                return None
-        
-        elif expresion[0] == 'numero':
-            return expresion[1]
-        
-        elif expresion[0] == 'variable':
-            var = expresion[1]
+            clase = nodo[0]
+            if clase == 'operacion_binaria':
+                # Las subexpresiones constantes se evalúan una sola vez por nodo
+                if id(nodo) in sin_variables and id(nodo) in cache_valores:
+                    valores.append(cache_valores[id(nodo)])
+                    continue
+                pila.append(nodo)
+                pila.append(combinar)
+                pila.append(nodo[3])
+                pila.append(nodo[2])
             
-            if var in visitados:
-                return None
+            elif clase == 'numero':
+                valores.append(nodo[1])
+            
+            elif clase == 'variable':
+                var = nodo[1]
+                if var in visitados or not self.variable_tiene_valor(var):
+                    valores.append(None)
+                else:
+                    visitados.add(var)
+                    pila.append(tabla[var]['valor'])
             
-            if self.variable_tiene_valor(var):
-                visitados.add(var)
-                return self.evaluar_operacion(self.tabla_simbolos[var]['valor'], visitados)
+            elif clase == 'negacion':
+                pila.append(nodo)
+                pila.append(combinar)
+                pila.append(nodo[1])
             
-            return None
+            else:
+                valores.append(None)
         
+        return valores[0]
+    
+    @staticmethod
+    def operar(op, val_izq, val_der):
+        """Aplica un operador aritmético (None si no se puede, ej: división por cero)"""
+        try:
+            if op == '+':
+                return val_izq + val_der
+            elif op == '-':
+                return val_izq - val_der
+            elif op == '*':
+                return val_izq * val_der
+            elif op == '/':
+                if val_der == 0:
+                    return None
+                return val_izq / val_der
+        except:
+            return None
         return None
     
     # ==================== GESTIÓN DE MENSAJES ====================
     
-    def agregar_mensaje(self, tipo, linea, mensaje):
+    def agregar_mensaje(self, tipo, linea, codigo, *args):
         """Agrega un mensaje evitando duplicados por línea"""
-        # Evitar duplicados en la misma línea
-        clave = (tipo, linea, mensaje)
+        # Las sentencias llegan en orden, así que basta recordar las claves de la línea actual
+        if linea != self.linea_actual:
+            self.linea_actual = linea
+            self.claves_linea.clear()
+        
+        # Los errores se comparan por texto (ERROR_TIPO puede repetir el texto de otro código)
+        if tipo == 'error':
+            clave = (tipo, Diagnostico(tipo, linea, codigo, args).mensaje)
+        else:
+            clave = (tipo, codigo, args)
+        
+        if clave in self.claves_linea:
+            return
+        self.claves_linea.add(clave)
         
-        # Verificar si ya existe este mensaje exacto
-        if any(m['tipo'] == tipo and m['linea'] == linea and m['mensaje'] == mensaje 
-               for m in self.mensajes):
+        if tipo == 'exito' and self.modo_lote:
+            self.aciertos_omitidos += 1
             return
+        if tipo == 'error':
+            self.errores += 1
         
-        self.mensajes.append({
-            'tipo': tipo,
-            'linea': linea,
-            'mensaje': mensaje
-        })
+        posicion, fin = self.span_actual if self.span_actual else (None, None)
+        self.mensajes.append(Diagnostico(tipo, linea, codigo, args, posicion, fin))
     
-    def validar_mensaje(self, expresion, linea):
+    def validar_mensaje(self, expresion, linea, span=None):
         """Valida la expresión de un Mensaje.Texto()"""
+        self.span_actual = span
         if isinstance(expresion, tuple) and expresion[0] == 'error':
             if len(expresion) > 1:
                 var_nombre = expresion[1]
                 if var_nombre == 'variable_no_definida':
                     var_nombre = expresion[2]
-                    self.agregar_mensaje('error', linea, 
-                        f"¡Ombe! La variable '{var_nombre}' no existe, no puedo mostrar un fantasma.")
+                    self.agregar_mensaje('error', linea, Codigo.MENSAJE_FANTASMA, var_nombre)
             # Para otros errores, ya fueron reportados por el parser
             return None
         
         if isinstance(expresion, tuple) and expresion[0] == 'capturar':
             tipo_captura = expresion[1]
-            self.agregar_mensaje('error', linea, 
-                f"¡Ombe! No puedes usar Captura.{tipo_captura}() dentro de Mensaje.Texto()")
+            self.agregar_mensaje('error', linea, Codigo.CAPTURA_EN_MENSAJE, tipo_captura)
             return None
         
         if isinstance(expresion, tuple) and expresion[0] == 'variable':
             var_nombre = expresion[1]
             if not self.variable_existe(var_nombre):
-                self.agregar_mensaje('error', linea, 
-                    f"¡Ombe! La variable '{var_nombre}' no existe, no puedo mostrar un fantasma.")
+                self.agregar_mensaje('error', linea, Codigo.MENSAJE_FANTASMA, var_nombre)
+                return None
+            elif self.lista(var_nombre) is not None:
+                self.agregar_mensaje('error', linea, Codigo.LISTA_EN_MENSAJE, var_nombre)
                 return None
             elif not self.variable_tiene_valor(var_nombre):
-                self.agregar_mensaje('error', linea, 
-                    f"¡Ombe! La variable '{var_nombre}' no tiene valor, asígnale algo primero.")
+                self.agregar_mensaje('error', linea, Codigo.VARIABLE_SIN_VALOR, var_nombre)
                 return None
         
-        if isinstance(expresion, tuple) and expresion[0] == 'operacion_binaria':
+        if isinstance(expresion, tuple) and expresion[0] in ('operacion_binaria', 'elemento'):
             tipo_expresion = self.obtener_tipo_expresion(expresion)
             # Si el tipo es Error (por operadores mal colocados), no mostrar mensaje
             if tipo_expresion == 'Error':
                 return None
             if 'Error:' in str(tipo_expresion) or str(tipo_expresion).startswith('¡'):
-                self.agregar_mensaje('error', linea, tipo_expresion)
+                self.agregar_mensaje('error', linea, Codigo.ERROR_TIPO, tipo_expresion)
                 return None
         
         valor = self.obtener_valor_expresion(expresion)
         if valor is not None:
-            self.agregar_mensaje('exito', linea, 
-                f"Nojoda mostro está bueno el valor es \"{valor}\"")
+            self.agregar_mensaje('exito', linea, Codigo.MENSAJE_OK, valor)
             return valor
         
         return None
\ No newline at end of file
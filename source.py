@@ -0,0 +1,147 @@
+import mmap
+from array import array
+from bisect import bisect_right
+
+
+class IndiceLineas:
+    """Índice de inicios de línea del código fuente.
+
+    Se construye una sola vez, la primera vez que alguien pregunta por
+    una columna, y después cada consulta es una búsqueda binaria.
+    """
+
+    def __init__(self, codigo):
+        self.codigo = codigo
+        self._inicios = None
+
+    @property
+    def inicios(self):
+        """Posición donde empieza cada línea (la línea 1 empieza en 0)"""
+        if self._inicios is None:
+            inicios = [0]
+            codigo = self.codigo
+            posicion = codigo.find('\n')
+            while posicion != -1:
+                inicios.append(posicion + 1)
+                posicion = codigo.find('\n', posicion + 1)
+            self._inicios = inicios
+        return self._inicios
+
+    def linea(self, posicion):
+        """Número de línea (desde 1) de una posición"""
+        return bisect_right(self.inicios, posicion)
+
+    def columna(self, posicion):
+        """Número de columna (desde 1) de una posición"""
+        inicios = self.inicios
+        return posicion - inicios[bisect_right(inicios, posicion) - 1] + 1
+
+    def ubicacion(self, posicion):
+        """Retorna (línea, columna) de una posición"""
+        inicios = self.inicios
+        linea = bisect_right(inicios, posicion)
+        return linea, posicion - inicios[linea - 1] + 1
+
+    def texto_linea(self, linea):
+        """Texto de una línea sin el salto final"""
+        inicios = self.inicios
+        if linea < 1 or linea > len(inicios):
+            return ''
+        fin = inicios[linea] - 1 if linea < len(inicios) else len(self.codigo)
+        return self.codigo[inicios[linea - 1]:fin]
+
+
+class FuenteArchivo:
+    """Código fuente cargado desde un archivo mapeado en memoria.
+
+    El texto se decodifica directo desde el mapa (sin leer primero todo el
+    archivo a un `bytes`). Se prueba UTF-8 (con o sin BOM) y, si no es
+    válido, Latin-1. Con los inicios de línea en bytes se traducen
+    posiciones del texto a posiciones en el archivo y al revés.
+    """
+
+    BOM_UTF8 = b'\xef\xbb\xbf'
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        with open(ruta, 'rb') as archivo:
+            try:
+                datos = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Archivo vacío: mmap no acepta tamaño 0
+                datos = None
+        if datos is not None and hasattr(datos, 'madvise'):
+            # Se recorre una sola vez de principio a fin
+            datos.madvise(mmap.MADV_SEQUENTIAL)
+        try:
+            self.codigo, self.codificacion, self.desplazamiento = self.decodificar(datos)
+            self.tamano = len(datos) if datos is not None else 0
+        finally:
+            if datos is not None:
+                datos.close()
+        # Si cada carácter ocupa un byte, las posiciones coinciden (ASCII o Latin-1)
+        self.un_byte = self.tamano - self.desplazamiento == len(self.codigo)
+        self.indice = IndiceLineas(self.codigo)
+        self._inicios_bytes = None
+
+    @classmethod
+    def decodificar(cls, datos):
+        """Retorna (texto, codificación, bytes del BOM)"""
+        if datos is None:
+            return '', 'utf-8', 0
+        desplazamiento = len(cls.BOM_UTF8) if datos[:3] == cls.BOM_UTF8 else 0
+        # Las vistas se liberan antes de cerrar el mapa
+        with memoryview(datos) as todo, todo[desplazamiento:] as vista:
+            try:
+                return str(vista, 'utf-8'), 'utf-8', desplazamiento
+            except UnicodeDecodeError:
+                if desplazamiento:
+                    raise
+                # Archivos guardados en Windows con "ñ" y tildes de un byte
+                return str(vista, 'latin-1'), 'latin-1', 0
+
+    @property
+    def inicios_bytes(self):
+        """Byte (contado después del BOM) donde empieza cada línea.
+
+        Solo hace falta si hay caracteres de más de un byte; se arma la
+        primera vez que se pide y se guarda en un arreglo compacto.
+        """
+        if self._inicios_bytes is None:
+            if self.un_byte:
+                self._inicios_bytes = self.indice.inicios
+            else:
+                codigo = self.codigo
+                codificacion = self.codificacion
+                inicios = self.indice.inicios
+                bytes_linea = array('q', [0])
+                acumulado = 0
+                for i in range(1, len(inicios)):
+                    acumulado += len(codigo[inicios[i - 1]:inicios[i]].encode(codificacion))
+                    bytes_linea.append(acumulado)
+                self._inicios_bytes = bytes_linea
+        return self._inicios_bytes
+
+    def byte(self, posicion):
+        """Posición en el archivo (en bytes) de una posición del texto"""
+        if self.un_byte:
+            return posicion + self.desplazamiento
+        linea = self.indice.linea(posicion)
+        inicio = self.indice.inicios[linea - 1]
+        prefijo = self.codigo[inicio:posicion].encode(self.codificacion)
+        return self.desplazamiento + self.inicios_bytes[linea - 1] + len(prefijo)
+
+    def posicion(self, byte):
+        """Posición en el texto del carácter que contiene un byte del archivo"""
+        byte = max(byte - self.desplazamiento, 0)
+        if self.un_byte:
+            return min(byte, len(self.codigo))
+        linea = bisect_right(self.inicios_bytes, byte)
+        texto = self.indice.texto_linea(linea).encode(self.codificacion)
+        prefijo = texto[:byte - self.inicios_bytes[linea - 1]]
+        # Un carácter cortado a la mitad no cuenta: la posición queda en su inicio
+        return self.indice.inicios[linea - 1] + len(prefijo.decode(self.codificacion, 'ignore'))
+
+    def ubicacion_byte(self, byte):
+        """Retorna (línea, columna) de un byte del archivo"""
+        return self.indice.ubicacion(self.posicion(byte))
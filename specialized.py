@@ -0,0 +1,388 @@
+"""Ejecución especializada por tipos: el programa se traduce a una función de Python.
+
+Los programas en Costeñol no tienen saltos, así que al recorrer las
+sentencias en orden se sabe exactamente qué tipo tiene cada variable en
+cada punto (y si ya tiene valor). Con eso cada operación se emite ya
+resuelta: suma o producto de enteros, operaciones reales con una sola
+conversión float() donde un Entero entra a una operación Real, y
+concatenación para Texto + Texto. La comprobación de división por cero
+solo se emite si el divisor no es una constante distinta de cero.
+
+Los tipos que se siguen son los de ejecución, no los del semántico: '/'
+siempre da Real (también Entero / Entero, que el semántico tipa como
+Entero), así que una variable Entero puede guardar un Real. Si algún tipo
+no se puede saber se usa la operación genérica de Interprete.
+
+Las expresiones se aplanan en asignaciones a temporales (uno por nivel de
+la pila de evaluación), así una expresión muy anidada no anida el código
+generado.
+
+Las Listas son array('q') o array('d') de tamaño fijo: un índice constante
+ya se revisó al compilar y se emite como subíndice directo; uno variable
+Entero se revisa con una sola comparación contra el tamaño.
+"""
+import weakref
+from time import perf_counter
+
+from runtime import (NUMERO_MUY_GRANDE, TIEMPO_AGOTADO, EntradaLista, ErrorEjecucion, Interprete, Salida,
+                     TiempoAgotado, formatear_valor, guardar_elemento, nueva_lista, posicion_lista, texto_entero)
+
+DIVISION_CERO = "¡Ombe! Estás dividiendo por cero"
+
+# Código de cada función generada -> línea del programa de cada línea de Python
+# (índice f_lineno - 1; 0 = fuera de una sentencia). Lo usa el perfil por muestreo
+LINEAS_FUENTE = weakref.WeakKeyDictionary()
+
+
+def linea_fuente(traza, codigo):
+    """Línea del programa donde iba la función generada `codigo` cuando saltó la excepción"""
+    while traza is not None:
+        if traza.tb_frame.f_code is codigo:
+            return LINEAS_FUENTE[codigo][traza.tb_lineno - 1] or None
+        traza = traza.tb_next
+    return None
+
+
+def formatear_real(valor):
+    """formatear_valor sin preguntar el tipo (el valor ya se sabe que es Real)"""
+    if valor.is_integer():
+        return str(int(valor))
+    return str(valor)
+
+
+def a_real(valor):
+    """Conversión de Interprete para variables Real, cuando el tipo no se conoce"""
+    return float(valor) if isinstance(valor, int) else valor
+
+
+class GeneradorEspecializado:
+    """Traduce las sentencias de un Programa al código de una función de Python"""
+
+    COMBINAR = object()
+
+    def __init__(self, con_plazo=False, con_perfil=False):
+        # Con plazo se revisa el reloj antes de cada sentencia, como Interprete
+        self.con_plazo = con_plazo
+        # Con perfil se mide cada sentencia y se pasa a perfil.registrar (profiler.py)
+        self.con_perfil = con_perfil
+
+    def generar(self, programa):
+        """Retorna la función ejecutar(entrada, salida, plazo, perfil)"""
+        codigo = self.generar_codigo(programa)
+        entorno = {
+            'ErrorEjecucion': ErrorEjecucion,
+            'TiempoAgotado': TiempoAgotado,
+            'perf_counter': perf_counter,
+            'formatear_valor': formatear_valor,
+            'formatear_real': formatear_real,
+            'texto_entero': texto_entero,
+            'a_real': a_real,
+            'operar': Interprete.operar,
+            'nueva_lista': nueva_lista,
+            'posicion_lista': posicion_lista,
+            'guardar_elemento': guardar_elemento,
+        }
+        exec(compile(codigo, '<costeñol especializado>', 'exec'), entorno)
+        funcion = entorno['ejecutar']
+        LINEAS_FUENTE[funcion.__code__] = self.fuente
+        return funcion
+
+    def generar_codigo(self, programa):
+        """Código fuente de la función (útil para revisar qué se emitió)"""
+        self.lineas = []
+        # Línea del programa de cada línea emitida
+        self.fuente = []
+        self.linea_actual = 0
+        # Nombre de Python de cada variable (los identificadores podrían chocar con palabras de Python)
+        self.nombres = {}
+        # Tipo en ejecución de cada variable que ya tiene valor
+        self.tipos = {}
+        # Tipo de elemento y tamaño de cada Lista
+        self.listas = {}
+
+        for sentencia in programa.sentencias:
+            clase = sentencia[0]
+            self.linea_actual = sentencia[-1]
+            if self.con_plazo:
+                self.emitir(f'if perf_counter() > plazo: raise TiempoAgotado({TIEMPO_AGOTADO!r}, {sentencia[-1]!r})')
+            if self.con_perfil:
+                self.emitir(f'inicio = perf_counter(); linea = {sentencia[-1]!r}')
+
+            if clase == 'asignar':
+                _, nombre, expresion, linea = sentencia
+                valor, tipo = self.expresion(expresion, linea)
+                if programa.tipos.get(nombre) == 'Real':
+                    valor, tipo = self.convertir_real(valor, tipo)
+                variable = self.variable(nombre)
+                if valor == 't0' and self.lineas[-1].startswith('    t0 = '):
+                    # El resultado va directo a la variable, sin pasar por el temporal
+                    self.lineas[-1] = f'    {variable} = ' + self.lineas[-1][len('    t0 = '):]
+                else:
+                    self.emitir(f'{variable} = {valor}')
+                self.tipos[nombre] = tipo
+
+            elif clase == 'mensaje_texto':
+                _, expresion, linea = sentencia
+                if isinstance(expresion, str):
+                    self.emitir(f'escribir({expresion!r})')
+                else:
+                    self.mostrar(*self.expresion(expresion, linea))
+
+            elif clase == 'declarar_lista':
+                _, nombre, tipo, tamano, _ = sentencia
+                self.emitir(f'{self.variable(nombre)} = nueva_lista({tipo!r}, {tamano!r})')
+                self.listas[nombre] = (tipo, tamano)
+
+            elif clase == 'asignar_elemento':
+                self.guardar_elemento(*sentencia[1:])
+
+            if self.con_perfil:
+                self.emitir(f'registrar({sentencia[-1]!r}, perf_counter() - inicio); linea = 0')
+
+        self.linea_actual = 0
+        self.emitir('salida.vaciar()')
+        self.emitir('return salida')
+
+        encabezado = [
+            'def ejecutar(entrada, salida, plazo, perfil):',
+            '    leer = entrada.leer',
+            '    escribir = salida.escribir',
+        ]
+        cuerpo = self.lineas
+        if self.con_perfil:
+            # Una sentencia que falla también se registra, como en Interprete
+            encabezado += ['    registrar = perfil.registrar', '    linea = 0', '    try:']
+            cuerpo = ['    ' + linea for linea in cuerpo] + [
+                '    except BaseException:',
+                '        if linea: registrar(linea, perf_counter() - inicio)',
+                '        raise',
+            ]
+        self.fuente = tuple([0] * len(encabezado) + self.fuente + [0] * (len(cuerpo) - len(self.fuente)))
+        return '\n'.join(encabezado + cuerpo) + '\n'
+
+    def variable(self, nombre):
+        """Nombre de Python de la variable"""
+        if nombre not in self.nombres:
+            self.nombres[nombre] = f'v{len(self.nombres)}'
+        return self.nombres[nombre]
+
+    def mostrar(self, valor, tipo):
+        """Emite el Mensaje.Texto de un valor con el formato de su tipo"""
+        if tipo == 'Texto':
+            self.emitir(f'escribir({valor})')
+        elif tipo == 'Entero':
+            self.emitir(f'escribir(texto_entero({valor}, {self.linea_actual!r}))')
+        elif tipo == 'Real':
+            self.emitir(f'escribir(formatear_real({valor}))')
+        else:
+            self.emitir(f'escribir(formatear_valor({valor}, {self.linea_actual!r}))')
+
+    def emitir(self, linea):
+        self.lineas.append('    ' + linea)
+        self.fuente.append(self.linea_actual)
+
+    # ===================== EXPRESIONES =====================
+
+    def expresion(self, expresion, linea):
+        """Emite la expresión; retorna (código del valor, tipo en ejecución).
+
+        Misma pila que Interprete.evaluar (izquierda a derecha). Las hojas
+        quedan como código (nombre o constante); cada operación y cada
+        Captura se guarda en el temporal t<n> de su nivel en la pila.
+        """
+        combinar = self.COMBINAR
+        resultados = []
+        pila = [expresion]
+        while pila:
+            nodo = pila.pop()
+
+            if nodo is combinar:
+                nodo = pila.pop()
+                destino = f't{len(resultados) - (2 if nodo[0] == "operacion_binaria" else 1)}'
+                if nodo[0] == 'negacion':
+                    valor, tipo = resultados.pop()
+                    self.emitir(f'{destino} = -{valor}')
+                elif nodo[0] == 'elemento':
+                    posicion = self.posicion(nodo[1], *resultados.pop(), destino, linea)
+                    self.emitir(f'{destino} = {self.nombres[nodo[1]]}[{posicion}]')
+                    tipo = self.listas[nodo[1]][0]
+                else:
+                    der = resultados.pop()
+                    izq = resultados.pop()
+                    tipo = self.operacion(destino, nodo[1], izq, der, linea)
+                resultados.append((destino, tipo))
+                continue
+
+            clase = nodo[0] if isinstance(nodo, tuple) else None
+            if clase == 'operacion_binaria':
+                pila.append(nodo)
+                pila.append(combinar)
+                pila.append(nodo[3])
+                pila.append(nodo[2])
+
+            elif clase == 'numero':
+                resultados.append((repr(nodo[1]), 'Entero' if isinstance(nodo[1], int) else 'Real'))
+
+            elif clase == 'cadena':
+                resultados.append((repr(nodo[1]), 'Texto'))
+
+            elif clase == 'variable':
+                if nodo[1] not in self.tipos:
+                    mensaje = f"¡Ombe! La variable '{nodo[1]}' no tiene valor"
+                    self.emitir(f'raise ErrorEjecucion({mensaje!r}, {linea!r})')
+                    resultados.append(('None', None))
+                else:
+                    resultados.append((self.nombres[nodo[1]], self.tipos[nodo[1]]))
+
+            elif clase == 'elemento':
+                if nodo[2][0] == 'numero':
+                    # Índice constante: su rango ya se revisó al compilar
+                    resultados.append((f'{self.nombres[nodo[1]]}[{nodo[2][1]!r}]', self.listas[nodo[1]][0]))
+                else:
+                    pila.append(nodo)
+                    pila.append(combinar)
+                    pila.append(nodo[2])
+
+            elif clase == 'capturar':
+                destino = f't{len(resultados)}'
+                self.emitir(f'{destino} = leer({nodo[1]!r}, {linea!r})')
+                resultados.append((destino, nodo[1]))
+
+            elif clase == 'negacion':
+                pila.append(nodo)
+                pila.append(combinar)
+                pila.append(nodo[1])
+
+            else:
+                mensaje = f"Expresión no ejecutable: {nodo!r}"
+                self.emitir(f'raise ErrorEjecucion({mensaje!r}, {linea!r})')
+                resultados.append(('None', None))
+
+        return resultados[0]
+
+    # ===================== LISTAS =====================
+
+    def posicion(self, nombre, valor, tipo, destino, linea):
+        """Emite la revisión del índice `valor` de la Lista; retorna el código del índice revisado"""
+        lista = self.nombres[nombre]
+        if tipo == 'Entero':
+            # posicion_lista solo se llama para armar el error
+            self.emitir(f'if not 0 <= {valor} < {self.listas[nombre][1]}: '
+                        f'posicion_lista({lista}, {valor}, {nombre!r}, {linea!r})')
+            return valor
+        self.emitir(f'{destino} = posicion_lista({lista}, {valor}, {nombre!r}, {linea!r})')
+        return destino
+
+    def guardar_elemento(self, nombre, indice, expresion, linea):
+        """Emite nombre[indice] = expresion (el índice se evalúa primero)"""
+        lista = self.nombres[nombre]
+        if indice[0] == 'numero':
+            posicion = repr(indice[1])
+        else:
+            valor, tipo = self.expresion(indice, linea)
+            if valor.startswith('t'):
+                # El valor se calcula en los mismos temporales
+                self.emitir(f'p = {valor}')
+                valor = 'p'
+            posicion = self.posicion(nombre, valor, tipo, 'p', linea)
+
+        valor, tipo = self.expresion(expresion, linea)
+        if tipo == 'Real' and self.listas[nombre][0] == 'Real':
+            self.emitir(f'{lista}[{posicion}] = {valor}')
+        elif tipo == 'Entero':
+            # Un Entero de Python puede no caber en 64 bits: guardar_elemento arma el error
+            self.emitir(f'try: {lista}[{posicion}] = {valor}')
+            self.emitir(f'except OverflowError: guardar_elemento({lista}, {posicion}, {valor}, {nombre!r}, {linea!r})')
+        else:
+            self.emitir(f'guardar_elemento({lista}, {posicion}, {valor}, {nombre!r}, {linea!r})')
+
+    # ===================== OPERACIONES =====================
+
+    def operacion(self, destino, op, izq, der, linea):
+        """Emite `destino = izq op der` para los tipos conocidos; retorna el tipo"""
+        (val_izq, tipo_izq), (val_der, tipo_der) = izq, der
+        numericos = ('Entero', 'Real')
+
+        if op == '+' and tipo_izq == 'Texto' and tipo_der == 'Texto':
+            self.emitir(f'{destino} = {val_izq} + {val_der}')
+            return 'Texto'
+
+        if tipo_izq not in numericos or tipo_der not in numericos:
+            self.emitir(f'{destino} = operar({op!r}, {val_izq}, {val_der}, {linea!r})')
+            return None
+
+        if op == '/':
+            if not self.constante_no_cero(val_der):
+                self.emitir(f'if {val_der} == 0: raise ErrorEjecucion({DIVISION_CERO!r}, {linea!r})')
+            if tipo_izq == 'Entero' and tipo_der == 'Entero':
+                # División real exacta de enteros: no se convierte antes
+                self.emitir(f'{destino} = {val_izq} / {val_der}')
+                return 'Real'
+
+        elif tipo_izq == 'Entero' and tipo_der == 'Entero':
+            self.emitir(f'{destino} = {val_izq} {op} {val_der}')
+            return 'Entero'
+
+        # Entero -> Real: una sola conversión, en el operando que la necesita
+        val_izq, _ = self.convertir_real(val_izq, tipo_izq)
+        val_der, _ = self.convertir_real(val_der, tipo_der)
+        self.emitir(f'{destino} = {val_izq} {op} {val_der}')
+        return 'Real'
+
+    @staticmethod
+    def convertir_real(valor, tipo):
+        """Código de `valor` como Real (las constantes se convierten al generar)"""
+        if tipo == 'Real':
+            return valor, 'Real'
+        if tipo != 'Entero':
+            return f'a_real({valor})', None
+        if valor.lstrip('-').isdigit():
+            try:
+                return repr(float(int(valor))), 'Real'
+            except OverflowError:
+                pass
+        return f'float({valor})', 'Real'
+
+    @staticmethod
+    def constante_no_cero(valor):
+        try:
+            return float(valor) != 0
+        except ValueError:
+            return False
+
+
+class InterpreteEspecializado(Interprete):
+    """Interprete que ejecuta cada programa con su función especializada por tipos.
+
+    La función se genera la primera vez que se ejecuta el programa y se
+    guarda (una por cada combinación de plazo y perfil).
+    """
+
+    def __init__(self):
+        # id(sentencias) -> (sentencias, con_plazo, función)
+        self.funciones = {}
+
+    def __getstate__(self):
+        # Las funciones generadas no se pueden enviar a otro proceso; allá se regeneran
+        return {'funciones': {}}
+
+    def funcion(self, programa, con_plazo, con_perfil=False):
+        clave = (id(programa.sentencias), con_plazo, con_perfil)
+        memo = self.funciones.get(clave)
+        if memo is not None and memo[0] is programa.sentencias:
+            return memo[1]
+        funcion = GeneradorEspecializado(con_plazo, con_perfil).generar(programa)
+        # Guardar las sentencias evita que su id se recicle mientras están en el memo
+        self.funciones[clave] = (programa.sentencias, funcion)
+        return funcion
+
+    def ejecutar(self, programa, entrada=None, salida=None, plazo=None):
+        """Igual que Interprete.ejecutar, con la función especializada"""
+        entrada = entrada if entrada is not None else EntradaLista([])
+        salida = salida if salida is not None else Salida()
+        perfil = self.perfil
+        funcion = self.funcion(programa, plazo is not None, perfil is not None)
+        try:
+            return funcion(entrada, salida, plazo, perfil)
+        except OverflowError as e:
+            raise ErrorEjecucion(NUMERO_MUY_GRANDE, linea_fuente(e.__traceback__, funcion.__code__)) from None
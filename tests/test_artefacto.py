@@ -0,0 +1,159 @@
+"""Artefactos compilados (artifact.py): guardar y volver a cargar da lo mismo"""
+import math
+import struct
+
+import pytest
+
+from artifact import CABECERA, FORMATO, MAGIA, Artefacto, ArtefactoInvalido, guardar_artefacto, serializar
+from golden import huella
+from parser import Compilador
+from runtime import ErrorEjecucion, Programa
+
+UTIL = 'base Entero;\nbase = 40;\nnombre Texto;\nnombre = "util";\n'
+
+# (nombre, código, entradas para ejecutarlo)
+PROGRAMAS = [
+    ('listas', 'L Lista Entero[3];\nL[0] = Captura.Entero();\nL[2] = L[0] * 2;\nMensaje.Texto(L[2]);\n'
+               'R Lista Real[2];\nR[1] = L[2] / 4;\nMensaje.Texto(R[1]);\ni Entero;\ni = 5;\nMensaje.Texto(L[i]);\n',
+     [['3'], ['-7']]),
+    ('enteros grandes', 'x Entero;\nx = 99999999999999999999999;\ny Entero;\ny = -2147483649;\n'
+                        'Mensaje.Texto(x * 2);\nMensaje.Texto(y);\nr Real;\nr = 0,1 + 1,5;\nMensaje.Texto(r);\n',
+     [[]]),
+    ('textos', 'Mensaje.Texto("¡Qué más, ñero! 😀");\nt Texto;\nt = Captura.Texto();\nMensaje.Texto(t + "!");\n',
+     [['hola'], ['']]),
+    ('con errores', 'x Entero;\nx = "t";\ny = 3;\nz Entero z;\nMensaje.Texto(1);\n', [[]]),
+    ('vacío', '', [[]]),
+    ('solo comentarios', '/* nada */\n', [[]]),
+]
+
+
+def ida_y_vuelta(compilador, codigo, interfaces=None, ruta=None):
+    """Analiza, guarda y carga; retorna (resultado, tabla, artefacto abierto)"""
+    resultado = compilador.analizar(codigo, interfaces=interfaces)
+    tabla = compilador.semantico.tabla_simbolos
+    if ruta is None:
+        return resultado, tabla, Artefacto.desde_bytes(serializar(resultado, tabla, compilador.indice))
+    guardar_artefacto(str(ruta), resultado, tabla, compilador.indice)
+    return resultado, tabla, Artefacto(str(ruta))
+
+
+def revisar_igual(resultado, tabla, artefacto):
+    cargado = artefacto.resultado()
+    assert cargado['resultado'] == resultado['resultado']
+    assert cargado['exito'] == resultado['exito'] and cargado['vacio'] == resultado['vacio']
+    assert cargado['estadisticas'] == resultado['estadisticas']
+    assert huella(cargado) == huella(resultado)
+    assert [(m.codigo, m.args, m.span) for m in cargado['mensajes']] == \
+           [(m.codigo, m.args, m.span) for m in resultado['mensajes']]
+    assert artefacto.tabla_simbolos == tabla
+
+
+def correr(programa, entradas):
+    """Salida y error de cada entrada, o el error si el programa no se puede ejecutar"""
+    try:
+        resultados = programa.ejecutar_lote(entradas)
+    except ErrorEjecucion as e:
+        return str(e)
+    return [(salida, None if error is None else str(error)) for salida, error in resultados]
+
+
+@pytest.fixture(scope='module')
+def compilador():
+    return Compilador()
+
+
+@pytest.mark.parametrize('nombre, codigo, entradas', PROGRAMAS, ids=[p[0] for p in PROGRAMAS])
+@pytest.mark.parametrize('en_archivo', [False, True], ids=['bytes', 'archivo'])
+def test_ida_y_vuelta(compilador, tmp_path, nombre, codigo, entradas, en_archivo):
+    ruta = tmp_path / 'programa.cosb' if en_archivo else None
+    resultado, tabla, artefacto = ida_y_vuelta(compilador, codigo, ruta=ruta)
+    with artefacto:
+        revisar_igual(resultado, tabla, artefacto)
+        for especializado in (False, True):
+            programa = artefacto.programa(especializado)
+            original = compilador.compilar(codigo, especializado)
+            assert correr(programa, entradas) == correr(original, entradas)
+
+
+def test_con_importar(compilador):
+    compilador.analizar(UTIL, exporta=True)
+    interfaces = {'util': compilador.semantico.interfaz('util')}
+    codigo = 'Importar util;\ntotal Entero;\ntotal = base + 2;\nMensaje.Texto(total);\nMensaje.Texto(nombre);\n'
+    resultado, tabla, artefacto = ida_y_vuelta(compilador, codigo, interfaces)
+    with artefacto:
+        revisar_igual(resultado, tabla, artefacto)
+        assert artefacto.simbolo('base')['modulo'] == 'util'
+        # Lo importado corre antes (como en modules.Proyecto.compilar)
+        tipos = {n: s['tipo'] for n, s in tabla.items()}
+        util = compilador.analizar(UTIL)['resultado']
+        esperado = Programa(util + resultado['resultado'], tipos).ejecutar_lote([[]])
+        assert Programa(util + artefacto.sentencias, artefacto.tipos()).ejecutar_lote([[]]) == esperado
+        assert esperado == [('42\nutil\n', None)]
+
+
+def test_analisis_cortado(compilador):
+    resultado, tabla, artefacto = ida_y_vuelta(Compilador(max_errores=3), 'a Entero;\n' * 20)
+    with artefacto:
+        assert resultado['resultado'] is None and artefacto.sentencias is None
+        revisar_igual(resultado, tabla, artefacto)
+
+
+def test_reales_y_enteros_en_los_bordes():
+    numeros = [-0.0, 0.0, 1e-320, 1.7976931348623157e308, math.inf, -math.inf,
+               2 ** 29 - 1, 2 ** 29, -1, 2 ** 63 - 1, 2 ** 63, -2 ** 63, -2 ** 63 - 1, 10 ** 40]
+    sentencias = [('asignar', 'x', ('numero', numero), i + 1) for i, numero in enumerate(numeros)]
+    resultado = {'exito': True, 'vacio': False, 'resultado': sentencias, 'mensajes': [],
+                 'estadisticas': {'aciertos': 0, 'errores': 0}}
+    with Artefacto.desde_bytes(serializar(resultado, {})) as artefacto:
+        cargados = [sentencia[2][1] for sentencia in artefacto.sentencias]
+    for original, cargado in zip(numeros, cargados):
+        assert type(cargado) is type(original) and cargado == original
+        if isinstance(original, float):
+            assert math.copysign(1.0, cargado) == math.copysign(1.0, original)
+    real = {'exito': True, 'vacio': False, 'resultado': [('asignar', 'x', ('numero', math.nan), 1)],
+            'mensajes': [], 'estadisticas': {'aciertos': 0, 'errores': 0}}
+    with Artefacto.desde_bytes(serializar(real, {})) as artefacto:
+        assert math.isnan(artefacto.sentencia(0)[2][1])
+
+
+def test_nodos_compartidos_siguen_compartidos(compilador):
+    codigo = 'x Entero;\nx = 1;\ny Entero;\ny = (x + 1) * (x + 1);\nMensaje.Texto(y);\n'
+    _, _, artefacto = ida_y_vuelta(compilador, codigo)
+    with artefacto:
+        producto = artefacto.sentencia(3)[2]
+        assert producto[2] is producto[3]
+
+
+# ===================== ARCHIVOS INVÁLIDOS =====================
+
+@pytest.fixture(scope='module')
+def datos(compilador):
+    resultado = compilador.analizar('x Entero;\nx = 1;\nMensaje.Texto(x);\n')
+    return serializar(resultado, compilador.semantico.tabla_simbolos, compilador.indice)
+
+
+@pytest.mark.parametrize('dano', [
+    lambda d: b'',
+    lambda d: d[:CABECERA.size - 1],
+    lambda d: b'ZZZZ' + d[4:],
+    lambda d: d[:4] + struct.pack('<H', FORMATO + 1) + d[6:],
+    lambda d: d[:4] + struct.pack('<H', 0) + d[6:],
+    lambda d: d[:CABECERA.size + 8],
+    lambda d: d[:len(d) - 5],
+    lambda d: d[:6] + struct.pack('<H', 2) + d[8:],
+    lambda d: d[:CABECERA.size + 4] + struct.pack('<I', len(d)) + d[CABECERA.size + 8:],
+], ids=['vacío', 'cabecera corta', 'magia', 'formato nuevo', 'formato viejo', 'secciones cortadas',
+        'archivo cortado', 'pocas secciones', 'sección fuera del archivo'])
+def test_archivo_danado_se_rechaza(tmp_path, datos, dano):
+    danado = dano(datos)
+    with pytest.raises(ArtefactoInvalido):
+        Artefacto.desde_bytes(danado)
+    ruta = tmp_path / 'danado.cosb'
+    ruta.write_bytes(danado)
+    with pytest.raises(ArtefactoInvalido):
+        Artefacto(str(ruta))
+
+
+def test_formato_distinto_pide_recompilar(datos):
+    with pytest.raises(ArtefactoInvalido, match='vuelve a compilar'):
+        Artefacto.desde_bytes(MAGIA + struct.pack('<H', FORMATO + 1) + datos[6:])
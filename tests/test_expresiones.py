@@ -0,0 +1,24 @@
+"""Nodos internados (expressions.py): iguales se comparten, distintos no"""
+import math
+
+from expressions import FabricaExpresiones
+
+
+def test_numeros_iguales_se_comparten():
+    nodos = FabricaExpresiones()
+    assert nodos.numero(2) is nodos.numero(2)
+    assert nodos.numero(2.5) is nodos.numero(2.5)
+    assert nodos.numero(-0.0) is nodos.numero(-0.0)
+    suma = nodos.binaria('+', nodos.numero(1), nodos.variable('x'))
+    assert nodos.binaria('+', nodos.numero(1), nodos.variable('x')) is suma
+
+
+def test_numeros_que_python_confunde_no_se_comparten():
+    nodos = FabricaExpresiones()
+    assert nodos.numero(1) is not nodos.numero(1.0)
+    assert nodos.numero(True) is not nodos.numero(1)
+    cero, menos_cero = nodos.numero(0.0), nodos.numero(-0.0)
+    assert cero is not menos_cero
+    assert math.copysign(1.0, cero[1]) == 1.0 and math.copysign(1.0, menos_cero[1]) == -1.0
+    # Tampoco las operaciones que los usan
+    assert nodos.negacion(cero) is not nodos.negacion(menos_cero)
@@ -0,0 +1,86 @@
+"""Modo protegido (limits.py): cada límite corta el análisis con su mensaje, sin excepciones"""
+import pytest
+
+from diagnostics import Codigo
+from limits import LimiteExcedido, Limites
+from parser import Compilador
+
+
+def solo(**limite):
+    """Limites con todo desactivado menos lo que se pasa"""
+    todos = dict(max_caracteres=None, max_tokens=None, max_profundidad=None, max_mensajes=None, max_segundos=None)
+    todos.update(limite)
+    return Limites(**todos)
+
+
+def analizar(codigo, **opciones):
+    return Compilador(advertencias=False, **opciones).analizar(codigo)
+
+
+def revisar_corte(resultado, codigo, maximo=None):
+    """El análisis no tuvo éxito y el último mensaje es el del límite"""
+    ultimo = resultado['mensajes'][-1]
+    assert not resultado['exito']
+    assert resultado['resultado'] is None
+    assert ultimo.codigo == codigo
+    assert all(m.codigo != Codigo.ERROR_INTERNO for m in resultado['mensajes'])
+    assert resultado['estadisticas']['errores'] >= 1
+    if maximo is not None:
+        valor, tope = ultimo.args
+        assert tope == maximo and valor > maximo
+    # El texto se puede armar (las plantillas reciben los argumentos correctos)
+    assert ultimo.mensaje
+
+
+def test_caracteres():
+    codigo = 'x Entero;\n' * 1000
+    revisar_corte(analizar(codigo, limites=solo(max_caracteres=5000)), Codigo.LIMITE_CARACTERES, 5000)
+
+
+def test_tokens():
+    codigo = 'x Real;\n' + 'x = 1 + 2 + 3;\n' * 200
+    revisar_corte(analizar(codigo, limites=solo(max_tokens=500)), Codigo.LIMITE_TOKENS, 500)
+
+
+@pytest.mark.parametrize('expresion', [' + '.join(['x'] * 500), '-(' * 300 + '1' + ')' * 300],
+                         ids=['suma larga', 'negaciones anidadas'])
+def test_profundidad(expresion):
+    codigo = f'x Entero;\nx = {expresion};\n'
+    revisar_corte(analizar(codigo, limites=solo(max_profundidad=50)), Codigo.LIMITE_PROFUNDIDAD, 50)
+
+
+def test_mensajes():
+    # Cada redeclaración es un error: los mensajes crecen con cada línea
+    codigo = 'a Entero;\n' * 500
+    revisar_corte(analizar(codigo, limites=solo(max_mensajes=100)), Codigo.LIMITE_MENSAJES, 100)
+
+
+def test_tiempo():
+    # Con plazo cero el reloj se vence en la primera revisión
+    codigo = 'x Real;\n' + 'x = 1,5 * 2 + 3;\n' * 200
+    revisar_corte(analizar(codigo, limites=solo(max_segundos=0)), Codigo.LIMITE_TIEMPO)
+
+
+def test_max_errores():
+    resultado = analizar('a Entero;\n' * 500, max_errores=10)
+    revisar_corte(resultado, Codigo.DEMASIADOS_ERRORES)
+    # Los errores antes del resumen no pasan del máximo
+    assert resultado['estadisticas']['errores'] == 10 + 1
+
+
+def test_sin_limites_no_se_corta():
+    codigo = 'x Entero;\nx = 1;\nx = ' + ' + '.join(['x'] * 2000) + ';\nMensaje.Texto(x);\n'
+    resultado = analizar(codigo)
+    assert resultado['exito']
+    assert all(m.codigo not in (Codigo.ERROR_INTERNO, Codigo.LIMITE_PROFUNDIDAD) for m in resultado['mensajes'])
+
+
+def test_limites_por_defecto_dejan_pasar_un_programa_normal():
+    resultado = analizar('edad Entero;\nedad = 20 + 1;\nMensaje.Texto(edad);\n', limites=Limites())
+    assert resultado['exito']
+
+
+def test_verificar_fuente_lanza_limite_excedido():
+    with pytest.raises(LimiteExcedido) as error:
+        solo(max_caracteres=3).verificar_fuente('abcd')
+    assert (error.value.limite, error.value.valor, error.value.maximo) == ('caracteres', 4, 3)
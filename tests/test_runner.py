@@ -0,0 +1,87 @@
+"""Runner de casos de prueba (runner.py)"""
+import time
+
+import pytest
+
+from parser import Compilador
+from runner import GRACIA, buscar_casos, correr, ejecutar_casos
+from runtime import TIEMPO_AGOTADO, Programa
+
+# Entero que crece hasta no caber en un Real: r = x no se puede convertir
+DESBORDA = 'x Entero;\nx = Captura.Entero();\n' + 'x = x * x;\n' * 11 + 'r Real;\nr = x;\nMensaje.Texto(r);\n'
+
+# Con 10 una sola sentencia (x * x con miles de millones de cifras) no
+# termina: solo se puede cortar matando el proceso
+DESBOCADO = 'x Entero;\nx = Captura.Entero();\nMensaje.Texto(x);\n' + 'x = x * x;\n' * 32 + 'Mensaje.Texto(x);\n'
+
+
+def escribir_casos(carpeta, casos):
+    for nombre, (entrada, salida) in casos.items():
+        (carpeta / f'{nombre}.in').write_text(entrada, encoding='utf-8')
+        (carpeta / f'{nombre}.out').write_text(salida, encoding='utf-8')
+    return buscar_casos(str(carpeta))
+
+
+class InterpreteRoto:
+    """Intérprete que falla con una excepción que no es ErrorEjecucion"""
+
+    def ejecutar(self, programa, entrada, salida, plazo=None):
+        salida.escribir('antes')
+        raise KeyError('roto')
+
+
+class InterpreteColgado:
+    """Intérprete que se queda pegado (sin revisar el plazo) si lee 'colgado'"""
+
+    def ejecutar(self, programa, entrada, salida, plazo=None):
+        texto = entrada.leer('Texto')
+        salida.escribir(texto)
+        if texto == 'colgado':
+            time.sleep(60)
+
+
+@pytest.mark.parametrize('trabajadores, timeout', [(1, None), (2, None), (1, 5), (2, 5)])
+def test_falla_interna_no_tumba_la_corrida(tmp_path, trabajadores, timeout):
+    casos = escribir_casos(tmp_path, {f'c{i}': ('1\n', 'antes\n') for i in range(3)})
+    programa = Programa([], {}, exito=True, interprete=InterpreteRoto())
+    resultados = ejecutar_casos(programa, casos, trabajadores, timeout)
+    assert [r['estado'] for r in resultados] == ['error'] * 3
+    assert all('KeyError' in r['error'] and r['salida'] == 'antes\n' for r in resultados)
+
+
+def test_un_caso_que_desborda_no_detiene_los_demas(tmp_path):
+    casos = escribir_casos(tmp_path, {'a_grande': ('10\n', ''), 'b_uno': ('1\n', '1\n')})
+    ruta = tmp_path / 'p.cos'
+    ruta.write_text(DESBORDA, encoding='utf-8')
+    informe = correr(str(ruta), str(tmp_path), trabajadores=1)
+    estados = {r['nombre']: r['estado'] for r in informe['casos']}
+    assert estados == {'a_grande': 'error', 'b_uno': 'ok'}
+    assert Compilador(advertencias=False).compilar(DESBORDA).exito
+
+
+@pytest.mark.parametrize('trabajadores', [1, 2])
+def test_caso_colgado_se_mata_al_vencer_el_plazo(tmp_path, trabajadores):
+    casos = escribir_casos(tmp_path, {'a': ('uno\n', 'uno\n'), 'b_colgado': ('colgado\n', 'colgado\n'),
+                                      'c': ('dos\n', 'dos\n'), 'd': ('tres\n', 'tres\n')})
+    programa = Programa([], {}, exito=True, interprete=InterpreteColgado())
+    timeout = 0.3
+    resultados = {r['nombre']: r for r in ejecutar_casos(programa, casos, trabajadores, timeout)}
+    colgado = resultados.pop('b_colgado')
+    assert colgado['estado'] == 'tiempo' and colgado['error'] == TIEMPO_AGOTADO
+    # Lo que mostró se pierde con el proceso
+    assert colgado['salida'] == ''
+    assert colgado['segundos'] >= timeout + GRACIA
+    # Los casos de después corren en un proceso nuevo
+    assert {nombre: r['estado'] for nombre, r in resultados.items()} == {'a': 'ok', 'c': 'ok', 'd': 'ok'}
+
+
+@pytest.mark.parametrize('trabajadores', [1, 2])
+def test_programa_desbocado_queda_por_tiempo(tmp_path, trabajadores):
+    casos = escribir_casos(tmp_path, {'a_uno': ('1\n', '1\n1\n'), 'b_desbocado': ('10\n', '10\n'),
+                                      'c_cero': ('0\n', '0\n0\n')})
+    programa = Compilador(advertencias=False).compilar(DESBOCADO)
+    resultados = {r['nombre']: r for r in ejecutar_casos(programa, casos, trabajadores, 0.5)}
+    # Según dónde caiga el plazo el caso se corta solo entre sentencias o se mata
+    assert resultados['b_desbocado']['estado'] == 'tiempo'
+    assert TIEMPO_AGOTADO in resultados['b_desbocado']['error']
+    assert resultados['a_uno']['estado'] == resultados['c_cero']['estado'] == 'ok'
@@ -0,0 +1,139 @@
+"""Ejecución de programas (runtime.py) con el intérprete, el especializado y por columnas"""
+import pytest
+
+from parser import Compilador
+from runtime import DEMASIADAS_CIFRAS, formatear_valor
+
+
+@pytest.fixture(scope='module')
+def compilador():
+    return Compilador(advertencias=False)
+
+
+def como_texto(resultados):
+    return [(salida, None if error is None else str(error)) for salida, error in resultados]
+
+
+def ejecutar(compilador, codigo, entradas):
+    """[(salida, error)] de cada entrada; revisa que los backends den lo mismo"""
+    programa = compilador.compilar(codigo)
+    assert programa.exito, [m.mensaje for m in programa.mensajes if m.tipo == 'error']
+    resultados = como_texto(programa.ejecutar_lote(entradas))
+    assert como_texto(compilador.compilar(codigo, especializado=True).ejecutar_lote(entradas)) == resultados
+    return resultados
+
+
+def test_formatear_valor():
+    assert formatear_valor(3.0) == '3'
+    assert formatear_valor(2.5) == '2.5'
+    assert formatear_valor(-0.5) == '-0.5'
+    assert formatear_valor(float('inf')) == 'inf'
+    assert formatear_valor(float('-inf')) == '-inf'
+    assert formatear_valor(float('nan')) == 'nan'
+    assert formatear_valor(2 ** 100) == str(2 ** 100)
+    assert formatear_valor('hola') == 'hola'
+
+
+def test_real_que_se_desborda_muestra_inf(compilador):
+    codigo = ('x Real;\nx = Captura.Real();\n' + 'x = x * x;\n' * 9
+              + 'Mensaje.Texto(x);\ny Real;\ny = x - x;\nMensaje.Texto(y);\n')
+    assert ejecutar(compilador, codigo, [['10'], ['-10'], ['1']]) == [
+        ('inf\nnan\n', None), ('inf\nnan\n', None), ('1\n0\n', None)]
+
+
+def test_entero_con_demasiadas_cifras_es_error_de_ejecucion(compilador):
+    codigo = 'x Entero;\nx = Captura.Entero();\n' + 'x = x * x;\n' * 14 + 'Mensaje.Texto(1);\nMensaje.Texto(x);\n'
+    resultados = ejecutar(compilador, codigo, [['10'], ['1']])
+    assert resultados[0] == ('1\n', f'[Línea 18] {DEMASIADAS_CIFRAS}')
+    assert resultados[1] == ('1\n1\n', None)
+
+
+def test_por_columnas_igual_que_por_filas(compilador):
+    np = pytest.importorskip('numpy')
+    real = ('x Real;\nx = Captura.Real();\n' + 'x = x * x;\n' * 9 + 'Mensaje.Texto(x);\n')
+    entero = 'x Entero;\nx = Captura.Entero();\n' + 'x = x * x;\n' * 14 + 'Mensaje.Texto(x);\n'
+    for codigo, entradas in ((real, ['10', '-10', '1']), (entero, ['10', '1', '0'])):
+        programa = compilador.compilar(codigo)
+        esperado = como_texto(programa.ejecutar_lote([[valor] for valor in entradas]))
+        assert como_texto(programa.ejecutar_columnas([np.array(entradas)]).como_lote()) == esperado
+
+
+# Entero que crece hasta no caber en un Real
+CRECE = 'x Entero;\nx = Captura.Entero();\n' + 'x = x * x;\n' * 11
+
+
+@pytest.mark.parametrize('resto', [
+    'r Real;\nr = x;\nMensaje.Texto(r);\n',
+    'r Real;\nr = x / 3;\nMensaje.Texto(r);\n',
+    'r Real;\nr = 1,5 * x;\nMensaje.Texto(r);\n',
+    'L Lista Real[2];\nL[0] = x;\nMensaje.Texto(L[0]);\n',
+])
+def test_entero_que_no_cabe_en_real_es_error_de_ejecucion(compilador, resto):
+    resultados = ejecutar(compilador, CRECE + resto, [['10'], ['1']])
+    assert resultados[0][0] == '' and resultados[0][1].startswith('[Línea 15] ¡Ombe!')
+    assert resultados[1][1] is None
+
+
+def test_entero_que_no_cabe_en_real_por_columnas(compilador):
+    np = pytest.importorskip('numpy')
+    for resto in ('r Real;\nr = x;\nMensaje.Texto(r);\n', 'r Real;\nr = x / x;\nMensaje.Texto(r);\n',
+                  'r Real;\nr = 1,5 * x;\nMensaje.Texto(r);\n', 'L Lista Real[2];\nL[0] = x;\nMensaje.Texto(L[0]);\n'):
+        programa = compilador.compilar(CRECE + resto)
+        entradas = ['10', '2', '0', '-3']
+        esperado = como_texto(programa.ejecutar_lote([[valor] for valor in entradas]))
+        assert como_texto(programa.ejecutar_columnas([np.array(entradas)]).como_lote()) == esperado
+
+
+# ===================== ENTRADA, LISTAS Y DIVISIÓN =====================
+
+def test_captura_entero(compilador):
+    codigo = 'x Entero;\nx = Captura.Entero();\nMensaje.Texto(x + 1);\n'
+    assert ejecutar(compilador, codigo, [['41'], [' -3 '], ['4,5'], ['abc'], []]) == [
+        ('42\n', None), ('-2\n', None),
+        ('', "[Línea 2] ¡Qué vaina! '4,5' no es un Entero"),
+        ('', "[Línea 2] ¡Qué vaina! 'abc' no es un Entero"),
+        ('', '[Línea 2] ¡Ombe! Captura.Entero() no tiene más entrada que leer')]
+
+
+def test_captura_real_con_coma_o_punto(compilador):
+    codigo = 'r Real;\nr = Captura.Real();\nMensaje.Texto(r * 2);\n'
+    assert ejecutar(compilador, codigo, [['2,25'], ['2.25'], ['-3'], ['2,'], ['1e3']]) == [
+        ('4.5\n', None), ('4.5\n', None), ('-6\n', None),
+        ('', "[Línea 2] ¡Qué vaina! '2,' no es un Real"),
+        ('', "[Línea 2] ¡Qué vaina! '1e3' no es un Real")]
+
+
+def test_captura_texto_sin_entrada(compilador):
+    codigo = 't Texto;\nt = Captura.Texto();\nMensaje.Texto(t + "!");\nt = Captura.Texto();\n'
+    assert ejecutar(compilador, codigo, [['hola', ''], ['']]) == [
+        ('hola!\n', None), ('!\n', '[Línea 4] ¡Ombe! Captura.Texto() no tiene más entrada que leer')]
+
+
+def test_posiciones_de_una_lista(compilador):
+    codigo = ('L Lista Entero[3];\ni Entero;\ni = Captura.Entero();\nL[i] = 7;\n'
+              'Mensaje.Texto(L[i]);\nMensaje.Texto(L[i / 2]);\n')
+    fuera = "¡Ombe! La Lista 'L' no tiene la posición {}, va de 0 a 2"
+    assert ejecutar(compilador, codigo, [['2'], ['0'], ['3'], ['-1'], ['1']]) == [
+        ('7\n0\n', None), ('7\n7\n', None),
+        ('', '[Línea 4] ' + fuera.format(3)), ('', '[Línea 4] ' + fuera.format(-1)),
+        ('7\n', '[Línea 6] ' + fuera.format(0.5))]
+
+
+def test_division_por_cero(compilador):
+    codigo = 'x Entero;\nx = Captura.Entero();\nr Real;\nr = 10 / x;\nMensaje.Texto(r);\n'
+    assert ejecutar(compilador, codigo, [['4'], ['0']]) == [
+        ('2.5\n', None), ('', '[Línea 4] ¡Ombe! Estás dividiendo por cero')]
+
+
+@pytest.mark.parametrize('codigo, entradas', [
+    ('x Entero;\nx = Captura.Entero();\nMensaje.Texto(x + 1);\n', ['41', ' -3 ', '4,5', 'abc']),
+    ('r Real;\nr = Captura.Real();\nMensaje.Texto(r * 2);\n', ['2,25', '2.25', '-3', '2,']),
+    ('L Lista Entero[3];\ni Entero;\ni = Captura.Entero();\nL[i] = 7;\nMensaje.Texto(L[i]);\n'
+     'Mensaje.Texto(L[i / 2]);\n', ['2', '0', '3', '-1', '1']),
+    ('x Entero;\nx = Captura.Entero();\nr Real;\nr = 10 / x;\nMensaje.Texto(r);\n', ['4', '0']),
+], ids=['entero', 'real', 'lista', 'división'])
+def test_errores_por_columnas(compilador, codigo, entradas):
+    np = pytest.importorskip('numpy')
+    programa = compilador.compilar(codigo)
+    esperado = como_texto(programa.ejecutar_lote([[valor] for valor in entradas]))
+    assert como_texto(programa.ejecutar_columnas([np.array(entradas)]).como_lote()) == esperado
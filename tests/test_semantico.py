@@ -0,0 +1,55 @@
+"""Tipado y evaluación de expresiones (semantic.py): recursión hasta un margen y pila después"""
+import pytest
+
+from semantic import AnalizadorSemantico
+
+
+def preparar(nodos_activos):
+    semantico = AnalizadorSemantico()
+    semantico.nodos.activa = nodos_activos
+    semantico.declarar_variable('x', 'Real', 1)
+    semantico.asignar_variable('x', semantico.nodos.numero(1.5), 2)
+    return semantico
+
+
+def cadena(nodos, n):
+    expresion = nodos.binaria('*', nodos.variable('x'), nodos.numero(2))
+    for i in range(n):
+        expresion = nodos.binaria('+' if i % 2 else '-', expresion, nodos.numero(i % 7 + 1))
+        if i % 3 == 0:
+            expresion = nodos.negacion(expresion)
+    return expresion
+
+
+def ancha(nodos, n):
+    nivel = [nodos.binaria('*', nodos.variable('x'), nodos.numero(i % 5 + 1)) for i in range(n)]
+    while len(nivel) > 1:
+        nivel = [nodos.binaria('+', nivel[i], nivel[i + 1]) if i + 1 < len(nivel) else nivel[i]
+                 for i in range(0, len(nivel), 2)]
+    return nivel[0]
+
+
+@pytest.mark.parametrize('construir, n', [
+    (cadena, 10), (cadena, AnalizadorSemantico.PROFUNDIDAD_RECURSIVA), (cadena, 5000), (ancha, 3000),
+])
+@pytest.mark.parametrize('nodos_activos', [False, True], ids=['sin memo', 'con memo'])
+def test_recursivo_igual_que_con_pila(construir, n, nodos_activos):
+    semantico = preparar(nodos_activos)
+    expresion = construir(semantico.nodos, n)
+    tipo = semantico.obtener_tipo_expresion(expresion)
+    valor = semantico.evaluar_operacion(expresion)
+    semantico.cache_tipos.clear()
+    semantico.cache_valores.clear()
+    assert semantico.tipo_con_pila(expresion) == tipo == 'Real'
+    assert semantico.valor_con_pila(expresion, set()) == valor
+    # `visitados` deja seguir x una sola vez: el árbol ancho no se puede evaluar
+    assert (valor is None) == (construir is ancha)
+
+
+def test_variable_sin_valor_no_se_evalua():
+    semantico = preparar(True)
+    semantico.declarar_variable('y', 'Real', 3)
+    nodos = semantico.nodos
+    expresion = nodos.binaria('+', nodos.variable('x'), nodos.variable('y'))
+    assert semantico.evaluar_operacion(expresion) is None
+    assert semantico.evaluar_operacion(nodos.binaria('+', nodos.variable('x'), nodos.numero(1))) == 2.5
@@ -0,0 +1,62 @@
+"""Modo vigilancia con Importar (watch.py)"""
+import os
+
+from watch import Vigilante
+
+
+def escribir(ruta, codigo):
+    """Escribe el archivo con un mtime en el pasado, distinto del anterior (así la firma cambia seguro)"""
+    anterior = os.stat(ruta).st_mtime_ns if os.path.exists(ruta) else None
+    ruta.write_text(codigo, encoding='utf-8')
+    mtime = (anterior if anterior is not None else os.stat(ruta).st_mtime_ns) - 10**9
+    os.utime(ruta, ns=(mtime, mtime))
+
+
+def test_analiza_con_las_interfaces_de_lo_que_importa(tmp_path):
+    (tmp_path / 'g1').mkdir()
+    escribir(tmp_path / 'g1' / 'main.cos', 'Importar util;\ny Entero;\ny = x + 1;\nMensaje.Texto(y);\n')
+    escribir(tmp_path / 'g1' / 'util.cos', 'x Entero;\nx = 1;\n')
+    escribir(tmp_path / 'suelto.cos', 'Importar util;\n')
+
+    with Vigilante(str(tmp_path), espera=0) as vigilante:
+        analizados = vigilante.revisar()
+
+    assert set(analizados) == {'g1/main.cos', 'g1/util.cos', 'suelto.cos'}
+    assert analizados['g1/main.cos']['exito']
+    # util.cos está en otra carpeta: desde la raíz no se puede importar
+    assert not analizados['suelto.cos']['exito']
+
+
+def test_cambio_de_interfaz_reanaliza_a_quien_importa(tmp_path):
+    escribir(tmp_path / 'main.cos', 'Importar util;\ny Entero;\ny = x + 1;\nMensaje.Texto(y);\n')
+    escribir(tmp_path / 'util.cos', 'x Entero;\nx = 1;\n')
+
+    with Vigilante(str(tmp_path), espera=0) as vigilante:
+        vigilante.revisar()
+        assert vigilante.revisar() == {}
+
+        # Sin tocar la interfaz solo se analiza el módulo
+        escribir(tmp_path / 'util.cos', 'x Entero;\nx = 1;\nMensaje.Texto(x);\n')
+        assert set(vigilante.revisar()) == {'util.cos'}
+
+        # x pasa a Real: main.cos no cambió pero ahora tiene errores
+        escribir(tmp_path / 'util.cos', 'x Real;\nx = 1,5;\n')
+        analizados = vigilante.revisar()
+        assert set(analizados) == {'main.cos', 'util.cos'}
+        assert not analizados['main.cos']['exito']
+
+        # Borrar el módulo también reanaliza a quien lo importa
+        os.remove(tmp_path / 'util.cos')
+        analizados = vigilante.revisar()
+        assert set(analizados) == {'main.cos'}
+        assert not analizados['main.cos']['exito']
+
+
+def test_indice_guardado_sigue_al_dia(tmp_path):
+    escribir(tmp_path / 'main.cos', 'Importar util;\nMensaje.Texto(x);\n')
+    escribir(tmp_path / 'util.cos', 'x Entero;\nx = 1;\n')
+    with Vigilante(str(tmp_path), espera=0) as vigilante:
+        vigilante.revisar()
+    with Vigilante(str(tmp_path), espera=0) as vigilante:
+        assert vigilante.revisar() == {}
+        assert vigilante.totales()['sin_errores'] == 2
@@ -0,0 +1,450 @@
+"""Ejecución por columnas: un programa contra muchas filas de entrada a la vez.
+
+Los programas en Costeñol no tienen saltos (declaraciones, asignaciones,
+Captura y Mensaje.Texto), así que cada variable puede ser una columna de
+NumPy con un valor por fila. Cada Captura lee la siguiente columna de la
+entrada y cada Mensaje.Texto deja una columna de salida.
+
+Los resultados son los mismos que da Interprete.ejecutar_lote fila por fila:
+'/' siempre es división real (también Entero / Entero), una variable Real
+guarda los Entero como Real, y una fila que divide por cero o recibe una
+entrada mala se detiene ahí con su ErrorEjecucion, conservando lo que ya
+había mostrado.
+
+Cada Lista es una matriz (filas x tamaño) de int64 o float64: leer
+datos[i] toma un valor por fila y una posición fuera de rango detiene solo
+las filas que la usan.
+
+Requiere numpy (solo este módulo).
+"""
+import numpy as np
+
+from runtime import DEMASIADAS_CIFRAS, NUMERO_MUY_GRANDE, Entrada, ErrorEjecucion, Interprete, formatear_valor
+
+# Por encima de esto un producto de Entero puede salirse de int64
+LIMITE_INT64 = float(2 ** 63)
+
+# dtype de cada tipo de elemento de una Lista (los mismos que array('q') y array('d'))
+DTYPES_LISTA = {'Entero': np.int64, 'Real': np.float64}
+
+
+def cabe_en_real(valor):
+    """Si float(valor) no se desborda"""
+    try:
+        float(valor)
+    except OverflowError:
+        return False
+    return True
+
+
+class ResultadoColumnas:
+    """Salida de una ejecución por columnas.
+
+    `columnas` tiene una entrada por cada Mensaje.Texto ejecutado:
+    (sentencia, línea, valores), con valores un arreglo de NumPy (un valor
+    por fila) o un texto fijo. `filas_ok` marca las filas que terminaron sin error.
+    """
+
+    def __init__(self, filas, columnas, parada, fallos, total_sentencias):
+        self.filas = filas
+        self.columnas = columnas
+        # parada[i]: índice de la sentencia donde se detuvo la fila i (total = no se detuvo)
+        self.parada = parada
+        # [(sentencia, línea, índices de filas, función fila -> mensaje), ...]
+        self.fallos = fallos
+        self.total_sentencias = total_sentencias
+
+    @property
+    def filas_ok(self):
+        return self.parada == self.total_sentencias
+
+    def error(self, fila):
+        """ErrorEjecucion de una fila, o None si terminó bien"""
+        if self.parada[fila] == self.total_sentencias:
+            return None
+        for sentencia, linea, indices, mensaje in self.fallos:
+            if sentencia == self.parada[fila] and np.any(indices == fila):
+                return ErrorEjecucion(mensaje(fila), linea)
+        return None
+
+    def texto_columna(self, i):
+        """Textos de la columna i tal como los escribe Mensaje.Texto"""
+        valores = self.columnas[i][2]
+        if isinstance(valores, str):
+            return [valores] * self.filas
+        return [formatear_valor(valor) for valor in valores.tolist()]
+
+    def salida(self, fila):
+        """Texto que mostró una fila (igual que Salida.texto())"""
+        lineas = []
+        for sentencia, _, valores in self.columnas:
+            if sentencia >= self.parada[fila]:
+                break
+            lineas.append(valores if isinstance(valores, str) else formatear_valor(valores[fila:fila + 1].tolist()[0]))
+        return '\n'.join(lineas) + '\n' if lineas else ''
+
+    def como_lote(self):
+        """[(salida, error), ...] por fila, como Programa.ejecutar_lote"""
+        return [(self.salida(fila), self.error(fila)) for fila in range(self.filas)]
+
+
+class InterpreteColumnas:
+    """Ejecuta las sentencias una vez, con columnas en vez de valores sueltos"""
+
+    COMBINAR = object()
+
+    def ejecutar(self, programa, entradas, filas=None):
+        """Corre el programa sobre todas las filas.
+
+        `entradas` es un arreglo 2D (filas x capturas) o una lista de
+        columnas; la captura k (en el orden en que se ejecutan) lee la
+        columna k. Las filas salen de la forma del arreglo (también de uno
+        (N, 0), sin capturas) o del largo de la primera columna; con una
+        lista vacía hay que pasar `filas`.
+        """
+        columnas, filas_entrada = self.preparar_entradas(entradas)
+        if filas is None:
+            filas = filas_entrada if filas_entrada is not None else 1
+        total = len(programa.sentencias)
+
+        self.programa = programa
+        self.columnas_entrada = columnas
+        self.siguiente_captura = 0
+        self.filas = filas
+        self.parada = np.full(filas, total, dtype=np.int32)
+        self.fallos = []
+
+        valores = {}
+        salidas = []
+        # Como en Python, los Real que se pasan dan inf o nan sin avisar
+        with np.errstate(over='ignore', invalid='ignore'):
+            self.ejecutar_sentencias(programa, valores, salidas)
+        return ResultadoColumnas(filas, salidas, self.parada, self.fallos, total)
+
+    def ejecutar_sentencias(self, programa, valores, salidas):
+        for indice, sentencia in enumerate(programa.sentencias):
+            self.sentencia = indice
+            clase = sentencia[0]
+            if clase == 'asignar':
+                _, nombre, expresion, linea = sentencia
+                valor = self.evaluar(expresion, valores, linea)
+                if programa.tipos.get(nombre) == 'Real':
+                    valor = self.a_real(valor, linea)
+                valores[nombre] = valor
+
+            elif clase == 'mensaje_texto':
+                _, expresion, linea = sentencia
+                if isinstance(expresion, str):
+                    salidas.append((indice, linea, expresion))
+                else:
+                    valor = self.columna(self.evaluar(expresion, valores, linea))
+                    salidas.append((indice, linea, self.mostrable(valor, linea)))
+
+            elif clase == 'declarar_lista':
+                _, nombre, tipo, tamano, _ = sentencia
+                valores[nombre] = np.zeros((self.filas, tamano), dtype=DTYPES_LISTA[tipo])
+
+            elif clase == 'asignar_elemento':
+                _, nombre, posicion, expresion, linea = sentencia
+                if posicion[0] == 'numero':
+                    # Índice constante: su rango ya se revisó al compilar
+                    posicion = posicion[1]
+                else:
+                    posicion = self.posiciones(nombre, valores[nombre], self.evaluar(posicion, valores, linea), linea)
+                self.guardar_elemento(nombre, valores[nombre], posicion, self.evaluar(expresion, valores, linea), linea)
+
+    # ===================== ENTRADAS =====================
+
+    @staticmethod
+    def preparar_entradas(entradas):
+        """Retorna (columnas, filas), con filas None si no se puede saber"""
+        if isinstance(entradas, np.ndarray):
+            if entradas.ndim == 1:
+                return [entradas], len(entradas)
+            return [entradas[:, k] for k in range(entradas.shape[1])], entradas.shape[0]
+        columnas = [np.asarray(columna) for columna in entradas]
+        return columnas, len(columnas[0]) if columnas else None
+
+    @staticmethod
+    def columna_entera(valores):
+        """Columna int64, o de enteros exactos (object) si alguno no cabe en int64"""
+        if all(-2 ** 63 <= valor < 2 ** 63 for valor in valores):
+            return np.array(valores, dtype=np.int64)
+        # Los Entero de Python no tienen tope: se sigue como en operar() cuando se desborda
+        columna = np.empty(len(valores), dtype=object)
+        columna[:] = valores
+        return columna
+
+    def mostrable(self, columna, linea):
+        """La columna sin los Entero con demasiadas cifras para mostrarse: esas filas se detienen aquí"""
+        if columna.dtype != object:
+            return columna
+        largos = np.zeros(self.filas, dtype=bool)
+        for fila, valor in enumerate(columna.tolist()):
+            try:
+                formatear_valor(valor)
+            except ErrorEjecucion:
+                largos[fila] = True
+        if not largos.any():
+            return columna
+        self.fallar(largos, linea, lambda fila: DEMASIADAS_CIFRAS)
+        columna = columna.copy()
+        columna[largos] = 0
+        return columna
+
+    def fallar(self, mascara, linea, mensaje):
+        """Detiene en la sentencia actual las filas de `mascara` que seguían vivas"""
+        mascara = mascara & (self.parada == len(self.programa.sentencias))
+        indices = np.flatnonzero(mascara)
+        if len(indices):
+            self.parada[indices] = self.sentencia
+            self.fallos.append((self.sentencia, linea, indices, mensaje))
+
+    def capturar(self, tipo, linea):
+        """Lee la siguiente columna como Entero, Real o Texto"""
+        k = self.siguiente_captura
+        self.siguiente_captura += 1
+        if k >= len(self.columnas_entrada):
+            self.fallar(np.ones(self.filas, dtype=bool), linea,
+                        lambda fila: f"¡Ombe! Captura.{tipo}() no tiene más entrada que leer")
+            return np.zeros(self.filas, dtype=np.float64 if tipo == 'Real' else np.int64)
+
+        columna = self.columnas_entrada[k]
+        if tipo == 'Texto':
+            return columna.astype(str)
+
+        if columna.dtype.kind in 'iu':
+            if tipo == 'Real':
+                return columna.astype(np.float64)
+            if columna.dtype.kind == 'u' and len(columna) and columna.max() > np.iinfo(np.int64).max:
+                # uint64 por encima de int64 no se puede convertir sin darle la vuelta
+                return self.columna_entera(columna.tolist())
+            return columna.astype(np.int64)
+        if columna.dtype.kind == 'f':
+            # Igual que con una lista: el valor se lee como str(valor), así
+            # que 3.0 no es un Entero y 1e+16, 1e-05, nan o inf no son Real
+            if tipo == 'Real':
+                columna = columna.astype(np.float64)
+                magnitud = np.abs(columna)
+                malos = ~np.isfinite(columna) | (magnitud >= 1e16) | ((magnitud < 1e-4) & (columna != 0))
+            else:
+                malos = np.ones(self.filas, dtype=bool)
+            self.fallar(malos, linea, lambda fila: f"¡Qué vaina! '{columna[fila].item()}' no es un {tipo}")
+            return columna if tipo == 'Real' else np.zeros(self.filas, dtype=np.int64)
+
+        # Textos: se validan con los mismos patrones de Entrada (camino lento)
+        patron = Entrada.patron_entero if tipo == 'Entero' else Entrada.patron_real
+        textos = [str(valor).strip() for valor in columna.tolist()]
+        malos = np.array([not patron.fullmatch(texto) for texto in textos], dtype=bool)
+        self.fallar(malos, linea, lambda fila: f"¡Qué vaina! '{textos[fila]}' no es un {tipo}")
+        if tipo == 'Entero':
+            return self.columna_entera([0 if malo else int(texto) for texto, malo in zip(textos, malos)])
+        return np.array([0.0 if malo else float(texto.replace(',', '.')) for texto, malo in zip(textos, malos)],
+                        dtype=np.float64)
+
+    # ===================== EXPRESIONES =====================
+
+    def evaluar(self, expresion, valores, linea):
+        """Misma pila que Interprete.evaluar, con columnas (o escalares) como valores"""
+        combinar = self.COMBINAR
+        resultados = []
+        pila = [expresion]
+        while pila:
+            nodo = pila.pop()
+
+            if nodo is combinar:
+                nodo = pila.pop()
+                if nodo[0] == 'negacion':
+                    resultados.append(-resultados.pop())
+                    continue
+                if nodo[0] == 'elemento':
+                    lista = valores[nodo[1]]
+                    posiciones = self.posiciones(nodo[1], lista, resultados.pop(), linea)
+                    resultados.append(lista[np.arange(self.filas), posiciones])
+                    continue
+                der = resultados.pop()
+                izq = resultados.pop()
+                resultados.append(self.operar(nodo[1], izq, der, linea))
+                continue
+
+            clase = nodo[0]
+            if clase == 'operacion_binaria':
+                pila.append(nodo)
+                pila.append(combinar)
+                pila.append(nodo[3])
+                pila.append(nodo[2])
+
+            elif clase in ('numero', 'cadena'):
+                resultados.append(nodo[1])
+
+            elif clase == 'elemento':
+                if nodo[2][0] == 'numero':
+                    # Índice constante: su rango ya se revisó al compilar (copia: la
+                    # Lista puede cambiar después)
+                    resultados.append(valores[nodo[1]][:, nodo[2][1]].copy())
+                else:
+                    pila.append(nodo)
+                    pila.append(combinar)
+                    pila.append(nodo[2])
+
+            elif clase == 'variable':
+                if nodo[1] not in valores:
+                    raise ErrorEjecucion(f"¡Ombe! La variable '{nodo[1]}' no tiene valor", linea)
+                resultados.append(valores[nodo[1]])
+
+            elif clase == 'capturar':
+                resultados.append(self.capturar(nodo[1], linea))
+
+            elif clase == 'negacion':
+                pila.append(nodo)
+                pila.append(combinar)
+                pila.append(nodo[1])
+
+            else:
+                raise ErrorEjecucion(f"Expresión no ejecutable: {nodo!r}", linea)
+
+        return resultados[0]
+
+    # ===================== LISTAS =====================
+
+    def posiciones(self, nombre, lista, indice, linea):
+        """Columna de índices revisada como posicion_lista; las filas con un índice malo se detienen"""
+        indice = self.columna(indice)
+        tamano = lista.shape[1]
+        if indice.dtype.kind == 'f':
+            # Como en Interprete, un Real sirve si es exacto (4 / 2)
+            malos = ~(np.isfinite(indice) & (indice == np.floor(indice)))
+            malos |= (indice < 0) | (indice >= tamano)
+        else:
+            malos = np.asarray((indice < 0) | (indice >= tamano), dtype=bool)
+        if not malos.any():
+            return indice.astype(np.int64)
+        self.fallar(malos, linea, lambda fila: f"¡Ombe! La Lista '{nombre}' no tiene la posición "
+                                               f"{formatear_valor(indice[fila:fila + 1].tolist()[0])}, "
+                                               f"va de 0 a {tamano - 1}")
+        return np.where(malos, 0, indice).astype(np.int64)
+
+    def guardar_elemento(self, nombre, lista, posicion, valor, linea):
+        """lista[posición de cada fila] = valor, con los mismos errores que guardar_elemento de runtime"""
+        valor = original = self.columna(valor)
+
+        def mostrado(fila):
+            return formatear_valor(original[fila:fila + 1].tolist()[0])
+
+        grandes = np.zeros(self.filas, dtype=bool)
+        if lista.dtype.kind == 'i' and valor.dtype.kind == 'f':
+            inexactos = ~(np.isfinite(valor) & (valor == np.floor(valor)))
+            self.fallar(inexactos, linea,
+                        lambda fila: f"¡Ombe! {mostrado(fila)} no es un Entero, no cabe en la Lista '{nombre}'")
+            grandes = ~inexactos & ((valor < -LIMITE_INT64) | (valor >= LIMITE_INT64))
+            valor = np.where(inexactos | grandes, 0, valor)
+        elif valor.dtype == object:
+            # Enteros exactos que se salieron de int64: se revisan uno por uno
+            if lista.dtype.kind == 'i':
+                grandes = np.array([not -2 ** 63 <= v < 2 ** 63 for v in valor.tolist()], dtype=bool)
+            else:
+                grandes = np.array([not cabe_en_real(v) for v in valor.tolist()], dtype=bool)
+            valor = np.where(grandes, 0, valor)
+        if grandes.any():
+            self.fallar(grandes, linea,
+                        lambda fila: f"¡Ombe! El número {mostrado(fila)} es muy grande para la Lista '{nombre}'")
+        if isinstance(posicion, int):
+            lista[:, posicion] = valor.astype(lista.dtype)
+        else:
+            lista[np.arange(self.filas), posicion] = valor.astype(lista.dtype)
+
+    # ===================== OPERACIONES =====================
+
+    def operar(self, op, izq, der, linea):
+        """Interprete.operar sobre columnas: división real y división por cero por fila"""
+        if self.es_texto(izq) or self.es_texto(der):
+            return np.char.add(np.asarray(izq, dtype=str), np.asarray(der, dtype=str))
+
+        if op == '/':
+            ceros = np.asarray(der == 0)
+            if ceros.any():
+                self.fallar(np.broadcast_to(ceros, (self.filas,)), linea,
+                            lambda fila: "¡Ombe! Estás dividiendo por cero")
+                der = np.where(ceros, 1, der)
+            if self.fuera_de_int64(izq) or self.fuera_de_int64(der):
+                return self.por_filas(linea, lambda a, b: a / b, izq, der)
+            return np.true_divide(izq, der)
+
+        if (self.fuera_de_int64(izq) or self.fuera_de_int64(der)) and not (self.es_entero(izq) and self.es_entero(der)):
+            # Entero exacto con Real: se convierte en cada fila, como en Interprete
+            return self.por_filas(linea, lambda a, b: Interprete.operar(op, a, b, linea), izq, der)
+
+        resultado = self.aplicar(op, izq, der)
+        if self.es_entero(resultado) and self.desborda(op, izq, der, resultado):
+            # Los Entero de Python no tienen tope: se repite con enteros exactos
+            resultado = self.aplicar(op, self.exacto(izq), self.exacto(der))
+        return resultado
+
+    @staticmethod
+    def aplicar(op, izq, der):
+        if op == '+':
+            return np.add(izq, der)
+        if op == '-':
+            return np.subtract(izq, der)
+        return np.multiply(izq, der)
+
+    @staticmethod
+    def desborda(op, izq, der, resultado):
+        """Si una operación de Entero se salió de int64"""
+        if isinstance(resultado, np.ndarray) and resultado.dtype == object:
+            return False
+        izq = np.asarray(izq, dtype=np.int64)
+        der = np.asarray(der, dtype=np.int64)
+        if op == '+':
+            return bool(np.any((izq ^ resultado) & (der ^ resultado) < 0))
+        if op == '-':
+            return bool(np.any((izq ^ der) & (izq ^ resultado) < 0))
+        producto = np.abs(izq.astype(np.float64) * der.astype(np.float64))
+        return bool(np.any(producto >= LIMITE_INT64 / 2))
+
+    @staticmethod
+    def exacto(valor):
+        if isinstance(valor, np.ndarray):
+            return valor.astype(object)
+        return valor
+
+    @staticmethod
+    def es_texto(valor):
+        return isinstance(valor, str) or (isinstance(valor, np.ndarray) and valor.dtype.kind == 'U')
+
+    @staticmethod
+    def es_entero(valor):
+        return isinstance(valor, (int, np.integer)) or (isinstance(valor, np.ndarray) and valor.dtype.kind in 'iuO')
+
+    @staticmethod
+    def fuera_de_int64(valor):
+        """Si el valor trae Entero exactos que no caben en int64 (no se pasan a Real sin revisar)"""
+        if isinstance(valor, np.ndarray):
+            return valor.dtype == object
+        return isinstance(valor, int) and not -2 ** 63 <= valor < 2 ** 63
+
+    def por_filas(self, linea, funcion, *valores):
+        """funcion(...) fila por fila con valores de Python; las filas que se desbordan se detienen"""
+        resultado = np.zeros(self.filas)
+        grandes = np.zeros(self.filas, dtype=bool)
+        for fila, argumentos in enumerate(zip(*[self.columna(valor).tolist() for valor in valores])):
+            try:
+                resultado[fila] = funcion(*argumentos)
+            except OverflowError:
+                grandes[fila] = True
+        self.fallar(grandes, linea, lambda fila: NUMERO_MUY_GRANDE)
+        return resultado
+
+    def a_real(self, valor, linea):
+        """Una variable Real guarda los Entero como Real"""
+        if self.fuera_de_int64(valor):
+            return self.por_filas(linea, float, valor)
+        if isinstance(valor, np.ndarray):
+            return valor if valor.dtype.kind == 'f' else valor.astype(np.float64)
+        return float(valor) if isinstance(valor, (int, np.integer)) else valor
+
+    def columna(self, valor):
+        """Un valor como columna de `filas` elementos"""
+        if isinstance(valor, np.ndarray) and valor.shape == (self.filas,):
+            return valor
+        return np.full(self.filas, valor)
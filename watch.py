@@ -0,0 +1,230 @@
+"""Modo vigilancia: mantiene analizada una carpeta de programas .cos que cambian.
+
+Pensado para el servidor del salón: los estudiantes guardan sus `.cos` en
+una carpeta (con subcarpetas) y aquí se vuelven a analizar solo los que
+cambiaron, con `Compilador.analizar`. No usa servicios externos: cada
+revisión recorre la carpeta con os.scandir y compara la firma de cada
+archivo (mtime en ns y tamaño) con la del índice. Si nada cambió no se abre
+ningún archivo, así que revisar la carpeta completa cuesta un stat por archivo.
+
+- Un archivo cuya firma cambió pero el contenido no (se guardó igual) no se
+  vuelve a analizar: el índice guarda también el hash del código.
+- Escrituras seguidas se juntan: un archivo se analiza cuando lleva
+  `espera` segundos sin cambiar, no en cada guardada.
+- El índice se guarda en la carpeta (ARCHIVO_INDICE) junto con el hash de
+  los módulos del compilador (golden.version_backend): si el compilador
+  cambió, todo se vuelve a analizar; si no, al arrancar solo se analiza lo
+  que cambió mientras no se estaba vigilando.
+- Los análisis se reparten en un pool de procesos que se crea una vez y se
+  queda caliente (cada trabajador construye su Compilador una sola vez).
+
+- `Importar util;` en `grupo/main.cos` trae `grupo/util.cos`: cada carpeta
+  es un proyecto como los de modules.py, y los archivos se analizan con las
+  interfaces de lo que importan, cada uno después de esos módulos. Si la
+  interfaz de un módulo cambia (o el módulo aparece o se borra) se vuelven
+  a analizar los archivos que lo importan, aunque ellos no hayan cambiado.
+
+El índice tiene por archivo: exito, vacio, estadisticas (aciertos y errores)
+y mensajes, más lo que modules.py guarda de cada módulo (importaciones,
+interfaz y hash de la interfaz de cada módulo importado).
+
+Uso: python watch.py carpeta [--trabajadores N] [--intervalo S] [--espera S] [--una-vez]
+"""
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from golden import hash_texto, leer_json, version_backend
+from modules import _preparar_trabajador, analizar_en_orden, importaciones
+from source import FuenteArchivo
+
+ARCHIVO_INDICE = '.indice.json'
+BACKEND = 'parser:Compilador'
+# Cambia cuando cambia lo que se guarda de cada archivo en el índice
+FORMATO = 2
+
+
+# ===================== VIGILANTE =====================
+
+class Vigilante:
+    """Índice de una carpeta de .cos que se pone al día con revisar()"""
+
+    def __init__(self, carpeta, trabajadores=1, espera=0.3, ruta_indice=None, extension='.cos'):
+        self.carpeta = carpeta
+        self.trabajadores = trabajadores or os.cpu_count() or 1
+        # Segundos que un archivo debe llevar sin cambiar para analizarlo
+        self.espera = espera
+        self.extension = extension
+        self.ruta_indice = ruta_indice if ruta_indice is not None else os.path.join(carpeta, ARCHIVO_INDICE)
+        self.version = version_backend(BACKEND)
+        self.ejecutor = None
+
+        guardado = leer_json(self.ruta_indice, {})
+        # nombre relativo -> {'firma', 'hash', 'importa', 'exito', 'vacio', 'estadisticas', 'mensajes',
+        #                     'exporta', 'dependencias', 'interfaz', 'hash_interfaz'}
+        vigente = guardado.get('version') == self.version and guardado.get('formato') == FORMATO
+        self.archivos = guardado.get('archivos', {}) if vigente else {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.cerrar()
+
+    def cerrar(self):
+        if self.ejecutor is not None:
+            self.ejecutor.shutdown()
+            self.ejecutor = None
+
+    # ===================== REVISIÓN =====================
+
+    def escanear(self):
+        """{nombre relativo: (ruta, firma)} de los .cos de la carpeta y subcarpetas"""
+        encontrados = {}
+        pendientes = [self.carpeta]
+        while pendientes:
+            carpeta = pendientes.pop()
+            try:
+                entradas = os.scandir(carpeta)
+            except OSError:
+                continue
+            with entradas:
+                for entrada in entradas:
+                    if entrada.is_dir(follow_symlinks=False):
+                        if not entrada.name.startswith('.'):
+                            pendientes.append(entrada.path)
+                    elif entrada.name.endswith(self.extension):
+                        try:
+                            datos = entrada.stat()
+                        except OSError:
+                            continue
+                        nombre = os.path.relpath(entrada.path, self.carpeta).replace(os.sep, '/')
+                        encontrados[nombre] = (entrada.path, [datos.st_mtime_ns, datos.st_size])
+        return encontrados
+
+    def revisar(self, ahora=None):
+        """Analiza lo que cambió (o importa una interfaz que cambió) y quita lo borrado.
+
+        Retorna {nombre: datos del índice} de lo analizado.
+        """
+        ahora = time.time() if ahora is None else ahora
+        encontrados = self.escanear()
+        cambio = False
+
+        for nombre in [n for n in self.archivos if n not in encontrados]:
+            del self.archivos[nombre]
+            cambio = True
+
+        # Código de los archivos que hubo que leer (los demás se leen solo si se reanalizan)
+        codigos = {}
+        for nombre, (ruta, firma) in encontrados.items():
+            anterior = self.archivos.get(nombre)
+            if anterior is not None and anterior['firma'] == firma:
+                continue
+            if ahora - firma[0] / 1e9 < self.espera:
+                # Se está escribiendo: se espera a que se quede quieto
+                continue
+            try:
+                codigo = FuenteArchivo(ruta).codigo
+            except (OSError, UnicodeDecodeError):
+                # Se borró o se reemplazó a medio escanear: la próxima revisión lo ve
+                continue
+            clave = hash_texto(codigo)
+            cambio = True
+            if anterior is not None and anterior['hash'] == clave:
+                anterior['firma'] = firma
+                continue
+            codigos[nombre] = codigo
+            # Sin 'interfaz' el archivo queda marcado para analizar
+            self.archivos[nombre] = {'firma': firma, 'hash': clave,
+                                     'importa': [self.clave_modulo(nombre, m) for m in importaciones(codigo)]}
+
+        if not cambio:
+            # Nada cambió: ninguna interfaz pudo cambiar
+            return {}
+        analizados = analizar_en_orden(self.archivos, codigos, self.leer, self.nombre_modulo, self.pool)
+        self.guardar()
+        return {nombre: self.archivos[nombre] for nombre in analizados}
+
+    def clave_modulo(self, nombre, modulo):
+        """Nombre relativo del archivo que trae `Importar modulo;` escrito en el archivo `nombre`"""
+        carpeta = nombre.rpartition('/')[0]
+        return f"{carpeta}/{modulo}{self.extension}" if carpeta else modulo + self.extension
+
+    def nombre_modulo(self, nombre):
+        """Nombre con que se importa el archivo: el del archivo sin carpeta ni extensión"""
+        return nombre.rpartition('/')[2][:-len(self.extension)]
+
+    def leer(self, nombre):
+        return FuenteArchivo(os.path.join(self.carpeta, *nombre.split('/'))).codigo
+
+    def pool(self):
+        """Pool de procesos para analizar (se crea al primer uso), o None con un solo trabajador"""
+        if self.trabajadores == 1:
+            return None
+        if self.ejecutor is None:
+            self.ejecutor = ProcessPoolExecutor(self.trabajadores, initializer=_preparar_trabajador)
+        return self.ejecutor
+
+    def guardar(self):
+        """Escribe el índice (primero a un temporal, así nunca queda a medias)"""
+        temporal = self.ruta_indice + '.tmp'
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump({'version': self.version, 'formato': FORMATO, 'archivos': self.archivos}, f,
+                      ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+        os.replace(temporal, self.ruta_indice)
+
+    def totales(self):
+        """Archivos, archivos sin errores y suma de aciertos y errores"""
+        totales = {'archivos': len(self.archivos), 'sin_errores': 0, 'aciertos': 0, 'errores': 0}
+        for datos in self.archivos.values():
+            totales['sin_errores'] += datos['exito']
+            totales['aciertos'] += datos['estadisticas']['aciertos']
+            totales['errores'] += datos['estadisticas']['errores']
+        return totales
+
+    def vigilar(self, intervalo=0.5, al_analizar=None):
+        """Revisa cada `intervalo` segundos hasta Ctrl+C; llama al_analizar(nombre, resumen)"""
+        try:
+            while True:
+                for nombre, datos in self.revisar().items():
+                    if al_analizar is not None:
+                        al_analizar(nombre, datos)
+                time.sleep(intervalo)
+        except KeyboardInterrupt:
+            pass
+
+
+def mostrar(nombre, datos):
+    estadisticas = datos['estadisticas']
+    estado = 'vacío' if datos['vacio'] else ('ok' if datos['exito'] else 'errores')
+    print(f"[{estado}] {nombre}: {estadisticas['aciertos']} aciertos, {estadisticas['errores']} errores", flush=True)
+
+
+def main():
+    argumentos = argparse.ArgumentParser(description="Analiza de nuevo los .cos de una carpeta cuando cambian")
+    argumentos.add_argument('carpeta')
+    argumentos.add_argument('--trabajadores', type=int, default=None)
+    argumentos.add_argument('--intervalo', type=float, default=0.5, help="Segundos entre revisiones")
+    argumentos.add_argument('--espera', type=float, default=0.3,
+                            help="Segundos sin cambios antes de analizar un archivo")
+    argumentos.add_argument('--indice', default=None, help=f"Archivo del índice (por defecto <carpeta>/{ARCHIVO_INDICE})")
+    argumentos.add_argument('--una-vez', action='store_true', help="Revisar una sola vez y salir")
+    opciones = argumentos.parse_args()
+
+    espera = 0.0 if opciones.una_vez else opciones.espera
+    with Vigilante(opciones.carpeta, opciones.trabajadores, espera, opciones.indice) as vigilante:
+        inicio = time.perf_counter()
+        for nombre, datos in sorted(vigilante.revisar().items()):
+            mostrar(nombre, datos)
+        totales = vigilante.totales()
+        print(f"{totales['archivos']} archivos ({totales['sin_errores']} sin errores) "
+              f"revisados en {time.perf_counter() - inicio:.2f} s")
+        if not opciones.una_vez:
+            vigilante.vigilar(opciones.intervalo, mostrar)
+
+
+if __name__ == '__main__':
+    main()